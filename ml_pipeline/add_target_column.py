@@ -1,9 +1,18 @@
-import pandas as pd
+from ml_pipeline.src.ml.dataset_manager import load_dataset, save_dataset
 
-path = "ml_data/features/AAPL/intraday/60min/compact/latest.parquet"
-print(f"Loading features from {path}...")
+# Run as: python -m ml_pipeline.add_target_column
+dataset = {
+    "dataset_type": "features",
+    "symbol": "AAPL",
+    "mode": "intraday",
+    "interval": "60min",
+    "outputsize": "compact",
+}
+print(f"Loading latest features for {dataset['symbol']}...")
 
-df = pd.read_parquet(path)
+df = load_dataset(**dataset)
+if df is None:
+    raise SystemExit("❌ No cached features dataset found.")
 
 # Add target: 1-hour forward return
 df["target"] = df["close"].shift(-1) / df["close"] - 1
@@ -11,7 +20,7 @@ df["target"] = df["close"].shift(-1) / df["close"] - 1
 # Drop row with NaN target (last row)
 df.dropna(inplace=True)
 
-print(f"Saving updated dataset with 'target' column to {path}")
-df.to_parquet(path)
+path = save_dataset(df, **dataset)
+print(f"Saved updated dataset with 'target' column to {path}")
 
 print("✅ Target column added successfully.")
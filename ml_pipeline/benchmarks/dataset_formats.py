@@ -0,0 +1,221 @@
+"""
+Parquet vs memory-mapped Feather load benchmark for feature datasets.
+
+Writes one synthetic features dataset per storage format into a scratch data
+directory through `dataset_manager.save_dataset`, then loads it back with
+`load_dataset` (cache disabled) in three shapes: the full frame, a column
+projection and a time slice. For each it reports the median load latency, the
+latency of loading and scanning the loaded columns once, and, measured in a
+fresh process per load, the resident set growth and how much of it is
+anonymous (private) memory. Pages of a mapped Feather file are file-backed, so
+they are shared with every other process reading the same file and can be
+dropped by the OS under pressure; decoded Parquet columns are anonymous.
+
+Examples:
+    # 1M rows x 40 indicator columns, 5 repetitions
+    python -m ml_pipeline.benchmarks.dataset_formats --rows 1000000 --columns 40
+
+    # Project 3 columns and keep the last 5% of rows
+    python -m ml_pipeline.benchmarks.dataset_formats --project 3 --slice 0.05 --output report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("parquet", "feather")
+SHAPES = ("full", "projection", "slice")
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Parquet vs Feather dataset loads.")
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows in the synthetic dataset.")
+    parser.add_argument("--columns", type=int, default=30, help="Float indicator columns.")
+    parser.add_argument("--project", type=int, default=4,
+                        help="Columns loaded by the projection shape.")
+    parser.add_argument("--slice", type=float, default=0.1,
+                        help="Fraction of the most recent rows loaded by the slice shape.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed loads per shape.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--keep-data", action="store_true",
+                        help="Keep the scratch data directory instead of deleting it.")
+    return parser.parse_args()
+
+
+def _configure_environment(data_dir: str) -> None:
+    """Point the pipeline at the scratch directory before it is imported."""
+    os.environ.update({"ML_DATA_DIR": data_dir, "ML_S3_BUCKET": "", "ML_DATASET_CACHE": "0"})
+    if "ml_pipeline.src.ml.config" in sys.modules:
+        raise RuntimeError("Pipeline configuration was imported before the benchmark set it up.")
+
+
+def _synthetic_features(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2000-01-03", periods=rows, freq="min", tz="UTC", name="date")
+    data = {f"ind_{i:03d}": rng.standard_normal(rows) for i in range(columns)}
+    return pd.DataFrame(data, index=index)
+
+
+def _memory() -> Dict[str, Optional[int]]:
+    """Resident and anonymous bytes of this process (Linux /proc, None elsewhere)."""
+    usage: Dict[str, Optional[int]] = {"rss": None, "anonymous": None}
+    try:
+        with open("/proc/self/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    usage["rss"] = int(line.split()[1]) * 1024
+        with open("/proc/self/smaps_rollup", encoding="utf-8") as rollup:
+            for line in rollup:
+                if line.startswith("Anonymous:"):
+                    usage["anonymous"] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return usage
+
+
+def _load_kwargs(shape: str, symbol: str, frame_info: Dict[str, Any]) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"dataset_type": "features", "symbol": symbol, "use_cache": False}
+    if shape == "projection":
+        kwargs["columns"] = frame_info["projection"]
+    elif shape == "slice":
+        kwargs["start"] = frame_info["slice_start"]
+    return kwargs
+
+
+def _scan(df: pd.DataFrame) -> float:
+    """Touch every loaded value once, as a model fit or indicator pass would."""
+    return float(sum(np.nansum(df[col].to_numpy()) for col in df.columns))
+
+
+def _measure_in_child(shape: str, symbol: str, frame_info: Dict[str, Any], queue) -> None:
+    dataset_manager = importlib.import_module("ml_pipeline.src.ml.dataset_manager")
+    before = _memory()
+    df = dataset_manager.load_dataset(**_load_kwargs(shape, symbol, frame_info))
+    _scan(df)
+    after = _memory()
+    queue.put(
+        {
+            name: None if after[name] is None else after[name] - before[name]
+            for name in ("rss", "anonymous")
+        }
+    )
+
+
+def _memory_growth(shape: str, symbol: str, frame_info: Dict[str, Any]) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure_in_child, args=(shape, symbol, frame_info, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _timed(load, repeat: int, scan: bool) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = load()
+        if scan:
+            _scan(df)
+        samples.append(time.perf_counter() - started)
+        del df
+    return statistics.median(samples)
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Save the dataset in each format, measure every load shape and return the report."""
+    data_dir = tempfile.mkdtemp(prefix="ml_formats_")
+    try:
+        _configure_environment(data_dir)
+        dataset_manager = importlib.import_module("ml_pipeline.src.ml.dataset_manager")
+        df = _synthetic_features(args.rows, args.columns)
+        frame_info = {
+            "projection": list(df.columns[: args.project]),
+            "slice_start": str(df.index[int(len(df) * (1 - args.slice))]),
+        }
+
+        report: Dict[str, Any] = {
+            "rows": args.rows,
+            "columns": args.columns,
+            "in_memory_mb": round(df.memory_usage(deep=True).sum() / 1e6, 1),
+            "formats": {},
+        }
+        for fmt in FORMATS:
+            symbol = fmt.upper()
+            dataset_manager.DATASET_FORMATS["features"] = fmt
+            started = time.perf_counter()
+            path = dataset_manager.save_dataset(df, "features", symbol, version="bench")
+            result: Dict[str, Any] = {
+                "file_mb": round(path.stat().st_size / 1e6, 1),
+                "save_seconds": round(time.perf_counter() - started, 3),
+                "shapes": {},
+            }
+            for shape in SHAPES:
+                kwargs = _load_kwargs(shape, symbol, frame_info)
+                load = lambda kwargs=kwargs: dataset_manager.load_dataset(**kwargs)  # noqa: E731
+                growth = _memory_growth(shape, symbol, frame_info)
+                result["shapes"][shape] = {
+                    "load_ms": round(_timed(load, args.repeat, scan=False) * 1000, 2),
+                    "load_and_scan_ms": round(_timed(load, args.repeat, scan=True) * 1000, 2),
+                    "rss_mb": None if growth["rss"] is None else round(growth["rss"] / 1e6, 1),
+                    "anonymous_mb": None
+                    if growth["anonymous"] is None
+                    else round(growth["anonymous"] / 1e6, 1),
+                }
+            report["formats"][fmt] = result
+    finally:
+        if args.keep_data:
+            logger.info("Scratch data kept at %s", data_dir)
+        else:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"\n{report['rows']} rows x {report['columns']} columns "
+        f"({report['in_memory_mb']} MB in memory)"
+    )
+    for fmt, result in report["formats"].items():
+        print(f"{fmt}: {result['file_mb']} MB on disk, saved in {result['save_seconds']:.2f}s")
+    print(
+        f"{'format':<9}{'shape':<12}{'load ms':>10}{'+scan ms':>10}"
+        f"{'RSS MB':>9}{'anon MB':>9}"
+    )
+    for fmt, result in report["formats"].items():
+        for shape, timing in result["shapes"].items():
+            print(
+                f"{fmt:<9}{shape:<12}{timing['load_ms']:>10.2f}{timing['load_and_scan_ms']:>10.2f}"
+                f"{str(timing['rss_mb']):>9}{str(timing['anonymous_mb']):>9}"
+            )
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Speed benchmark of incremental feature updates against full recomputes.
+
+Builds a synthetic hourly OHLCV history, runs a full feature build over all
+but the last ``--append`` bars for every config/indicators_set*.yaml, then
+appends those bars ``--step`` at a time through
+`incremental_features.update_features`. Reports the median time of a full
+recompute of the final history, the median incremental update and whether
+the incremental result equals the full recompute exactly.
+
+Examples:
+    # 100k bars, 20 appended one at a time
+    python -m ml_pipeline.benchmarks.incremental_features --rows 100000 --append 20
+
+    # Keep the JSON report
+    python -m ml_pipeline.benchmarks.incremental_features --output incremental.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+import yaml
+
+from ml_pipeline.benchmarks.indicator_kernels import CONFIG_DIR, _synthetic_ohlcv
+from ml_pipeline.src.ml.incremental_features import update_features
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark incremental feature updates.")
+    parser.add_argument("--rows", type=int, default=50_000, help="Bars in the final history.")
+    parser.add_argument("--append", type=int, default=10, help="Bars appended after the build.")
+    parser.add_argument("--step", type=int, default=1, help="Bars appended per update.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed full recomputes per set.")
+    parser.add_argument(
+        "--configs",
+        default=str(CONFIG_DIR / "indicators_set*.yaml"),
+        help="Glob of indicator config files to benchmark.",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    return parser.parse_args()
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Time full and incremental builds for every config and return the report."""
+    df = _synthetic_ohlcv(args.rows)
+    start = args.rows - args.append
+    report: Dict[str, Any] = {
+        "rows": args.rows,
+        "append": args.append,
+        "step": args.step,
+        "sets": [],
+    }
+    pattern = Path(args.configs)
+    for config in sorted(pattern.parent.glob(pattern.name)):
+        indicators = yaml.safe_load(config.read_text(encoding="utf-8")).get("indicators", [])
+        full_samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            expected, _, _, _ = update_features(df, indicators)
+            full_samples.append(time.perf_counter() - started)
+
+        features, state, _, _ = update_features(df.iloc[:start], indicators)
+        update_samples, modes = [], set()
+        for end in range(start + args.step, args.rows + args.step, args.step):
+            end = min(end, args.rows)
+            started = time.perf_counter()
+            features, state, _, result = update_features(df.iloc[:end], indicators, features, state)
+            update_samples.append(time.perf_counter() - started)
+            modes.add(result["mode"])
+
+        full_ms = statistics.median(full_samples) * 1e3
+        update_ms = statistics.median(update_samples) * 1e3 if update_samples else None
+        try:
+            pd.testing.assert_frame_equal(features, expected, check_freq=False)
+            exact = True
+        except AssertionError:
+            exact = False
+        report["sets"].append(
+            {
+                "config": config.stem,
+                "full_ms": round(full_ms, 3),
+                "update_ms": None if update_ms is None else round(update_ms, 3),
+                "speedup": round(full_ms / update_ms, 1) if update_ms else None,
+                "modes": sorted(modes),
+                "exact": exact,
+            }
+        )
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"\n{report['rows']} bars, {report['append']} appended {report['step']} at a time"
+    )
+    print(f"{'config':<20}{'full ms':>10}{'update ms':>11}{'speedup':>9}{'mode':>14}{'exact':>7}")
+    for item in report["sets"]:
+        update_ms = "-" if item["update_ms"] is None else f"{item['update_ms']:.3f}"
+        speedup = "-" if item["speedup"] is None else f"{item['speedup']:.1f}x"
+        print(
+            f"{item['config']:<20}{item['full_ms']:>10.3f}{update_ms:>11}{speedup:>9}"
+            f"{'/'.join(item['modes']):>14}{'yes' if item['exact'] else 'NO':>7}"
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Speed benchmark of the NumPy indicator kernels against pandas_ta.
+
+Builds a synthetic hourly OHLCV frame, then times every distinct indicator
+configured in config/indicators_set*.yaml (and the defaults of every kernel)
+once through its `indicator_kernels` kernel and once through the pandas_ta
+accessor (``talib=False``, the implementation the kernels reproduce). Reports
+the median time of each, the speedup and the largest absolute difference
+between the two outputs. Without pandas_ta installed only kernel timings are
+reported.
+
+Examples:
+    # 50k bars, 5 timed calls per indicator
+    python -m ml_pipeline.benchmarks.indicator_kernels --rows 50000 --repeat 5
+
+    # Keep the JSON report
+    python -m ml_pipeline.benchmarks.indicator_kernels --output kernels.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ml_pipeline.src.ml.indicator_kernels import KERNELS
+from ml_pipeline.src.ml.indicator_kernels import pandas_ta as ta  # None when not installed
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark NumPy indicator kernels vs pandas_ta.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Bars in the synthetic frame.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per implementation.")
+    parser.add_argument(
+        "--configs",
+        default=str(CONFIG_DIR / "indicators_set*.yaml"),
+        help="Glob of indicator config files to take indicators from.",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    return parser.parse_args()
+
+
+def _synthetic_ohlcv(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-02 09:00", periods=rows, freq="h", name="timestamp")
+    close = 100 + rng.standard_normal(rows).cumsum() * 0.5
+    open_ = close + rng.normal(0, 0.2, rows)
+    spread = rng.uniform(0.05, 1.0, rows)
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 100_000, rows).astype(float),
+        },
+        index=index,
+    )
+
+
+def _indicators(pattern: str) -> List[Tuple[str, Dict[str, Any]]]:
+    path = Path(pattern)
+    entries: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for config in sorted(path.parent.glob(path.name)):
+        for ind in yaml.safe_load(config.read_text(encoding="utf-8")).get("indicators", []):
+            params = ind.get("params") or {}
+            if ind.get("name") in KERNELS:
+                entries[f"{ind['name']}{sorted(params.items())}"] = (ind["name"], params)
+    for name in KERNELS:
+        entries.setdefault(f"{name}[]", (name, {}))
+    return list(entries.values())
+
+
+def _median_seconds(action: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def _as_frame(result: Any) -> pd.DataFrame:
+    return result.to_frame() if isinstance(result, pd.Series) else result
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Time every indicator through its kernel (and pandas_ta) and return the report."""
+    df = _synthetic_ohlcv(args.rows)
+    report: Dict[str, Any] = {
+        "rows": args.rows,
+        "pandas_ta": ta is not None,
+        "indicators": [],
+    }
+    for name, params in _indicators(args.configs):
+        kernel = KERNELS[name]
+        result: Dict[str, Any] = {
+            "indicator": name,
+            "params": params,
+            "kernel_ms": round(_median_seconds(lambda: kernel(df, **params), args.repeat) * 1e3, 3),
+            "pandas_ta_ms": None,
+            "speedup": None,
+            "max_abs_diff": None,
+        }
+        if ta is not None:
+            accessor = getattr(df.ta, name)
+            result["pandas_ta_ms"] = round(
+                _median_seconds(lambda: accessor(talib=False, **params), args.repeat) * 1e3, 3
+            )
+            result["speedup"] = round(result["pandas_ta_ms"] / max(result["kernel_ms"], 1e-6), 1)
+            expected = _as_frame(accessor(talib=False, **params)).to_numpy(dtype=float)
+            actual = _as_frame(kernel(df, **params)).to_numpy(dtype=float)
+            result["max_abs_diff"] = float(np.nanmax(np.abs(actual - expected)))
+        report["indicators"].append(result)
+
+    kernel_total = sum(item["kernel_ms"] for item in report["indicators"])
+    report["kernel_total_ms"] = round(kernel_total, 3)
+    if ta is not None:
+        pandas_total = sum(item["pandas_ta_ms"] for item in report["indicators"])
+        report["pandas_ta_total_ms"] = round(pandas_total, 3)
+        report["total_speedup"] = round(pandas_total / max(kernel_total, 1e-6), 1)
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"\n{report['rows']} bars, pandas_ta {'available' if report['pandas_ta'] else 'missing'}")
+    print(f"{'indicator':<34}{'kernel ms':>11}{'pandas_ta ms':>14}{'speedup':>9}{'max diff':>11}")
+    for item in report["indicators"]:
+        label = f"{item['indicator']} {item['params'] or ''}".strip()
+        pandas_ms = "-" if item["pandas_ta_ms"] is None else f"{item['pandas_ta_ms']:.3f}"
+        speedup = "-" if item["speedup"] is None else f"{item['speedup']:.1f}x"
+        diff = "-" if item["max_abs_diff"] is None else f"{item['max_abs_diff']:.1e}"
+        print(f"{label[:33]:<34}{item['kernel_ms']:>11.3f}{pandas_ms:>14}{speedup:>9}{diff:>11}")
+    line = f"total: kernels {report['kernel_total_ms']:.1f} ms"
+    if report["pandas_ta"]:
+        line += f", pandas_ta {report['pandas_ta_total_ms']:.1f} ms ({report['total_speedup']}x)"
+    print(line)
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
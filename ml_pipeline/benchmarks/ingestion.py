@@ -0,0 +1,216 @@
+"""
+End-to-end ingestion benchmark against local Alpha Vantage and Supabase stand-ins.
+
+Starts an `AlphaVantageStub` (fixtures, recording or synthetic series) and a
+`PostgrestStub` standing in for the Supabase ``stock_prices``/``pipeline_logs``
+tables, points the pipeline at them through environment variables, runs one of
+the ingestion drivers over N symbols in a scratch data directory and reports
+symbols/s, rows/s and per-stage latency (fetch, normalize, cache, records, upload).
+
+Examples:
+    # 50 synthetic symbols through the threaded historical pipeline
+    python -m ml_pipeline.benchmarks.ingestion --symbols 50 --driver concurrent
+
+    # data_fetcher, one symbol at a time with the streaming parser
+    python -m ml_pipeline.benchmarks.ingestion --symbols 20 --driver fetcher --parser stream
+
+    # Record real responses once (uses ALPHA_VANTAGE_API_KEY), then replay offline
+    python -m ml_pipeline.benchmarks.ingestion --tickers AAPL,MSFT --fixtures fixtures/av --record
+    python -m ml_pipeline.benchmarks.ingestion --tickers AAPL,MSFT --fixtures fixtures/av
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+from ml_pipeline.src.ml.alpha_vantage_stub import AlphaVantageStub
+from ml_pipeline.src.ml.postgrest_stub import PostgrestStub
+
+REAL_ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+DRIVERS = ("run", "concurrent", "async", "fetcher", "fetcher-many")
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ingestion against local stubs.")
+    parser.add_argument("--symbols", type=int, default=10, help="Number of synthetic symbols.")
+    parser.add_argument("--tickers", help="Comma-separated tickers (overrides --symbols).")
+    parser.add_argument("--rows", type=int, default=5000, help="Bars per synthetic series.")
+    parser.add_argument("--driver", choices=DRIVERS, default="concurrent")
+    parser.add_argument("--workers", type=int, default=8, help="Worker threads / concurrency.")
+    parser.add_argument("--mode", choices=["daily", "intraday"], default="daily",
+                        help="Data mode for the data_fetcher drivers.")
+    parser.add_argument("--interval", default="60min", help="Intraday interval.")
+    parser.add_argument("--parser", default="auto", help="data_fetcher response parser.")
+    parser.add_argument("--av-latency", type=float, default=0.05,
+                        help="Simulated Alpha Vantage round trip (seconds).")
+    parser.add_argument("--db-latency", type=float, default=0.02,
+                        help="Simulated Supabase round trip (seconds).")
+    parser.add_argument("--db-latency-per-row", type=float, default=0.0,
+                        help="Extra simulated Supabase time per written row (seconds).")
+    parser.add_argument("--fixtures", type=Path, help="Directory of recorded responses.")
+    parser.add_argument("--record", action="store_true",
+                        help="Proxy misses to the real API and save them under --fixtures.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--keep-data", action="store_true",
+                        help="Keep the scratch data directory instead of deleting it.")
+    args = parser.parse_args()
+    if args.record and not args.fixtures:
+        parser.error("--record requires --fixtures.")
+    return args
+
+
+def _configure_environment(av_url: str, db_url: str, data_dir: str, record: bool) -> None:
+    """Point the pipeline configuration at the stubs before it is imported."""
+    if record:
+        load_dotenv()  # the real API key is needed to record
+    os.environ.update(
+        {
+            "ALPHA_VANTAGE_BASE_URL": av_url,
+            "ALPHA_VANTAGE_API_KEY": os.environ.get("ALPHA_VANTAGE_API_KEY", "replay")
+            if record
+            else "replay",
+            "ALPHA_VANTAGE_REQUESTS_PER_MINUTE": "1000000",
+            "SUPABASE_URL": db_url,
+            "SUPABASE_SERVICE_ROLE": "replay",
+            "ML_DATA_DIR": data_dir,
+            "ML_HTTP_CACHE": "0",
+            "ML_UPLOAD_DEDUPE": "0",
+            "ML_S3_BUCKET": "",
+        }
+    )
+    if "ml_pipeline.src.ml.config" in sys.modules:
+        raise RuntimeError("Pipeline configuration was imported before the stubs were set up.")
+
+
+def _drive(args: argparse.Namespace, symbols: List[str]) -> Callable[[], Any]:
+    """Import the selected driver (after the environment is configured) and bind it."""
+    if args.driver in ("run", "concurrent", "async"):
+        run_pipeline = importlib.import_module("ml_pipeline.historical_ingestion.run_pipeline")
+        rate_limiter = run_pipeline.RateLimiter(1_000_000, burst=max(1, args.workers))
+        if args.driver == "run":
+            return lambda: run_pipeline.run(symbols, pause=0)
+        if args.driver == "concurrent":
+            return lambda: run_pipeline.run_concurrent(symbols, args.workers, rate_limiter)
+        return lambda: run_pipeline.run_async(symbols, args.workers, rate_limiter)
+
+    data_fetcher = importlib.import_module("ml_pipeline.src.ml.data_fetcher")
+    base_argv = [
+        "data_fetcher",
+        "--mode", args.mode,
+        "--interval", args.interval,
+        "--outputsize", "full",
+        "--upload",
+        "--no-http-cache",
+        "--parser", args.parser,
+        "--concurrency", str(args.workers),
+    ]
+
+    def _run_fetcher(batches: List[List[str]]) -> None:
+        saved_argv = sys.argv
+        try:
+            for batch in batches:
+                sys.argv = base_argv + ["--symbol", ",".join(batch)]
+                data_fetcher.main()
+        finally:
+            sys.argv = saved_argv
+
+    if args.driver == "fetcher":
+        return lambda: _run_fetcher([[symbol] for symbol in symbols])
+    return lambda: _run_fetcher([symbols])
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one benchmark and return the report."""
+    if args.tickers:
+        symbols = [s.strip().upper() for s in args.tickers.split(",") if s.strip()]
+    else:
+        symbols = [f"SYN{i:04d}" for i in range(args.symbols)]
+
+    data_dir = tempfile.mkdtemp(prefix="ml_benchmark_")
+    av_stub = AlphaVantageStub(
+        fixtures_dir=args.fixtures,
+        upstream=REAL_ALPHA_VANTAGE_URL if args.record else None,
+        synthetic_rows=0 if args.record else args.rows,
+        latency=args.av_latency,
+    )
+    db_stub = PostgrestStub(latency=args.db_latency, latency_per_row=args.db_latency_per_row)
+    try:
+        with av_stub, db_stub:
+            _configure_environment(av_stub.url, db_stub.url, data_dir, args.record)
+            driver = _drive(args, symbols)
+            utils = importlib.import_module("ml_pipeline.historical_ingestion.utils")
+            timings = importlib.import_module("ml_pipeline.src.ml.stage_timings")
+
+            started = time.perf_counter()
+            driver()
+            elapsed = time.perf_counter() - started
+
+            rows = db_stub.rows("stock_prices")
+            ingested = {row.get("symbol") for row in rows}
+            report = {
+                "driver": args.driver,
+                "symbols": len(symbols),
+                "symbols_ingested": len(ingested),
+                "rows": len(rows),
+                "elapsed_seconds": round(elapsed, 3),
+                "symbols_per_second": round(len(ingested) / elapsed, 3),
+                "rows_per_second": round(len(rows) / elapsed, 1),
+                "stages": timings.stage_timings.snapshot(),
+                "retries": utils.retry_stats.snapshot(),
+                "alpha_vantage": {"requests": av_stub.requests, "served": dict(av_stub.served)},
+                "supabase": {
+                    "requests": db_stub.requests,
+                    "max_in_flight": db_stub.max_in_flight,
+                    "pipeline_logs": len(db_stub.rows("pipeline_logs")),
+                },
+            }
+    finally:
+        if args.keep_data:
+            logger.info("Scratch data kept at %s", data_dir)
+        else:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"\n{report['driver']}: {report['symbols_ingested']}/{report['symbols']} symbols, "
+        f"{report['rows']} rows in {report['elapsed_seconds']:.2f}s -> "
+        f"{report['symbols_per_second']:.2f} symbols/s, {report['rows_per_second']:.0f} rows/s"
+    )
+    print(f"{'stage':<10}{'count':>7}{'mean s':>10}{'p50 s':>10}{'p95 s':>10}{'total s':>10}")
+    for stage in ("fetch", "normalize", "cache", "records", "upload"):
+        timing = report["stages"].get(stage)
+        if timing:
+            print(
+                f"{stage:<10}{timing['count']:>7}{timing['mean_seconds']:>10.4f}"
+                f"{timing['p50_seconds']:>10.4f}{timing['p95_seconds']:>10.4f}"
+                f"{timing['total_seconds']:>10.2f}"
+            )
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
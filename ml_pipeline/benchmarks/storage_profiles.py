@@ -0,0 +1,140 @@
+"""
+Size, write and read benchmark of the Parquet storage profiles.
+
+Builds a synthetic features frame (a ``symbol`` column, OHLCV prices and N
+float indicator columns on a minute index), writes it once per storage profile
+with `storage_profiles.write_parquet` and reports the file size, the median
+write time, and the median read time through `dataset_manager.read_parquet_subset`
+(which restores downcast dtypes) for a full load and a column projection.
+
+Examples:
+    # Every configured profile on 1M rows x 40 indicators
+    python -m ml_pipeline.benchmarks.storage_profiles --rows 1000000 --columns 40
+
+    # Compare two profiles and keep the JSON report
+    python -m ml_pipeline.benchmarks.storage_profiles --profiles fast,compact --output profiles.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from ml_pipeline.src.ml.config import STORAGE_PROFILES
+from ml_pipeline.src.ml.dataset_manager import read_parquet_subset
+from ml_pipeline.src.ml.storage_profiles import get_profile, write_parquet
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Parquet storage profiles.")
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows in the synthetic frame.")
+    parser.add_argument("--columns", type=int, default=30, help="Float indicator columns.")
+    parser.add_argument("--project", type=int, default=4,
+                        help="Indicator columns loaded by the projected read.")
+    parser.add_argument("--profiles", help="Comma-separated profiles (default: all configured).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed writes/reads per profile.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    return parser.parse_args()
+
+
+def _synthetic_features(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2000-01-03", periods=rows, freq="min", tz="UTC", name="timestamp")
+    close = 100 + rng.standard_normal(rows).cumsum() * 0.1
+    data: Dict[str, Any] = {
+        "symbol": "AAPL",
+        "open": close + rng.standard_normal(rows) * 0.05,
+        "high": close + 0.1,
+        "low": close - 0.1,
+        "close": close,
+        "volume": rng.integers(0, 1_000_000, rows),
+    }
+    data.update({f"ind_{i:03d}": rng.standard_normal(rows) for i in range(columns)})
+    return pd.DataFrame(data, index=index)
+
+
+def _median_seconds(action: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Write and read the frame with every selected profile and return the report."""
+    names = list(STORAGE_PROFILES)
+    if args.profiles:
+        names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    df = _synthetic_features(args.rows, args.columns)
+    projection = [col for col in df.columns if col.startswith("ind_")][: args.project]
+    report: Dict[str, Any] = {
+        "rows": args.rows,
+        "columns": df.shape[1],
+        "in_memory_mb": round(df.memory_usage(deep=True).sum() / 1e6, 1),
+        "profiles": {},
+    }
+    scratch = Path(tempfile.mkdtemp(prefix="ml_profiles_"))
+    try:
+        for name in names:
+            profile = get_profile(name)
+            path = scratch / f"{name}.parquet"
+            write_seconds = _median_seconds(lambda: write_parquet(df, path, profile), args.repeat)
+            read_seconds = _median_seconds(lambda: read_parquet_subset(path), args.repeat)
+            projected_seconds = _median_seconds(
+                lambda: read_parquet_subset(path, projection), args.repeat
+            )
+            restored = read_parquet_subset(path)
+            report["profiles"][name] = {
+                "compression": profile["compression"],
+                "row_group_size": profile["row_group_size"],
+                "file_mb": round(path.stat().st_size / 1e6, 2),
+                "write_seconds": round(write_seconds, 3),
+                "read_seconds": round(read_seconds, 3),
+                "projected_read_seconds": round(projected_seconds, 3),
+                "dtypes_restored": bool(restored.dtypes.equals(df.dtypes)),
+            }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"\n{report['rows']} rows x {report['columns']} columns "
+        f"({report['in_memory_mb']} MB in memory)"
+    )
+    print(
+        f"{'profile':<10}{'codec':<8}{'rows/group':>11}{'file MB':>10}"
+        f"{'write s':>9}{'read s':>9}{'proj s':>9}{'dtypes':>8}"
+    )
+    for name, result in report["profiles"].items():
+        print(
+            f"{name:<10}{result['compression']:<8}{result['row_group_size']:>11}"
+            f"{result['file_mb']:>10.2f}{result['write_seconds']:>9.3f}"
+            f"{result['read_seconds']:>9.3f}{result['projected_read_seconds']:>9.3f}"
+            f"{'ok' if result['dtypes_restored'] else 'CHANGED':>8}"
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
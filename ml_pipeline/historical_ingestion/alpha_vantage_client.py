@@ -6,46 +6,156 @@ from the Alpha Vantage API. It is designed for use in data ingestion pipelines,
 retrieving full historical output for one or more stock symbols.
 
 Functions:
-- fetch_daily_adjusted(symbol: str) -> dict:
-    Fetches TIME_SERIES_DAILY_ADJUSTED data for a given stock symbol.
+- fetch_daily_adjusted(symbol: str, rate_limiter=None, use_cache=True) -> dict:
+    Fetches TIME_SERIES_DAILY_ADJUSTED data for a given stock symbol, serving
+    it from the on-disk response cache until the next daily close.
+- fetch_daily_adjusted_async(client, symbol: str) -> dict:
+    Same as above using a shared AsyncAlphaVantageClient.
+- fetch_daily_adjusted_many(symbols, max_concurrency, rate_limiter) -> dict:
+    Fetches many symbols concurrently over pooled connections.
 
 Dependencies:
 - requests
+- httpx (via ml_pipeline.src.ml.alpha_vantage)
 - config (for API key)
 """
 
+import asyncio
+
+import httpx
 import requests
-from ml_pipeline.src.ml.config import ALPHA_VANTAGE_API_KEY
+from ml_pipeline.historical_ingestion.utils import RetryError, retry
+from ml_pipeline.src.ml.alpha_vantage import (
+    AlphaVantageError,
+    AlphaVantageRateLimitError,
+    AsyncAlphaVantageClient,
+)
+from ml_pipeline.src.ml.config import ALPHA_VANTAGE_API_KEY, ALPHA_VANTAGE_BASE_URL
+from ml_pipeline.src.ml.response_cache import response_cache
+
+
+BASE_URL = ALPHA_VANTAGE_BASE_URL
+FUNCTION = "TIME_SERIES_DAILY_ADJUSTED"
+SERIES_KEY = "Time Series (Daily)"
 
+# Shared session so sequential fetches reuse keep-alive connections.
+_SESSION = requests.Session()
 
-BASE_URL = "https://www.alphavantage.co/query"
+# Transient errors back off from 2s; rate-limit notes wait out the minute window.
+RETRY_POLICY = {
+    "attempts": 3,
+    "delay": 2,
+    "rate_limit_delay": 20,
+    "max_elapsed": 120,
+    "rate_limit_exceptions": (AlphaVantageRateLimitError,),
+}
 
 
-def fetch_daily_adjusted(symbol):
+@retry(exceptions=(requests.RequestException,), **RETRY_POLICY)
+def _request_daily_adjusted(params, rate_limiter=None):
+    """
+    Issue one request, raising AlphaVantageRateLimitError for a rate-limit note.
+
+    The limiter is acquired inside the retried call on purpose: every attempt,
+    retries included, is a request Alpha Vantage counts against the plan, so
+    each one takes its own token after the retry backoff. DailyQuotaExceeded
+    is not retried.
+    """
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    response = _SESSION.get(BASE_URL, params=params, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    if "Note" in data:
+        raise AlphaVantageRateLimitError(data["Note"])
+    return data, response.content
+
+
+@retry(exceptions=(httpx.TransportError, httpx.HTTPStatusError), **RETRY_POLICY)
+async def _fetch_series_async(client, symbol):
+    return await client.fetch_series(symbol, mode="daily", outputsize="full")
+
+
+def fetch_daily_adjusted(symbol, rate_limiter=None, use_cache=True):
     """
     Fetches daily adjusted time series data for a given stock symbol from Alpha Vantage.
 
+    Network errors and rate-limit notes are retried with jittered exponential
+    backoff (see ``utils.retry``).
+
     Args:
         symbol (str): The stock ticker symbol (e.g., 'AAPL', 'TSLA').
+        rate_limiter (RateLimiter): Optional limiter acquired before a network call
+            (cache hits do not consume a request).
+        use_cache (bool): Serve/store the response through the response cache.
 
     Returns:
         dict: A dictionary containing the time series data keyed by date.
               Returns an empty dictionary if the API request fails or no data is available.
-
-    Raises:
-        requests.RequestException: If the API request fails due to connectivity or response errors.
     """
+    if use_cache:
+        cached = response_cache.get(FUNCTION, symbol, None, "full")
+        if cached is not None:
+            return cached.get(SERIES_KEY, {})
+
     params = {
-        "function": "TIME_SERIES_DAILY_ADJUSTED",
+        "function": FUNCTION,
         "symbol": symbol,
         "outputsize": "full",
         "apikey": ALPHA_VANTAGE_API_KEY,
     }
     try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("Time Series (Daily)", {})
-    except requests.RequestException as e:
+        data, content = _request_daily_adjusted(params, rate_limiter=rate_limiter)
+    except (RetryError, ValueError) as e:
+        print(f"[ERROR] Failed to fetch data for {symbol}: {e.__cause__ or e}")
+        return {}
+    series = data.get(SERIES_KEY, {})
+    if use_cache and series:
+        response_cache.put(FUNCTION, symbol, None, "full", content)
+    return series
+
+
+async def fetch_daily_adjusted_async(client, symbol):
+    """
+    Async variant of `fetch_daily_adjusted` using a shared client.
+
+    Args:
+        client (AsyncAlphaVantageClient): Pooled client to issue the request with.
+        symbol (str): The stock ticker symbol.
+
+    Returns:
+        dict: Time series data keyed by date, or an empty dictionary on failure.
+    """
+    try:
+        return await _fetch_series_async(client, symbol)
+    except (httpx.HTTPError, AlphaVantageError, RetryError) as e:
         print(f"[ERROR] Failed to fetch data for {symbol}: {e}")
         return {}
+
+
+def fetch_daily_adjusted_many(symbols, max_concurrency=8, rate_limiter=None, use_cache=True):
+    """
+    Fetch daily adjusted history for many symbols concurrently.
+
+    Args:
+        symbols (list): Ticker symbols to fetch.
+        max_concurrency (int): Maximum requests in flight at once.
+        rate_limiter (RateLimiter): Optional limiter shared by all requests.
+        use_cache (bool): Serve/store responses through the response cache.
+
+    Returns:
+        dict: Symbol -> time series dict (empty for symbols that failed).
+    """
+
+    async def _fetch_all():
+        async with AsyncAlphaVantageClient(
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache if use_cache else None,
+        ) as client:
+            results = await asyncio.gather(
+                *(fetch_daily_adjusted_async(client, symbol) for symbol in symbols)
+            )
+        return dict(zip(symbols, results))
+
+    return asyncio.run(_fetch_all())
@@ -1,13 +1,116 @@
 """
 Module that localizes and normalizes stock data for ingestion into Supabase.
+
+Normalization is columnar: the raw Alpha Vantage payload is turned into typed
+pandas columns in one pass (vectorized date parsing and numeric conversion,
+one ingestion timestamp per call) rather than row by row.
 """
 
 from datetime import datetime
 import logging
+
+import numpy as np
+import pandas as pd
 import pytz
 
 UTC = pytz.UTC
 
+FIELD_MAPPING = {
+    "1. open": "open",
+    "2. high": "high",
+    "3. low": "low",
+    "4. close": "close",
+    "5. adjusted close": "adjusted_close",
+    "6. volume": "volume",
+}
+
+OUTPUT_COLUMNS = [
+    "symbol",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "adjusted_close",
+    "volume",
+    "source",
+    "ingested_at",
+]
+
+
+def _to_float_array(values):
+    """Parse a list of numeric strings in one call, coercing bad entries to NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(
+            dtype=np.float64
+        )
+
+
+def normalize_stock_frame(symbol, raw_data):
+    """
+    Normalize Alpha Vantage raw data into a typed DataFrame.
+
+    Args:
+        symbol (str): Stock symbol.
+        raw_data (dict): Raw data returned from Alpha Vantage API.
+
+    Returns:
+        pd.DataFrame: One row per date (in payload order) with a tz-aware UTC
+        ``date`` column, float64 prices, int64 volume and a single
+        ``ingested_at`` timestamp. Rows with unparseable values are dropped.
+    """
+    if not raw_data:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    dates = list(raw_data)
+    rows = list(raw_data.values())
+    try:
+        columns = {
+            name: [row.get(key) for row in rows] for key, name in FIELD_MAPPING.items()
+        }
+    except AttributeError as err:
+        logging.error("Data normalization error: %s", err, exc_info=True)
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    df = pd.DataFrame({name: _to_float_array(values) for name, values in columns.items()})
+    df.insert(0, "date", pd.to_datetime(dates, format="%Y-%m-%d", errors="coerce", utc=True))
+
+    invalid = df.isna().any(axis=1)
+    if invalid.any():
+        logging.error(
+            "Data normalization error: dropped %d rows with invalid values for %s (%s)",
+            int(invalid.sum()),
+            symbol,
+            ", ".join(str(d) for d, bad in zip(dates, invalid.to_numpy()) if bad)[:200],
+        )
+        df = df.loc[~invalid].copy()
+
+    df["volume"] = df["volume"].astype("int64")
+    df.insert(0, "symbol", symbol)
+    df["source"] = "historical"
+    df["ingested_at"] = datetime.now(UTC).isoformat()
+    return df.reset_index(drop=True)[OUTPUT_COLUMNS]
+
+
+def stock_frame_to_records(df):
+    """
+    Convert a frame from `normalize_stock_frame` into database rows.
+
+    Args:
+        df (pd.DataFrame): Normalized stock data.
+
+    Returns:
+        list of dict: Rows with ISO-8601 ``date`` strings, ready for Supabase.
+    """
+    if df.empty:
+        return []
+    utc_values = df["date"].dt.tz_convert(None).to_numpy()
+    dates = np.char.add(np.datetime_as_string(utc_values, unit="s"), "+00:00").tolist()
+    columns = [dates if col == "date" else df[col].tolist() for col in OUTPUT_COLUMNS]
+    return [dict(zip(OUTPUT_COLUMNS, row)) for row in zip(*columns)]
+
 
 def normalize_stock_data(symbol, raw_data):
     """
@@ -20,27 +123,4 @@ def normalize_stock_data(symbol, raw_data):
     Returns:
         list of dict: Normalized rows with parsed and formatted fields.
     """
-    rows = []
-
-    for date_str, values in raw_data.items():
-        try:
-            utc_date = (
-                datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=UTC).isoformat()
-            )
-            row = {
-                "symbol": symbol,
-                "date": utc_date,
-                "open": float(values["1. open"]),
-                "high": float(values["2. high"]),
-                "low": float(values["3. low"]),
-                "close": float(values["4. close"]),
-                "adjusted_close": float(values["5. adjusted close"]),
-                "volume": int(values["6. volume"]),
-                "source": "historical",
-                "ingested_at": datetime.now(UTC).isoformat(),
-            }
-            rows.append(row)
-        except (KeyError, ValueError, TypeError) as err:
-            logging.error("Data normalization error: %s", err, exc_info=True)
-
-    return rows
+    return stock_frame_to_records(normalize_stock_frame(symbol, raw_data))
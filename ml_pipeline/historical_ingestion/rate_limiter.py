@@ -0,0 +1,133 @@
+"""
+rate_limiter.py
+
+Token-bucket rate limiting shared by concurrent ingestion workers.
+
+A single RateLimiter instance is handed to every worker thread so the
+combined request rate stays within the Alpha Vantage plan limits
+(requests/minute and, optionally, requests per rolling 24 hours) without
+fixed sleeps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+# Length of the window the requests/day quota is counted over.
+DAY_SECONDS = 24 * 60 * 60
+
+
+class DailyQuotaExceeded(RuntimeError):
+    """Raised when the requests/day budget of the last 24 hours has been used up."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``refill_rate`` per second up to
+    ``capacity``. Reservations may drive the balance negative so that
+    concurrent callers are queued in arrival order instead of racing.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float) -> None:
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError("capacity and refill_rate must be positive.")
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket and return the seconds to wait before use."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_rate
+
+
+class RateLimiter:
+    """
+    Pace API requests using a per-minute token bucket and a per-day quota.
+
+    The daily quota is counted over a rolling 24-hour window, so a limiter
+    living longer than a day (a scheduler, a long backfill) admits requests
+    again as the ones made 24 hours earlier age out.
+
+    Args:
+        requests_per_minute: Sustained request rate allowed by the API plan.
+        requests_per_day: Optional cap on requests admitted by this limiter in
+            any 24-hour window.
+        burst: Number of requests that may be issued back-to-back before
+            pacing kicks in. Defaults to 1 (evenly spaced requests).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        requests_per_day: Optional[int] = None,
+        burst: int = 1,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.requests_per_day = requests_per_day
+        self._bucket = TokenBucket(capacity=burst, refill_rate=requests_per_minute / 60.0)
+        self._count_lock = threading.Lock()
+        self._requests = 0
+        self._admitted: Deque[float] = deque()
+        self._waited = 0.0
+
+    @property
+    def requests_made(self) -> int:
+        """Number of requests admitted so far (in total, not per day)."""
+        return self._requests
+
+    @property
+    def time_waited(self) -> float:
+        """Total seconds callers have spent waiting on the limiter."""
+        return self._waited
+
+    def reserve(self) -> float:
+        """Admit one request and return how long the caller must wait before sending it."""
+        with self._count_lock:
+            if self.requests_per_day:
+                now = time.monotonic()
+                while self._admitted and now - self._admitted[0] >= DAY_SECONDS:
+                    self._admitted.popleft()
+                if len(self._admitted) >= self.requests_per_day:
+                    retry_in = DAY_SECONDS - (now - self._admitted[0])
+                    raise DailyQuotaExceeded(
+                        f"Daily request quota of {self.requests_per_day} exhausted; "
+                        f"the next request is allowed in {retry_in / 3600:.1f}h."
+                    )
+                self._admitted.append(now)
+            self._requests += 1
+        wait = self._bucket.reserve()
+        with self._count_lock:
+            self._waited += wait
+        return wait
+
+    def acquire(self) -> float:
+        """Block until one request may be sent. Returns the seconds waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Asyncio variant of `acquire` that yields to the event loop while waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
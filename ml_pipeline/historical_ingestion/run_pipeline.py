@@ -4,20 +4,41 @@ This script is the entry point for running the historical stock data ingestion p
 It fetches daily adjusted stock data for a list of symbols, normalizes the data,
 and inserts it into a database using Supabase.
 
+Symbols are processed one at a time by default. With ``--concurrent`` a pool of
+worker threads ingests symbols in parallel while a shared token-bucket
+rate limiter keeps the combined request rate within the Alpha Vantage plan.
+With ``--async-fetch`` requests go through the pooled asyncio client instead and
+each response is normalized, cached and inserted on a worker thread.
 """
 
 import argparse
+import asyncio
 import logging
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
 
-import pandas as pd
-
-from ml_pipeline.historical_ingestion.alpha_vantage_client import fetch_daily_adjusted
-from ml_pipeline.historical_ingestion.ingest_historical import normalize_stock_data
+from ml_pipeline.historical_ingestion.alpha_vantage_client import (
+    fetch_daily_adjusted,
+    fetch_daily_adjusted_async,
+)
+from ml_pipeline.historical_ingestion.ingest_historical import (
+    normalize_stock_frame,
+    stock_frame_to_records,
+)
+from ml_pipeline.historical_ingestion.rate_limiter import DailyQuotaExceeded, RateLimiter
 from ml_pipeline.historical_ingestion.supabase_client import insert_stock_data
-from ml_pipeline.src.ml.config import DEFAULT_SYMBOLS
+from ml_pipeline.historical_ingestion.utils import retry_stats
+from ml_pipeline.src.ml.alpha_vantage import AsyncAlphaVantageClient
+from ml_pipeline.src.ml.config import (
+    ALPHA_VANTAGE_REQUESTS_PER_DAY,
+    ALPHA_VANTAGE_REQUESTS_PER_MINUTE,
+    DEFAULT_SYMBOLS,
+    INGESTION_MAX_WORKERS,
+)
 from ml_pipeline.src.ml.dataset_manager import ensure_data_dirs, save_dataset
+from ml_pipeline.src.ml.response_cache import response_cache
+from ml_pipeline.src.ml.stage_timings import stage_timings
 
 
 logging.basicConfig(
@@ -26,48 +47,301 @@ logging.basicConfig(
 )
 
 
-def run(symbols):
+def ingest_symbol(
+    symbol: str,
+    rate_limiter: Optional[RateLimiter] = None,
+    raw_data: Optional[Dict[str, Any]] = None,
+) -> int:
     """
-    Main function to run the historical stock data ingestion pipeline
+    Fetch, normalize, cache and insert the history for a single symbol.
+
+    Args:
+        symbol: Ticker symbol to ingest.
+        rate_limiter: Optional limiter to acquire from before calling Alpha Vantage
+            (responses served from the response cache do not consume a request).
+        raw_data: Already-fetched time series; skips the Alpha Vantage call.
+
+    Returns:
+        int: Number of records inserted (0 when nothing was ingested).
     """
-    ensure_data_dirs()
-    for symbol in symbols:
-        logging.info("⏳ Processing: %s", symbol)
-        raw_data = fetch_daily_adjusted(symbol)
-        if not raw_data:
-            logging.warning("No data returned for %s", symbol)
-            continue
-        records = normalize_stock_data(symbol, raw_data)
-        if not records:
-            logging.warning("No normalized records for %s", symbol)
-            continue
+    logging.info("⏳ Processing: %s", symbol)
+    if raw_data is None:
+        with stage_timings.time("fetch"):
+            raw_data = fetch_daily_adjusted(symbol, rate_limiter=rate_limiter)
+    if not raw_data:
+        logging.warning("No data returned for %s", symbol)
+        return 0
+    with stage_timings.time("normalize"):
+        frame = normalize_stock_frame(symbol, raw_data)
+    if frame.empty:
+        logging.warning("No normalized records for %s", symbol)
+        return 0
 
-        try:
-            df_records = pd.DataFrame.from_records(records)
-            df_records["date"] = pd.to_datetime(df_records["date"])
-            df_records.set_index("date", inplace=True)
-            version_tag = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    try:
+        with stage_timings.time("cache"):
             cache_path = save_dataset(
-                df_records,
+                frame.set_index("date"),
                 dataset_type="raw",
                 symbol=symbol,
                 mode="daily",
                 outputsize="full",
-                version=version_tag,
             )
-            logging.info("Cached dataset for %s at %s", symbol, cache_path)
-        except Exception as exc:  # pylint: disable=broad-except
-            logging.warning("Failed to cache dataset for %s: %s", symbol, exc)
+        logging.info("Cached dataset for %s at %s", symbol, cache_path)
+    except Exception as exc:  # pylint: disable=broad-except
+        logging.warning("Failed to cache dataset for %s: %s", symbol, exc)
+
+    with stage_timings.time("records"):
+        records = stock_frame_to_records(frame)
+    with stage_timings.time("upload"):
+        stats = insert_stock_data(records, mode="daily")
+    logging.info(
+        "✅ %s: %d records ingested, %d new or changed inserted",
+        symbol,
+        len(records),
+        stats["rows"] if stats else 0,
+    )
+    return len(records)
+
+
+def _summarize(
+    symbols: List[str],
+    succeeded: List[str],
+    failed: List[str],
+    records: int,
+    started: float,
+) -> Dict[str, Any]:
+    elapsed = max(time.monotonic() - started, 1e-9)
+    summary = {
+        "symbols": len(symbols),
+        "succeeded": len(succeeded),
+        "failed": failed,
+        "records": records,
+        "elapsed_seconds": elapsed,
+        "symbols_per_second": len(succeeded) / elapsed,
+        "records_per_second": records / elapsed,
+    }
+    logging.info(
+        "🏁 Ingested %d/%d symbols (%d records) in %.1fs: %.3f symbols/s, %.1f records/s",
+        summary["succeeded"],
+        summary["symbols"],
+        records,
+        elapsed,
+        summary["symbols_per_second"],
+        summary["records_per_second"],
+    )
+    cache_stats = response_cache.stats()
+    summary["response_cache"] = cache_stats
+    logging.info(
+        "Response cache: %d hits, %d misses",
+        cache_stats["hits"],
+        cache_stats["misses"],
+    )
+    retries = retry_stats.snapshot()
+    summary["retries"] = retries
+    logging.info(
+        "Retries: %d attempts for %d calls, %d rate-limited and %d transient retries, "
+        "%.1fs backing off",
+        retries["attempts"],
+        retries["calls"],
+        retries["rate_limited"],
+        retries["transient"],
+        retries["sleep_seconds"],
+    )
+    stages = stage_timings.snapshot()
+    summary["stages"] = stages
+    for stage, timing in stages.items():
+        logging.info(
+            "Stage %-9s %4d calls, mean %.3fs, p95 %.3fs, total %.1fs",
+            stage,
+            timing["count"],
+            timing["mean_seconds"],
+            timing["p95_seconds"],
+            timing["total_seconds"],
+        )
+    if failed:
+        logging.warning("Symbols without ingested data: %s", ", ".join(failed))
+    return summary
+
+
+def run(symbols, pause=12):
+    """
+    Main function to run the historical stock data ingestion pipeline
+
+    Args:
+        symbols: Ticker symbols to ingest one at a time.
+        pause: Seconds to sleep after each symbol to respect the API rate limit.
+    """
+    ensure_data_dirs()
+    started = time.monotonic()
+    succeeded, failed, total_records = [], [], 0
+    for symbol in symbols:
+        inserted = ingest_symbol(symbol)
+        if not inserted:
+            failed.append(symbol)
+            continue
+        succeeded.append(symbol)
+        total_records += inserted
+
+        if pause:
+            time.sleep(pause)  # Respect API rate limit
+
+    return _summarize(symbols, succeeded, failed, total_records, started)
+
+
+def run_concurrent(
+    symbols: List[str],
+    max_workers: int = INGESTION_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest symbols in parallel, pacing Alpha Vantage calls with a shared limiter.
+
+    Args:
+        symbols: Ticker symbols to ingest.
+        max_workers: Number of worker threads fetching/inserting at once.
+        rate_limiter: Shared limiter. Defaults to one built from the configured
+            ALPHA_VANTAGE_REQUESTS_PER_MINUTE/ALPHA_VANTAGE_REQUESTS_PER_DAY.
+
+    Returns:
+        dict: Run summary including achieved symbols/s and records/s.
+    """
+    ensure_data_dirs()
+    limiter = rate_limiter or RateLimiter(
+        ALPHA_VANTAGE_REQUESTS_PER_MINUTE,
+        ALPHA_VANTAGE_REQUESTS_PER_DAY,
+    )
+    started = time.monotonic()
+    succeeded, failed, total_records = [], [], 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(ingest_symbol, symbol, limiter): symbol for symbol in symbols
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                inserted = future.result()
+            except DailyQuotaExceeded as exc:
+                logging.warning("Skipping %s: %s", symbol, exc)
+                inserted = 0
+            except Exception as exc:  # pylint: disable=broad-except
+                logging.error("Ingestion failed for %s: %s", symbol, exc)
+                inserted = 0
+            if inserted:
+                succeeded.append(symbol)
+                total_records += inserted
+            else:
+                failed.append(symbol)
+
+    logging.info(
+        "Rate limiter admitted %d requests, %.1fs spent waiting across workers",
+        limiter.requests_made,
+        limiter.time_waited,
+    )
+    return _summarize(symbols, succeeded, failed, total_records, started)
+
+
+def run_async(
+    symbols: List[str],
+    max_concurrency: int = INGESTION_MAX_WORKERS,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest symbols using the pooled asyncio Alpha Vantage client.
+
+    Network waits overlap on the event loop; normalization, caching and the
+    Supabase insert for each symbol run on worker threads as responses arrive.
+
+    Args:
+        symbols: Ticker symbols to ingest.
+        max_concurrency: Maximum Alpha Vantage requests in flight.
+        rate_limiter: Shared limiter (defaults to the configured plan limits).
+
+    Returns:
+        dict: Run summary including achieved symbols/s and records/s.
+    """
+    ensure_data_dirs()
+    limiter = rate_limiter or RateLimiter(
+        ALPHA_VANTAGE_REQUESTS_PER_MINUTE,
+        ALPHA_VANTAGE_REQUESTS_PER_DAY,
+    )
+    started = time.monotonic()
+
+    async def _ingest_all():
+        async with AsyncAlphaVantageClient(
+            max_concurrency=max_concurrency,
+            rate_limiter=limiter,
+            response_cache=response_cache,
+        ) as client:
+
+            async def _one(symbol):
+                started_fetch = time.perf_counter()
+                raw_data = await fetch_daily_adjusted_async(client, symbol)
+                stage_timings.add("fetch", time.perf_counter() - started_fetch)
+                return await asyncio.to_thread(ingest_symbol, symbol, raw_data=raw_data)
+
+            return await asyncio.gather(
+                *(_one(symbol) for symbol in symbols), return_exceptions=True
+            )
 
-        insert_stock_data(records)
-        logging.info("✅ %s: %d records inserted", symbol, len(records))
+    succeeded, failed, total_records = [], [], 0
+    for symbol, result in zip(symbols, asyncio.run(_ingest_all())):
+        if isinstance(result, BaseException):
+            logging.error("Ingestion failed for %s: %s", symbol, result)
+            failed.append(symbol)
+        elif result:
+            succeeded.append(symbol)
+            total_records += result
+        else:
+            failed.append(symbol)
 
-        time.sleep(12)  # Respect API rate limit
+    return _summarize(symbols, succeeded, failed, total_records, started)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Ingest historical stock data.")
     parser.add_argument("--symbols", type=str, help="Comma-separated stock symbols")
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Ingest symbols in parallel, paced by a token-bucket rate limiter.",
+    )
+    parser.add_argument(
+        "--async-fetch",
+        action="store_true",
+        help="Fetch through the pooled asyncio client, paced by the rate limiter.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=INGESTION_MAX_WORKERS,
+        help="Worker threads for --concurrent mode (max in-flight requests with --async-fetch).",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=ALPHA_VANTAGE_REQUESTS_PER_MINUTE,
+        help="Alpha Vantage requests/minute allowed in --concurrent/--async-fetch mode.",
+    )
+    parser.add_argument(
+        "--requests-per-day",
+        type=int,
+        default=ALPHA_VANTAGE_REQUESTS_PER_DAY,
+        help="Optional Alpha Vantage cap per rolling 24h in --concurrent/--async-fetch mode.",
+    )
     args = parser.parse_args()
     selected_symbols = args.symbols.split(",") if args.symbols else DEFAULT_SYMBOLS
-    run(selected_symbols)
+    if args.async_fetch:
+        run_async(
+            selected_symbols,
+            max_concurrency=args.workers,
+            rate_limiter=RateLimiter(args.requests_per_minute, args.requests_per_day),
+        )
+    elif args.concurrent:
+        run_concurrent(
+            selected_symbols,
+            max_workers=args.workers,
+            rate_limiter=RateLimiter(args.requests_per_minute, args.requests_per_day),
+        )
+    else:
+        run(selected_symbols)
@@ -5,23 +5,66 @@ This module provides a client for interacting with Supabase to insert stock data
 
 """
 
+import pandas as pd
 from httpx import HTTPError
 from supabase import create_client, Client
+from ml_pipeline.src.ml.bulk_writer import BulkWriteError, bulk_write
 from ml_pipeline.src.ml.config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
+from ml_pipeline.src.ml.upload_state import make_scope, upload_state
+
+TABLE_NAME = "stock_prices"
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 
 
-def insert_stock_data(records):
+def _select_changed(records, mode, interval):
+    """Split records per symbol and keep only rows not already uploaded."""
+    frame = pd.DataFrame.from_records(records)
+    if "symbol" not in frame.columns or "date" not in frame.columns:
+        return records, {}
+    selected, pending = [], {}
+    for symbol, group in frame.groupby("symbol", sort=False):
+        scope = make_scope(TABLE_NAME, symbol, mode, interval)
+        changed, hashes = upload_state.select_changed(
+            group, scope, key_column="date", ignore_columns=("ingested_at",)
+        )
+        selected.extend(changed.index)
+        pending[symbol] = (scope, hashes)
+    return [records[i] for i in sorted(selected)], pending
+
+
+def _record_batch(pending, rows):
+    """Mark the rows of one written batch as uploaded in the upload index."""
+    keys = {}
+    for row in rows:
+        keys.setdefault(row["symbol"], []).append(str(row["date"]))
+    for symbol, dates in keys.items():
+        scope, hashes = pending[symbol]
+        upload_state.record(scope, hashes.loc[dates])
+
+
+def insert_stock_data(records, mode="daily", interval=None, dedupe=True):
     """
-    Insert stock data records into the 'stock_prices' Supabase table in batches of 100.
+    Insert stock data records into the 'stock_prices' Supabase table.
+
+    Records are upserted on (symbol, date), the unique index added by
+    ``supabase/migrations/*_stock_prices_symbol_date_unique.sql``, through the
+    shared bulk writer: concurrent, adaptively sized batches, each retried on
+    its own. Rows whose
+    (symbol, date) was already uploaded with the same values are skipped via
+    the local upload index, which is updated after every written batch so a
+    failure partway only resends the batches that did not make it.
 
     Args:
         records (list): A list of dictionaries where each dictionary represents
                         a row of stock data to be inserted.
+        mode (str): Data mode the rows belong to (scopes the upload index).
+        interval (str): Intraday interval, if any (scopes the upload index).
+        dedupe (bool): Skip rows already uploaded unchanged.
 
     Returns:
-        None
+        dict: Bulk write statistics (rows, failed_rows, rows_per_second, ...),
+        or None when there was nothing to insert or the insert failed.
 
     Raises:
         ValueError: If the input records are not a list.
@@ -29,10 +72,27 @@ def insert_stock_data(records):
         (replace with actual Supabase error if known).
     """
     if not records:
-        return
+        return None
+    pending = {}
+    if dedupe:
+        records, pending = _select_changed(records, mode, interval)
+        if not records:
+            print("[INFO] No new or changed rows to insert.")
+            return None
+    on_batch = (lambda rows: _record_batch(pending, rows)) if pending else None
     try:
-        for i in range(0, len(records), 100):
-            batch = records[i : i + 100]
-            supabase.table("stock_prices").insert(batch).execute()
-    except (HTTPError, ValueError, TypeError) as e:
+        stats = bulk_write(
+            supabase,
+            TABLE_NAME,
+            records,
+            method="upsert",
+            on_conflict="symbol,date",
+            on_batch=on_batch,
+        )
+    except (BulkWriteError, HTTPError, ValueError, TypeError) as e:
         print(f"[ERROR] Failed to insert batch: {e}")
+        return None
+    finally:
+        for scope, _ in pending.values():
+            upload_state.flush(scope)
+    return stats
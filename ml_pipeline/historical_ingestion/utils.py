@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
+import random
+import threading
 import time
 from functools import wraps
-from typing import Any, Callable, Tuple, Type
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 Retryable = Callable[..., Any]
 
@@ -26,46 +30,199 @@ DEFAULT_RETRY_EXCEPTIONS: Tuple[Type[Exception], ...] = (
     TimeoutError,
 )
 
+# Exceptions that always mean "slow down" rather than "try again soon". None by
+# default: callers pass their API's rate-limit errors (HTTP 429 is always one).
+DEFAULT_RATE_LIMIT_EXCEPTIONS: Tuple[Type[Exception], ...] = ()
+
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+
+
+class RetryStats:
+    """
+    Thread-safe counters describing how much work and wall time retries cost.
+
+    ``attempts`` counts every call attempt, ``retries`` the attempts after the
+    first, split into ``rate_limited`` and ``transient`` by failure class.
+    ``sleep_seconds`` is the total backoff time and ``exhausted`` the number of
+    calls that gave up.
+    """
+
+    FIELDS = (
+        "calls",
+        "attempts",
+        "retries",
+        "rate_limited",
+        "transient",
+        "exhausted",
+        "sleep_seconds",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, **increments: float) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["sleep_seconds"] = round(counters["sleep_seconds"], 3)
+        return counters
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+
+
+# Process-wide counters reported by ingestion runs.
+retry_stats = RetryStats()
+
+
+def classify_exception(
+    exc: BaseException,
+    rate_limit_exceptions: Tuple[Type[Exception], ...] = DEFAULT_RATE_LIMIT_EXCEPTIONS,
+) -> str:
+    """
+    Classify a failure as a rate limit or a transient error.
+
+    Rate limits are the given exception types (e.g. the Alpha Vantage "Note"
+    payload error) and HTTP 429 responses from requests/httpx.
+    """
+    if isinstance(exc, rate_limit_exceptions):
+        return RATE_LIMIT
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return RATE_LIMIT
+    return TRANSIENT
+
+
+def backoff_delay(
+    retry_number: int,
+    base: float,
+    factor: float = 2.0,
+    max_delay: float = 60.0,
+    jitter: float = 0.5,
+) -> float:
+    """
+    Exponential backoff for the ``retry_number``-th retry (1-based) with jitter.
+
+    The un-jittered delay is ``base * factor ** (retry_number - 1)`` capped at
+    ``max_delay``; ``jitter`` is the fraction of it that is randomized away so
+    concurrent workers do not retry in lockstep.
+    """
+    delay = min(max_delay, base * factor ** (retry_number - 1))
+    return random.uniform(delay * (1 - jitter), delay)
+
 
 def retry(
     attempts: int = 3,
-    delay: int = 5,
+    delay: float = 5,
     exceptions: Tuple[Type[Exception], ...] | None = None,
+    backoff: float = 2.0,
+    max_delay: float = 60.0,
+    jitter: float = 0.5,
+    max_elapsed: Optional[float] = None,
+    rate_limit_delay: Optional[float] = None,
+    rate_limit_exceptions: Tuple[Type[Exception], ...] = DEFAULT_RATE_LIMIT_EXCEPTIONS,
+    stats: RetryStats = retry_stats,
 ) -> Callable[[Retryable], Retryable]:
     """
     Decorator to retry a function when specific exceptions are raised.
 
+    Works on plain and ``async def`` functions; coroutines back off with
+    ``asyncio.sleep`` so the event loop keeps running.
+
     Args:
         attempts: Number of retry attempts before giving up.
-        delay: Delay (seconds) between retries.
+        delay: Initial delay (seconds) before retrying a transient error.
         exceptions: Exception classes that trigger a retry. Defaults to a
             connection/timeout tuple if not provided.
+        backoff: Multiplier applied to the delay after every retry.
+        max_delay: Upper bound for a single delay.
+        jitter: Fraction of each delay that is randomized (0 disables jitter).
+        max_elapsed: Total time budget in seconds; no retry starts if its delay
+            would run past it.
+        rate_limit_delay: Initial delay for rate-limit failures (defaults to
+            ``delay``). Rate limits are always retried.
+        rate_limit_exceptions: Exception classes treated as rate limits.
+        stats: Counters updated with attempts, retries and sleep time.
     """
 
-    handled_exceptions = exceptions or DEFAULT_RETRY_EXCEPTIONS
+    handled_exceptions = tuple(exceptions or DEFAULT_RETRY_EXCEPTIONS) + tuple(
+        rate_limit_exceptions
+    )
+    limit_delay = delay if rate_limit_delay is None else rate_limit_delay
+
+    def _next_delay(func: Retryable, attempt: int, exc: BaseException, started: float):
+        """Return the delay before the next attempt, or None to give up."""
+        kind = classify_exception(exc, rate_limit_exceptions)
+        logging.warning(
+            "Retry %s/%s for %s failed (%s): %s",
+            attempt,
+            attempts,
+            func.__name__,
+            kind,
+            exc,
+        )
+        if attempt == attempts:
+            return None
+        base = limit_delay if kind == RATE_LIMIT else delay
+        wait = backoff_delay(attempt, base, backoff, max_delay, jitter)
+        if max_elapsed is not None and time.monotonic() - started + wait > max_elapsed:
+            logging.warning(
+                "Retry budget of %.1fs exhausted for %s", max_elapsed, func.__name__
+            )
+            return None
+        counter = "rate_limited" if kind == RATE_LIMIT else "transient"
+        stats.add(retries=1, sleep_seconds=wait, **{counter: 1})
+        return wait
 
     def decorator(func: Retryable) -> Retryable:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.monotonic()
+                stats.add(calls=1)
+                attempt = 0
+                while True:
+                    attempt += 1
+                    stats.add(attempts=1)
+                    try:
+                        return await func(*args, **kwargs)
+                    except handled_exceptions as exc:  # type: ignore[misc]
+                        wait = _next_delay(func, attempt, exc, started)
+                        if wait is None:
+                            stats.add(exhausted=1)
+                            raise RetryError(
+                                f"All {attempt} retries failed for {func.__name__}"
+                            ) from exc
+                    await asyncio.sleep(wait)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exc = None
-            for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            stats.add(calls=1)
+            attempt = 0
+            while True:
+                attempt += 1
+                stats.add(attempts=1)
                 try:
                     return func(*args, **kwargs)
                 except handled_exceptions as exc:  # type: ignore[misc]
-                    last_exc = exc
-                    logging.warning(
-                        "Retry %s/%s for %s failed: %s",
-                        attempt,
-                        attempts,
-                        func.__name__,
-                        exc,
-                    )
-                    if attempt == attempts:
-                        break
-                    time.sleep(delay)
-            raise RetryError(
-                f"All {attempts} retries failed for {func.__name__}"
-            ) from last_exc
+                    wait = _next_delay(func, attempt, exc, started)
+                    if wait is None:
+                        stats.add(exhausted=1)
+                        raise RetryError(
+                            f"All {attempt} retries failed for {func.__name__}"
+                        ) from exc
+                time.sleep(wait)
 
         return wrapper
 
@@ -0,0 +1,231 @@
+"""
+Shared Alpha Vantage request/response handling plus a pooled asyncio client.
+
+The request parameters, response validation and DataFrame normalization live
+here so the synchronous `data_fetcher`, the historical ingestion flow and the
+async client all interpret Alpha Vantage payloads the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Union
+
+import httpx
+import pandas as pd
+
+from .config import ALPHA_VANTAGE_API_KEY, ALPHA_VANTAGE_BASE_URL
+
+BASE_URL = ALPHA_VANTAGE_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+MODE_CONFIG = {
+    "intraday": {
+        "function": "TIME_SERIES_INTRADAY",
+        "response_key": lambda interval: f"Time Series ({interval})",
+    },
+    "daily": {
+        "function": "TIME_SERIES_DAILY_ADJUSTED",
+        "response_key": lambda _interval: "Time Series (Daily)",
+    },
+}
+
+COLUMN_MAPPING = {
+    "1. open": "open",
+    "2. high": "high",
+    "3. low": "low",
+    "4. close": "close",
+    "5. volume": "volume",
+    "5. adjusted close": "adjusted_close",
+    "6. volume": "volume",
+    "7. dividend amount": "dividend_amount",
+    "8. split coefficient": "split_coefficient",
+}
+
+
+class AlphaVantageError(Exception):
+    """Base Alpha Vantage error."""
+
+
+class AlphaVantageRateLimitError(AlphaVantageError):
+    """Raised when Alpha Vantage rate limits the request."""
+
+
+def build_params(
+    ticker: str,
+    mode: str = "intraday",
+    interval: str = "60min",
+    outputsize: str = "compact",
+    api_key: Optional[str] = None,
+) -> Dict[str, str]:
+    """Build the query parameters for a time series request."""
+    mode = mode.lower()
+    if mode not in MODE_CONFIG:
+        raise ValueError(f"Unsupported mode '{mode}'. Valid options: {list(MODE_CONFIG)}")
+
+    params = {
+        "function": MODE_CONFIG[mode]["function"],
+        "symbol": ticker,
+        "apikey": api_key or ALPHA_VANTAGE_API_KEY,
+        "outputsize": outputsize,
+    }
+    if mode == "intraday":
+        params["interval"] = interval
+    return params
+
+
+def extract_time_series(
+    raw_data: Dict[str, Any],
+    mode: str = "intraday",
+    interval: str = "60min",
+) -> Dict[str, Dict[str, Any]]:
+    """Validate an Alpha Vantage payload and return its time series object."""
+    if "Note" in raw_data:
+        raise AlphaVantageRateLimitError(raw_data["Note"])
+    if "Error Message" in raw_data:
+        raise AlphaVantageError(raw_data["Error Message"])
+
+    key = MODE_CONFIG[mode.lower()]["response_key"](interval)
+    if key not in raw_data:
+        raise AlphaVantageError(f"Response missing expected key '{key}': {raw_data}")
+    return raw_data[key]
+
+
+def normalize_time_series(raw_series: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Convert a raw time series object into a numeric, time-sorted DataFrame."""
+    df = pd.DataFrame.from_dict(raw_series, orient="index")
+    df.rename(
+        columns={k: v for k, v in COLUMN_MAPPING.items() if k in df.columns},
+        inplace=True,
+    )
+    df = df.apply(lambda col: pd.to_numeric(col, errors="coerce"))
+    df.index = pd.to_datetime(df.index)
+    df.sort_index(inplace=True)
+    return df
+
+
+class AsyncAlphaVantageClient:
+    """
+    Asyncio Alpha Vantage client backed by a pooled ``httpx.AsyncClient``.
+
+    Connections are kept alive between requests and at most
+    ``max_concurrency`` requests are in flight at once. An optional
+    ``RateLimiter`` (see ``historical_ingestion.rate_limiter``) paces requests
+    to the plan limits, and an optional ``ResponseCache`` serves responses
+    for bars that have not closed yet without touching the network.
+
+    Usage:
+        async with AsyncAlphaVantageClient(max_concurrency=16) as client:
+            frames = await client.fetch_many(["AAPL", "MSFT"], mode="daily")
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 8,
+        timeout: float = 15.0,
+        rate_limiter=None,
+        response_cache=None,
+        base_url: str = BASE_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.api_key = api_key or ALPHA_VANTAGE_API_KEY
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max(1, max_concurrency),
+                max_keepalive_connections=max(1, max_concurrency),
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncAlphaVantageClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+    async def _get(self, params: Dict[str, str]) -> httpx.Response:
+        if not self.api_key:
+            raise EnvironmentError("Missing ALPHA_VANTAGE_API_KEY in environment variables.")
+        async with self._semaphore:
+            # Per attempt: a retried fetch is another request against the plan.
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            response = await self._client.get(self.base_url, params=params)
+            response.raise_for_status()
+            return response
+
+    async def fetch_json(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Issue one GET request and return the decoded JSON payload."""
+        response = await self._get(params)
+        return response.json()
+
+    async def fetch_series(
+        self,
+        ticker: str,
+        mode: str = "intraday",
+        interval: str = "60min",
+        outputsize: str = "compact",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch and validate the raw time series object for one symbol."""
+        params = build_params(ticker, mode, interval, outputsize, api_key=self.api_key)
+        cache_args = (
+            params["function"],
+            ticker,
+            params.get("interval"),
+            outputsize,
+        )
+        if self.response_cache is not None:
+            cached = self.response_cache.get(*cache_args)
+            if cached is not None:
+                return extract_time_series(cached, mode, interval)
+
+        response = await self._get(params)
+        series = extract_time_series(response.json(), mode, interval)
+        if self.response_cache is not None:
+            self.response_cache.put(*cache_args, response.content)
+        return series
+
+    async def fetch_dataframe(
+        self,
+        ticker: str,
+        mode: str = "intraday",
+        interval: str = "60min",
+        outputsize: str = "compact",
+    ) -> pd.DataFrame:
+        """Fetch one symbol and normalize it like `data_fetcher.fetch_stock_data`."""
+        raw_series = await self.fetch_series(ticker, mode, interval, outputsize)
+        df = normalize_time_series(raw_series)
+        logger.info("✅ Retrieved %d rows for %s", len(df), ticker)
+        return df
+
+    async def fetch_many(
+        self,
+        tickers: Iterable[str],
+        mode: str = "intraday",
+        interval: str = "60min",
+        outputsize: str = "compact",
+    ) -> Dict[str, Union[pd.DataFrame, Exception]]:
+        """
+        Fetch several symbols concurrently.
+
+        Returns:
+            dict: Ticker -> DataFrame, or the exception raised for that ticker.
+        """
+        tickers = list(tickers)
+        results = await asyncio.gather(
+            *(self.fetch_dataframe(t, mode, interval, outputsize) for t in tickers),
+            return_exceptions=True,
+        )
+        return dict(zip(tickers, results))
@@ -0,0 +1,292 @@
+"""
+Local Alpha Vantage stand-in with record/replay fixtures and synthetic data.
+
+The stub answers ``GET /query`` like the real API. Each request is resolved in
+order from:
+
+1. a fixture file in ``fixtures_dir`` (a captured response),
+2. the ``upstream`` API when recording: the real response is proxied and
+   written to ``fixtures_dir`` for later offline replays,
+3. a deterministic synthetic series when ``synthetic_rows`` is set,
+
+and otherwise returns an ``Error Message`` payload. ``outputsize=compact``
+requests fall back to the newest 100 bars of a ``full`` fixture and
+``datatype=csv`` responses are rendered from the JSON payload.
+
+Point the fetchers at it with ``ALPHA_VANTAGE_BASE_URL=<stub.url>/query``.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import numpy as np
+import pandas as pd
+
+COMPACT_BARS = 100
+SYNTHETIC_END = "2024-12-31 20:00:00"
+
+DAILY_FUNCTIONS = {"TIME_SERIES_DAILY", "TIME_SERIES_DAILY_ADJUSTED"}
+
+
+def series_key(function: str, interval: Optional[str]) -> str:
+    """Name of the time series object Alpha Vantage returns for ``function``."""
+    if function in DAILY_FUNCTIONS:
+        return "Time Series (Daily)"
+    return f"Time Series ({interval})"
+
+
+def synthetic_payload(
+    function: str,
+    symbol: str,
+    interval: Optional[str] = None,
+    rows: int = 5000,
+) -> Dict[str, Any]:
+    """
+    Build a deterministic random-walk payload shaped like an Alpha Vantage response.
+
+    The same (function, symbol, interval, rows) always yields the same bars, so
+    benchmark runs are reproducible.
+    """
+    rng = np.random.default_rng(zlib.crc32(f"{function}|{symbol}|{interval}".encode("utf-8")))
+    daily = function in DAILY_FUNCTIONS
+    if daily:
+        index = pd.bdate_range(end=SYNTHETIC_END[:10], periods=rows)
+        fmt = "%Y-%m-%d"
+    else:
+        index = pd.date_range(end=SYNTHETIC_END, periods=rows, freq=pd.Timedelta(interval))
+        fmt = "%Y-%m-%d %H:%M:%S"
+
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, rows)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0.0, 0.01, rows)
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.integers(10_000, 5_000_000, rows)
+
+    columns = {"1. open": open_, "2. high": high, "3. low": low, "4. close": close}
+    if function == "TIME_SERIES_DAILY_ADJUSTED":
+        columns["5. adjusted close"] = close
+        columns["6. volume"] = volume
+        columns["7. dividend amount"] = np.zeros(rows)
+        columns["8. split coefficient"] = np.ones(rows)
+    else:
+        columns["5. volume"] = volume
+
+    rendered = {
+        name: [str(v) for v in values] if name.endswith("volume") else [f"{v:.4f}" for v in values]
+        for name, values in columns.items()
+    }
+    names = list(rendered)
+    timestamps = index.strftime(fmt)
+    series = {
+        timestamps[i]: {name: rendered[name][i] for name in names}
+        for i in range(rows - 1, -1, -1)  # newest first, like the real API
+    }
+    meta = {"1. Information": f"Synthetic {function}", "2. Symbol": symbol}
+    if not daily:
+        meta["4. Interval"] = interval
+    return {"Meta Data": meta, series_key(function, interval): series}
+
+
+def payload_to_csv(payload: Dict[str, Any], key: str) -> bytes:
+    """Render a JSON payload as the equivalent ``datatype=csv`` body."""
+    series = payload[key]
+    buffer = io.StringIO()
+    fields = list(next(iter(series.values()), {}))
+    names = [field.split(". ", 1)[-1].replace(" ", "_") for field in fields]
+    buffer.write(",".join(["timestamp", *names]) + "\n")
+    for timestamp, values in series.items():
+        buffer.write(",".join([timestamp, *(values[field] for field in fields)]) + "\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+class AlphaVantageStub:
+    """
+    Background HTTP server replaying (or recording) Alpha Vantage responses.
+
+    Args:
+        fixtures_dir: Directory of captured responses (created when recording).
+        upstream: Real API URL to proxy and record misses from (None = offline).
+        synthetic_rows: Bars per synthetic series for symbols without fixtures
+            (0 disables synthetic data).
+        latency: Seconds to sleep per request to mimic network round trips.
+        host: Interface to bind (port is picked automatically).
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: Optional[Path] = None,
+        upstream: Optional[str] = None,
+        synthetic_rows: int = 0,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self.upstream = upstream
+        self.synthetic_rows = synthetic_rows
+        self.latency = latency
+        self.requests = 0
+        self.served: Dict[str, int] = {"fixture": 0, "recorded": 0, "synthetic": 0, "missing": 0}
+        self._rate_limits = 0
+        self._payloads: Dict[Tuple[str, ...], bytes] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``ALPHA_VANTAGE_BASE_URL``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/query"
+
+    def start(self) -> "AlphaVantageStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "AlphaVantageStub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def rate_limit_next(self, count: int = 1) -> None:
+        """Answer the next ``count`` requests with a rate-limit ``Note`` payload."""
+        with self._lock:
+            self._rate_limits += count
+
+    def fixture_path(
+        self, function: str, symbol: str, interval: Optional[str], outputsize: str
+    ) -> Optional[Path]:
+        if self.fixtures_dir is None:
+            return None
+        interval_part = "daily" if function in DAILY_FUNCTIONS else interval
+        name = f"{function}_{symbol.upper()}_{interval_part}_{outputsize}.json"
+        return self.fixtures_dir / name
+
+    def _count(self, source: str) -> None:
+        with self._lock:
+            self.served[source] += 1
+
+    def _load_fixture(
+        self, function: str, symbol: str, interval: Optional[str], outputsize: str
+    ) -> Optional[Dict[str, Any]]:
+        sizes = [outputsize] + (["full"] if outputsize == "compact" else [])
+        for size in sizes:
+            path = self.fixture_path(function, symbol, interval, size)
+            if path is not None and path.exists():
+                return json.loads(path.read_bytes())
+        return None
+
+    def _record(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        upstream_params = {k: v for k, v in params.items() if k != "datatype"}
+        response = httpx.get(self.upstream, params=upstream_params, timeout=30)
+        response.raise_for_status()
+        payload = response.json()
+        key = series_key(params["function"], params.get("interval"))
+        if key not in payload:
+            return payload  # rate limit / error: pass through, never record
+        path = self.fixture_path(
+            params["function"], params["symbol"], params.get("interval"), params["outputsize"]
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(response.content)
+        return payload
+
+    def resolve(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Return the JSON payload for one request."""
+        function = params.get("function", "")
+        symbol = params.get("symbol", "")
+        interval = params.get("interval")
+        outputsize = params.get("outputsize", "compact")
+
+        payload = self._load_fixture(function, symbol, interval, outputsize)
+        if payload is not None:
+            self._count("fixture")
+        elif self.upstream and self.fixtures_dir is not None:
+            payload = self._record(params)
+            self._count("recorded")
+        elif self.synthetic_rows:
+            payload = synthetic_payload(function, symbol, interval, self.synthetic_rows)
+            self._count("synthetic")
+        else:
+            self._count("missing")
+            return {"Error Message": f"No fixture for {function} {symbol}."}
+
+        key = series_key(function, interval)
+        if outputsize == "compact" and key in payload:
+            newest = sorted(payload[key], reverse=True)[:COMPACT_BARS]
+            payload = {**payload, key: {ts: payload[key][ts] for ts in newest}}
+        return payload
+
+    def _body(self, params: Dict[str, str]) -> Tuple[bytes, str]:
+        with self._lock:
+            self.requests += 1
+            if self._rate_limits:
+                self._rate_limits -= 1
+                note = {"Note": "Thank you for using Alpha Vantage! (stub rate limit)"}
+                return json.dumps(note).encode("utf-8"), "application/json"
+
+        datatype = params.get("datatype", "json")
+        cache_key = tuple(
+            params.get(name, "") for name in ("function", "symbol", "interval", "outputsize")
+        ) + (datatype,)
+        with self._lock:
+            cached = self._payloads.get(cache_key)
+        if cached is not None:
+            return cached, "text/csv" if datatype == "csv" else "application/json"
+
+        payload = self.resolve(params)
+        key = series_key(params.get("function", ""), params.get("interval"))
+        if datatype == "csv" and key in payload:
+            body, content_type = payload_to_csv(payload, key), "text/csv"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        if key in payload:
+            with self._lock:
+                self._payloads[cache_key] = body
+        return body, content_type
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler bound to the enclosing stub."""
+
+            def log_message(self, *_args) -> None:  # silence default stderr logging
+                return
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                params = dict(parse_qsl(urlsplit(self.path).query))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                try:
+                    body, content_type = stub._body(params)  # pylint: disable=protected-access
+                    status = 200
+                except Exception as exc:  # pylint: disable=broad-except
+                    body = json.dumps({"Error Message": str(exc)}).encode("utf-8")
+                    content_type, status = "application/json", 502
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
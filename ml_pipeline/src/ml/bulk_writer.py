@@ -0,0 +1,246 @@
+"""
+Parallel, adaptive-batch bulk writer for Supabase/PostgREST tables.
+
+Rows are sent in batches with a bounded number of requests in flight. The
+batch size grows while requests come back well under the latency target and
+shrinks when they are slow, fail, or would exceed the payload budget. Each
+batch is retried on its own, so one failing request does not abort the rest
+of the upload.
+
+Any client exposing ``.table(name).insert/upsert(rows).execute()`` works: the
+Supabase client used across the pipeline, or a bare ``postgrest`` client
+pointed at a local stub server in tests.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from postgrest.types import ReturnMethod
+
+from .config import (
+    SUPABASE_BULK_BATCH_SIZE,
+    SUPABASE_BULK_MAX_BATCH_SIZE,
+    SUPABASE_BULK_MAX_IN_FLIGHT,
+    SUPABASE_BULK_MAX_PAYLOAD_BYTES,
+    SUPABASE_BULK_MAX_RETRIES,
+    SUPABASE_BULK_TARGET_LATENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("insert", "upsert")
+MIN_BATCH_SIZE = 10
+PAYLOAD_SAMPLE_ROWS = 25
+
+
+class BulkWriteError(Exception):
+    """Raised when some batches still fail after their retries."""
+
+    def __init__(self, message: str, stats: Dict[str, Any]) -> None:
+        super().__init__(message)
+        self.stats = stats
+
+
+class BulkWriter:
+    """
+    Write rows to one table through concurrent, adaptively sized batches.
+
+    Args:
+        client: Supabase or postgrest client.
+        table: Destination table name.
+        method: ``insert`` or ``upsert``.
+        on_conflict: Conflict target columns for upserts (PostgREST ``on_conflict``).
+        max_in_flight: Maximum concurrent requests.
+        batch_size: Starting batch size.
+        max_batch_size: Upper bound the batch size may grow to.
+        target_latency: Per-request latency (seconds) the batch size is tuned towards.
+        max_payload_bytes: Estimated request body size a batch must stay under.
+        max_retries: Retries per batch after the first attempt.
+        retry_backoff: Initial retry delay in seconds, doubled per attempt.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        table: str,
+        method: str = "upsert",
+        on_conflict: Optional[str] = None,
+        max_in_flight: int = SUPABASE_BULK_MAX_IN_FLIGHT,
+        batch_size: int = SUPABASE_BULK_BATCH_SIZE,
+        max_batch_size: int = SUPABASE_BULK_MAX_BATCH_SIZE,
+        target_latency: float = SUPABASE_BULK_TARGET_LATENCY,
+        max_payload_bytes: int = SUPABASE_BULK_MAX_PAYLOAD_BYTES,
+        max_retries: int = SUPABASE_BULK_MAX_RETRIES,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        if method not in METHODS:
+            raise ValueError(f"Unsupported method '{method}'. Valid options: {list(METHODS)}")
+        self.client = client
+        self.table = table
+        self.method = method
+        self.on_conflict = on_conflict
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_batch_size = max(MIN_BATCH_SIZE, max_batch_size)
+        self.batch_size = min(max(MIN_BATCH_SIZE, batch_size), self.max_batch_size)
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self._bytes_per_row: Optional[float] = None
+
+    def _execute(self, rows: Sequence[Dict[str, Any]]) -> None:
+        query = self.client.table(self.table)
+        if self.method == "upsert":
+            kwargs = {"returning": ReturnMethod.minimal}
+            if self.on_conflict:
+                kwargs["on_conflict"] = self.on_conflict
+            query.upsert(list(rows), **kwargs).execute()
+        else:
+            query.insert(list(rows), returning=ReturnMethod.minimal).execute()
+
+    def _send(self, rows: Sequence[Dict[str, Any]]) -> Tuple[float, int]:
+        """Send one batch with retries. Returns (latency of the successful attempt, retries)."""
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                self._execute(rows)
+                return time.perf_counter() - started, attempt
+            except Exception as exc:  # pylint: disable=broad-except
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_backoff * (2**attempt)
+                attempt += 1
+                logger.warning(
+                    "Batch of %d rows to %s failed (%s); retry %d/%d in %.1fs",
+                    len(rows),
+                    self.table,
+                    exc,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                time.sleep(delay)
+
+    def _estimate_bytes_per_row(self, rows: Sequence[Dict[str, Any]]) -> float:
+        sample = list(rows[:PAYLOAD_SAMPLE_ROWS])
+        return len(json.dumps(sample, default=str)) / max(1, len(sample))
+
+    def _payload_cap(self) -> int:
+        if not self._bytes_per_row:
+            return self.max_batch_size
+        return max(MIN_BATCH_SIZE, int(self.max_payload_bytes / self._bytes_per_row))
+
+    def _adapt(self, latency: Optional[float]) -> None:
+        """Grow on fast responses, halve on slow or failed ones, respect the payload cap."""
+        size = self.batch_size
+        if latency is None or latency > self.target_latency:
+            size //= 2
+        elif latency < self.target_latency / 2:
+            size *= 2
+        self.batch_size = max(MIN_BATCH_SIZE, min(size, self.max_batch_size, self._payload_cap()))
+
+    def write(
+        self,
+        records: Sequence[Dict[str, Any]],
+        raise_on_error: bool = True,
+        on_batch: Optional[Callable[[Sequence[Dict[str, Any]]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Write all records and return throughput statistics.
+
+        Args:
+            records: Rows to write.
+            raise_on_error: Raise `BulkWriteError` when batches fail after retries.
+            on_batch: Called with the rows of each batch once it is written,
+                so callers can checkpoint progress before a later batch fails.
+
+        Returns:
+            dict: rows, failed_rows, batches, retries, elapsed_seconds,
+            rows_per_second and the final batch_size.
+        """
+        total = len(records)
+        stats: Dict[str, Any] = {
+            "rows": 0,
+            "failed_rows": 0,
+            "batches": 0,
+            "retries": 0,
+            "errors": [],
+        }
+        started = time.perf_counter()
+        if total:
+            self._bytes_per_row = self._estimate_bytes_per_row(records)
+            self.batch_size = min(self.batch_size, self._payload_cap())
+
+        offset = 0
+        pending: Dict[Future, Sequence[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="bulk-writer"
+        ) as pool:
+            while offset < total or pending:
+                while offset < total and len(pending) < self.max_in_flight:
+                    batch = records[offset : offset + self.batch_size]
+                    pending[pool.submit(self._send, batch)] = batch
+                    offset += len(batch)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = pending.pop(future)
+                    rows = len(batch)
+                    stats["batches"] += 1
+                    try:
+                        latency, retries = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        stats["failed_rows"] += rows
+                        stats["retries"] += self.max_retries
+                        stats["errors"].append(str(exc))
+                        self._adapt(None)
+                        continue
+                    stats["rows"] += rows
+                    stats["retries"] += retries
+                    self._adapt(latency)
+                    if on_batch is not None:
+                        on_batch(batch)
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["rows_per_second"] = round(stats["rows"] / elapsed, 1) if elapsed > 0 else 0.0
+        stats["batch_size"] = self.batch_size
+        logger.info(
+            "📤 Wrote %d/%d rows to %s in %.2fs (%.1f rows/s, %d batches, %d retries, final batch %d)",
+            stats["rows"],
+            total,
+            self.table,
+            elapsed,
+            stats["rows_per_second"],
+            stats["batches"],
+            stats["retries"],
+            self.batch_size,
+        )
+        if stats["failed_rows"] and raise_on_error:
+            raise BulkWriteError(
+                f"{stats['failed_rows']} of {total} rows failed to write to {self.table}: "
+                f"{stats['errors'][0]}",
+                stats,
+            )
+        return stats
+
+
+def bulk_write(
+    client: Any,
+    table: str,
+    records: List[Dict[str, Any]],
+    method: str = "upsert",
+    raise_on_error: bool = True,
+    on_batch: Optional[Callable[[Sequence[Dict[str, Any]]], None]] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Convenience wrapper: ``BulkWriter(client, table, method, **kwargs).write(records)``."""
+    return BulkWriter(client, table, method=method, **kwargs).write(
+        records, raise_on_error=raise_on_error, on_batch=on_batch
+    )
@@ -0,0 +1,336 @@
+"""
+Compact cached dataset versions and enforce retention.
+
+Every fetch/ingestion run stores a full timestamped version, so a dataset
+directory accumulates mostly-overlapping copies. Compaction merges the
+versions that share the newest version's schema into one de-duplicated,
+time-sorted history (newer versions win on overlapping timestamps), saves it
+as a new version and moves ``latest`` to it. Retention then keeps the newest
+``--keep-last`` versions plus the newest version of each of the last
+``--keep-daily`` days and deletes the other merged versions locally and in S3.
+
+Versions with a different schema are never deleted (their rows are not part
+of the compacted history) and neither is the version ``latest`` points to.
+
+Examples:
+    # Compact every cached raw and features dataset
+    python -m ml_pipeline.src.ml.compact_datasets
+
+    # Preview one intraday cache with a tighter policy
+    python -m ml_pipeline.src.ml.compact_datasets --dataset-type raw --symbol AAPL \\
+        --mode intraday --interval 60min --outputsize compact --keep-last 1 --keep-daily 0 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import COMPACTION_KEEP_DAILY, COMPACTION_KEEP_LAST
+from .dataset_manager import (
+    DATASET_DIRS,
+    DEFAULT_VERSION,
+    TIMESTAMP_FMT,
+    dataset_lock,
+    delete_version,
+    iter_datasets,
+    list_version_entries,
+    load_dataset,
+    merge_time_series,
+    resolve_version,
+    save_dataset,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _is_timestamped(version: str) -> bool:
+    try:
+        datetime.strptime(version, TIMESTAMP_FMT)
+    except ValueError:
+        return False
+    return True
+
+
+def version_time(version: str, entry: Optional[Dict[str, Any]] = None) -> datetime:
+    """When a version was written: its timestamp name, else its index entry."""
+    if _is_timestamped(version):
+        return datetime.strptime(version, TIMESTAMP_FMT)
+    if entry and entry.get("saved_at"):
+        return datetime.fromisoformat(entry["saved_at"].rstrip("Z"))
+    return datetime.min
+
+
+def version_order(version: str, written_at: datetime) -> Tuple[bool, datetime, str]:
+    """
+    Sort key from oldest to newest.
+
+    Named copies (``manual``, a physical ``latest``) rank by when they were
+    written but always below timestamped versions, whose names are reliable.
+    """
+    return (_is_timestamped(version), written_at, version)
+
+
+def retained_versions(
+    stamps: Dict[str, datetime],
+    keep_last: int = COMPACTION_KEEP_LAST,
+    keep_daily: int = COMPACTION_KEEP_DAILY,
+) -> List[str]:
+    """
+    Apply the retention policy to ``{version: written_at}``.
+
+    Keeps the newest ``keep_last`` versions and the newest version of each of
+    the ``keep_daily`` most recent days that have versions.
+    """
+    ordered = sorted(stamps, key=lambda version: version_order(version, stamps[version]))
+    keep = set(ordered[-keep_last:]) if keep_last > 0 else set()
+    days: List[Any] = []
+    for version in reversed(ordered):
+        day = stamps[version].date()
+        if day in days:
+            continue
+        if len(days) >= keep_daily:
+            break
+        days.append(day)
+        keep.add(version)
+    return [version for version in ordered if version in keep]
+
+
+def compact_dataset(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
+    keep_last: int = COMPACTION_KEEP_LAST,
+    keep_daily: int = COMPACTION_KEEP_DAILY,
+    partitioning: Optional[str] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Merge overlapping versions of one dataset and delete the superseded ones.
+
+    Args:
+        dataset_type, symbol, mode, interval, outputsize, feature_set: Dataset
+            to compact.
+        keep_last: Newest versions to keep regardless of age.
+        keep_daily: Days (most recent first) for which one version is kept.
+        partitioning: Layout of the compacted version (see `save_dataset`).
+        dry_run: Report what would happen without writing or deleting anything.
+
+    Returns:
+        dict: Versions before, merged and kept, the compacted version (None when
+        the newest version already held the full history), deleted versions,
+        bytes freed and the row count of the compacted history.
+    """
+    dataset = {
+        "dataset_type": dataset_type,
+        "symbol": symbol,
+        "mode": mode,
+        "interval": interval,
+        "outputsize": outputsize,
+        "feature_set": feature_set,
+    }
+    # Other writers must not save between the merge and the pointer move,
+    # or latest could be moved back onto the compacted (older) history.
+    with nullcontext() if dry_run else dataset_lock(**dataset):
+        return _compact(dataset, keep_last, keep_daily, partitioning, dry_run)
+
+
+def _compact(
+    dataset: Dict[str, Optional[str]],
+    keep_last: int,
+    keep_daily: int,
+    partitioning: Optional[str],
+    dry_run: bool,
+) -> Dict[str, Any]:
+    # A physical "latest" written before pointers existed is merged like any
+    # other version; moving the pointer to the compacted version removes it.
+    entries = {entry["version"]: entry for entry in list_version_entries(**dataset)}
+    stats: Dict[str, Any] = {
+        **dataset,
+        "versions": len(entries),
+        "merged": 0,
+        "rows": 0,
+        "compacted_version": None,
+        "kept": sorted(entries),
+        "deleted": [],
+        "bytes_freed": 0,
+        "dry_run": dry_run,
+    }
+    if not entries:
+        return stats
+
+    stamps = {version: version_time(version, entry) for version, entry in entries.items()}
+    ordered = sorted(entries, key=lambda version: version_order(version, stamps[version]))
+    newest = ordered[-1]
+    schema_hash = entries[newest]["schema_hash"]
+    mergeable = [v for v in ordered if entries[v]["schema_hash"] == schema_hash]
+
+    history: Optional[pd.DataFrame] = None
+    newest_df: Optional[pd.DataFrame] = None
+    for version in mergeable:
+        frame = load_dataset(**dataset, version=version, use_cache=False)
+        if frame is None:
+            logger.warning(
+                "Indexed version %s of %s is missing; skipping it.", version, dataset["symbol"]
+            )
+            continue
+        history = merge_time_series(history, frame)
+        newest_df = frame
+    if history is None:
+        return stats
+    stats["merged"] = len(mergeable)
+    stats["rows"] = len(history)
+
+    latest = resolve_version(**dataset)
+    protected = {latest} if latest else set()
+    moves_latest = False
+    if len(mergeable) > 1 and not history.equals(newest_df.sort_index()):
+        compacted = max(datetime.utcnow(), stamps[newest] + timedelta(seconds=1))
+        compacted_version = compacted.strftime(TIMESTAMP_FMT)
+        stats["compacted_version"] = compacted_version
+        # Only move latest when it pointed into the history just merged.
+        moves_latest = latest in mergeable
+        if not dry_run:
+            save_dataset(
+                history,
+                **dataset,
+                version=compacted_version,
+                persist_latest=moves_latest,
+                partitioning=partitioning,
+            )
+        if moves_latest:
+            protected = set()
+        stamps[compacted_version] = compacted
+        protected.add(compacted_version)
+    else:
+        protected.add(newest)
+
+    keep = set(retained_versions(stamps, keep_last, keep_daily)) | protected
+    keep.update(v for v in entries if v not in mergeable)
+    if moves_latest:
+        keep.discard(DEFAULT_VERSION)  # superseded by the pointer
+    deleted = [v for v in mergeable if v not in keep and v != DEFAULT_VERSION]
+    for version in deleted:
+        if dry_run:
+            stats["bytes_freed"] += int(entries[version]["bytes"])
+        else:
+            stats["bytes_freed"] += delete_version(**dataset, version=version)
+    stats["deleted"] = deleted
+    stats["kept"] = [
+        version
+        for version in sorted(stamps, key=lambda version: version_order(version, stamps[version]))
+        if version in keep and version not in deleted
+    ]
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compact cached dataset versions.")
+    parser.add_argument(
+        "--dataset-type",
+        choices=[*DATASET_DIRS, "all"],
+        default="all",
+        help="Dataset type to compact.",
+    )
+    parser.add_argument(
+        "--symbol",
+        help="Comma-separated symbols. Defaults to every cached dataset of the type.",
+    )
+    parser.add_argument("--mode", default="default", help="Dataset mode (with --symbol).")
+    parser.add_argument("--interval", help="Intraday interval (with --symbol).")
+    parser.add_argument("--outputsize", help="Output size (with --symbol).")
+    parser.add_argument("--feature-set", help="Named feature set (with --symbol).")
+    parser.add_argument(
+        "--keep-last",
+        type=int,
+        default=COMPACTION_KEEP_LAST,
+        help="Number of newest versions to keep.",
+    )
+    parser.add_argument(
+        "--keep-daily",
+        type=int,
+        default=COMPACTION_KEEP_DAILY,
+        help="Keep the newest version of each of this many most recent days.",
+    )
+    parser.add_argument(
+        "--partitioning",
+        choices=["none", "year", "month"],
+        help="Layout of the compacted version (default: ML_DATASET_PARTITIONING).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be merged and deleted without changing anything.",
+    )
+    args = parser.parse_args()
+    if args.symbol and args.dataset_type == "all":
+        parser.error("--symbol requires a single --dataset-type.")
+    return args
+
+
+def _targets(args: argparse.Namespace) -> List[Dict[str, Optional[str]]]:
+    if args.symbol:
+        return [
+            {
+                "dataset_type": args.dataset_type,
+                "symbol": symbol.strip(),
+                "mode": args.mode,
+                "interval": args.interval,
+                "outputsize": args.outputsize,
+                "feature_set": args.feature_set,
+            }
+            for symbol in args.symbol.split(",")
+            if symbol.strip()
+        ]
+    types = list(DATASET_DIRS) if args.dataset_type == "all" else [args.dataset_type]
+    return [dataset for dataset_type in types for dataset in iter_datasets(dataset_type)]
+
+
+def main() -> None:
+    args = parse_args()
+    total_deleted = total_bytes = 0
+    for dataset in _targets(args):
+        stats = compact_dataset(
+            **dataset,
+            keep_last=args.keep_last,
+            keep_daily=args.keep_daily,
+            partitioning=args.partitioning,
+            dry_run=args.dry_run,
+        )
+        total_deleted += len(stats["deleted"])
+        total_bytes += stats["bytes_freed"]
+        logger.info(
+            "%s%s%s %s/%s/%s/%s: %d versions, %d merged into %s (%d rows), %d kept, %d deleted",
+            "[dry run] " if args.dry_run else "",
+            dataset["dataset_type"],
+            f"[{dataset['feature_set']}]" if dataset["feature_set"] else "",
+            dataset["symbol"],
+            dataset["mode"],
+            dataset["interval"] or "-",
+            dataset["outputsize"] or "-",
+            stats["versions"],
+            stats["merged"],
+            stats["compacted_version"] or "the newest version",
+            stats["rows"],
+            len(stats["kept"]),
+            len(stats["deleted"]),
+        )
+    logger.info(
+        "🧹 %s %d versions, %.1f MB",
+        "Would delete" if args.dry_run else "Deleted",
+        total_deleted,
+        total_bytes / (1024 * 1024),
+    )
+
+
+if __name__ == "__main__":
+    main()
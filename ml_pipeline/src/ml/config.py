@@ -7,9 +7,10 @@ real-time and historical ingestion flows stay in sync.
 
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -35,6 +36,72 @@ DATA_STORAGE_DIR = Path(
 RAW_DATA_DIR = DATA_STORAGE_DIR / "raw"
 FEATURES_DATA_DIR = DATA_STORAGE_DIR / "features"
 
+# Rows per Parquet row group; smaller groups let time-range loads skip more data.
+DATASET_ROW_GROUP_SIZE = int(os.getenv("ML_PARQUET_ROW_GROUP_SIZE", "4096"))
+
+# Named Parquet storage profiles (see `storage_profiles`). Missing settings
+# fall back to snappy, ML_PARQUET_ROW_GROUP_SIZE rows per group, dictionary
+# encoding and unchanged dtypes. ML_STORAGE_PROFILES (JSON) adds or overrides
+# profiles, e.g. '{"archive": {"compression": "zstd", "compression_level": 19}}'.
+STORAGE_PROFILES = {
+    "default": {},
+    "fast": {"compression": "lz4", "row_group_size": 131072, "use_dictionary": False},
+    "compact": {
+        "compression": "zstd",
+        "compression_level": 9,
+        "use_dictionary": True,
+        "float_dtype": "float32",
+        "categorical_columns": ["symbol"],
+    },
+}
+STORAGE_PROFILES.update(json.loads(os.getenv("ML_STORAGE_PROFILES", "{}")))
+# Profile used for every dataset write, overridable per dataset type (the
+# compact profile's float32 storage is meant for features rather than prices).
+STORAGE_PROFILE = os.getenv("ML_STORAGE_PROFILE", "default").lower()
+RAW_STORAGE_PROFILE = os.getenv("ML_RAW_STORAGE_PROFILE", STORAGE_PROFILE).lower()
+FEATURES_STORAGE_PROFILE = os.getenv("ML_FEATURES_STORAGE_PROFILE", STORAGE_PROFILE).lower()
+
+# Storage format per dataset type: "parquet" (compressed, partitionable) or
+# "feather" (uncompressed Arrow IPC, memory-mapped for zero-copy loads).
+RAW_DATASET_FORMAT = os.getenv("ML_RAW_DATASET_FORMAT", "parquet").lower()
+FEATURES_DATASET_FORMAT = os.getenv("ML_FEATURES_DATASET_FORMAT", "parquet").lower()
+
+# Default dataset layout: "none" (one file per version) or Hive-style
+# "year"/"month" partitions, which suit long 1min/5min intraday histories.
+DATASET_PARTITIONING = os.getenv("ML_DATASET_PARTITIONING", "none").lower()
+
+# Retention applied by `compact_datasets`: keep the newest N versions plus the
+# newest version of each of the last D days that have versions.
+COMPACTION_KEEP_LAST = int(os.getenv("ML_COMPACTION_KEEP_LAST", "3"))
+COMPACTION_KEEP_DAILY = int(os.getenv("ML_COMPACTION_KEEP_DAILY", "7"))
+
+# In-process LRU cache of loaded datasets, bounded by DataFrame memory usage
+# (set ML_DATASET_CACHE=0 to disable)
+DATASET_CACHE_MAX_BYTES = int(os.getenv("ML_DATASET_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+DATASET_CACHE_ENABLED = os.getenv("ML_DATASET_CACHE", "1") != "0"
+
+# Seconds a dataset writer waits for another process's lock on the same
+# dataset directory before giving up (0 waits indefinitely).
+DATASET_LOCK_TIMEOUT = float(os.getenv("ML_DATASET_LOCK_TIMEOUT", "600"))
+
+# Threads used by `dataset_manager.load_panel` to load symbols concurrently.
+DATASET_LOAD_MAX_WORKERS = int(os.getenv("ML_DATASET_LOAD_WORKERS", "8"))
+
+# On-disk cache of raw Alpha Vantage responses (set ML_HTTP_CACHE=0 to disable)
+HTTP_CACHE_DIR = Path(
+    os.getenv("ML_HTTP_CACHE_DIR", DATA_STORAGE_DIR / "http_cache")
+).resolve()
+HTTP_CACHE_MAX_BYTES = int(os.getenv("ML_HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+HTTP_CACHE_ENABLED = os.getenv("ML_HTTP_CACHE", "1") != "0"
+
+# Row-hash index of rows already uploaded to Supabase (set ML_UPLOAD_DEDUPE=0 to disable)
+UPLOAD_STATE_DIR = Path(
+    os.getenv("ML_UPLOAD_STATE_DIR", DATA_STORAGE_DIR / "upload_state")
+).resolve()
+UPLOAD_DEDUPE_ENABLED = os.getenv("ML_UPLOAD_DEDUPE", "1") != "0"
+# Recorded batches after which a scope's index is written out (and at the end of each upload)
+UPLOAD_STATE_FLUSH_BATCHES = int(os.getenv("ML_UPLOAD_STATE_FLUSH_BATCHES", "20"))
+
 # Optional S3 storage (disabled unless a bucket is provided)
 S3_BUCKET = os.getenv("ML_S3_BUCKET")
 S3_PREFIX = os.getenv("ML_S3_PREFIX", "ml_data")
@@ -47,6 +114,39 @@ USE_S3 = bool(S3_BUCKET)
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY") or os.getenv(
     "ALPHA_VANTAGE_KEY"
 )
+# Override to point the fetchers at a local replay stub.
+ALPHA_VANTAGE_BASE_URL = os.getenv(
+    "ALPHA_VANTAGE_BASE_URL", "https://www.alphavantage.co/query"
+)
+
+# Alpha Vantage plan limits used to pace concurrent ingestion.
+ALPHA_VANTAGE_REQUESTS_PER_MINUTE = float(
+    os.getenv("ALPHA_VANTAGE_REQUESTS_PER_MINUTE", "5")
+)
+ALPHA_VANTAGE_REQUESTS_PER_DAY: Optional[int] = (
+    int(os.getenv("ALPHA_VANTAGE_REQUESTS_PER_DAY", "0")) or None
+)
+INGESTION_MAX_WORKERS = int(os.getenv("INGESTION_MAX_WORKERS", "4"))
+
+# Indicators `feature_engineer` computes concurrently (1 runs them sequentially)
+# and the pool they run on ("thread" or "process").
+FEATURE_MAX_WORKERS = int(os.getenv("ML_FEATURE_WORKERS", "1"))
+FEATURE_EXECUTOR = os.getenv("ML_FEATURE_EXECUTOR", "thread").lower()
+
+# Use the NumPy indicator kernels where available (0 forces pandas_ta for all).
+# They also stay off when the installed pandas_ta is not the release they
+# mirror (`indicator_kernels.PANDAS_TA_VERSION`).
+INDICATOR_KERNELS_ENABLED = os.getenv("ML_INDICATOR_KERNELS", "1") != "0"
+
+# On-disk memo of computed indicator columns, keyed by input data and params
+# (set ML_INDICATOR_CACHE=0 to disable)
+INDICATOR_CACHE_DIR = Path(
+    os.getenv("ML_INDICATOR_CACHE_DIR", DATA_STORAGE_DIR / "indicator_cache")
+).resolve()
+INDICATOR_CACHE_MAX_BYTES = int(
+    os.getenv("ML_INDICATOR_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))
+)
+INDICATOR_CACHE_ENABLED = os.getenv("ML_INDICATOR_CACHE", "1") != "0"
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE") or os.getenv(
@@ -54,6 +154,16 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE") or os.getenv(
 )
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 
+# Bulk writer tuning: concurrent requests, batch size bounds and targets.
+SUPABASE_BULK_MAX_IN_FLIGHT = int(os.getenv("SUPABASE_BULK_MAX_IN_FLIGHT", "4"))
+SUPABASE_BULK_BATCH_SIZE = int(os.getenv("SUPABASE_BULK_BATCH_SIZE", "500"))
+SUPABASE_BULK_MAX_BATCH_SIZE = int(os.getenv("SUPABASE_BULK_MAX_BATCH_SIZE", "5000"))
+SUPABASE_BULK_TARGET_LATENCY = float(os.getenv("SUPABASE_BULK_TARGET_LATENCY", "1.0"))
+SUPABASE_BULK_MAX_PAYLOAD_BYTES = int(
+    os.getenv("SUPABASE_BULK_MAX_PAYLOAD_BYTES", str(2 * 1024 * 1024))
+)
+SUPABASE_BULK_MAX_RETRIES = int(os.getenv("SUPABASE_BULK_MAX_RETRIES", "3"))
+
 # Comma-separated list of default ticker symbols to ingest/train on.
 DEFAULT_SYMBOLS: List[str] = [
     symbol.strip().upper()
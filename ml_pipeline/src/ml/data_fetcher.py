@@ -5,128 +5,353 @@ Fetch stock data from Alpha Vantage API and upload/save via CLI.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
-from datetime import datetime
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import requests
 
-from ml_pipeline.historical_ingestion.utils import retry
-from .config import ALPHA_VANTAGE_API_KEY, validate_required_settings
+from ml_pipeline.historical_ingestion.utils import retry, retry_stats
+from .alpha_vantage import (
+    BASE_URL,
+    MODE_CONFIG,
+    AlphaVantageError,
+    AlphaVantageRateLimitError,
+    AsyncAlphaVantageClient,
+    build_params,
+    extract_time_series,
+    normalize_time_series,
+)
+from .config import ALPHA_VANTAGE_API_KEY, STORAGE_PROFILES, validate_required_settings
 from .dataset_manager import (
     DEFAULT_VERSION,
     ensure_data_dirs,
     load_dataset as load_cached_dataset,
+    merge_time_series,
     save_dataset as cache_dataset,
 )
+from .response_cache import response_cache
+from .stage_timings import stage_timings
+from .storage_profiles import write_parquet
+from .streaming_parser import TimeSeriesStreamParser, parse_csv_series
 from .supabase_uploader import upload_to_supabase
 
 API_KEY = ALPHA_VANTAGE_API_KEY
-BASE_URL = "https://www.alphavantage.co/query"
 
 logger = logging.getLogger(__name__)
 
-MODE_CONFIG = {
-    "intraday": {
-        "function": "TIME_SERIES_INTRADAY",
-        "response_key": lambda interval: f"Time Series ({interval})",
-    },
-    "daily": {
-        "function": "TIME_SERIES_DAILY_ADJUSTED",
-        "response_key": lambda _interval: "Time Series (Daily)",
-    },
-}
-
-COLUMN_MAPPING = {
-    "1. open": "open",
-    "2. high": "high",
-    "3. low": "low",
-    "4. close": "close",
-    "5. volume": "volume",
-    "5. adjusted close": "adjusted_close",
-    "6. volume": "volume",
-    "7. dividend amount": "dividend_amount",
-    "8. split coefficient": "split_coefficient",
-}
-
-
-class AlphaVantageError(Exception):
-    """Base Alpha Vantage error."""
-
-
-class AlphaVantageRateLimitError(AlphaVantageError):
-    """Raised when Alpha Vantage rate limits the request."""
-
-
-def _normalize_dataframe(raw_series: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
-    df = pd.DataFrame.from_dict(raw_series, orient="index")
-    df.rename(
-        columns={k: v for k, v in COLUMN_MAPPING.items() if k in df.columns},
-        inplace=True,
-    )
-    df = df.apply(lambda col: pd.to_numeric(col, errors="coerce"))
-    df.index = pd.to_datetime(df.index)
-    df.sort_index(inplace=True)
+# Shared session so repeated requests reuse pooled keep-alive connections.
+_SESSION = requests.Session()
+
+# Number of most recent bars Alpha Vantage returns for outputsize=compact.
+COMPACT_BARS = 100
+
+
+PARSERS = ("auto", "json", "stream", "csv")
+STREAM_CHUNK_BYTES = 65536
+
+
+def _resolve_parser(parser: str, outputsize: str) -> str:
+    if parser not in PARSERS:
+        raise ValueError(f"Unsupported parser '{parser}'. Valid options: {list(PARSERS)}")
+    if parser == "auto":
+        return "stream" if outputsize == "full" else "json"
+    return parser
+
+
+def _fetch_json(
+    params: Dict[str, str],
+    ticker: str,
+    mode: str,
+    interval: str,
+    cache_args: Tuple[Any, ...],
+    use_cache: bool,
+) -> pd.DataFrame:
+    with stage_timings.time("fetch"):
+        raw_data = response_cache.get(*cache_args) if use_cache else None
+        if raw_data is None:
+            logger.info("📡 Fetching %s data for %s...", mode, ticker)
+            response = _SESSION.get(BASE_URL, params=params, timeout=15)
+            response.raise_for_status()
+            series = extract_time_series(response.json(), mode, interval)
+            if use_cache:
+                response_cache.put(*cache_args, response.content)
+        else:
+            series = extract_time_series(raw_data, mode, interval)
+    with stage_timings.time("normalize"):
+        return normalize_time_series(series)
+
+
+def _fetch_streamed(
+    params: Dict[str, str],
+    ticker: str,
+    mode: str,
+    interval: str,
+    cache_args: Tuple[Any, ...],
+    use_cache: bool,
+) -> pd.DataFrame:
+    """
+    Parse the response chunk by chunk, teeing the raw bytes into the response cache.
+
+    Parsing overlaps the download, so the whole call is timed as the fetch stage.
+    """
+    with stage_timings.time("fetch"):
+        parser = TimeSeriesStreamParser(
+            MODE_CONFIG[mode]["response_key"](interval), mode=mode, interval=interval
+        )
+        if use_cache:
+            with response_cache.open_payload(*cache_args) as cached:
+                if cached is not None:
+                    for chunk in iter(lambda: cached.read(STREAM_CHUNK_BYTES), b""):
+                        parser.feed(chunk)
+                    return parser.finish()
+
+        logger.info("📡 Streaming %s data for %s...", mode, ticker)
+        with _SESSION.get(BASE_URL, params=params, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            with response_cache.writer(*cache_args) if use_cache else nullcontext() as sink:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                    parser.feed(chunk)
+                    if sink is not None:
+                        sink.write(chunk)
+                # Raising here (rate limit note, truncated body) discards the cache entry.
+                return parser.finish()
+
+
+def _fetch_csv(
+    params: Dict[str, str],
+    ticker: str,
+    mode: str,
+    interval: str,
+    cache_args: Tuple[Any, ...],
+    use_cache: bool,
+) -> pd.DataFrame:
+    with stage_timings.time("fetch"):
+        content = response_cache.get_bytes(*cache_args, datatype="csv") if use_cache else None
+        fetched = content is None
+        if fetched:
+            logger.info("📡 Fetching %s CSV data for %s...", mode, ticker)
+            response = _SESSION.get(BASE_URL, params={**params, "datatype": "csv"}, timeout=15)
+            response.raise_for_status()
+            content = response.content
+    with stage_timings.time("normalize"):
+        df = parse_csv_series(content, mode, interval)
+    if fetched and use_cache:
+        response_cache.put(*cache_args, content, datatype="csv")
     return df
 
 
+_FETCHERS = {"json": _fetch_json, "stream": _fetch_streamed, "csv": _fetch_csv}
+
+
 @retry(
     attempts=3,
-    delay=20,
-    exceptions=(AlphaVantageRateLimitError, requests.RequestException),
+    delay=2,
+    rate_limit_delay=20,
+    max_elapsed=120,
+    exceptions=(requests.RequestException,),
+    rate_limit_exceptions=(AlphaVantageRateLimitError,),
 )
 def fetch_stock_data(
     ticker: str,
     mode: str = "intraday",
     interval: str = "60min",
     outputsize: str = "compact",
+    use_cache: bool = True,
+    parser: str = "auto",
 ) -> pd.DataFrame:
-    """Fetch stock data from Alpha Vantage for a given symbol and mode."""
+    """
+    Fetch stock data from Alpha Vantage for a given symbol and mode.
+
+    Responses are served from the on-disk response cache until the current
+    bar closes; pass ``use_cache=False`` to always hit the API.
+
+    ``parser`` selects how the body is decoded: ``json`` loads the whole
+    payload, ``stream`` parses it incrementally into typed arrays, ``csv``
+    requests ``datatype=csv`` and reads it with the CSV reader. ``auto``
+    streams ``full`` responses and uses ``json`` for compact ones.
+    """
     if not API_KEY:
         raise EnvironmentError("Missing ALPHA_VANTAGE_API_KEY in environment variables.")
 
     mode = mode.lower()
-    if mode not in MODE_CONFIG:
-        raise ValueError(f"Unsupported mode '{mode}'. Valid options: {list(MODE_CONFIG)}")
-
-    logger.info("📡 Fetching %s data for %s...", mode, ticker)
-    params = {
-        "function": MODE_CONFIG[mode]["function"],
-        "symbol": ticker,
-        "apikey": API_KEY,
-        "outputsize": outputsize,
-    }
-    if mode == "intraday":
-        params["interval"] = interval
+    params = build_params(ticker, mode, interval, outputsize, api_key=API_KEY)
+    cache_args = (
+        params["function"],
+        ticker,
+        interval if mode == "intraday" else None,
+        outputsize,
+    )
+    fetch = _FETCHERS[_resolve_parser(parser, outputsize)]
+    df = fetch(params, ticker, mode, interval, cache_args, use_cache)
+    logger.info("✅ Retrieved %d rows (%s -> %s)", len(df), df.index.min(), df.index.max())
+    return df
 
-    response = requests.get(BASE_URL, params=params, timeout=15)
-    response.raise_for_status()
-    raw_data = response.json()
 
-    if "Note" in raw_data:
-        raise AlphaVantageRateLimitError(raw_data["Note"])
-    if "Error Message" in raw_data:
-        raise AlphaVantageError(raw_data["Error Message"])
+def fetch_many_stock_data(
+    tickers: List[str],
+    mode: str = "intraday",
+    interval: str = "60min",
+    outputsize: str = "compact",
+    max_concurrency: int = 8,
+    rate_limiter=None,
+    use_cache: bool = True,
+) -> Dict[str, Union[pd.DataFrame, Exception]]:
+    """
+    Fetch several tickers concurrently through the pooled async client.
+
+    Returns:
+        dict: Ticker -> normalized DataFrame, or the exception raised for it.
+    """
+    if not API_KEY:
+        raise EnvironmentError("Missing ALPHA_VANTAGE_API_KEY in environment variables.")
 
-    key = MODE_CONFIG[mode]["response_key"](interval)
-    if key not in raw_data:
-        raise AlphaVantageError(f"Response missing expected key '{key}': {raw_data}")
+    async def _fetch_one(client, ticker):
+        started = time.perf_counter()
+        try:
+            return await client.fetch_dataframe(ticker, mode, interval, outputsize)
+        finally:
+            stage_timings.add("fetch", time.perf_counter() - started)
+
+    async def _fetch_all():
+        async with AsyncAlphaVantageClient(
+            api_key=API_KEY,
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache if use_cache else None,
+        ) as client:
+            results = await asyncio.gather(
+                *(_fetch_one(client, ticker) for ticker in tickers),
+                return_exceptions=True,
+            )
+        return dict(zip(tickers, results))
 
-    df = _normalize_dataframe(raw_data[key])
-    logger.info("✅ Retrieved %d rows (%s -> %s)", len(df), df.index.min(), df.index.max())
-    return df
+    logger.info("📡 Fetching %s data for %d symbols concurrently...", mode, len(tickers))
+    return asyncio.run(_fetch_all())
+
+
+def choose_outputsize(
+    last_timestamp: Optional[pd.Timestamp],
+    mode: str = "intraday",
+    interval: str = "60min",
+    now: Optional[pd.Timestamp] = None,
+) -> str:
+    """
+    Pick the smallest Alpha Vantage outputsize that covers the gap since the cache.
+
+    The gap is measured in business days (daily) or wall-clock bars (intraday),
+    which over-counts bars outside market hours and so errs towards ``full``.
+    """
+    if last_timestamp is None or pd.isna(last_timestamp):
+        return "full"
+
+    now = now or pd.Timestamp.now(tz="UTC").tz_localize(None)
+    last_timestamp = pd.Timestamp(last_timestamp)
+    if last_timestamp.tzinfo is not None:
+        last_timestamp = last_timestamp.tz_convert("UTC").tz_localize(None)
+
+    if mode.lower() == "daily":
+        missing_bars = int(np.busday_count(last_timestamp.date(), now.date()))
+    else:
+        missing_bars = int((now - last_timestamp) / pd.Timedelta(interval))
+    return "compact" if missing_bars < COMPACT_BARS else "full"
 
 
-def save_dataframe(df: pd.DataFrame, output_path: str) -> Path:
-    """Persist DataFrame to CSV or Parquet."""
+def incremental_refresh(
+    ticker: str,
+    mode: str = "intraday",
+    interval: str = "60min",
+    outputsize: str = "compact",
+    use_cache: bool = True,
+    parser: str = "auto",
+) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    Fetch only the bars missing from the cached history and merge them in.
+
+    Args:
+        ticker: Symbol to refresh.
+        mode: intraday or daily.
+        interval: Intraday interval (ignored for daily).
+        outputsize: Cache label of the stored history (not the fetch size).
+        use_cache: Allow serving the fetch from the response cache.
+        parser: Response parser passed to `fetch_stock_data`.
+
+    Returns:
+        tuple: (merged history, freshly fetched bars, number of merged bars
+        that are new or differ from the cached ones).
+    """
+    existing = load_cached_dataset(
+        dataset_type="raw",
+        symbol=ticker,
+        mode=mode,
+        interval=interval if mode == "intraday" else None,
+        outputsize=outputsize,
+        version=DEFAULT_VERSION,
+    )
+    last_timestamp = None
+    if existing is not None and not existing.empty:
+        last_timestamp = existing.index.max()
+
+    fetch_size = choose_outputsize(last_timestamp, mode, interval)
+    logger.info(
+        "Incremental refresh for %s: cached through %s, fetching outputsize=%s",
+        ticker,
+        last_timestamp,
+        fetch_size,
+    )
+    fresh = fetch_stock_data(
+        ticker=ticker,
+        mode=mode,
+        interval=interval,
+        outputsize=fetch_size,
+        use_cache=use_cache,
+        parser=parser,
+    )
+    if last_timestamp is not None and not fresh.empty and fresh.index.min() > last_timestamp:
+        logger.warning(
+            "Fetched bars for %s start at %s; history after %s may have a gap.",
+            ticker,
+            fresh.index.min(),
+            last_timestamp,
+        )
+
+    merged = merge_time_series(existing, fresh)
+    added = len(merged) - (0 if existing is None else len(existing))
+    changed = _changed_rows(existing, merged)
+    logger.info(
+        "Merged %d new and %d revised bars into %d cached rows for %s",
+        added,
+        changed - added,
+        len(merged) - added,
+        ticker,
+    )
+    return merged, fresh, changed
+
+
+def _changed_rows(existing: Optional[pd.DataFrame], merged: pd.DataFrame) -> int:
+    """Rows of ``merged`` that are missing from ``existing`` or hold other values."""
+    if existing is None or existing.empty:
+        return len(merged)
+    previous = existing[~existing.index.duplicated(keep="last")].reindex(
+        index=merged.index, columns=merged.columns
+    )
+    differs = merged.ne(previous) & ~(merged.isna() & previous.isna())
+    return int(differs.any(axis=1).sum())
+
+
+def save_dataframe(df: pd.DataFrame, output_path: str, profile: Optional[str] = None) -> Path:
+    """Persist DataFrame to CSV or Parquet (with the raw storage profile by default)."""
     path = Path(output_path).expanduser().resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
     if path.suffix.lower() == ".csv":
         df.to_csv(path)
     elif path.suffix.lower() in {".parquet", ".pq"}:
-        df.to_parquet(path)
+        write_parquet(df, path, profile, dataset_type="raw")
     else:
         raise ValueError(f"Unsupported file format for {path}")
     logger.info("Saved %d rows to %s", len(df), path)
@@ -135,7 +360,11 @@ def save_dataframe(df: pd.DataFrame, output_path: str) -> Path:
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fetch stock data from Alpha Vantage.")
-    parser.add_argument("--symbol", required=True, help="Ticker symbol to fetch (e.g., AAPL).")
+    parser.add_argument(
+        "--symbol",
+        required=True,
+        help="Ticker symbol to fetch (e.g., AAPL). Comma-separate several to fetch them concurrently.",
+    )
     parser.add_argument(
         "--mode",
         choices=list(MODE_CONFIG.keys()),
@@ -162,6 +391,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Upload the fetched data to Supabase.",
     )
+    parser.add_argument(
+        "--full-upload",
+        action="store_true",
+        help="Upload every row, including ones already uploaded unchanged.",
+    )
     parser.add_argument(
         "--no-cache",
         action="store_true",
@@ -180,45 +414,201 @@ def parse_args() -> argparse.Namespace:
         "--cache-version",
         help="Custom version label when caching the dataset.",
     )
-    return parser.parse_args()
-
+    parser.add_argument(
+        "--storage-profile",
+        choices=list(STORAGE_PROFILES),
+        help="Parquet storage profile for the cache and --output "
+        "(default: ML_RAW_STORAGE_PROFILE).",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Bypass the on-disk Alpha Vantage response cache.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fetch only bars newer than the cached history and merge them into it.",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=list(PARSERS),
+        default="auto",
+        help="Response parser: streaming typed-array parse for full history by default.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum concurrent requests when fetching several symbols.",
+    )
+    args = parser.parse_args()
+    args.symbols = [s.strip() for s in args.symbol.split(",") if s.strip()]
+    if len(args.symbols) > 1 and args.output:
+        parser.error("--output is only supported when fetching a single symbol.")
+    return args
 
-def main() -> None:
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
-    args = parse_args()
-    validate_required_settings()
-    ensure_data_dirs()
 
-    cache_kwargs = {
+def _cache_kwargs(args: argparse.Namespace, symbol: str) -> Dict[str, Any]:
+    return {
         "dataset_type": "raw",
-        "symbol": args.symbol,
+        "symbol": symbol,
         "mode": args.mode,
         "interval": args.interval if args.mode == "intraday" else None,
         "outputsize": args.outputsize,
     }
 
-    df = None
-    if not args.no_cache and not args.force_refresh:
-        cached = load_cached_dataset(
-            version=args.load_version or DEFAULT_VERSION,
-            **cache_kwargs,
+
+def _load_from_cache(args: argparse.Namespace, symbol: str) -> Optional[pd.DataFrame]:
+    if args.no_cache or args.force_refresh:
+        return None
+    cached = load_cached_dataset(
+        version=args.load_version or DEFAULT_VERSION,
+        **_cache_kwargs(args, symbol),
+    )
+    if cached is not None:
+        logger.info(
+            "Loaded %d cached rows for %s (%s).",
+            len(cached),
+            symbol,
+            args.load_version or DEFAULT_VERSION,
         )
-        if cached is not None:
-            logger.info(
-                "Loaded %d cached rows for %s (%s).",
-                len(cached),
-                args.symbol,
-                args.load_version or DEFAULT_VERSION,
+    return cached
+
+
+def _handle_fetched(args: argparse.Namespace, symbol: str, df: pd.DataFrame) -> bool:
+    """Cache freshly fetched data. Returns False when there is nothing to keep."""
+    if df.empty:
+        logger.warning("No data returned for %s", symbol)
+        return False
+    if not args.no_cache:
+        with stage_timings.time("cache"):
+            cache_path = cache_dataset(
+                df,
+                version=args.cache_version,
+                profile=args.storage_profile,
+                **_cache_kwargs(args, symbol),
             )
-            df = cached
+        logger.info("Cached dataset at %s", cache_path)
+    return True
+
 
-    if df is None:
+def _finish(
+    args: argparse.Namespace,
+    symbol: str,
+    df: pd.DataFrame,
+    upload_df: Optional[pd.DataFrame] = None,
+) -> None:
+    if args.output:
+        save_dataframe(df, args.output, args.storage_profile)
+    if args.upload:
+        with stage_timings.time("upload"):
+            upload_to_supabase(
+                df if upload_df is None else upload_df,
+                symbol,
+                mode=args.mode,
+                interval=args.interval,
+                dedupe=not args.full_upload,
+            )
+
+    logger.info("Preview (%s):\n%s\n%s", symbol, df.head(), df.tail())
+
+
+def _log_run_stats() -> None:
+    stats = response_cache.stats()
+    if stats["hits"] or stats["misses"]:
+        logger.info(
+            "Response cache: %d hits, %d misses.",
+            stats["hits"],
+            stats["misses"],
+        )
+    retries = retry_stats.snapshot()
+    if retries["retries"]:
+        logger.info(
+            "Retries: %d (%d rate-limited, %d transient), %.1fs spent backing off.",
+            retries["retries"],
+            retries["rate_limited"],
+            retries["transient"],
+            retries["sleep_seconds"],
+        )
+    for stage, timing in stage_timings.snapshot().items():
+        logger.info(
+            "Stage %s: %d calls, mean %.3fs, total %.1fs",
+            stage,
+            timing["count"],
+            timing["mean_seconds"],
+            timing["total_seconds"],
+        )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    args = parse_args()
+    validate_required_settings()
+    ensure_data_dirs()
+
+    if args.incremental:
+        for symbol in args.symbols:
+            try:
+                merged, fresh, changed = incremental_refresh(
+                    symbol,
+                    mode=args.mode,
+                    interval=args.interval,
+                    outputsize=args.outputsize,
+                    use_cache=not args.no_http_cache,
+                    parser=args.parser,
+                )
+            except AlphaVantageError as alpha_err:
+                logger.error("Alpha Vantage error for %s: %s", symbol, alpha_err)
+                continue
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("Unexpected error refreshing %s: %s", symbol, exc)
+                continue
+            if merged.empty:
+                logger.warning("No data returned for %s", symbol)
+                continue
+            if changed:
+                _handle_fetched(args, symbol, merged)
+            else:
+                # Saving would only write a copy of latest and move the pointer onto it.
+                logger.info("No new or revised bars for %s; keeping the cached version.", symbol)
+            _finish(args, symbol, merged, upload_df=fresh)
+        _log_run_stats()
+        return
+
+    frames: Dict[str, pd.DataFrame] = {}
+    to_fetch = []
+    for symbol in args.symbols:
+        cached = _load_from_cache(args, symbol)
+        if cached is not None:
+            frames[symbol] = cached
+        else:
+            to_fetch.append(symbol)
+
+    if len(to_fetch) > 1:
+        results = fetch_many_stock_data(
+            to_fetch,
+            mode=args.mode,
+            interval=args.interval,
+            outputsize=args.outputsize,
+            max_concurrency=args.concurrency,
+            use_cache=not args.no_http_cache,
+        )
+        for symbol, result in results.items():
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch %s: %s", symbol, result)
+            elif _handle_fetched(args, symbol, result):
+                frames[symbol] = result
+    elif to_fetch:
+        symbol = to_fetch[0]
         try:
             df = fetch_stock_data(
-                ticker=args.symbol,
+                ticker=symbol,
                 mode=args.mode,
                 interval=args.interval,
                 outputsize=args.outputsize,
+                use_cache=not args.no_http_cache,
+                parser=args.parser,
             )
         except AlphaVantageRateLimitError as rate_err:
             logger.error("Rate limit hit: %s", rate_err)
@@ -229,24 +619,14 @@ def main() -> None:
         except Exception as exc:  # pylint: disable=broad-except
             logger.error("Unexpected error fetching data: %s", exc)
             return
-        if df.empty:
-            logger.warning("No data returned for %s", args.symbol)
+        if not _handle_fetched(args, symbol, df):
             return
-        if not args.no_cache:
-            cache_version = args.cache_version or datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            cache_path = cache_dataset(
-                df,
-                version=cache_version,
-                **cache_kwargs,
-            )
-            logger.info("Cached dataset at %s", cache_path)
-
-    if args.output:
-        save_dataframe(df, args.output)
-    if args.upload:
-        upload_to_supabase(df, args.symbol)
+        frames[symbol] = df
 
-    logger.info("Preview:\n%s\n%s", df.head(), df.tail())
+    for symbol in args.symbols:
+        if symbol in frames:
+            _finish(args, symbol, frames[symbol])
+    _log_run_stats()
 
 
 if __name__ == "__main__":
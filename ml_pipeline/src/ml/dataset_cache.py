@@ -0,0 +1,182 @@
+"""
+In-process LRU cache for datasets returned by `dataset_manager.load_dataset`.
+
+Training sweeps and multi-model prediction runs load the same dataset many
+times in one process. Entries are keyed by the dataset identity plus the
+requested projection and time range, and each one remembers a validation
+token (local mtime/size or S3 ETag) taken before it was read, so an entry is
+only served while the stored dataset is unchanged.
+
+The cache is bounded by the in-memory size of the cached frames
+(``DataFrame.memory_usage(deep=True)``) and evicts least recently used
+entries first. Callers never receive the cached frame itself: with pandas
+Copy-on-Write enabled they get a lazy shallow copy, otherwise a deep copy,
+so mutating a loaded dataset cannot corrupt later hits.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .config import DATASET_CACHE_ENABLED, DATASET_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[Hashable, ...]
+
+
+def _share(df: pd.DataFrame) -> pd.DataFrame:
+    """Hand out a frame that can be mutated without touching the cached one."""
+    if pd.options.mode.copy_on_write is True:
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memory used by ``df`` including its index and object payloads."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class DatasetCache:
+    """
+    Byte-bounded LRU cache of loaded DataFrames with token validation.
+
+    Args:
+        max_bytes: Budget for the summed memory usage of cached frames.
+        enabled: When False every lookup misses and nothing is stored.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DATASET_CACHE_MAX_BYTES,
+        enabled: bool = DATASET_CACHE_ENABLED,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        dataset_type: str,
+        symbol: str,
+        mode: Optional[str],
+        interval: Optional[str],
+        outputsize: Optional[str],
+        feature_set: Optional[str],
+        version: str,
+        columns: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> CacheKey:
+        """Cache key for one `load_dataset` call."""
+        return (
+            dataset_type,
+            symbol.upper(),
+            mode or "default",
+            interval or "",
+            outputsize or "",
+            feature_set or "",
+            version,
+            tuple(columns) if columns is not None else None,
+            str(pd.Timestamp(start)) if start is not None else None,
+            str(pd.Timestamp(end)) if end is not None else None,
+        )
+
+    def get(self, key: CacheKey, token: Any) -> Optional[pd.DataFrame]:
+        """
+        Return a private copy of the cached frame, or None on a miss.
+
+        Entries whose token differs from ``token`` are stale: they are dropped
+        and reported as a miss. A None token (dataset not found) always misses.
+        """
+        with self._lock:
+            entry = self._entries.get(key) if self.enabled and token is not None else None
+            if entry is not None and entry[0] != token:
+                self._drop(key)
+                self.stale += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            df = entry[1]
+        return _share(df)
+
+    def put(self, key: CacheKey, token: Any, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cache ``df`` under ``key`` and return the copy the caller should use.
+
+        Frames larger than the whole budget are returned without being cached.
+        """
+        if not self.enabled or token is None:
+            return df
+        size = frame_nbytes(df)
+        if size > self.max_bytes:
+            logger.debug("Dataset %s (%d bytes) exceeds the cache budget.", key[:7], size)
+            return df
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (token, df, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return _share(df)
+
+    def invalidate(
+        self,
+        dataset_type: str,
+        symbol: str,
+        mode: Optional[str] = None,
+        interval: Optional[str] = None,
+        outputsize: Optional[str] = None,
+        feature_set: Optional[str] = None,
+    ) -> int:
+        """Drop every cached version/projection of one dataset. Returns the count."""
+        dataset = self.make_key(dataset_type, symbol, mode, interval, outputsize, feature_set, "")
+        with self._lock:
+            keys = [key for key in self._entries if key[:6] == dataset[:6]]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _drop(self, key: CacheKey) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current occupancy for reporting."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Process-wide cache used by `dataset_manager.load_dataset`.
+dataset_cache = DatasetCache()
@@ -3,21 +3,62 @@ Utilities for managing local dataset storage and caching.
 
 Provides helpers for saving/loading raw and feature datasets in a consistent
 directory structure, as well as simple splitting/versioning utilities.
+
+A ``_versions.sqlite`` index per dataset directory (see `version_index`)
+records each version's rows, time range, schema hash, size and location, so
+listing, existence and coverage lookups never glob the directory or probe S3.
+
+``latest`` is not a copy of the data: ``latest.ptr`` (mirrored to S3) names
+the version it resolves to and is replaced atomically on every save.
+
+Each version is stored either as a single ``<version>.parquet`` file or, with
+partitioning enabled, as a ``<version>/`` directory of Hive-style
+``year=YYYY/month=MM/data.parquet`` partitions described by ``_partitions.json``.
+Partitioned saves only re-encode partitions whose content changed and loads
+only read the partitions overlapping the requested time range.
+
+Dataset types configured for the ``feather`` format (ML_RAW_DATASET_FORMAT /
+ML_FEATURES_DATASET_FORMAT) are stored as uncompressed ``<version>.feather``
+Arrow IPC files instead, which loads memory-map (see `read_feather_subset`).
+
+`load_panel` loads one dataset for many symbols on a thread pool and returns
+a single MultiIndex or long-format frame.
+
+Datasets of a named feature set (``feature_set``, e.g. one per
+``config/indicators_set*.yaml``) live under ``<type dir>/sets/<name>/`` with
+the usual ``<SYMBOL>/<mode>/...`` layout below it; without a name the
+dataset is the type's default one.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
-from datetime import datetime
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 
 from .config import (
+    DATASET_LOAD_MAX_WORKERS,
+    DATASET_LOCK_TIMEOUT,
+    DATASET_PARTITIONING,
     FEATURES_DATA_DIR,
+    FEATURES_DATASET_FORMAT,
     RAW_DATA_DIR,
+    RAW_DATASET_FORMAT,
     S3_BUCKET,
     S3_PREFIX,
     S3_REGION,
@@ -25,6 +66,11 @@ from .config import (
     USE_S3,
 )
 
+from .dataset_cache import dataset_cache
+from .file_lock import file_lock
+from .storage_profiles import get_profile, restore_dtypes, write_parquet
+from .version_index import INDEX_FILE, VersionIndex, schema_signature
+
 try:
     import boto3  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - optional dependency
@@ -37,9 +83,29 @@ DATASET_DIRS = {
     "features": FEATURES_DATA_DIR,
 }
 
+DATASET_FORMATS = {
+    "raw": RAW_DATASET_FORMAT,
+    "features": FEATURES_DATASET_FORMAT,
+}
+FORMAT_SUFFIXES = {"parquet": ".parquet", "feather": ".feather"}
+
 DEFAULT_VERSION = "latest"
 TIMESTAMP_FMT = "%Y%m%d%H%M%S"
 
+PARTITION_SCHEMES = ("none", "year", "month")
+PARTITION_MANIFEST = "_partitions.json"
+PARTITION_FILE = "data.parquet"
+# Small JSON file naming the version `latest` resolves to (also used for models).
+LATEST_POINTER = "latest.ptr"
+# Per-directory advisory lock file serializing writers across processes.
+LOCK_FILE = ".lock"
+# Time columns of frames written without their index (e.g. ``reset_index()`` exports).
+TIME_COLUMNS = ("timestamp", "date")
+# Directory (under a dataset type's root) holding the named feature sets.
+FEATURE_SETS_DIR = "sets"
+
+TimeBound = Optional[Union[str, datetime, pd.Timestamp]]
+
 
 def ensure_data_dirs() -> None:
     """Create dataset directories if they do not exist."""
@@ -47,6 +113,16 @@ def ensure_data_dirs() -> None:
         path.mkdir(parents=True, exist_ok=True)
 
 
+def dataset_format(dataset_type: str, fmt: Optional[str] = None) -> str:
+    """Storage format for ``dataset_type`` (``fmt`` overrides the configured one)."""
+    fmt = (fmt or DATASET_FORMATS.get(dataset_type) or "parquet").lower()
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(
+            f"Unsupported dataset format '{fmt}'. Choose from {', '.join(FORMAT_SUFFIXES)}."
+        )
+    return fmt
+
+
 def _sanitize_part(part: Optional[str]) -> Optional[str]:
     if not part:
         return None
@@ -59,11 +135,16 @@ def _dataset_dir(
     mode: str = "default",
     interval: Optional[str] = None,
     outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
 ) -> Path:
     if dataset_type not in DATASET_DIRS:
         raise ValueError(f"Unsupported dataset type '{dataset_type}'.")
 
-    path = DATASET_DIRS[dataset_type] / symbol.upper() / _sanitize_part(mode or "default")
+    path = DATASET_DIRS[dataset_type]
+    set_part = _sanitize_part(feature_set)
+    if set_part:
+        path = path / FEATURE_SETS_DIR / set_part
+    path = path / symbol.upper() / _sanitize_part(mode or "default")
     interval_part = _sanitize_part(interval)
     output_part = _sanitize_part(outputsize)
 
@@ -81,14 +162,31 @@ def _dataset_key(
     mode: str = "default",
     interval: Optional[str] = None,
     outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
     version: str = DEFAULT_VERSION,
+    suffix: str = ".parquet",
 ) -> str:
     """
     Build the S3 object key matching the local dataset layout.
     """
+    prefix = _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    return f"{prefix}/{version}{suffix}"
+
+
+def _dataset_prefix(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
+) -> str:
+    """S3 key prefix of the dataset directory (without the version)."""
+    set_part = _sanitize_part(feature_set)
     parts = [
         _sanitize_part(S3_PREFIX),
         dataset_type,
+        *((FEATURE_SETS_DIR, set_part) if set_part else ()),
         symbol.upper(),
         _sanitize_part(mode or "default"),
     ]
@@ -99,7 +197,7 @@ def _dataset_key(
     if output_part:
         parts.append(output_part)
 
-    return "/".join(filter(None, parts)) + f"/{version}.parquet"
+    return "/".join(filter(None, parts))
 
 
 def get_dataset_path(
@@ -110,28 +208,76 @@ def get_dataset_path(
     outputsize: Optional[str] = None,
     version: str = DEFAULT_VERSION,
     create_dirs: bool = False,
+    fmt: Optional[str] = None,
+    feature_set: Optional[str] = None,
 ) -> Path:
     """
     Compute the file path for the requested dataset parameters.
+
+    The suffix follows ``fmt`` (default: the format configured for the type).
     """
-    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize)
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
     if create_dirs:
         base_dir.mkdir(parents=True, exist_ok=True)
-    return base_dir / f"{version}.parquet"
+    return base_dir / f"{version}{FORMAT_SUFFIXES[dataset_format(dataset_type, fmt)]}"
+
+
+def _version_file(base_dir: Path, version: str) -> Optional[Path]:
+    """The single-file copy of ``version`` in ``base_dir``, whatever its format."""
+    for suffix in FORMAT_SUFFIXES.values():
+        path = base_dir / f"{version}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def _format_suffixes(dataset_type: str) -> List[str]:
+    """File suffixes to probe, the configured format first."""
+    preferred = FORMAT_SUFFIXES[dataset_format(dataset_type)]
+    return [preferred, *(s for s in FORMAT_SUFFIXES.values() if s != preferred)]
+
+
+def get_partitioned_dataset_dir(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    version: str = DEFAULT_VERSION,
+    feature_set: Optional[str] = None,
+) -> Path:
+    """
+    Compute the directory holding the partitions of a partitioned dataset version.
+    """
+    return _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set) / version
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
 
 
 def _get_s3_client():
+    """
+    Shared S3 client, created on first use.
+
+    Clients are thread-safe once built, but creating them through the default
+    boto3 session is not, so concurrent loads (see `load_panel`) share one.
+    """
+    global _s3_client  # pylint: disable=global-statement
     if not USE_S3:
         raise RuntimeError("S3 is not configured. Set ML_S3_BUCKET to enable.")
     if boto3 is None:
         raise ImportError(
             "boto3 is required for S3 dataset operations. Install boto3 to continue."
         )
-    return boto3.client(
-        "s3",
-        region_name=S3_REGION or None,
-        endpoint_url=S3_ENDPOINT or None,
-    )
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client(
+                "s3",
+                region_name=S3_REGION or None,
+                endpoint_url=S3_ENDPOINT or None,
+            )
+        return _s3_client
 
 
 def _download_dataset_from_s3(
@@ -140,6 +286,7 @@ def _download_dataset_from_s3(
     mode: str,
     interval: Optional[str],
     outputsize: Optional[str],
+    feature_set: Optional[str],
     version: str,
     local_path: Path,
 ) -> Optional[pd.DataFrame]:
@@ -147,32 +294,759 @@ def _download_dataset_from_s3(
         return None
 
     client = _get_s3_client()
-    key = _dataset_key(dataset_type, symbol, mode, interval, outputsize, version)
+    key = _dataset_key(dataset_type, symbol, mode, interval, outputsize, feature_set, version)
     try:
         obj = client.get_object(Bucket=S3_BUCKET, Key=key)
     except Exception as exc:  # pragma: no cover - passthrough logging
         logger.debug("S3 get_object failed for %s/%s: %s", S3_BUCKET, key, exc)
         return None
 
-    df = pd.read_parquet(BytesIO(obj["Body"].read()))
+    body = obj["Body"].read()
+    df = read_parquet_subset(BytesIO(body))
     try:
+        # Keep the stored bytes so the local copy has the same storage profile.
         local_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(local_path)
+        _write_atomic(local_path, lambda tmp: tmp.write_bytes(body))
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to persist S3 dataset locally at %s: %s", local_path, exc)
     logger.info("Loaded dataset from s3://%s/%s", S3_BUCKET, key)
     return df
 
 
-def _upload_dataset_to_s3(local_path: Path, key: str) -> None:
+def _upload_dataset_to_s3(local_path: Path, key: str) -> bool:
+    """Upload one file. Returns True when it reached the bucket."""
     if not USE_S3:
-        return
+        return False
     client = _get_s3_client()
     try:
         client.upload_file(str(local_path), S3_BUCKET, key)
         logger.info("Uploaded dataset to s3://%s/%s", S3_BUCKET, key)
+        return True
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to upload %s to s3://%s/%s: %s", local_path, S3_BUCKET, key, exc)
+        return False
+
+
+def _copy_s3_object(source_key: str, key: str) -> None:
+    """Server-side copy, so unchanged partitions are never re-uploaded."""
+    if not USE_S3:
+        return
+    client = _get_s3_client()
+    try:
+        client.copy_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            CopySource={"Bucket": S3_BUCKET, "Key": source_key},
+        )
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Failed to copy s3://%s/%s to %s: %s", S3_BUCKET, source_key, key, exc)
+
+
+def _delete_s3_object(key: str) -> None:
+    if not USE_S3:
+        return
+    client = _get_s3_client()
+    try:
+        client.delete_object(Bucket=S3_BUCKET, Key=key)
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Failed to delete s3://%s/%s: %s", S3_BUCKET, key, exc)
+
+
+def _download_s3_file(key: str, local_path: Path) -> bool:
+    """Download one object to ``local_path``. Returns False when it is unavailable."""
+    if not USE_S3:
+        return False
+    client = _get_s3_client()
+    try:
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        client.download_file(S3_BUCKET, key, str(local_path))
+    except Exception as exc:  # pragma: no cover - passthrough logging
+        logger.debug("S3 download failed for %s/%s: %s", S3_BUCKET, key, exc)
+        return False
+    return True
+
+
+def _partition_codes(index: pd.DatetimeIndex, scheme: str) -> np.ndarray:
+    codes = index.year.to_numpy(dtype=np.int64)
+    if scheme == "month":
+        codes = codes * 100 + index.month.to_numpy(dtype=np.int64)
+    return codes
+
+
+def _partition_label(code: int, scheme: str) -> str:
+    if scheme == "year":
+        return f"year={code:04d}"
+    return f"year={code // 100:04d}/month={code % 100:02d}"
+
+
+def _partition_span(label: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Half-open [start, end) period covered by a partition, in index-local time."""
+    fields = dict(part.split("=", 1) for part in label.split("/"))
+    start = pd.Timestamp(year=int(fields["year"]), month=int(fields.get("month", 1)), day=1)
+    step = pd.DateOffset(months=1) if "month" in fields else pd.DateOffset(years=1)
+    return start, start + step
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a partition (values, index, column names and dtypes)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(schema_signature(df).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _read_partition_manifest(directory: Optional[Path]) -> Optional[Dict[str, Any]]:
+    if directory is None:
+        return None
+    path = directory / PARTITION_MANIFEST
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable partition manifest %s: %s", path, exc)
+        return None
+
+
+def _temp_path(path: Path) -> Path:
+    """Hidden sibling of ``path`` unique to this process and thread."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+@contextmanager
+def _dir_lock(base_dir: Path, shared: bool = False) -> Iterator[None]:
+    """
+    Advisory lock on one dataset directory (see `file_lock`).
+
+    Writers hold it exclusively for a whole save/delete so versions, the
+    index and the latest pointer change together; local reads share it.
+    Readers of a directory that does not exist yet take no lock.
+    """
+    if shared and not base_dir.exists():
+        yield
+        return
+    base_dir.mkdir(parents=True, exist_ok=True)
+    with file_lock(base_dir / LOCK_FILE, shared, DATASET_LOCK_TIMEOUT or None):
+        yield
+
+
+@contextmanager
+def dataset_lock(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
+) -> Iterator[None]:
+    """
+    Hold a dataset's writer lock across several manager calls.
+
+    `save_dataset` and `delete_version` already lock for themselves; use this
+    for read-modify-write sequences (e.g. compaction) that must not
+    interleave with other writers. Re-entrant within a thread.
+    """
+    with _dir_lock(_dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)):
+        yield
+
+
+def _version_taken(base_dir: Path, index: VersionIndex, version: str) -> bool:
+    return index.get(version) is not None or _has_version(base_dir, version)
+
+
+def _unused_version(
+    base_dir: Path, index: VersionIndex, stamp: Optional[datetime] = None
+) -> str:
+    """
+    Timestamp version for a new save (``stamp``, default now), one second later while it is taken.
+
+    Called under the directory lock, so writers saving in the same second
+    get distinct versions instead of overwriting each other.
+    """
+    stamp = stamp or datetime.utcnow()
+    while True:
+        version = stamp.strftime(TIMESTAMP_FMT)
+        if not _version_taken(base_dir, index, version):
+            return version
+        stamp += timedelta(seconds=1)
+
+
+def _parse_timestamp_version(version: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(version, TIMESTAMP_FMT)
+    except ValueError:
+        return None
+
+
+def _write_atomic(path: Path, write) -> None:
+    """
+    Write through a temp file and rename it into place.
+
+    Readers see either the previous file or the complete new one, never a
+    partial write, and concurrent writers never share a temp file. Renaming
+    gives the file a new inode, so snapshots hard-linked to (and readers
+    memory-mapping) the old file keep their content.
+    """
+    tmp_path = _temp_path(path)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    tmp_path = _temp_path(target)
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def _same_partition(manifest: Optional[Dict[str, Any]], label: str, fingerprint: str) -> bool:
+    entry = (manifest or {}).get("partitions", {}).get(label)
+    return bool(entry) and entry.get("fingerprint") == fingerprint
+
+
+def _remove_partition(directory: Path, label: str) -> None:
+    path = directory / label / PARTITION_FILE
+    path.unlink(missing_ok=True)
+    for parent in path.parents:
+        if parent == directory:
+            break
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+
+
+def _save_partitioned(
+    df: pd.DataFrame,
+    directory: Path,
+    scheme: str,
+    s3_prefix: Optional[str] = None,
+    reference: Optional[Path] = None,
+    reference_s3_prefix: Optional[str] = None,
+    profile: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Write ``df`` as Hive-style partitions under ``directory``.
+
+    Partitions whose fingerprint matches what ``directory`` already holds are
+    left untouched; ones matching the ``reference`` snapshot are hard-linked
+    locally and copied server-side in S3. Only the remaining partitions are
+    encoded (with the storage ``profile``) and uploaded. Partitions that no
+    longer have rows are removed. Partitions stored under a different
+    partitioning or profile are never reused.
+
+    Returns:
+        int: Number of partitions that had to be written.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Partitioned datasets require a DatetimeIndex.")
+
+    profile = profile or get_profile()
+    layout = (scheme, profile["name"])
+    directory.mkdir(parents=True, exist_ok=True)
+    current = _read_partition_manifest(directory) or {}
+    if (current.get("scheme"), current.get("profile", "default")) != layout:
+        reusable: Dict[str, Any] = {}
+    else:
+        reusable = current
+    reference_manifest = _read_partition_manifest(reference) or {}
+    if (reference_manifest.get("scheme"), reference_manifest.get("profile", "default")) != layout:
+        reference_manifest = None
+
+    partitions: Dict[str, Dict[str, Any]] = {}
+    written = 0
+    for code, part in df.groupby(_partition_codes(df.index, scheme), sort=True):
+        label = _partition_label(int(code), scheme)
+        fingerprint = _frame_fingerprint(part)
+        partitions[label] = {"fingerprint": fingerprint, "rows": len(part)}
+        target = directory / label / PARTITION_FILE
+        key = f"{s3_prefix}/{label}/{PARTITION_FILE}" if s3_prefix else None
+        if _same_partition(reusable, label, fingerprint) and target.exists():
+            continue
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source = reference / label / PARTITION_FILE if reference is not None else None
+        if _same_partition(reference_manifest, label, fingerprint) and source.exists():
+            _link_or_copy(source, target)
+            if key and reference_s3_prefix:
+                _copy_s3_object(f"{reference_s3_prefix}/{label}/{PARTITION_FILE}", key)
+            continue
+
+        _write_atomic(
+            target,
+            lambda tmp, frame=part: write_parquet(frame, tmp, profile),
+        )
+        written += 1
+        if key:
+            _upload_dataset_to_s3(target, key)
+
+    for label in set(current.get("partitions", {})) - set(partitions):
+        _remove_partition(directory, label)
+        if s3_prefix:
+            _delete_s3_object(f"{s3_prefix}/{label}/{PARTITION_FILE}")
+
+    manifest = {
+        "scheme": scheme,
+        "profile": profile["name"],
+        "tz": str(df.index.tz) if df.index.tz is not None else None,
+        "rows": len(df),
+        "partitions": partitions,
+    }
+    manifest_path = directory / PARTITION_MANIFEST
+    _write_atomic(
+        manifest_path,
+        lambda tmp: tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8"),
+    )
+    if s3_prefix:
+        _upload_dataset_to_s3(manifest_path, f"{s3_prefix}/{PARTITION_MANIFEST}")
+
+    logger.info(
+        "Wrote %d of %d partitions to %s", written, len(partitions), directory
+    )
+    return written
+
+
+def _select_partitions(
+    manifest: Dict[str, Any],
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> List[str]:
+    """Labels of the partitions that can hold rows within [start, end]."""
+    tz = manifest.get("tz")
+    lower = _local_bound(start, tz) if start is not None else None
+    upper = _local_bound(end, tz) if end is not None else None
+    selected = []
+    for label in sorted(manifest.get("partitions", {})):
+        span_start, span_end = _partition_span(label)
+        if lower is not None and span_end <= lower:
+            continue
+        if upper is not None and span_start > upper:
+            continue
+        selected.append(label)
+    return selected
+
+
+def _load_partitioned(
+    directory: Path,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    s3_prefix: Optional[str] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Load the partitions of ``directory`` overlapping [start, end].
+
+    Missing partitions (and the manifest) are fetched from S3 one by one when
+    ``s3_prefix`` is given, so only the needed part of the history is downloaded.
+    """
+    manifest = _read_partition_manifest(directory)
+    if manifest is None and s3_prefix:
+        if _download_s3_file(f"{s3_prefix}/{PARTITION_MANIFEST}", directory / PARTITION_MANIFEST):
+            manifest = _read_partition_manifest(directory)
+    if manifest is None:
+        return None
+
+    labels = _select_partitions(manifest, start, end)
+    if not labels and manifest.get("partitions"):
+        # Nothing overlaps: read one partition for the schema and return no rows.
+        labels, start, end = [min(manifest["partitions"])], None, None
+        empty = True
+    else:
+        empty = False
+
+    frames = []
+    for label in labels:
+        path = directory / label / PARTITION_FILE
+        if not path.exists():
+            key = f"{s3_prefix}/{label}/{PARTITION_FILE}" if s3_prefix else None
+            if key is None or not _download_s3_file(key, path):
+                raise FileNotFoundError(f"Partition {label} of {directory} is missing.")
+            logger.info("Loaded partition from s3://%s/%s", S3_BUCKET, key)
+        frames.append(read_parquet_subset(path, columns, start, end))
+
+    if not frames:
+        return pd.DataFrame()
+    df = frames[0] if len(frames) == 1 else pd.concat(frames)
+    return df.iloc[0:0] if empty else df
+
+
+def _coerce_bound(value: TimeBound, tz: Any) -> pd.Timestamp:
+    """Coerce a start/end bound to the timezone convention of the stored index."""
+    bound = pd.Timestamp(value)
+    if tz is not None and bound.tzinfo is None:
+        return bound.tz_localize(tz)
+    if tz is None and bound.tzinfo is not None:
+        return bound.tz_convert("UTC").tz_localize(None)
+    return bound
+
+
+def _local_bound(value: TimeBound, tz: Any) -> pd.Timestamp:
+    """Bound expressed as naive wall-clock time of an index in ``tz``."""
+    bound = _coerce_bound(value, tz)
+    if bound.tzinfo is not None:
+        bound = bound.tz_convert(tz).tz_localize(None)
+    return bound
+
+
+def subset_frame(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> pd.DataFrame:
+    """
+    In-memory equivalent of the Parquet pushdown for frames already loaded.
+
+    Keeps ``columns`` that exist (all when None) and index values within the
+    inclusive ``start``/``end`` range when the index is a DatetimeIndex.
+    """
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    if (start is not None or end is not None) and isinstance(df.index, pd.DatetimeIndex):
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= df.index >= _coerce_bound(start, df.index.tz)
+        if end is not None:
+            mask &= df.index <= _coerce_bound(end, df.index.tz)
+        df = df.loc[mask]
+    return df
+
+
+def _projection(
+    names: Sequence[str], columns: Sequence[str], index_columns: Sequence[str]
+) -> List[str]:
+    """Stored columns to read for ``columns``: the requested ones plus the time index."""
+    wanted = set(columns).union(index_columns or TIME_COLUMNS)
+    return [name for name in names if name in wanted]
+
+
+def read_parquet_subset(
+    source: Any,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> pd.DataFrame:
+    """
+    Read a pandas-written Parquet file, pushing projection and time filters down.
+
+    Only the requested columns (plus the index, or the ``timestamp``/``date``
+    column of files written without one) are decoded, and ``start``/``end``
+    (inclusive) become filters on the index column, so row groups whose min/max
+    statistics fall outside the range are skipped without being read. Columns
+    a storage profile downcast are returned in their original dtypes.
+
+    Args:
+        source: Path or file-like object.
+        columns: Columns to load (unknown names are ignored); None loads all.
+        start: Earliest index value to keep.
+        end: Latest index value to keep.
+    """
+    if columns is None and start is None and end is None:
+        table = pq.read_table(source)
+        return restore_dtypes(table.to_pandas(), table.schema)
+
+    schema = pq.read_schema(source)
+    pandas_meta = schema.pandas_metadata or {}
+    index_columns = [
+        name for name in pandas_meta.get("index_columns", []) if isinstance(name, str)
+    ]
+
+    read_columns = None
+    if columns is not None:
+        read_columns = _projection(schema.names, columns, index_columns)
+
+    filters = []
+    time_column = index_columns[0] if index_columns else None
+    if time_column is not None and pa.types.is_timestamp(schema.field(time_column).type):
+        tz = schema.field(time_column).type.tz
+        if start is not None:
+            filters.append((time_column, ">=", _coerce_bound(start, tz)))
+        if end is not None:
+            filters.append((time_column, "<=", _coerce_bound(end, tz)))
+        start = end = None  # handled by the reader
+
+    table = pq.read_table(source, columns=read_columns, filters=filters or None)
+    df = restore_dtypes(table.to_pandas(), schema)
+    # Fall back to an in-memory slice when the index is not a stored timestamp column.
+    return subset_frame(df, None, start, end)
+
+
+def _datetime64_bound(value: TimeBound, tz: Any) -> np.datetime64:
+    """Bound as the naive UTC datetime64 Arrow stores timestamps as."""
+    bound = _coerce_bound(value, tz)
+    if bound.tzinfo is not None:
+        bound = bound.tz_convert("UTC").tz_localize(None)
+    return np.datetime64(bound.value, "ns")
+
+
+def read_feather_subset(
+    source: Any,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> pd.DataFrame:
+    """
+    Memory-map an uncompressed Arrow IPC (Feather v2) file and slice it.
+
+    Nothing is decoded up front: the selected columns are views of the mapped
+    file, so only the pages actually touched are read and processes loading
+    the same file share them through the OS page cache. Those columns are
+    read-only; adding or replacing columns works as usual, but copy the frame
+    before writing values in place.
+
+    On a sorted time index ``start``/``end`` (inclusive) become a zero-copy
+    row slice found by binary search; otherwise the rows are filtered.
+
+    Args:
+        source: Path of the ``.feather`` file.
+        columns: Columns to load besides the index, as for `read_parquet_subset`
+            (unknown names are ignored); None loads all.
+        start: Earliest index value to keep.
+        end: Latest index value to keep.
+    """
+    table = feather.read_table(str(source), memory_map=True)
+    pandas_meta = table.schema.pandas_metadata or {}
+    index_columns = [
+        name for name in pandas_meta.get("index_columns", []) if isinstance(name, str)
+    ]
+    if columns is not None:
+        table = table.select(_projection(table.column_names, columns, index_columns))
+
+    time_column = index_columns[0] if index_columns else None
+    if (
+        (start is not None or end is not None)
+        and time_column is not None
+        and pa.types.is_timestamp(table.schema.field(time_column).type)
+    ):
+        tz = table.schema.field(time_column).type.tz
+        times = table.column(time_column).to_numpy()
+        if len(times) < 2 or bool((times[1:] >= times[:-1]).all()):
+            lower, upper = 0, len(times)
+            if start is not None:
+                lower = int(np.searchsorted(times, _datetime64_bound(start, tz), "left"))
+            if end is not None:
+                upper = int(np.searchsorted(times, _datetime64_bound(end, tz), "right"))
+            table = table.slice(lower, max(upper - lower, 0))
+        else:
+            mask = np.ones(len(times), dtype=bool)
+            if start is not None:
+                mask &= times >= _datetime64_bound(start, tz)
+            if end is not None:
+                mask &= times <= _datetime64_bound(end, tz)
+            table = table.filter(pa.array(mask))
+        start = end = None
+
+    df = table.to_pandas(split_blocks=True)
+    return subset_frame(df, None, start, end)
+
+
+def read_dataset_file(
+    source: Any,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> pd.DataFrame:
+    """Read one stored version file with the reader matching its suffix."""
+    if Path(source).suffix == FORMAT_SUFFIXES["feather"]:
+        return read_feather_subset(source, columns, start, end)
+    return read_parquet_subset(source, columns, start, end)
+
+
+def _write_feather(df: pd.DataFrame, path: Path) -> None:
+    # Uncompressed and in a single record batch so loads map contiguous columns.
+    feather.write_feather(df, str(path), compression="uncompressed", chunksize=max(len(df), 1))
+
+
+def read_latest_pointer(directory: Path) -> Optional[str]:
+    """Return the version ``latest`` points to in ``directory`` (None when unset)."""
+    path = Path(directory) / LATEST_POINTER
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable latest pointer %s: %s", path, exc)
+        return None
+    version = payload.get("version") if isinstance(payload, dict) else None
+    return str(version) if version else None
+
+
+def write_latest_pointer(directory: Path, version: str) -> Path:
+    """Atomically point ``latest`` in ``directory`` at ``version``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / LATEST_POINTER
+    payload = {"version": version, "updated_at": datetime.utcnow().isoformat() + "Z"}
+    _write_atomic(path, lambda tmp: tmp.write_text(json.dumps(payload), encoding="utf-8"))
+    return path
+
+
+def _download_latest_pointer(prefix: str, directory: Path) -> Optional[str]:
+    if not _download_s3_file(f"{prefix}/{LATEST_POINTER}", directory / LATEST_POINTER):
+        return None
+    return read_latest_pointer(directory)
+
+
+def _version_index(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
+) -> VersionIndex:
+    """
+    Version index of a dataset directory.
+
+    A missing local index is fetched from S3, or else rebuilt from the
+    versions already on disk (directories written before the index existed).
+    """
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    index = VersionIndex(base_dir / INDEX_FILE)
+    if index.exists():
+        return index
+    if USE_S3:
+        prefix = _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        if _download_s3_file(f"{prefix}/{INDEX_FILE}", index.path):
+            return index
+    if base_dir.exists() and _scan_versions(base_dir):
+        rebuild_version_index(
+            dataset_type, symbol, mode, interval, outputsize, feature_set=feature_set
+        )
+    return index
+
+
+def _scan_versions(base_dir: Path) -> List[str]:
+    """Versions found by listing ``base_dir`` (used only to build the index)."""
+    versions = set()
+    for path in base_dir.iterdir():
+        if path.is_file() and path.suffix in FORMAT_SUFFIXES.values():
+            versions.add(path.stem)
+        elif path.is_dir() and (path / PARTITION_MANIFEST).exists():
+            versions.add(path.name)
+    return sorted(versions)
+
+
+def _stored_bytes(path: Path) -> int:
+    if path.is_dir():
+        return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+    return path.stat().st_size
+
+
+def rebuild_version_index(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
+) -> VersionIndex:
+    """
+    (Re)create the version index from the versions stored locally.
+
+    Every version is read once, so this is meant for migrating directories
+    written before the index existed or repairing a lost index.
+    """
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    index = VersionIndex(base_dir / INDEX_FILE)
+    with _dir_lock(base_dir):
+        for version in _scan_versions(base_dir):
+            df = _load_dataset_uncached(
+                dataset_type, symbol, mode, interval, outputsize, feature_set, version
+            )
+            if df is None:
+                continue
+            partitioned = (base_dir / version).is_dir()
+            stored = base_dir / version if partitioned else _version_file(base_dir, version)
+            # Keep the original write time, not the time of the rebuild.
+            saved_at = datetime.utcfromtimestamp(stored.stat().st_mtime)
+            index.record(version, df, _stored_bytes(stored), "local", partitioned, saved_at)
+    logger.info("Rebuilt version index for %s with %d versions", base_dir, len(index.versions()))
+    return index
+
+
+def list_version_entries(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    feature_set: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Index entries (rows, time range, schema hash, size, location) of every version."""
+    return _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set).entries()
+
+
+def versions_covering(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    feature_set: Optional[str] = None,
+) -> List[str]:
+    """
+    Versions holding rows within the inclusive [start, end] range.
+
+    Answered from the version index without opening any dataset file.
+    Naive bounds are taken as UTC.
+    """
+    return _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set).covering(
+        start, end
+    )
+
+
+def _has_version(base_dir: Path, version: str) -> bool:
+    return _version_file(base_dir, version) is not None or (
+        base_dir / version / PARTITION_MANIFEST
+    ).exists()
+
+
+def resolve_version(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    version: str = DEFAULT_VERSION,
+    feature_set: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Resolve ``latest`` to the concrete version it points to.
+
+    Other versions are returned unchanged. ``latest`` is looked up through the
+    local pointer, then the S3 pointer, then a physical ``latest`` file written
+    before pointers existed, and finally the newest listed version. Returns
+    None when the dataset has no versions at all.
+    """
+    if version != DEFAULT_VERSION:
+        return version
+
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    pointed = read_latest_pointer(base_dir)
+    if pointed is None and USE_S3:
+        prefix = _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        pointed = _download_latest_pointer(prefix, base_dir)
+    if pointed is not None:
+        return pointed
+
+    if _has_version(base_dir, DEFAULT_VERSION):
+        return DEFAULT_VERSION
+    versions = list_versions(
+        dataset_type, symbol, mode, interval, outputsize, feature_set=feature_set
+    )
+    if versions:
+        return versions[-1]
+    # A bucket populated before pointers existed may still hold a physical latest.
+    return DEFAULT_VERSION if USE_S3 else None
 
 
 def list_versions(
@@ -182,19 +1056,25 @@ def list_versions(
     interval: Optional[str] = None,
     outputsize: Optional[str] = None,
     include_latest: bool = False,
+    feature_set: Optional[str] = None,
 ) -> List[str]:
-    """List available cached versions for the dataset."""
-    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize)
-    if not base_dir.exists():
-        return []
+    """
+    List available cached versions for the dataset.
 
-    versions = []
-    for path in sorted(base_dir.glob("*.parquet")):
-        version = path.stem
-        if not include_latest and version == DEFAULT_VERSION:
-            continue
-        versions.append(version)
-    return versions
+    With ``include_latest`` the result also contains ``latest`` when it
+    resolves (through its pointer) to a stored version.
+    """
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    versions = set(
+        _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set).versions()
+    )
+    if include_latest:
+        pointed = read_latest_pointer(base_dir)
+        if pointed is not None and pointed in versions:
+            versions.add(DEFAULT_VERSION)
+    elif DEFAULT_VERSION in versions:
+        versions.discard(DEFAULT_VERSION)
+    return sorted(versions)
 
 
 def dataset_exists(
@@ -204,30 +1084,34 @@ def dataset_exists(
     interval: Optional[str] = None,
     outputsize: Optional[str] = None,
     version: str = DEFAULT_VERSION,
+    feature_set: Optional[str] = None,
 ) -> bool:
     """Return True if a cached dataset exists for the given parameters."""
-    path = get_dataset_path(
-        dataset_type,
-        symbol,
-        mode,
-        interval,
-        outputsize,
-        version,
-        create_dirs=False,
+    resolved = resolve_version(
+        dataset_type, symbol, mode, interval, outputsize, version, feature_set=feature_set
     )
-    if path.exists():
+    if resolved is None:
+        return False
+    index = _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    if index.exists():
+        return index.get(resolved) is not None
+    if _has_version(
+        _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set), resolved
+    ):
         return True
 
     if USE_S3:
-        try:
-            client = _get_s3_client()
-            client.head_object(
-                Bucket=S3_BUCKET,
-                Key=_dataset_key(dataset_type, symbol, mode, interval, outputsize, version),
-            )
-            return True
-        except Exception:  # pragma: no cover - best effort
-            return False
+        client = _get_s3_client()
+        prefix = _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        for key in (
+            *(f"{prefix}/{resolved}{suffix}" for suffix in _format_suffixes(dataset_type)),
+            f"{prefix}/{resolved}/{PARTITION_MANIFEST}",
+        ):
+            try:
+                client.head_object(Bucket=S3_BUCKET, Key=key)
+                return True
+            except Exception:  # pragma: no cover - best effort
+                continue
 
     return False
 
@@ -239,54 +1123,267 @@ def load_dataset(
     interval: Optional[str] = None,
     outputsize: Optional[str] = None,
     version: str = DEFAULT_VERSION,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    use_cache: bool = True,
+    feature_set: Optional[str] = None,
 ) -> Optional[pd.DataFrame]:
     """
     Load a cached dataset if available. Returns None when not found.
+
+    ``latest`` is resolved through its pointer (see `resolve_version`).
+    ``columns`` projects the load to those columns (the time index is always
+    kept) and ``start``/``end`` restrict it to an inclusive time range; both
+    are pushed down to the Parquet reader (see `read_parquet_subset`). For
+    partitioned datasets only the partitions overlapping the range are read.
+
+    Repeated loads are served from the in-process `dataset_cache` while the
+    stored file (or S3 object) is unchanged; pass ``use_cache=False`` to
+    always read from storage. The returned frame is always safe to modify.
+
+    Feather versions are memory-mapped instead (see `read_feather_subset`):
+    they bypass the cache, since the OS page cache already shares them, and
+    their columns are read-only views of the file.
     """
-    path = get_dataset_path(
-        dataset_type,
-        symbol,
-        mode,
-        interval,
-        outputsize,
-        version,
-        create_dirs=False,
-    )
-    if path.exists():
-        return pd.read_parquet(path)
-
-    s3_df = _download_dataset_from_s3(
-        dataset_type=dataset_type,
-        symbol=symbol,
-        mode=mode,
-        interval=interval,
-        outputsize=outputsize,
-        version=version,
-        local_path=path,
+    resolved = resolve_version(
+        dataset_type, symbol, mode, interval, outputsize, version, feature_set=feature_set
     )
-    if s3_df is not None:
-        return s3_df
-
-    if version == DEFAULT_VERSION:
-        versions = list_versions(
-            dataset_type,
-            symbol,
-            mode,
-            interval,
-            outputsize,
-        )
-        if versions:
+    if resolved is None:
+        return None
+    dataset = (dataset_type, symbol, mode, interval, outputsize, feature_set)
+    if not use_cache or not dataset_cache.enabled or _is_memory_mapped(*dataset, resolved):
+        return _load_dataset_uncached(*dataset, resolved, columns, start, end)
+
+    key = dataset_cache.make_key(*dataset, resolved, columns, start, end)
+    token = _dataset_token(*dataset, resolved)
+    cached = dataset_cache.get(key, token)
+    if cached is not None:
+        return cached
+
+    df = _load_dataset_uncached(*dataset, resolved, columns, start, end)
+    if df is None:
+        return None
+    return dataset_cache.put(key, token, df)
+
+
+def load_panel(
+    symbols: Sequence[str],
+    dataset_type: str = "features",
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    version: str = DEFAULT_VERSION,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+    layout: str = "multiindex",
+    max_workers: int = DATASET_LOAD_MAX_WORKERS,
+    use_cache: bool = True,
+    feature_set: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Load the same dataset for many symbols concurrently into one panel.
+
+    Each symbol goes through `load_dataset` on a thread pool, so local
+    Parquet decoding (which releases the GIL) and S3 downloads overlap.
+    Symbols without a stored dataset, or whose load fails, are logged and
+    left out; their names are listed in ``panel.attrs["missing_symbols"]``.
+
+    Args:
+        symbols: Ticker symbols (case-insensitive, duplicates ignored).
+        dataset_type, mode, interval, outputsize, version: Dataset selection
+            shared by every symbol (see `load_dataset`).
+        columns: Columns to load for every symbol; None loads all.
+        start: Earliest index value kept for every symbol (inclusive).
+        end: Latest index value kept for every symbol (inclusive).
+        layout: "multiindex" for a ``(symbol, <time index>)`` row index, or
+            "long" to keep each symbol's time index and add a ``symbol`` column.
+        max_workers: Symbols loaded at once (default: ML_DATASET_LOAD_WORKERS).
+        use_cache: Passed to `load_dataset`.
+
+    Returns:
+        pd.DataFrame: Rows of all loaded symbols in the order given.
+    """
+    if layout not in ("multiindex", "long"):
+        raise ValueError(f"Unsupported panel layout '{layout}'. Choose multiindex or long.")
+    ordered = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+
+    def _load(symbol: str) -> Optional[pd.DataFrame]:
+        try:
             return load_dataset(
                 dataset_type,
                 symbol,
-                mode,
-                interval,
-                outputsize,
-                version=versions[-1],
+                mode=mode,
+                interval=interval,
+                outputsize=outputsize,
+                feature_set=feature_set,
+                version=version,
+                columns=columns,
+                start=start,
+                end=end,
+                use_cache=use_cache,
             )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Failed to load %s dataset for %s: %s", dataset_type, symbol, exc)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ordered) or 1))) as executor:
+        loaded = dict(zip(ordered, executor.map(_load, ordered)))
+
+    frames = {symbol: df for symbol, df in loaded.items() if df is not None}
+    missing = [symbol for symbol in ordered if symbol not in frames]
+    if missing:
+        logger.warning("No %s dataset for %s", dataset_type, ", ".join(missing))
+    if not frames:
+        panel = pd.DataFrame()
+    elif layout == "multiindex":
+        index_name = next(iter(frames.values())).index.name
+        panel = pd.concat(
+            [df.drop(columns="symbol", errors="ignore") for df in frames.values()],
+            keys=list(frames),
+            names=["symbol", index_name],
+        )
+    else:
+        panel = pd.concat(
+            [
+                df.drop(columns="symbol", errors="ignore").assign(symbol=symbol)
+                for symbol, df in frames.items()
+            ]
+        )
+        panel = panel[["symbol", *(col for col in panel.columns if col != "symbol")]]
+    panel.attrs["missing_symbols"] = missing
+    return panel
+
+
+def _is_memory_mapped(
+    dataset_type: str,
+    symbol: str,
+    mode: str,
+    interval: Optional[str],
+    outputsize: Optional[str],
+    feature_set: Optional[str],
+    version: str,
+) -> bool:
+    """Whether ``version`` is (or, not yet downloaded, will be) a Feather file."""
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    path = _version_file(base_dir, version)
+    if path is not None:
+        return path.suffix == FORMAT_SUFFIXES["feather"]
+    if (base_dir / version / PARTITION_MANIFEST).exists():
+        return False
+    return dataset_format(dataset_type) == "feather"
+
+
+def _dataset_token(
+    dataset_type: str,
+    symbol: str,
+    mode: str,
+    interval: Optional[str],
+    outputsize: Optional[str],
+    feature_set: Optional[str],
+    version: str,
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Validation token for the stored dataset.
+
+    Local copies are validated by mtime/size (partitioned versions through
+    their manifest, which is replaced on every save). Remote-only versions use
+    their version index entry, or the S3 ETag for directories without an
+    index. Returns None when the dataset is not stored.
+    """
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    for candidate in (
+        base_dir / version / PARTITION_MANIFEST,
+        *(base_dir / f"{version}{suffix}" for suffix in FORMAT_SUFFIXES.values()),
+    ):
+        try:
+            stat = candidate.stat()
+        except OSError:
+            continue
+        return ("local", str(candidate), stat.st_mtime_ns, stat.st_size)
+
+    if USE_S3:
+        index = _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        if index.exists():
+            entry = index.get(version)
+            if entry is None:
+                return None
+            return ("index", version, entry["saved_at"], entry["bytes"])
+        client = _get_s3_client()
+        prefix = _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        for key in (
+            *(f"{prefix}/{version}{suffix}" for suffix in _format_suffixes(dataset_type)),
+            f"{prefix}/{version}/{PARTITION_MANIFEST}",
+        ):
+            try:
+                head = client.head_object(Bucket=S3_BUCKET, Key=key)
+            except Exception:  # pragma: no cover - best effort
+                continue
+            return ("s3", key, head.get("ETag"))
     return None
 
 
+def _load_dataset_uncached(
+    dataset_type: str,
+    symbol: str,
+    mode: str,
+    interval: Optional[str],
+    outputsize: Optional[str],
+    feature_set: Optional[str],
+    version: str,
+    columns: Optional[Sequence[str]] = None,
+    start: TimeBound = None,
+    end: TimeBound = None,
+) -> Optional[pd.DataFrame]:
+    """Load one concrete version from local storage, falling back to S3."""
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    partition_dir = base_dir / version
+    # A shared lock keeps a concurrent save of this version from swapping
+    # partitions (or the file) between the reads that make up one load.
+    with _dir_lock(base_dir, shared=True):
+        if (partition_dir / PARTITION_MANIFEST).exists():
+            return _load_partitioned(partition_dir, columns, start, end)
+        path = _version_file(base_dir, version)
+        if path is not None:
+            return read_dataset_file(path, columns, start, end)
+
+    if not USE_S3:
+        return None
+    index = _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    entry = index.get(version) if index.exists() else None
+    if index.exists() and entry is None:
+        return None  # the index knows this version was never stored
+    prefix = _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    if entry is not None and entry["partitioned"]:
+        return _load_partitioned(
+            partition_dir, columns, start, end, s3_prefix=f"{prefix}/{version}"
+        )
+
+    for suffix in _format_suffixes(dataset_type):
+        path = base_dir / f"{version}{suffix}"
+        if suffix == FORMAT_SUFFIXES["feather"]:
+            # Feather is only useful mapped from local disk, so fetch the file as is.
+            key = f"{prefix}/{version}{suffix}"
+            if _download_s3_file(key, path):
+                logger.info("Loaded dataset from s3://%s/%s", S3_BUCKET, key)
+                return read_feather_subset(path, columns, start, end)
+            continue
+        s3_df = _download_dataset_from_s3(
+            dataset_type=dataset_type,
+            symbol=symbol,
+            mode=mode,
+            interval=interval,
+            outputsize=outputsize,
+            feature_set=feature_set,
+            version=version,
+            local_path=path,
+        )
+        if s3_df is not None:
+            return subset_frame(s3_df, columns, start, end)
+    return _load_partitioned(partition_dir, columns, start, end, s3_prefix=f"{prefix}/{version}")
+
+
 def save_dataset(
     df: pd.DataFrame,
     dataset_type: str,
@@ -296,46 +1393,281 @@ def save_dataset(
     outputsize: Optional[str] = None,
     version: Optional[str] = None,
     persist_latest: bool = True,
+    partitioning: Optional[str] = None,
+    profile: Optional[str] = None,
+    feature_set: Optional[str] = None,
 ) -> Path:
     """
     Save a dataset to disk. Returns the path of the versioned file.
+
+    The data is written once, as ``<version>.parquet`` (``version`` defaults
+    to a UTC timestamp; ``latest`` is reserved for the pointer). A timestamp
+    version that is already taken moves to the next free second, so writers
+    stamping their saves in the same second never overwrite each other;
+    other explicit names overwrite their previous content. With
+    ``persist_latest`` the ``latest`` pointer is then moved to it, locally and
+    in S3, instead of writing and uploading a second copy.
+
+    With ``partitioning`` "year" or "month" (default: ML_DATASET_PARTITIONING)
+    the version is written as a directory of partitions instead, and the path
+    of that directory is returned. Partitions unchanged since the version
+    ``latest`` pointed to are hard-linked (server-side copied in S3) rather
+    than rewritten.
+
+    Parquet files are encoded with the storage ``profile`` (default: the one
+    configured for ``dataset_type``, see `storage_profiles`). Dataset types
+    configured for Feather are always written as a single uncompressed
+    ``<version>.feather`` file; the configured default partitioning and the
+    storage profile are ignored for them and an explicit partitioning is
+    rejected.
     """
+    scheme = (partitioning or DATASET_PARTITIONING).lower()
+    if scheme not in PARTITION_SCHEMES:
+        raise ValueError(
+            f"Unsupported partitioning '{scheme}'. Choose from {', '.join(PARTITION_SCHEMES)}."
+        )
+    fmt = dataset_format(dataset_type)
+    storage = get_profile(profile, dataset_type)
+    if fmt == "feather":
+        if partitioning and scheme != "none":
+            raise ValueError(
+                "Feather datasets are stored as single files and cannot be partitioned."
+            )
+        scheme = "none"
+
     ensure_data_dirs()
-    version_name = version or datetime.utcnow().strftime(TIMESTAMP_FMT)
-    version_path = get_dataset_path(
-        dataset_type,
-        symbol,
-        mode,
-        interval,
-        outputsize,
-        version_name,
-        create_dirs=True,
+    dataset_cache.invalidate(
+        dataset_type, symbol, mode, interval, outputsize, feature_set=feature_set
     )
-    df.to_parquet(version_path)
-    _upload_dataset_to_s3(
-        version_path,
-        _dataset_key(dataset_type, symbol, mode, interval, outputsize, version_name),
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    base_dir.mkdir(parents=True, exist_ok=True)
+    prefix = (
+        _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        if USE_S3
+        else None
     )
+    with _dir_lock(base_dir):
+        index = _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        if not version or version == DEFAULT_VERSION:
+            version = _unused_version(base_dir, index)
+        elif _version_taken(base_dir, index, version):
+            stamp = _parse_timestamp_version(version)
+            if stamp is not None:
+                requested, version = version, _unused_version(base_dir, index, stamp)
+                logger.info("Version %s of %s is taken; saving as %s.", requested, symbol, version)
 
-    if persist_latest and version_name != DEFAULT_VERSION:
-        latest_path = get_dataset_path(
-            dataset_type,
-            symbol,
-            mode,
-            interval,
-            outputsize,
-            DEFAULT_VERSION,
-            create_dirs=True,
-        )
-        df.to_parquet(latest_path)
-        _upload_dataset_to_s3(
-            latest_path,
-            _dataset_key(dataset_type, symbol, mode, interval, outputsize, DEFAULT_VERSION),
+        if scheme == "none":
+            suffix = FORMAT_SUFFIXES[fmt]
+            version_path = base_dir / f"{version}{suffix}"
+            if fmt == "feather":
+                _write_atomic(version_path, lambda tmp: _write_feather(df, tmp))
+            else:
+                _write_atomic(version_path, lambda tmp: write_parquet(df, tmp, storage))
+            for other in FORMAT_SUFFIXES.values():
+                if other != suffix:
+                    (base_dir / f"{version}{other}").unlink(missing_ok=True)
+            uploaded = _upload_dataset_to_s3(
+                version_path,
+                _dataset_key(
+                    dataset_type, symbol, mode, interval, outputsize, feature_set, version, suffix
+                ),
+            )
+        else:
+            # Reuse the unchanged partitions of the current latest rather than re-encoding.
+            reference = resolve_version(
+                dataset_type, symbol, mode, interval, outputsize, feature_set=feature_set
+            )
+            version_path = base_dir / version
+            _save_partitioned(
+                df,
+                version_path,
+                scheme,
+                s3_prefix=f"{prefix}/{version}" if prefix else None,
+                reference=base_dir / reference if reference else None,
+                reference_s3_prefix=f"{prefix}/{reference}" if prefix and reference else None,
+                profile=storage,
+            )
+            uploaded = bool(prefix)
+
+        index.record(
+            version,
+            df,
+            _stored_bytes(version_path),
+            "both" if uploaded else "local",
+            partitioned=scheme != "none",
         )
+        if persist_latest:
+            _point_latest(base_dir, version, prefix, index)
+        if prefix:
+            _upload_dataset_to_s3(index.path, f"{prefix}/{INDEX_FILE}")
 
     return version_path
 
 
+def _point_latest(
+    base_dir: Path, version: str, prefix: Optional[str], index: VersionIndex
+) -> None:
+    """Move the latest pointer and drop physical latest copies it supersedes."""
+    pointer_path = write_latest_pointer(base_dir, version)
+    if prefix:
+        _upload_dataset_to_s3(pointer_path, f"{prefix}/{LATEST_POINTER}")
+
+    legacy_file = base_dir / f"{DEFAULT_VERSION}.parquet"
+    legacy_dir = base_dir / DEFAULT_VERSION
+    index.remove(DEFAULT_VERSION)
+    if legacy_file.exists():
+        legacy_file.unlink()
+        if prefix:
+            _delete_s3_object(f"{prefix}/{DEFAULT_VERSION}.parquet")
+    if (legacy_dir / PARTITION_MANIFEST).exists():
+        manifest = _read_partition_manifest(legacy_dir) or {}
+        shutil.rmtree(legacy_dir, ignore_errors=True)
+        if prefix:
+            for label in manifest.get("partitions", {}):
+                _delete_s3_object(f"{prefix}/{DEFAULT_VERSION}/{label}/{PARTITION_FILE}")
+            _delete_s3_object(f"{prefix}/{DEFAULT_VERSION}/{PARTITION_MANIFEST}")
+
+
+def delete_version(
+    dataset_type: str,
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    version: str = "",
+    feature_set: Optional[str] = None,
+) -> int:
+    """
+    Delete one stored version locally and in S3 and drop it from the index.
+
+    The version ``latest`` points to cannot be deleted (move the pointer by
+    saving a newer version first).
+
+    Returns:
+        int: Bytes the version occupied according to the index (0 if unknown).
+    """
+    if not version or version == DEFAULT_VERSION:
+        raise ValueError("A concrete version is required; 'latest' is a pointer.")
+    base_dir = _dataset_dir(dataset_type, symbol, mode, interval, outputsize, feature_set)
+    with _dir_lock(base_dir):
+        if read_latest_pointer(base_dir) == version:
+            raise ValueError(f"Version {version} is the current latest and cannot be deleted.")
+
+        index = _version_index(dataset_type, symbol, mode, interval, outputsize, feature_set)
+        entry = index.get(version)
+        prefix = (
+            _dataset_prefix(dataset_type, symbol, mode, interval, outputsize, feature_set)
+            if USE_S3
+            else None
+        )
+        version_dir = base_dir / version
+        partitioned = version_dir.is_dir() or bool(entry and entry["partitioned"])
+        if partitioned:
+            manifest = _read_partition_manifest(version_dir)
+            if manifest is None and prefix and _download_s3_file(
+                f"{prefix}/{version}/{PARTITION_MANIFEST}", version_dir / PARTITION_MANIFEST
+            ):
+                manifest = _read_partition_manifest(version_dir)
+            shutil.rmtree(version_dir, ignore_errors=True)
+            if prefix:
+                for label in (manifest or {}).get("partitions", {}):
+                    _delete_s3_object(f"{prefix}/{version}/{label}/{PARTITION_FILE}")
+                _delete_s3_object(f"{prefix}/{version}/{PARTITION_MANIFEST}")
+        else:
+            for suffix in FORMAT_SUFFIXES.values():
+                (base_dir / f"{version}{suffix}").unlink(missing_ok=True)
+                if prefix:
+                    _delete_s3_object(f"{prefix}/{version}{suffix}")
+
+        if index.remove(version) and prefix:
+            _upload_dataset_to_s3(index.path, f"{prefix}/{INDEX_FILE}")
+    dataset_cache.invalidate(
+        dataset_type, symbol, mode, interval, outputsize, feature_set=feature_set
+    )
+    logger.info("Deleted version %s of %s", version, base_dir)
+    return int(entry["bytes"]) if entry else 0
+
+
+def iter_datasets(dataset_type: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Discover the datasets stored locally for ``dataset_type``.
+
+    Returns the `load_dataset` keyword arguments (symbol, mode, interval,
+    outputsize, feature_set) of every directory holding versions. A single
+    level below the mode is read as the output size when it is
+    ``compact``/``full`` and as the interval otherwise, matching how the
+    fetchers name their caches.
+    """
+    if dataset_type not in DATASET_DIRS:
+        raise ValueError(f"Unsupported dataset type '{dataset_type}'.")
+    root = DATASET_DIRS[dataset_type]
+    if not root.exists():
+        return []
+
+    def _holds_versions(path: Path) -> bool:
+        return (path / INDEX_FILE).exists() or bool(_scan_versions(path))
+
+    roots: List[Tuple[Optional[str], Path]] = [(None, root)]
+    sets_dir = root / FEATURE_SETS_DIR
+    if sets_dir.is_dir():
+        roots.extend((p.name, p) for p in sorted(sets_dir.iterdir()) if p.is_dir())
+
+    datasets = []
+    for feature_set, set_root in roots:
+        symbol_dirs = sorted(p for p in set_root.iterdir() if p.is_dir() and p != sets_dir)
+        for symbol_dir in symbol_dirs:
+            for mode_dir in sorted(p for p in symbol_dir.iterdir() if p.is_dir()):
+                candidates = [mode_dir]
+                for child in sorted(p for p in mode_dir.iterdir() if p.is_dir()):
+                    if (child / PARTITION_MANIFEST).exists():
+                        continue  # a partitioned version, not a dataset directory
+                    candidates.append(child)
+                    candidates.extend(
+                        sorted(
+                            p for p in child.iterdir()
+                            if p.is_dir() and not (p / PARTITION_MANIFEST).exists()
+                        )
+                    )
+                for path in candidates:
+                    if not _holds_versions(path):
+                        continue
+                    extras = path.relative_to(mode_dir).parts
+                    interval = outputsize = None
+                    if len(extras) == 2:
+                        interval, outputsize = extras
+                    elif len(extras) == 1:
+                        if extras[0] in ("compact", "full"):
+                            outputsize = extras[0]
+                        else:
+                            interval = extras[0]
+                    datasets.append(
+                        {
+                            "dataset_type": dataset_type,
+                            "symbol": symbol_dir.name,
+                            "mode": mode_dir.name,
+                            "interval": interval,
+                            "outputsize": outputsize,
+                            "feature_set": feature_set,
+                        }
+                    )
+    return datasets
+
+
+def merge_time_series(existing: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append new bars to an existing history.
+
+    Rows are de-duplicated on the index with the newer values winning (so a
+    partially formed bar is replaced by its final values) and time-sorted.
+    """
+    if existing is None or existing.empty:
+        merged = new.copy()
+    else:
+        merged = pd.concat([existing, new])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
 def split_dataset(
     df: pd.DataFrame,
     test_size: float = 0.2,
@@ -0,0 +1,87 @@
+"""
+Shared base of the on-disk caches (`response_cache`, `indicator_cache`).
+
+Entries are files named ``<key><suffix>`` in one directory. Reading an entry
+refreshes its mtime, and after every write the directory is trimmed back under
+a byte budget by deleting the least recently used entries first.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Directory of cache entries with hit/miss counters and mtime-LRU eviction.
+
+    Subclasses set ``ENTRY_SUFFIX`` and ``LABEL`` (used in log messages).
+
+    Args:
+        cache_dir: Directory holding cached entries.
+        max_bytes: Total size the directory is trimmed back to after writes.
+        enabled: When False every lookup misses and nothing is stored.
+    """
+
+    ENTRY_SUFFIX = ""
+    LABEL = "cache"
+
+    def __init__(self, cache_dir: Path, max_bytes: int, enabled: bool) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.ENTRY_SUFFIX}"
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        """Refresh the recency of an entry that was just served."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under ``max_bytes``. Returns count removed."""
+        if not self.cache_dir.exists():
+            return 0
+        entries = []
+        for path in self.cache_dir.glob(f"*{self.ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.debug("Evicted %d %s entries.", removed, self.LABEL)
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for reporting."""
+        return {"hits": self.hits, "misses": self.misses}
@@ -5,18 +5,34 @@ Feature Engineering with logging locally and uploading logs to Supabase.
 from __future__ import annotations
 
 import argparse
+import glob
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
-import pandas_ta as ta  # pylint: disable=unused-import
 import yaml
 
-from .config import INDICATORS_CONFIG_PATH, validate_required_settings
-from .dataset_manager import ensure_data_dirs, save_dataset as cache_dataset
+from .config import (
+    FEATURE_EXECUTOR,
+    FEATURE_MAX_WORKERS,
+    INDICATORS_CONFIG_PATH,
+    STORAGE_PROFILES,
+    validate_required_settings,
+)
+from .dataset_manager import ensure_data_dirs, read_parquet_subset, save_dataset as cache_dataset
+from .incremental_features import update_feature_dataset
+from .indicator_cache import indicator_cache
+from .indicator_engine import (
+    EXECUTORS,
+    compute_indicator_sets,
+    compute_indicators,
+    merge_outputs,
+)
+from .indicator_kernels import pandas_ta as ta  # noqa: F401  registers DataFrame.ta
+from .storage_profiles import write_parquet
 from .supabase_uploader import upload_logs_to_supabase
 
 _TA_VALIDATION_FRAME = pd.DataFrame(
@@ -40,13 +56,14 @@ logging.basicConfig(
 )
 
 
-def load_indicators_config():
-    """Load indicator settings from YAML config file."""
-    if not INDICATORS_CONFIG_PATH.exists():
-        logging.error("Config file not found: %s", INDICATORS_CONFIG_PATH)
-        raise FileNotFoundError(f"Config file not found: {INDICATORS_CONFIG_PATH}")
+def load_indicators_config(config_path: Optional[Union[str, Path]] = None):
+    """Load indicator settings from a YAML config file (default: INDICATORS_CONFIG_PATH)."""
+    config_path = Path(config_path) if config_path else INDICATORS_CONFIG_PATH
+    if not config_path.exists():
+        logging.error("Config file not found: %s", config_path)
+        raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    with open(INDICATORS_CONFIG_PATH, "r", encoding="utf-8") as file:
+    with open(config_path, "r", encoding="utf-8") as file:
         config = yaml.safe_load(file)
 
     return config.get("indicators", [])
@@ -74,63 +91,38 @@ def validate_indicators_config(indicators):
         raise ValueError("Invalid indicator configuration: " + "; ".join(invalid_entries))
 
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Adds technical indicators to stock price DataFrame based on YAML config."""
-    if df.empty:
-        logging.error("Cannot engineer features on an empty DataFrame")
-        raise ValueError("Cannot engineer features on an empty DataFrame")
-
-    df = df.copy()
-
-    # Ensure index is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df.index):
-        df.index = pd.to_datetime(df.index)
-
-    indicators = load_indicators_config()
-    validate_indicators_config(indicators)
-    run_logs = []
-
-    for ind in indicators:
-        name = ind.get("name")
-        params = ind.get("params", {})
-
-        func = getattr(df.ta, name, None)
-        if not func:
+def _log_outcomes(outcomes, run_logs):
+    """Log indicator outcomes and collect them into ``run_logs``."""
+    # Outcomes come back in configured order, so logs read as a sequential run.
+    for outcome in outcomes:
+        name, params = outcome["name"], outcome["params"]
+        if outcome["status"] == "unknown":
             msg = f"Skipping unknown indicator: {name}"
             logging.warning("%s", msg)
-            run_logs.append(
-                {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "level": "WARNING",
-                    "message": msg,
-                }
-            )
-            continue
-
-        try:
-            func(**params)
+            level = "WARNING"
+        elif outcome["status"] == "error":
+            msg = f"Failed to add indicator {name}: {outcome['error']}"
+            logging.error("%s", msg)
+            level = "ERROR"
+        else:
             msg = f"Added indicator: {name} with params {params}"
+            if outcome.get("cached"):
+                msg += " (cached)"
             logging.info("%s", msg)
-            run_logs.append(
-                {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "level": "INFO",
-                    "message": msg,
-                }
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            msg = f"Failed to add indicator {name}: {exc}"
-            logging.error("%s", msg)
-            run_logs.append(
-                {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "level": "ERROR",
-                    "message": msg,
-                }
-            )
+            level = "INFO"
+        run_logs.append(
+            {
+                "timestamp": datetime.utcnow().isoformat(),
+                "level": level,
+                "message": msg,
+            }
+        )
 
-    df.dropna(inplace=True)
-    success_msg = f"Engineered features: {df.shape[1]} columns, {len(df)} rows."
+
+def _log_shape(df, run_logs, set_name=None):
+    """Log the engineered shape (of feature set ``set_name``)."""
+    label = f" for {set_name}" if set_name else ""
+    success_msg = f"Engineered features{label}: {df.shape[1]} columns, {len(df)} rows."
     logging.info("%s", success_msg)
     run_logs.append(
         {
@@ -140,16 +132,180 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
         }
     )
 
-    # Upload logs batch to Supabase
+
+def _upload_run_logs(run_logs):
+    """Upload the run logs batch to Supabase."""
     try:
         upload_logs_to_supabase(run_logs)
         logging.info("Uploaded feature engineering logs to Supabase.")
     except Exception as exc:  # pylint: disable=broad-except
         logging.error("Failed to upload logs to Supabase: %s", exc)
 
+
+def _finish_run(df, run_logs):
+    """Log the engineered shape and upload the run logs to Supabase."""
+    _log_shape(df, run_logs)
+    _upload_run_logs(run_logs)
+
+
+def _prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of ``df`` with a datetime index; rejects empty frames."""
+    if df.empty:
+        logging.error("Cannot engineer features on an empty DataFrame")
+        raise ValueError("Cannot engineer features on an empty DataFrame")
+
+    df = df.copy()
+
+    # Ensure index is datetime
+    if not pd.api.types.is_datetime64_any_dtype(df.index):
+        df.index = pd.to_datetime(df.index)
+    return df
+
+
+def engineer_features(
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    executor: Optional[str] = None,
+    use_indicator_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Adds technical indicators to stock price DataFrame based on YAML config.
+
+    Args:
+        df: OHLCV price data.
+        workers: Indicators computed concurrently (default: ML_FEATURE_WORKERS).
+        executor: "thread" or "process" pool (default: ML_FEATURE_EXECUTOR).
+        use_indicator_cache: Read and store indicator columns in the on-disk
+            indicator cache.
+    """
+    df = _prepare_frame(df)
+
+    indicators = load_indicators_config()
+    validate_indicators_config(indicators)
+    run_logs = []
+
+    outcomes = compute_indicators(
+        df,
+        indicators,
+        workers=FEATURE_MAX_WORKERS if workers is None else workers,
+        executor=executor or FEATURE_EXECUTOR,
+        cache=indicator_cache if use_indicator_cache else None,
+    )
+    _log_outcomes(outcomes, run_logs)
+    df = merge_outputs(df, outcomes)
+    df.dropna(inplace=True)
+    _finish_run(df, run_logs)
     return df
 
 
+def feature_set_name(config_path: Union[str, Path]) -> str:
+    """Label of the feature set built from an indicator config file (its file stem)."""
+    return Path(config_path).stem
+
+
+def engineer_feature_sets(
+    df: pd.DataFrame,
+    config_paths: Sequence[Union[str, Path]],
+    workers: Optional[int] = None,
+    executor: Optional[str] = None,
+    use_indicator_cache: bool = True,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Build the features of several indicator configs in one pass.
+
+    The union of the configured indicators is computed once over ``df``; each
+    set then gets exactly the frame `engineer_features` would build from its
+    config alone.
+
+    Args:
+        df: OHLCV price data.
+        config_paths: Indicator config files, one feature set each.
+        workers: Indicators computed concurrently (default: ML_FEATURE_WORKERS).
+        executor: "thread" or "process" pool (default: ML_FEATURE_EXECUTOR).
+        use_indicator_cache: Read and store indicator columns in the on-disk
+            indicator cache.
+
+    Returns:
+        dict: Engineered features by set name (config file stem), in the
+        order of ``config_paths``.
+    """
+    df = _prepare_frame(df)
+
+    sets = {}
+    for config_path in config_paths:
+        set_name = feature_set_name(config_path)
+        if set_name in sets:
+            raise ValueError(f"Duplicate feature set name '{set_name}' in {config_path}")
+        indicators = load_indicators_config(config_path)
+        validate_indicators_config(indicators)
+        sets[set_name] = indicators
+    run_logs = []
+
+    outcomes_by_set = compute_indicator_sets(
+        df,
+        sets,
+        workers=FEATURE_MAX_WORKERS if workers is None else workers,
+        executor=executor or FEATURE_EXECUTOR,
+        cache=indicator_cache if use_indicator_cache else None,
+    )
+    features = {}
+    for set_name, outcomes in outcomes_by_set.items():
+        logging.info("Feature set %s:", set_name)
+        _log_outcomes(outcomes, run_logs)
+        features[set_name] = merge_outputs(df, outcomes).dropna()
+        _log_shape(features[set_name], run_logs, set_name)
+    _upload_run_logs(run_logs)
+    return features
+
+
+def engineer_features_incremental(
+    df: pd.DataFrame,
+    symbol: str,
+    mode: str = "intraday",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    version: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Path]:
+    """
+    Update the cached features of ``symbol`` for bars appended to ``df``.
+
+    Continues the indicator state saved with the last cached features over
+    the new bars only, falling back to a full build when the state does not
+    match; the result equals `engineer_features` on ``df``. Indicators are
+    updated one after another (the worker pool settings do not apply).
+
+    Args:
+        df: Full OHLCV price history, including the new bars.
+        symbol, mode, interval, outputsize: Identify the features dataset.
+        version: Version label of the saved features (default: timestamp).
+        profile: Parquet storage profile (default: ML_FEATURES_STORAGE_PROFILE).
+
+    Returns:
+        tuple: (engineered features, path of the saved dataset version).
+    """
+    df = _prepare_frame(df)
+    indicators = load_indicators_config()
+    validate_indicators_config(indicators)
+    run_logs = []
+
+    path, df, outcomes, report = update_feature_dataset(
+        df.sort_index(),
+        indicators,
+        symbol,
+        mode,
+        interval,
+        outputsize,
+        version=version,
+        profile=profile,
+    )
+    _log_outcomes(outcomes, run_logs)
+    if report["mode"] == "full":
+        logging.info("Computed all bars (%s) in %.2fs", report["reason"], report["seconds"])
+    _finish_run(df, run_logs)
+    return df, path
+
+
 def load_input_dataframe(input_path: Union[str, Path]) -> pd.DataFrame:
     """
     Load a DataFrame from CSV or Parquet.
@@ -164,7 +320,7 @@ def load_input_dataframe(input_path: Union[str, Path]) -> pd.DataFrame:
     if file_path.suffix.lower() in {".csv"}:
         df = pd.read_csv(file_path)
     elif file_path.suffix.lower() in {".parquet", ".pq"}:
-        df = pd.read_parquet(file_path)
+        df = read_parquet_subset(file_path)
     else:
         raise ValueError(f"Unsupported file format: {file_path.suffix}")
 
@@ -178,13 +334,18 @@ def load_input_dataframe(input_path: Union[str, Path]) -> pd.DataFrame:
     return df
 
 
-def save_output_dataframe(df: pd.DataFrame, output_path: Union[str, Path]) -> None:
+def save_output_dataframe(
+    df: pd.DataFrame,
+    output_path: Union[str, Path],
+    profile: Optional[str] = None,
+) -> None:
     """
     Persist engineered features to CSV or Parquet.
 
     Args:
         df: DataFrame with engineered indicators.
         output_path: Destination file path.
+        profile: Parquet storage profile (default: ML_FEATURES_STORAGE_PROFILE).
     """
     file_path = Path(output_path).expanduser().resolve()
     file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -192,7 +353,7 @@ def save_output_dataframe(df: pd.DataFrame, output_path: Union[str, Path]) -> No
     if file_path.suffix.lower() in {".csv"}:
         df.to_csv(file_path)
     elif file_path.suffix.lower() in {".parquet", ".pq"}:
-        df.to_parquet(file_path)
+        write_parquet(df, file_path, profile, dataset_type="features")
     else:
         raise ValueError(f"Unsupported output format: {file_path.suffix}")
 
@@ -237,17 +398,112 @@ def parse_args() -> argparse.Namespace:
         "--cache-version",
         help="Optional custom version label when saving to the cache.",
     )
+    parser.add_argument(
+        "--storage-profile",
+        choices=list(STORAGE_PROFILES),
+        help="Parquet storage profile for the cache and --output "
+        "(default: ML_FEATURES_STORAGE_PROFILE).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Indicators computed concurrently (default: ML_FEATURE_WORKERS; 1 is sequential).",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=list(EXECUTORS),
+        help="Pool used when --workers > 1: threads or processes (default: ML_FEATURE_EXECUTOR).",
+    )
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        help="Indicator config files (globs allowed, e.g. 'config/indicators_set*.yaml') to "
+        "build in one pass; each set is cached under mode <mode>_<config stem> and "
+        "written to <output stem>_<config stem>.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only compute bars appended since the cached features of --symbol "
+        "(falls back to a full build when the saved indicator state does not match).",
+    )
     parser.add_argument(
         "--no-cache",
         action="store_true",
         help="Skip saving engineered features to the local/S3 cache.",
     )
+    parser.add_argument(
+        "--no-indicator-cache",
+        action="store_true",
+        help="Bypass the on-disk indicator cache (ML_INDICATOR_CACHE=0 disables it globally).",
+    )
     parser.add_argument(
         "--head",
         action="store_true",
         help="Print head/tail of engineered data even if output is saved.",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.configs and args.incremental:
+        parser.error("--incremental cannot be combined with --configs")
+    if args.incremental and (args.workers is not None or args.executor is not None):
+        # Incremental updates continue each indicator's saved state in turn.
+        parser.error("--workers/--executor cannot be combined with --incremental")
+    return args
+
+
+def _expand_configs(patterns: Sequence[str]) -> List[Path]:
+    """Config paths matching ``patterns``, each glob sorted by name."""
+    paths: List[Path] = []
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if glob.has_magic(pattern):
+            matches = sorted(Path(match) for match in glob.glob(pattern))
+        else:
+            matches = [Path(pattern)]
+        if not matches:
+            raise FileNotFoundError(f"No config files match {pattern}")
+        paths.extend(matches)
+    return paths
+
+
+def _run_feature_sets(args: argparse.Namespace, source_df: pd.DataFrame) -> None:
+    """Build, cache and write every feature set of ``--configs``."""
+    config_paths = _expand_configs(args.configs)
+    feature_sets = engineer_feature_sets(
+        source_df,
+        config_paths,
+        workers=args.workers,
+        executor=args.executor,
+        use_indicator_cache=not args.no_indicator_cache,
+    )
+
+    cache_enabled = not args.no_cache and args.symbol
+    if cache_enabled:
+        ensure_data_dirs()
+    elif not args.no_cache:
+        logging.warning("Skipping cache save because --symbol was not provided.")
+    for set_name, engineered in feature_sets.items():
+        if cache_enabled:
+            cache_path = cache_dataset(
+                engineered,
+                dataset_type="features",
+                symbol=args.symbol,
+                mode=args.mode,
+                interval=args.interval if args.mode == "intraday" else None,
+                outputsize=args.outputsize,
+                version=args.cache_version,
+                profile=args.storage_profile,
+                feature_set=set_name,
+            )
+            logging.info("Cached %s features to %s", set_name, cache_path)
+        if args.output:
+            output = Path(args.output)
+            set_output = output.with_name(f"{output.stem}_{set_name}{output.suffix}")
+            save_output_dataframe(engineered, set_output, args.storage_profile)
+        if args.head:
+            print(f"{set_name}:")
+            print(engineered.head())
+            print(engineered.tail())
 
 
 def main() -> None:
@@ -259,12 +515,35 @@ def main() -> None:
     source_df = load_input_dataframe(args.input)
     logging.info("Loaded %d rows with %d columns", len(source_df), source_df.shape[1])
 
-    engineered = engineer_features(source_df)
+    if args.configs:
+        _run_feature_sets(args, source_df)
+        return
 
     cache_enabled = not args.no_cache and args.symbol
-    if cache_enabled:
+    if args.incremental and cache_enabled:
+        ensure_data_dirs()
+        engineered, cache_path = engineer_features_incremental(
+            source_df,
+            symbol=args.symbol,
+            mode=args.mode,
+            interval=args.interval if args.mode == "intraday" else None,
+            outputsize=args.outputsize,
+            version=args.cache_version,
+            profile=args.storage_profile,
+        )
+        logging.info("Cached engineered features to %s", cache_path)
+    else:
+        if args.incremental:
+            logging.warning("Ignoring --incremental: it needs --symbol and the cache.")
+        engineered = engineer_features(
+            source_df,
+            workers=args.workers,
+            executor=args.executor,
+            use_indicator_cache=not args.no_indicator_cache,
+        )
+
+    if cache_enabled and not args.incremental:
         ensure_data_dirs()
-        cache_version = args.cache_version or datetime.utcnow().strftime("%Y%m%d%H%M%S")
         cache_path = cache_dataset(
             engineered,
             dataset_type="features",
@@ -272,14 +551,15 @@ def main() -> None:
             mode=args.mode,
             interval=args.interval if args.mode == "intraday" else None,
             outputsize=args.outputsize,
-            version=cache_version,
+            version=args.cache_version,
+            profile=args.storage_profile,
         )
         logging.info("Cached engineered features to %s", cache_path)
-    elif not args.no_cache:
+    elif not args.no_cache and not args.symbol:
         logging.warning("Skipping cache save because --symbol was not provided.")
 
     if args.output:
-        save_output_dataframe(engineered, args.output)
+        save_output_dataframe(engineered, args.output, args.storage_profile)
     if args.output is None or args.head:
         print(engineered.head())
         print(engineered.tail())
@@ -0,0 +1,128 @@
+"""
+Advisory inter-process file locks.
+
+`file_lock` holds an ``flock`` (POSIX) or ``msvcrt.locking`` (Windows) lock on
+a small lock file for the duration of a ``with`` block, so processes sharing
+``ML_DATA_DIR`` can serialize writers of one dataset while readers share it.
+Windows has no shared mode, so shared locks are exclusive there.
+
+``flock`` itself has no fairness: a steady stream of overlapping readers can
+starve a writer forever. Every acquisition therefore first passes through a
+turnstile (an exclusive lock on ``<path>.gate`` held only while acquiring the
+main lock), so once a writer is waiting, new readers queue behind it.
+
+Locks are re-entrant per thread: nested ``with file_lock(...)`` blocks on the
+same path in one thread do not block (an exclusive lock also covers nested
+shared requests), which lets locked functions call each other freely.
+Upgrading a held shared lock to exclusive is refused because two threads
+doing so would deadlock.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - POSIX
+    msvcrt = None
+
+_POLL_SECONDS = 0.05
+_held = threading.local()
+
+
+def _try_lock(fd: int, shared: bool) -> bool:
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+    if msvcrt is not None:  # pragma: no cover - Windows
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    return True  # pragma: no cover - no locking primitive available
+
+
+def _lock(fd: int, shared: bool, deadline: Optional[float]) -> None:
+    if fcntl is not None and deadline is None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+    while not _try_lock(fd, shared):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError("Timed out waiting for a lock")
+        time.sleep(_POLL_SECONDS)
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:  # pragma: no cover - Windows
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(
+    path: Union[str, Path],
+    shared: bool = False,
+    timeout: Optional[float] = None,
+) -> Iterator[None]:
+    """
+    Hold an advisory lock on ``path`` (created if missing) inside the block.
+
+    Args:
+        path: Lock file (``<path>.gate`` is created next to it). Its parent
+            directory must exist.
+        shared: Take a shared (reader) lock instead of an exclusive one.
+        timeout: Seconds to wait before raising TimeoutError; None waits forever.
+    """
+    key = os.path.abspath(path)
+    held: Optional[Dict[str, List]] = getattr(_held, "locks", None)
+    if held is None:
+        held = _held.locks = {}
+    if key in held:
+        mode = held[key]
+        if mode[0] == "shared" and not shared:
+            raise RuntimeError(f"Cannot upgrade the shared lock on {key} to exclusive.")
+        mode[1] += 1
+        try:
+            yield
+        finally:
+            mode[1] -= 1
+        return
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    gate_fd = os.open(f"{key}.gate", os.O_RDWR | os.O_CREAT, 0o644)
+    fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            _lock(gate_fd, False, deadline)
+            try:
+                _lock(fd, shared, deadline)
+            finally:
+                _unlock(gate_fd)
+        finally:
+            os.close(gate_fd)
+        held[key] = ["shared" if shared else "exclusive", 1]
+        try:
+            yield
+        finally:
+            del held[key]
+            _unlock(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,310 @@
+"""
+Incremental feature updates from saved indicator state.
+
+A full build computes every configured indicator over the whole history
+and, for indicators with a NumPy kernel, records the kernel state (EMA/RMA
+recursion values, OBV running sum, rolling-window lookback; see
+`indicator_kernels.record_state`). `update_feature_dataset` saves that state
+as ``indicator_state.json`` next to the cached features dataset, together
+with the features version it belongs to and a hash of the bars it covers.
+
+When new bars are appended to the raw history, the next update checks that
+the covered bars are unchanged (a revised or inserted bar invalidates the
+state), continues each kernel over the new bars only and appends the new
+feature rows to the saved features. Indicators without a kernel are
+recomputed over the whole history and only their new rows kept. Either way
+the result is identical to a full recompute, which is what any mismatch
+falls back to. Each update reports its speedup over the last full build.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .dataset_manager import dataset_lock, get_dataset_path, load_dataset, save_dataset
+from .indicator_engine import OHLCV_COLUMNS, compute_indicator, merge_outputs, ohlcv_frame
+from .indicator_kernels import KERNELS_ENABLED, StreamStateError, continue_state, record_state
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "indicator_state.json"
+STATE_FORMAT = 2
+# Trailing bars whose hash must match before state is reused. Refreshes only
+# re-fetch recent bars, so revisions show up here (splits change them all).
+CHECK_BARS = 1000
+
+
+def config_signature(indicators: Sequence[Dict[str, Any]]) -> str:
+    """Stable hash of an indicator configuration (names, params and order)."""
+    canonical = [
+        {"name": ind.get("name"), "params": ind.get("params") or {}} for ind in indicators
+    ]
+    payload = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _bars_hash(bars: pd.DataFrame) -> str:
+    digest = hashlib.sha256(bars.index.asi8.tobytes())
+    for column in OHLCV_COLUMNS:
+        if column in bars.columns:
+            digest.update(bars[column].to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _as_frame(result: Any) -> pd.DataFrame:
+    return result.to_frame() if isinstance(result, pd.Series) else result
+
+
+def _outcome(name: str, params: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "params": params,
+        "status": "ok",
+        "source": "kernel",
+        "result": _as_frame(result),
+        "error": None,
+        "cached": False,
+    }
+
+
+def _compute_full(
+    frame: pd.DataFrame, name: str, params: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """One indicator over the whole history, with its kernel state when possible."""
+    if KERNELS_ENABLED:
+        try:
+            result, state = record_state(name, frame, params)
+            return _outcome(name, params, result), state
+        except Exception:  # pylint: disable=broad-except
+            pass  # no kernel, or one that cannot be continued
+    return compute_indicator(frame, name, params), None
+
+
+def _check(df: pd.DataFrame, rows: int) -> Dict[str, Any]:
+    check_rows = min(rows, CHECK_BARS)
+    return {"rows": check_rows, "hash": _bars_hash(df.iloc[rows - check_rows : rows])}
+
+
+def _mismatch(
+    df: pd.DataFrame,
+    indicators: Sequence[Dict[str, Any]],
+    previous: Optional[pd.DataFrame],
+    state: Optional[Dict[str, Any]],
+) -> Optional[str]:
+    """Why ``state`` cannot be continued over ``df`` (None when it can)."""
+    if state is None or previous is None:
+        return "no saved indicator state"
+    if state.get("format") != STATE_FORMAT:
+        return "saved state has an old format"
+    if state.get("config") != config_signature(indicators):
+        return "indicator configuration changed"
+    rows = state["rows"]
+    if len(df) < rows or df.index[rows - 1] != pd.Timestamp(state["last_timestamp"]):
+        return "history no longer ends where the saved state does"
+    if not df.index.is_monotonic_increasing:
+        return "history is not sorted by time"
+    if _check(df, rows) != state["check"]:
+        return "bars covered by the saved state were revised"
+    return None
+
+
+def _new_state(
+    df: pd.DataFrame,
+    indicators: Sequence[Dict[str, Any]],
+    states: List[Optional[Dict[str, Any]]],
+    full: Dict[str, Any],
+) -> Dict[str, Any]:
+    return {
+        "format": STATE_FORMAT,
+        "config": config_signature(indicators),
+        "rows": len(df),
+        "last_timestamp": df.index[-1].isoformat(),
+        "check": _check(df, len(df)),
+        "indicators": states,
+        "full_build": full,
+    }
+
+
+def update_features(
+    df: pd.DataFrame,
+    indicators: Sequence[Dict[str, Any]],
+    previous: Optional[pd.DataFrame] = None,
+    state: Optional[Dict[str, Any]] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Compute the features of ``df`` incrementally when possible.
+
+    Args:
+        df: Full OHLCV history, time-sorted, ending with the new bars.
+        indicators: Indicator config entries (``name``/``params``).
+        previous: Features built from the history ``state`` covers.
+        state: Indicator state saved with ``previous``.
+
+    Returns:
+        tuple: (features equal to a full recompute of ``df``, new state,
+        per-indicator outcomes in configured order, report dict with
+        ``mode``, ``rows``, ``new_rows``, ``seconds`` and ``speedup``).
+    """
+    started = time.perf_counter()
+    if not df.empty and not pd.api.types.is_datetime64_any_dtype(df.index):
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+    reason = _mismatch(df, indicators, previous, state)
+
+    if reason is None:
+        rows = state["rows"]
+        new_rows = len(df) - rows
+        # Kernels only need their window of processed bars; slice before copying.
+        windows = [saved["window"] for saved in state["indicators"] if saved is not None]
+        start = max(0, rows - max(windows, default=0))
+        frame, history = ohlcv_frame(df.iloc[start:]), None
+        outcomes: List[Dict[str, Any]] = []
+        states: List[Optional[Dict[str, Any]]] = []
+        # No new bars: nothing to compute, the saved features are current.
+        pending = zip(indicators, state["indicators"]) if new_rows else []
+        for ind, saved in pending:
+            name, params = ind.get("name"), ind.get("params") or {}
+            outcome, new_state = None, None
+            if saved is not None:
+                try:
+                    window = frame.iloc[max(0, rows - saved["window"]) - start :]
+                    result, new_state = continue_state(name, window, params, saved, new_rows)
+                    outcome = _outcome(name, params, result)
+                except StreamStateError as exc:
+                    logger.info("Recomputing %s from scratch: %s", name, exc)
+            if outcome is None:
+                history = ohlcv_frame(df) if history is None else history
+                outcome, new_state = _compute_full(history, name, params)
+                if outcome["status"] == "ok":
+                    outcome["result"] = outcome["result"].iloc[rows:]
+            outcomes.append(outcome)
+            states.append(new_state)
+        added = merge_outputs(df.iloc[rows:], outcomes).dropna()
+        if not new_rows or list(added.columns) == list(previous.columns):
+            features = pd.concat([previous, added]) if len(added) else previous.copy()
+            seconds = time.perf_counter() - started
+            full = state.get("full_build") or {}
+            estimate = full.get("seconds", 0.0) * len(df) / max(full.get("rows", 1), 1)
+            report = {
+                "mode": "incremental",
+                "rows": len(df),
+                "new_rows": new_rows,
+                "seconds": seconds,
+                "speedup": estimate / seconds if seconds > 0 and estimate else None,
+                "reason": None,
+            }
+            logger.info(
+                "⚡ Incremental feature update: %d new bars in %.1f ms "
+                "(~%.0fx faster than a full recompute of %d bars)",
+                new_rows,
+                seconds * 1e3,
+                report["speedup"] or 0,
+                len(df),
+            )
+            states = states if new_rows else state["indicators"]
+            return features, _new_state(df, indicators, states, full), outcomes, report
+        reason = "saved features have different columns"
+
+    logger.info("Full feature build over %d bars (%s)", len(df), reason)
+    frame = ohlcv_frame(df)
+    outcomes, states = [], []
+    for ind in indicators:
+        outcome, new_state = _compute_full(frame, ind.get("name"), ind.get("params") or {})
+        outcomes.append(outcome)
+        states.append(new_state)
+    features = merge_outputs(df, outcomes).dropna()
+    seconds = time.perf_counter() - started
+    full = {"seconds": seconds, "rows": len(df)}
+    report = {
+        "mode": "full",
+        "rows": len(df),
+        "new_rows": len(df),
+        "seconds": seconds,
+        "speedup": None,
+        "reason": reason,
+    }
+    return features, _new_state(df, indicators, states, full), outcomes, report
+
+
+def state_path(
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+) -> Path:
+    """Location of the indicator state saved next to a features dataset."""
+    return get_dataset_path("features", symbol, mode, interval, outputsize).parent / STATE_FILE
+
+
+def load_state(path: Path) -> Optional[Dict[str, Any]]:
+    """Read saved indicator state; None when missing or unreadable."""
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable indicator state %s: %s", path, exc)
+        return None
+
+
+def save_state(path: Path, state: Dict[str, Any]) -> None:
+    """Write indicator state atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def update_feature_dataset(
+    df: pd.DataFrame,
+    indicators: Sequence[Dict[str, Any]],
+    symbol: str,
+    mode: str = "default",
+    interval: Optional[str] = None,
+    outputsize: Optional[str] = None,
+    version: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> Tuple[Path, pd.DataFrame, List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Update a cached features dataset from the full raw history ``df``.
+
+    Loads the saved state and the features version it belongs to, computes
+    only the new bars when they are still valid (see `update_features`),
+    saves the result as a new version and the state next to it.
+
+    Returns:
+        tuple: (saved version path, features, outcomes, report).
+    """
+    path = state_path(symbol, mode, interval, outputsize)
+    with dataset_lock("features", symbol, mode, interval, outputsize):
+        state = load_state(path)
+        previous = None
+        if state is not None and state.get("version"):
+            previous = load_dataset(
+                "features", symbol, mode, interval, outputsize, version=state["version"]
+            )
+        features, state, outcomes, report = update_features(df, indicators, previous, state)
+        saved = save_dataset(
+            features,
+            "features",
+            symbol,
+            mode,
+            interval,
+            outputsize,
+            version=version,
+            profile=profile,
+        )
+        state["version"] = saved.name if saved.is_dir() else saved.stem
+        save_state(path, state)
+    return saved, features, outcomes, report
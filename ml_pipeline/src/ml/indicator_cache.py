@@ -0,0 +1,137 @@
+"""
+On-disk memoization of computed indicator columns.
+
+Entries are keyed by (fingerprint of the OHLCV input, indicator name,
+canonical params, implementation and its version), so the indicators shared by the
+config/indicators_set*.yaml sweep are computed once per raw dataset and
+served from disk for every other set. Params are canonicalized with the
+kernel's defaults applied, so ``sma`` and ``sma(length=10)`` share an entry.
+The kernel module version and the installed pandas_ta version are part of
+every key, so upgrading either recomputes instead of serving stale columns.
+Each entry is a Parquet file of the indicator's columns; the cache directory
+is trimmed back under a byte budget by evicting the least recently used
+entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from .config import INDICATOR_CACHE_DIR, INDICATOR_CACHE_ENABLED, INDICATOR_CACHE_MAX_BYTES
+from .disk_cache import DiskCache
+from .indicator_kernels import INSTALLED_PANDAS_TA, KERNELS, KERNELS_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def frame_fingerprint(frame: pd.DataFrame) -> str:
+    """Content hash of a price frame: index, column names and values."""
+    digest = hashlib.sha256("|".join(map(str, frame.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def canonical_params(name: str, params: Optional[Dict[str, Any]], source: str) -> Dict[str, Any]:
+    """
+    Params as the implementation sees them.
+
+    Kernel params get the kernel's defaults filled in; pandas_ta params are
+    taken as configured (its defaults are not introspectable).
+    """
+    params = dict(params or {})
+    kernel = KERNELS.get(name)
+    if source == "kernel" and kernel is not None:
+        bound = inspect.signature(kernel).bind(None, **params)
+        bound.apply_defaults()
+        params = dict(list(bound.arguments.items())[1:])
+    return params
+
+
+class IndicatorCache(DiskCache):
+    """
+    Parquet store of indicator outputs with a size budget.
+
+    Args:
+        cache_dir: Directory holding cached entries.
+        max_bytes: Total size the directory is trimmed back to after writes.
+        enabled: When False every lookup misses and nothing is stored.
+    """
+
+    ENTRY_SUFFIX = ".parquet"
+    LABEL = "indicator cache"
+
+    def __init__(
+        self,
+        cache_dir: Path = INDICATOR_CACHE_DIR,
+        max_bytes: int = INDICATOR_CACHE_MAX_BYTES,
+        enabled: bool = INDICATOR_CACHE_ENABLED,
+    ) -> None:
+        super().__init__(cache_dir, max_bytes, enabled)
+
+    @staticmethod
+    def key(
+        fingerprint: str, name: str, params: Optional[Dict[str, Any]], source: str
+    ) -> str:
+        """Entry key of indicator ``name`` computed by ``source`` over the fingerprinted frame."""
+        payload = json.dumps(
+            [
+                fingerprint,
+                name,
+                canonical_params(name, params, source),
+                source,
+                KERNELS_VERSION,
+                INSTALLED_PANDAS_TA,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached indicator columns, or None when missing or unreadable."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            result = pd.read_parquet(path)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug("Ignoring unreadable indicator cache entry %s: %s", path, exc)
+            self._count(hit=False)
+            return None
+        self._count(hit=True)
+        self._touch(path)
+        return result
+
+    def put(self, key: str, result: pd.DataFrame) -> None:
+        """Store indicator columns under ``key`` and trim the cache."""
+        if not self.enabled:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            os.close(fd)
+            try:
+                result.to_parquet(tmp_name)
+                os.replace(tmp_name, self._path(key))
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Failed to write indicator cache entry %s: %s", key, exc)
+            return
+        self.evict()
+
+
+# Process-wide cache shared by feature engineering runs.
+indicator_cache = IndicatorCache()
@@ -0,0 +1,294 @@
+"""
+Indicator execution for feature engineering.
+
+`compute_indicators` evaluates the configured indicators against the OHLCV
+columns of a price frame, either one after another or concurrently on a
+thread or process pool, and returns one outcome per configured entry in the
+configured order. `merge_outputs` then appends the computed columns to the
+frame in that same order, so the result does not depend on which indicator
+finished first.
+
+Every indicator reads the same read-only OHLCV frame and returns new
+columns; nothing is written into the shared input, which is what makes the
+indicators independent and safe to run in parallel. Threads suit NumPy-heavy
+indicators that release the GIL; processes receive the OHLCV frame once per
+worker and suit pure-Python indicators.
+
+Indicators with a NumPy kernel in `indicator_kernels` use it (unless
+ML_INDICATOR_KERNELS=0 or the installed pandas_ta is not the release the
+kernels mirror); everything else goes through the pandas_ta accessor.
+Given an `IndicatorCache`, outputs already computed for the same OHLCV data
+and params are read back from it and fresh ones are stored in it.
+`compute_indicator_sets` evaluates several configurations at once, computing
+the indicators they share only once.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .indicator_cache import IndicatorCache, canonical_params, frame_fingerprint
+from .indicator_kernels import KERNELS, KERNELS_ENABLED, get_kernel
+from .indicator_kernels import pandas_ta as ta  # None when not installed
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+EXECUTORS = ("thread", "process")
+
+IndicatorFunction = Callable[..., Union[pd.Series, pd.DataFrame, None]]
+
+# OHLCV frame shared by the indicators of one process-pool worker.
+_worker_frame: Optional[pd.DataFrame] = None
+
+
+def ohlcv_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of the OHLCV columns present in ``df``, the only input indicators see."""
+    return df[[col for col in OHLCV_COLUMNS if col in df.columns]].copy()
+
+
+def indicator_function(
+    name: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[IndicatorFunction]:
+    """
+    Callable computing indicator ``name`` as ``func(frame, **params)``.
+
+    Prefers the NumPy kernel when one supports ``params``; returns None when
+    neither a kernel nor pandas_ta provides the indicator.
+    """
+    if not name:
+        return None
+    if KERNELS_ENABLED:
+        kernel = get_kernel(name, params)
+        if kernel is not None:
+            return kernel
+    if ta is None:
+        return None
+    if getattr(pd.DataFrame.ta, name, None) is None:
+        return None
+
+    def _pandas_ta(frame: pd.DataFrame, **params: Any):
+        return getattr(frame.ta, name)(**params)
+
+    return _pandas_ta
+
+
+def _as_frame(result: Union[pd.Series, pd.DataFrame, None], name: str) -> pd.DataFrame:
+    if result is None:
+        raise ValueError(f"{name} returned no data")
+    if isinstance(result, pd.Series):
+        return result.to_frame(result.name or name.upper())
+    return result
+
+
+def compute_indicator(frame: pd.DataFrame, name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Evaluate one indicator and describe the outcome.
+
+    Returns:
+        dict: ``name``, ``params``, ``status`` ("ok", "unknown" or "error"),
+        ``source`` ("kernel" or "pandas_ta"), ``result`` (DataFrame of new
+        columns when ok), ``error`` (message) and ``cached`` (whether the
+        result was read from an `IndicatorCache`).
+    """
+    outcome: Dict[str, Any] = {
+        "name": name,
+        "params": params,
+        "status": "ok",
+        "source": None,
+        "result": None,
+        "error": None,
+        "cached": False,
+    }
+    func = indicator_function(name, params)
+    if func is None:
+        outcome["status"] = "unknown"
+        return outcome
+    outcome["source"] = "kernel" if func is KERNELS.get(name) else "pandas_ta"
+    try:
+        outcome["result"] = _as_frame(func(frame, **params), name)
+    except Exception as exc:  # pylint: disable=broad-except
+        outcome["status"] = "error"
+        outcome["error"] = str(exc)
+    return outcome
+
+
+def _init_worker(frame: pd.DataFrame) -> None:
+    global _worker_frame  # pylint: disable=global-statement
+    _worker_frame = frame
+
+
+def _compute_in_worker(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return compute_indicator(_worker_frame, name, params)
+
+
+def _cached_outcome(
+    name: str, params: Dict[str, Any], source: str, result: pd.DataFrame
+) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "params": params,
+        "status": "ok",
+        "source": source,
+        "result": result,
+        "error": None,
+        "cached": True,
+    }
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    indicators: Sequence[Dict[str, Any]],
+    workers: int = 1,
+    executor: str = "thread",
+    cache: Optional[IndicatorCache] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate configured indicators, optionally in parallel.
+
+    Args:
+        df: Price frame with (a subset of) the OHLCV columns.
+        indicators: Config entries with ``name`` and optional ``params``.
+        workers: Indicators computed at once; 1 runs them sequentially.
+        executor: "thread" or "process" pool when ``workers`` > 1.
+        cache: Memo of indicator outputs to read from and add to.
+
+    Returns:
+        list: One `compute_indicator` outcome per entry, in configured order.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unsupported executor '{executor}'. Choose from {', '.join(EXECUTORS)}.")
+    frame = ohlcv_frame(df)
+    jobs = [(ind.get("name"), ind.get("params") or {}) for ind in indicators]
+    if cache is None or not cache.enabled:
+        return _compute_jobs(frame, jobs, workers, executor)
+
+    fingerprint = frame_fingerprint(frame)
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    keys: List[Optional[str]] = [None] * len(jobs)
+    for i, (name, params) in enumerate(jobs):
+        func = indicator_function(name, params)
+        if func is None:
+            continue
+        source = "kernel" if func is KERNELS.get(name) else "pandas_ta"
+        keys[i] = cache.key(fingerprint, name, params, source)
+        result = cache.get(keys[i])
+        if result is not None:
+            outcomes[i] = _cached_outcome(name, params, source, result)
+
+    pending = [i for i, outcome in enumerate(outcomes) if outcome is None]
+    computed = _compute_jobs(frame, [jobs[i] for i in pending], workers, executor)
+    for i, outcome in zip(pending, computed):
+        outcomes[i] = outcome
+        if outcome["status"] == "ok" and keys[i] is not None:
+            cache.put(keys[i], outcome["result"])
+    if len(pending) < len(jobs):
+        logger.info("Read %d of %d indicators from the cache.", len(jobs) - len(pending), len(jobs))
+    return outcomes
+
+
+def _compute_jobs(
+    frame: pd.DataFrame, jobs: List[Tuple[str, Dict[str, Any]]], workers: int, executor: str
+) -> List[Dict[str, Any]]:
+    if workers <= 1 or len(jobs) <= 1:
+        return [compute_indicator(frame, name, params) for name, params in jobs]
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)), initializer=_init_worker, initargs=(frame,)
+        )
+        with pool:
+            futures = [pool.submit(_compute_in_worker, name, params) for name, params in jobs]
+            return [future.result() for future in futures]
+
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(jobs)))
+    with pool:
+        futures = [pool.submit(compute_indicator, frame, name, params) for name, params in jobs]
+        return [future.result() for future in futures]
+
+
+def _job_key(name: str, params: Dict[str, Any]) -> str:
+    func = indicator_function(name, params)
+    source = "kernel" if func is not None and func is KERNELS.get(name) else "pandas_ta"
+    canonical = canonical_params(name, params, source)
+    return json.dumps([name, canonical], sort_keys=True, default=str)
+
+
+def compute_indicator_sets(
+    df: pd.DataFrame,
+    sets: Dict[str, Sequence[Dict[str, Any]]],
+    workers: int = 1,
+    executor: str = "thread",
+    cache: Optional[IndicatorCache] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Evaluate several indicator configurations in one pass.
+
+    The union of their indicators is computed once (entries equal up to
+    defaulted kernel params count as one) and the outcomes are handed back
+    per configuration.
+
+    Args:
+        df: Price frame with (a subset of) the OHLCV columns.
+        sets: Indicator config entries by set name.
+        workers, executor, cache: As for `compute_indicators`.
+
+    Returns:
+        dict: Set name to its outcomes, in the set's configured order.
+    """
+    union: Dict[str, Dict[str, Any]] = {}
+    keyed: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    for set_name, indicators in sets.items():
+        keyed[set_name] = []
+        for ind in indicators:
+            name, params = ind.get("name"), ind.get("params") or {}
+            key = _job_key(name, params)
+            union.setdefault(key, {"name": name, "params": params})
+            keyed[set_name].append((key, params))
+
+    entries = list(union.values())
+    logger.info(
+        "Computing %d distinct indicators for %d sets (%d configured).",
+        len(entries),
+        len(sets),
+        sum(len(jobs) for jobs in keyed.values()),
+    )
+    outcomes = compute_indicators(df, entries, workers=workers, executor=executor, cache=cache)
+    by_key = dict(zip(union, outcomes))
+    return {
+        set_name: [{**by_key[key], "params": params} for key, params in jobs]
+        for set_name, jobs in keyed.items()
+    }
+
+
+def merge_outputs(df: pd.DataFrame, outcomes: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Append the columns of successful outcomes to ``df`` in outcome order.
+
+    A column produced twice (or already in ``df``) keeps its position and
+    takes the later value, as repeated in-place assignment would.
+    """
+    added: Dict[str, pd.Series] = {}
+    for outcome in outcomes:
+        if outcome["status"] != "ok":
+            continue
+        for col in outcome["result"].columns:
+            added[col] = outcome["result"][col]
+    if not added:
+        return df
+    df = df.copy()
+    new = {}
+    for col, values in added.items():
+        if col in df.columns:
+            df[col] = values
+        else:
+            new[col] = values
+    if not new:
+        return df
+    return pd.concat([df, pd.DataFrame(new, index=df.index)], axis=1)
@@ -0,0 +1,942 @@
+"""
+Vectorized NumPy kernels for the indicators used in config/indicators*.yaml.
+
+Each kernel takes the OHLCV frame plus the indicator's pandas_ta parameters
+and returns a Series/DataFrame with the same column names and values as the
+matching ``df.ta.<name>(...)`` call (pandas_ta's own implementation, not its
+TA-Lib mode), without the accessor's per-call overhead and intermediate
+Series. Rolling sums (and variances) are dot products (``np.convolve``),
+rolling extremes fold the window's lags with ``np.maximum``/``np.minimum``,
+the mean absolute deviation reduces a ``sliding_window_view`` block by block,
+and the EMA/RMA recursions run through ``scipy.signal.lfilter``.
+
+`get_kernel` returns None when no kernel exists for a name or the config
+uses a parameter the kernel does not implement (``offset``, ``mamode``...),
+in which case `indicator_engine` falls back to pandas_ta. Inputs are assumed
+to be gap-free price data; recursions over series with interior NaNs are
+delegated to pandas so they still match.
+
+The kernels mirror one pandas_ta release, `PANDAS_TA_PACKAGE` at
+`PANDAS_TA_VERSION` (pinned in requirements.txt; pandas-ta-classic carries
+on the 0.3.14b line, which upstream pandas_ta no longer publishes for
+Python < 3.12, with TA-Lib-compatible EMA/RMA seeding and ADX smoothing).
+When a different pandas_ta is installed its output may differ (column names
+such as ``LR_14``/``BBL_20_2.0`` or values), so the kernels are switched
+off (`KERNELS_ENABLED`) and pandas_ta computes every indicator.
+
+The batch kernels keep no state. For incremental updates, `STREAMS` gives
+each kernel how many trailing bars its rolling windows look back and, for
+kernels with a recursion (EMA/RMA/Wilder filters, the OBV running sum), an
+init function that also returns the end value of each recursion and an
+update function that continues them. `record_state` and `continue_state`
+run those, so continuing computes only the bars appended since, with the
+same floating point operations a full run performs, and the values are
+identical.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import sys
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from packaging.version import InvalidVersion, Version
+from scipy.signal import lfilter
+
+from .config import INDICATOR_KERNELS_ENABLED
+
+# pandas-ta-classic continues the 0.3.14b line (same accessor and column names)
+# and installs on current Python/NumPy; upstream pandas_ta is used when it is absent.
+try:
+    import pandas_ta_classic as pandas_ta  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import pandas_ta  # type: ignore[import-not-found]
+    except ImportError:
+        pandas_ta = None
+
+logger = logging.getLogger(__name__)
+
+KernelResult = Optional[Union[pd.Series, pd.DataFrame]]
+
+# Elements of a sliding-window block reduced at once (bounds temporaries).
+_BLOCK_ELEMENTS = 1 << 20
+_EPSILON = sys.float_info.epsilon
+
+# pandas_ta release whose output the kernels reproduce and are tested against
+# (keep requirements.txt in sync).
+PANDAS_TA_PACKAGE = "pandas_ta_classic"
+PANDAS_TA_VERSION = "0.8.32"
+# Bump whenever a kernel's output changes; it is part of `IndicatorCache` keys.
+KERNELS_VERSION = 2
+
+
+def pandas_ta_compatible(installed: Optional[Tuple[str, str]]) -> bool:
+    """
+    Whether the kernels may stand in for the installed ``(module, version)``.
+
+    True for the pinned release and when no pandas_ta is installed (None):
+    the kernels are then the only implementation there is to fall back on.
+    """
+    if installed is None:
+        return True
+    package, version = installed
+    try:
+        return package == PANDAS_TA_PACKAGE and Version(version) == Version(PANDAS_TA_VERSION)
+    except InvalidVersion:
+        return False
+
+
+# Installed pandas_ta (module name, version); None when neither package is installed.
+INSTALLED_PANDAS_TA: Optional[Tuple[str, str]] = (
+    (pandas_ta.__name__, str(getattr(pandas_ta, "version", ""))) if pandas_ta is not None else None
+)
+KERNELS_ENABLED = INDICATOR_KERNELS_ENABLED and pandas_ta_compatible(INSTALLED_PANDAS_TA)
+if INDICATOR_KERNELS_ENABLED and not KERNELS_ENABLED:
+    logger.warning(
+        "%s %s is installed but the indicator kernels mirror %s %s; using pandas_ta only.",
+        *INSTALLED_PANDAS_TA,
+        PANDAS_TA_PACKAGE,
+        PANDAS_TA_VERSION,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Array helpers mirroring the pandas operations pandas_ta is built from
+# ---------------------------------------------------------------------------
+
+
+def _length(value: Any, default: int) -> int:
+    return int(value) if value and value > 0 else default
+
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    return frame[name].to_numpy(dtype=np.float64)
+
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[: len(values) - periods]
+    return out
+
+
+def _nanmean(values: np.ndarray) -> float:
+    valid = values[~np.isnan(values)]
+    return float(valid.mean()) if len(valid) else np.nan
+
+
+def _non_zero_range(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    diff = high - low
+    return np.where(diff == 0, _EPSILON, diff)
+
+
+def _rolling_dot(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted sum of each full window (weights[0] applies to the oldest value)."""
+    length = len(weights)
+    out = np.full(len(values), np.nan)
+    if len(values) >= length:
+        out[length - 1 :] = np.convolve(values, weights[::-1], "valid")
+    return out
+
+
+def _rolling_sum(values: np.ndarray, length: int) -> np.ndarray:
+    return _rolling_dot(values, np.ones(length))
+
+
+def _rolling_mean(values: np.ndarray, length: int) -> np.ndarray:
+    return _rolling_sum(values, length) / length
+
+
+def _rolling_reduce(
+    values: np.ndarray, length: int, reducer: Callable[[np.ndarray], np.ndarray]
+) -> np.ndarray:
+    """Apply ``reducer`` to blocks of full windows (shape ``(rows, length)``)."""
+    out = np.full(len(values), np.nan)
+    if len(values) < length:
+        return out
+    windows = sliding_window_view(values, length)
+    step = max(1, _BLOCK_ELEMENTS // length)
+    for start in range(0, len(windows), step):
+        block = windows[start : start + step]
+        out[length - 1 + start : length - 1 + start + len(block)] = reducer(block)
+    return out
+
+
+def _rolling_extreme(values: np.ndarray, length: int, ufunc: np.ufunc) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) < length:
+        return out
+    count = len(values) - length + 1
+    extreme = values[length - 1 :].copy()
+    for lag in range(1, length):
+        ufunc(extreme, values[length - 1 - lag : length - 1 - lag + count], out=extreme)
+    out[length - 1 :] = extreme
+    return out
+
+
+def _rolling_max(values: np.ndarray, length: int) -> np.ndarray:
+    return _rolling_extreme(values, length, np.maximum)
+
+
+def _rolling_min(values: np.ndarray, length: int) -> np.ndarray:
+    return _rolling_extreme(values, length, np.minimum)
+
+
+def _rolling_var(values: np.ndarray, length: int, ddof: int = 1) -> np.ndarray:
+    # Two-pass variance of each window: well conditioned, and a window's value
+    # does not depend on the bars before it.
+    return _rolling_reduce(values, length, lambda block: block.var(axis=1, ddof=ddof))
+
+
+def _rolling_mad(values: np.ndarray, length: int) -> np.ndarray:
+    def _mad(block: np.ndarray) -> np.ndarray:
+        return np.abs(block - block.mean(axis=1, keepdims=True)).mean(axis=1)
+
+    return _rolling_reduce(values, length, _mad)
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """``Series.ewm(alpha=alpha, adjust=False).mean()``."""
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return out
+    first = valid[0]
+    data = values[first:]
+    if np.isnan(data).any():
+        return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    out[first] = data[0]
+    if len(data) > 1:
+        decay = 1.0 - alpha
+        out[first + 1 :] = lfilter([alpha], [1.0, -decay], data[1:], zi=[decay * data[0]])[0]
+    return out
+
+
+def _seeded_ewm(values: np.ndarray, length: int, alpha: float) -> np.ndarray:
+    """``_ewm`` seeded with the SMA of the first ``length`` values from the first valid one."""
+    seeded = values.copy()
+    valid = np.flatnonzero(~np.isnan(values))
+    first = valid[0] if len(valid) else len(values)
+    if first + length <= len(values):
+        seeded[: first + length - 1] = np.nan
+        seeded[first + length - 1] = _nanmean(values[first : first + length])
+    else:
+        seeded[:] = np.nan
+    return _ewm(seeded, alpha)
+
+
+def _ema(values: np.ndarray, length: int) -> np.ndarray:
+    """pandas_ta ``ema`` (SMA-seeded, so chained EMAs seed past each other's NaNs)."""
+    return _seeded_ewm(values, length, 2.0 / (length + 1))
+
+
+def _rma(values: np.ndarray, length: int) -> np.ndarray:
+    """pandas_ta ``rma`` (Wilder's moving average, SMA-seeded)."""
+    return _seeded_ewm(values, length, 1.0 / length)
+
+
+def _wilder(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    pandas_ta ``wilder_smooth`` divided by ``length``.
+
+    Wilder's sum ``y[t] = y[t-1] - y[t-1] / length + x[t]`` is ``length`` times
+    an EMA with ``alpha = 1 / length``; callers only use ratios of smoothed
+    series, so the factor is left out. The seed is the sum of the
+    ``length - 1`` values after the first bar (or after a longer leading NaN run).
+    """
+    seeded = values.copy()
+    valid = np.flatnonzero(~np.isnan(values))
+    start = max(int(valid[0]), 1) if len(valid) else len(values)
+    seed = start + length - 2
+    if seed < len(values):
+        seeded[:seed] = np.nan
+        seeded[seed] = np.nansum(values[start : seed + 1]) / length
+    else:
+        seeded[:] = np.nan
+    return _ewm(seeded, 1.0 / length)
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, drift: int) -> np.ndarray:
+    prev_close = _shift(close, drift)
+    ranges = np.fmax(
+        np.abs(_non_zero_range(high, low)),
+        np.fmax(np.abs(high - prev_close), np.abs(prev_close - low)),
+    )
+    ranges[:drift] = np.nan
+    return ranges
+
+
+def _gains(close: np.ndarray, drift: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Positive and negative close changes over ``drift`` bars (zero otherwise)."""
+    negative = close - _shift(close, drift)
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    return positive, negative
+
+
+def _directional_movement(
+    high: np.ndarray, low: np.ndarray, drift: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """+DM and -DM over ``drift`` bars."""
+    up = high - _shift(high, drift)
+    down = _shift(low, drift) - low
+    positive = ((up > down) & (up > 0)) * up
+    negative = ((down > up) & (down > 0)) * down
+    positive[np.abs(positive) < _EPSILON] = 0
+    negative[np.abs(negative) < _EPSILON] = 0
+    return positive, negative
+
+
+def _directional_index(
+    positive: np.ndarray, negative: np.ndarray, true_range: np.ndarray, scalar: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """+DI, -DI and DX from the smoothed directional movement and true range."""
+    dmp = scalar * positive / true_range
+    dmn = scalar * negative / true_range
+    return dmp, dmn, scalar * np.abs(dmp - dmn) / (dmp + dmn)
+
+
+def _obv_flow(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Volume signed by the close's direction (the first bar counts as up)."""
+    sign = np.sign(close - _shift(close, 1))
+    if len(sign):
+        sign[0] = 1
+    return sign * volume
+
+
+def _hlc3(frame: pd.DataFrame) -> np.ndarray:
+    return (_column(frame, "high") + _column(frame, "low") + _column(frame, "close")) / 3
+
+
+def _series(frame: pd.DataFrame, values: np.ndarray, name: str) -> pd.Series:
+    return pd.Series(values, index=frame.index, name=name)
+
+
+def _frame(frame: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    return pd.DataFrame(columns, index=frame.index)
+
+
+# ---------------------------------------------------------------------------
+# Kernels (defaults and column names follow pandas_ta)
+# ---------------------------------------------------------------------------
+
+
+def sma(frame: pd.DataFrame, length: int = 10) -> KernelResult:
+    """Simple moving average: ``SMA_{length}``."""
+    length = _length(length, 10)
+    if len(frame) < length:
+        return None
+    return _series(frame, _rolling_mean(_column(frame, "close"), length), f"SMA_{length}")
+
+
+def ema(frame: pd.DataFrame, length: int = 10) -> KernelResult:
+    """Exponential moving average: ``EMA_{length}``."""
+    length = _length(length, 10)
+    if len(frame) < length:
+        return None
+    return _series(frame, _ema(_column(frame, "close"), length), f"EMA_{length}")
+
+
+def wma(frame: pd.DataFrame, length: int = 10, asc: bool = True) -> KernelResult:
+    """Linearly weighted moving average: ``WMA_{length}``."""
+    length = _length(length, 10)
+    if len(frame) < length:
+        return None
+    weights = np.arange(1, length + 1, dtype=np.float64)
+    if not asc:
+        weights = weights[::-1]
+    values = _rolling_dot(_column(frame, "close"), weights) / (0.5 * length * (length + 1))
+    return _series(frame, values, f"WMA_{length}")
+
+
+def tema(frame: pd.DataFrame, length: int = 10) -> KernelResult:
+    """Triple exponential moving average: ``TEMA_{length}``."""
+    length = _length(length, 10)
+    if len(frame) < length:
+        return None
+    ema1 = _ema(_column(frame, "close"), length)
+    ema2 = _ema(ema1, length)
+    ema3 = _ema(ema2, length)
+    return _series(frame, 3 * (ema1 - ema2) + ema3, f"TEMA_{length}")
+
+
+def vwma(frame: pd.DataFrame, length: int = 10) -> KernelResult:
+    """Volume weighted moving average: ``VWMA_{length}``."""
+    length = _length(length, 10)
+    if len(frame) < length:
+        return None
+    close, volume = _column(frame, "close"), _column(frame, "volume")
+    values = _rolling_mean(close * volume, length) / _rolling_mean(volume, length)
+    return _series(frame, values, f"VWMA_{length}")
+
+
+def linreg(frame: pd.DataFrame, length: int = 14) -> KernelResult:
+    """Linear regression end-point over the window: ``LR_{length}``."""
+    length = _length(length, 14)
+    if len(frame) < length:
+        return None
+    close = _column(frame, "close")
+    x_sum = 0.5 * length * (length - 1)
+    x2_sum = x_sum * (2 * length - 1) / 3
+    divisor = length * x2_sum - x_sum * x_sum
+    y_sum = _rolling_sum(close, length)
+    xy_sum = _rolling_dot(close, np.arange(length, dtype=np.float64))
+    slope = (length * xy_sum - x_sum * y_sum) / divisor
+    intercept = (y_sum * x2_sum - x_sum * xy_sum) / divisor
+    return _series(frame, slope * (length - 1) + intercept, f"LR_{length}")
+
+
+def rsi(frame: pd.DataFrame, length: int = 14, scalar: float = 100, drift: int = 1) -> KernelResult:
+    """Relative strength index: ``RSI_{length}``."""
+    length = _length(length, 14)
+    scalar = float(scalar) if scalar else 100
+    drift = _length(drift, 1)
+    if len(frame) < length:
+        return None
+    positive, negative = _gains(_column(frame, "close"), drift)
+    positive_avg = _rma(positive, length)
+    negative_avg = _rma(negative, length)
+    values = scalar * positive_avg / (positive_avg + np.abs(negative_avg))
+    return _series(frame, values, f"RSI_{length}")
+
+
+def roc(frame: pd.DataFrame, length: int = 10, scalar: float = 100) -> KernelResult:
+    """Rate of change: ``ROC_{length}``."""
+    length = _length(length, 10)
+    scalar = float(scalar) if scalar else 100
+    if len(frame) < length:
+        return None
+    close = _column(frame, "close")
+    previous = _shift(close, length)
+    return _series(frame, scalar * (close - previous) / previous, f"ROC_{length}")
+
+
+def macd(frame: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> KernelResult:
+    """MACD line, histogram and signal: ``MACD_``/``MACDh_``/``MACDs_{fast}_{slow}_{signal}``."""
+    fast, slow, signal = _macd_lengths(fast, slow, signal)
+    if len(frame) < max(fast, slow, signal):
+        return None
+    close = _column(frame, "close")
+    line = _ema(close, fast) - _ema(close, slow)
+    return _macd_frame(frame, (fast, slow, signal), line, _ema(line, signal))
+
+
+def _macd_lengths(fast: int, slow: int, signal: int) -> Tuple[int, int, int]:
+    fast, slow, signal = _length(fast, 12), _length(slow, 26), _length(signal, 9)
+    return (slow, fast, signal) if slow < fast else (fast, slow, signal)
+
+
+def _macd_frame(
+    frame: pd.DataFrame, lengths: Tuple[int, int, int], line: np.ndarray, signal: np.ndarray
+) -> pd.DataFrame:
+    props = "_{}_{}_{}".format(*lengths)
+    return _frame(
+        frame,
+        {f"MACD{props}": line, f"MACDh{props}": line - signal, f"MACDs{props}": signal},
+    )
+
+
+def bbands(frame: pd.DataFrame, length: int = 5, std: float = 2.0, ddof: int = 0) -> KernelResult:
+    """Bollinger Bands: ``BBL_``/``BBM_``/``BBU_``/``BBB_``/``BBP_{length}_{std}``."""
+    length = _length(length, 5)
+    std = float(std) if std and std > 0 else 2.0
+    ddof = int(ddof) if 0 <= ddof < length else 1
+    if len(frame) < length:
+        return None
+    close = _column(frame, "close")
+    deviations = std * np.sqrt(_rolling_var(close, length, ddof))
+    mid = _rolling_mean(close, length)
+    lower, upper = mid - deviations, mid + deviations
+    width = _non_zero_range(upper, lower)
+    props = f"_{length}_{std}"
+    return _frame(
+        frame,
+        {
+            f"BBL{props}": lower,
+            f"BBM{props}": mid,
+            f"BBU{props}": upper,
+            f"BBB{props}": 100 * width / mid,
+            f"BBP{props}": _non_zero_range(close, lower) / width,
+        },
+    )
+
+
+def atr(frame: pd.DataFrame, length: int = 14, drift: int = 1) -> KernelResult:
+    """Average true range with Wilder's smoothing: ``ATRr_{length}``."""
+    length = _length(length, 14)
+    drift = _length(drift, 1)
+    if len(frame) < length:
+        return None
+    tr = _true_range(_column(frame, "high"), _column(frame, "low"), _column(frame, "close"), drift)
+    return _series(frame, _rma(tr, length), f"ATRr_{length}")
+
+
+def adx(
+    frame: pd.DataFrame,
+    length: int = 14,
+    lensig: Optional[int] = None,
+    scalar: float = 100,
+    drift: int = 1,
+) -> KernelResult:
+    """Average directional index and DI lines: ``ADX_{lensig}``, ``DMP_``/``DMN_{length}``."""
+    length = _length(length, 14)
+    lensig = _length(lensig, length)
+    scalar = float(scalar) if scalar else 100
+    drift = _length(drift, 1)
+    if len(frame) < length:
+        return None
+    high, low = _column(frame, "high"), _column(frame, "low")
+    true_range = _wilder(_true_range(high, low, _column(frame, "close"), 1), length)
+    positive, negative = _directional_movement(high, low, drift)
+    # The DI lines start one bar after the Wilder seed, as in TA-Lib.
+    seed = np.flatnonzero(~np.isnan(true_range))[:1]
+    true_range[seed] = np.nan
+    dmp, dmn, dx = _directional_index(
+        _wilder(positive, length), _wilder(negative, length), true_range, scalar
+    )
+    return _frame(
+        frame,
+        {f"ADX_{lensig}": _rma(dx, lensig), f"DMP_{length}": dmp, f"DMN_{length}": dmn},
+    )
+
+
+def stoch(frame: pd.DataFrame, k: int = 14, d: int = 3, smooth_k: int = 3) -> KernelResult:
+    """Stochastic oscillator: ``STOCHk_``/``STOCHd_{k}_{d}_{smooth_k}``."""
+    k, d, smooth_k = _length(k, 14), _length(d, 3), _length(smooth_k, 3)
+    if len(frame) < max(k, d, smooth_k):
+        return None
+    lowest = _rolling_min(_column(frame, "low"), k)
+    highest = _rolling_max(_column(frame, "high"), k)
+    raw = 100 * (_column(frame, "close") - lowest) / _non_zero_range(highest, lowest)
+    stoch_k = _rolling_mean(raw, smooth_k)
+    props = f"_{k}_{d}_{smooth_k}"
+    return _frame(
+        frame, {f"STOCHk{props}": stoch_k, f"STOCHd{props}": _rolling_mean(stoch_k, d)}
+    )
+
+
+def cci(frame: pd.DataFrame, length: int = 14, c: float = 0.015) -> KernelResult:
+    """Commodity channel index: ``CCI_{length}_{c}``."""
+    length = _length(length, 14)
+    c = float(c) if c and c > 0 else 0.015
+    if len(frame) < length:
+        return None
+    typical = _hlc3(frame)
+    values = (typical - _rolling_mean(typical, length)) / (c * _rolling_mad(typical, length))
+    return _series(frame, values, f"CCI_{length}_{c}")
+
+
+def mfi(frame: pd.DataFrame, length: int = 14, drift: int = 1) -> KernelResult:
+    """Money flow index: ``MFI_{length}``."""
+    length = _length(length, 14)
+    drift = _length(drift, 1)
+    if len(frame) < length:
+        return None
+    typical = _hlc3(frame)
+    money_flow = typical * _column(frame, "volume")
+    change = typical - _shift(typical, drift)
+    positive = _rolling_sum(np.where(change > 0, money_flow, 0.0), length)
+    negative = _rolling_sum(np.where(change < 0, money_flow, 0.0), length)
+    return _series(frame, 100 * positive / (positive + negative), f"MFI_{length}")
+
+
+def obv(frame: pd.DataFrame) -> KernelResult:
+    """On-balance volume: ``OBV``."""
+    flow = _obv_flow(_column(frame, "close"), _column(frame, "volume"))
+    return _series(frame, np.cumsum(flow), "OBV")
+
+
+def uo(
+    frame: pd.DataFrame,
+    fast: int = 7,
+    medium: int = 14,
+    slow: int = 28,
+    fast_w: float = 4.0,
+    medium_w: float = 2.0,
+    slow_w: float = 1.0,
+    drift: int = 1,
+) -> KernelResult:
+    """Ultimate oscillator: ``UO_{fast}_{medium}_{slow}``."""
+    fast, medium, slow = _length(fast, 7), _length(medium, 14), _length(slow, 28)
+    fast_w = float(fast_w) if fast_w and fast_w > 0 else 4.0
+    medium_w = float(medium_w) if medium_w and medium_w > 0 else 2.0
+    slow_w = float(slow_w) if slow_w and slow_w > 0 else 1.0
+    drift = _length(drift, 1)
+    if len(frame) < max(fast, medium, slow):
+        return None
+    close = _column(frame, "close")
+    prev_close = _shift(close, drift)
+    lowest = np.fmin(_column(frame, "low"), prev_close)
+    buying = close - lowest
+    ranges = np.fmax(_column(frame, "high"), prev_close) - lowest
+
+    def _average(length: int) -> np.ndarray:
+        return _rolling_sum(buying, length) / _rolling_sum(ranges, length)
+
+    weighted = fast_w * _average(fast) + medium_w * _average(medium) + slow_w * _average(slow)
+    values = 100 * weighted / (fast_w + medium_w + slow_w)
+    return _series(frame, values, f"UO_{fast}_{medium}_{slow}")
+
+
+KERNELS: Dict[str, Callable[..., KernelResult]] = {
+    "sma": sma,
+    "ema": ema,
+    "wma": wma,
+    "tema": tema,
+    "vwma": vwma,
+    "linreg": linreg,
+    "rsi": rsi,
+    "roc": roc,
+    "macd": macd,
+    "bbands": bbands,
+    "atr": atr,
+    "adx": adx,
+    "stoch": stoch,
+    "cci": cci,
+    "mfi": mfi,
+    "obv": obv,
+    "uo": uo,
+}
+
+
+def get_kernel(
+    name: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[Callable[..., KernelResult]]:
+    """
+    Kernel for indicator ``name`` if it accepts every parameter in ``params``.
+
+    Returns None when the indicator has no kernel or the config uses options
+    only pandas_ta implements, so the caller can fall back to it.
+    """
+    kernel = KERNELS.get(name)
+    if kernel is None:
+        return None
+    try:
+        inspect.signature(kernel).bind(None, **(params or {}))
+    except TypeError:
+        return None
+    return kernel
+
+
+# ---------------------------------------------------------------------------
+# Incremental state: per-kernel init/update functions
+# ---------------------------------------------------------------------------
+
+
+class StreamStateError(Exception):
+    """Saved kernel state cannot be continued over the given bars."""
+
+
+def _ends(**recursions: np.ndarray) -> Dict[str, float]:
+    """Last value of each recursion, which must have started by the last bar."""
+    ends = {name: float(values[-1]) for name, values in recursions.items()}
+    if any(np.isnan(value) for value in ends.values()):
+        raise StreamStateError("Not enough bars to start every recursion.")
+    return ends
+
+
+def _continue_ewm(values: np.ndarray, alpha: float, last: float) -> np.ndarray:
+    """`_ewm` of ``values`` continued from its previous output ``last``."""
+    if np.isnan(values).any():
+        raise StreamStateError("Cannot continue a recursion over gaps.")
+    decay = 1.0 - alpha
+    return lfilter([alpha], [1.0, -decay], values, zi=[decay * last])[0]
+
+
+def _init_ema(frame: pd.DataFrame, length: int = 10) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 10)
+    values = _ema(_column(frame, "close"), length)
+    return _series(frame, values, f"EMA_{length}"), _ends(ema=values)
+
+
+def _update_ema(
+    frame: pd.DataFrame, ends: Dict[str, float], new_rows: int, length: int = 10
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 10)
+    close = _column(frame, "close")[-new_rows:]
+    values = _continue_ewm(close, 2.0 / (length + 1), ends["ema"])
+    return _series(frame.iloc[-new_rows:], values, f"EMA_{length}"), _ends(ema=values)
+
+
+def _init_tema(frame: pd.DataFrame, length: int = 10) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 10)
+    ema1 = _ema(_column(frame, "close"), length)
+    ema2 = _ema(ema1, length)
+    ema3 = _ema(ema2, length)
+    result = _series(frame, 3 * (ema1 - ema2) + ema3, f"TEMA_{length}")
+    return result, _ends(ema1=ema1, ema2=ema2, ema3=ema3)
+
+
+def _update_tema(
+    frame: pd.DataFrame, ends: Dict[str, float], new_rows: int, length: int = 10
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 10)
+    alpha = 2.0 / (length + 1)
+    ema1 = _continue_ewm(_column(frame, "close")[-new_rows:], alpha, ends["ema1"])
+    ema2 = _continue_ewm(ema1, alpha, ends["ema2"])
+    ema3 = _continue_ewm(ema2, alpha, ends["ema3"])
+    result = _series(frame.iloc[-new_rows:], 3 * (ema1 - ema2) + ema3, f"TEMA_{length}")
+    return result, _ends(ema1=ema1, ema2=ema2, ema3=ema3)
+
+
+def _init_macd(
+    frame: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[KernelResult, Dict[str, float]]:
+    lengths = _macd_lengths(fast, slow, signal)
+    close = _column(frame, "close")
+    fast_ema, slow_ema = _ema(close, lengths[0]), _ema(close, lengths[1])
+    signal_ema = _ema(fast_ema - slow_ema, lengths[2])
+    result = _macd_frame(frame, lengths, fast_ema - slow_ema, signal_ema)
+    return result, _ends(fast=fast_ema, slow=slow_ema, signal=signal_ema)
+
+
+def _update_macd(
+    frame: pd.DataFrame,
+    ends: Dict[str, float],
+    new_rows: int,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> Tuple[KernelResult, Dict[str, float]]:
+    lengths = _macd_lengths(fast, slow, signal)
+    close = _column(frame, "close")[-new_rows:]
+    fast_ema = _continue_ewm(close, 2.0 / (lengths[0] + 1), ends["fast"])
+    slow_ema = _continue_ewm(close, 2.0 / (lengths[1] + 1), ends["slow"])
+    signal_ema = _continue_ewm(fast_ema - slow_ema, 2.0 / (lengths[2] + 1), ends["signal"])
+    result = _macd_frame(frame.iloc[-new_rows:], lengths, fast_ema - slow_ema, signal_ema)
+    return result, _ends(fast=fast_ema, slow=slow_ema, signal=signal_ema)
+
+
+def _init_rsi(
+    frame: pd.DataFrame, length: int = 14, scalar: float = 100, drift: int = 1
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 14)
+    scalar = float(scalar) if scalar else 100
+    positive, negative = _gains(_column(frame, "close"), _length(drift, 1))
+    positive, negative = _rma(positive, length), _rma(negative, length)
+    values = scalar * positive / (positive + np.abs(negative))
+    return _series(frame, values, f"RSI_{length}"), _ends(positive=positive, negative=negative)
+
+
+def _update_rsi(
+    frame: pd.DataFrame,
+    ends: Dict[str, float],
+    new_rows: int,
+    length: int = 14,
+    scalar: float = 100,
+    drift: int = 1,
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 14)
+    scalar = float(scalar) if scalar else 100
+    positive, negative = _gains(_column(frame, "close"), _length(drift, 1))
+    positive = _continue_ewm(positive[-new_rows:], 1.0 / length, ends["positive"])
+    negative = _continue_ewm(negative[-new_rows:], 1.0 / length, ends["negative"])
+    values = scalar * positive / (positive + np.abs(negative))
+    result = _series(frame.iloc[-new_rows:], values, f"RSI_{length}")
+    return result, _ends(positive=positive, negative=negative)
+
+
+def _frame_true_range(frame: pd.DataFrame, drift: int) -> np.ndarray:
+    columns = (_column(frame, name) for name in ("high", "low", "close"))
+    return _true_range(*columns, drift)
+
+
+def _init_atr(
+    frame: pd.DataFrame, length: int = 14, drift: int = 1
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 14)
+    values = _rma(_frame_true_range(frame, _length(drift, 1)), length)
+    return _series(frame, values, f"ATRr_{length}"), _ends(atr=values)
+
+
+def _update_atr(
+    frame: pd.DataFrame, ends: Dict[str, float], new_rows: int, length: int = 14, drift: int = 1
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 14)
+    true_range = _frame_true_range(frame, _length(drift, 1))[-new_rows:]
+    values = _continue_ewm(true_range, 1.0 / length, ends["atr"])
+    return _series(frame.iloc[-new_rows:], values, f"ATRr_{length}"), _ends(atr=values)
+
+
+def _adx_frame(
+    frame: pd.DataFrame, lengths: Tuple[int, int], adx_: np.ndarray, dmp: np.ndarray, dmn: np.ndarray
+) -> pd.DataFrame:
+    length, lensig = lengths
+    return _frame(frame, {f"ADX_{lensig}": adx_, f"DMP_{length}": dmp, f"DMN_{length}": dmn})
+
+
+def _init_adx(
+    frame: pd.DataFrame,
+    length: int = 14,
+    lensig: Optional[int] = None,
+    scalar: float = 100,
+    drift: int = 1,
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 14)
+    lensig = _length(lensig, length)
+    scalar = float(scalar) if scalar else 100
+    high, low = _column(frame, "high"), _column(frame, "low")
+    true_range = _wilder(_frame_true_range(frame, 1), length)
+    positive, negative = _directional_movement(high, low, _length(drift, 1))
+    positive, negative = _wilder(positive, length), _wilder(negative, length)
+    ends = _ends(range=true_range, positive=positive, negative=negative)
+    # The DI lines start one bar after the Wilder seed, as in TA-Lib.
+    true_range[np.flatnonzero(~np.isnan(true_range))[:1]] = np.nan
+    dmp, dmn, dx = _directional_index(positive, negative, true_range, scalar)
+    adx_ = _rma(dx, lensig)
+    return _adx_frame(frame, (length, lensig), adx_, dmp, dmn), {**ends, **_ends(adx=adx_)}
+
+
+def _update_adx(
+    frame: pd.DataFrame,
+    ends: Dict[str, float],
+    new_rows: int,
+    length: int = 14,
+    lensig: Optional[int] = None,
+    scalar: float = 100,
+    drift: int = 1,
+) -> Tuple[KernelResult, Dict[str, float]]:
+    length = _length(length, 14)
+    lensig = _length(lensig, length)
+    scalar = float(scalar) if scalar else 100
+    high, low = _column(frame, "high"), _column(frame, "low")
+    true_range = _frame_true_range(frame, 1)[-new_rows:]
+    positive, negative = _directional_movement(high, low, _length(drift, 1))
+    true_range = _continue_ewm(true_range, 1.0 / length, ends["range"])
+    positive = _continue_ewm(positive[-new_rows:], 1.0 / length, ends["positive"])
+    negative = _continue_ewm(negative[-new_rows:], 1.0 / length, ends["negative"])
+    dmp, dmn, dx = _directional_index(positive, negative, true_range, scalar)
+    adx_ = _continue_ewm(dx, 1.0 / lensig, ends["adx"])
+    result = _adx_frame(frame.iloc[-new_rows:], (length, lensig), adx_, dmp, dmn)
+    return result, _ends(range=true_range, positive=positive, negative=negative, adx=adx_)
+
+
+def _init_obv(frame: pd.DataFrame) -> Tuple[KernelResult, Dict[str, float]]:
+    values = np.cumsum(_obv_flow(_column(frame, "close"), _column(frame, "volume")))
+    return _series(frame, values, "OBV"), _ends(obv=values)
+
+
+def _update_obv(
+    frame: pd.DataFrame, ends: Dict[str, float], new_rows: int
+) -> Tuple[KernelResult, Dict[str, float]]:
+    flow = _obv_flow(_column(frame, "close"), _column(frame, "volume"))[-new_rows:]
+    values = np.cumsum(np.concatenate(([ends["obv"]], flow)))[1:]
+    return _series(frame.iloc[-new_rows:], values, "OBV"), _ends(obv=values)
+
+
+class _Stream(NamedTuple):
+    """How a kernel's output is extended over appended bars."""
+
+    # Trailing bars besides the new ones an update reads, from the kernel params.
+    window: Callable[..., int]
+    # Kernels with a recursion: ``init(frame, **params)`` returns (output, end of
+    # each recursion) and ``update(frame, ends, new_rows, **params)`` continues
+    # them. Without these the kernel is rerun over the window and new bars.
+    init: Optional[Callable[..., Tuple[KernelResult, Dict[str, float]]]] = None
+    update: Optional[Callable[..., Tuple[KernelResult, Dict[str, float]]]] = None
+
+
+def _lookback(default: int, extra: int = -1) -> Callable[..., int]:
+    """Window of a kernel whose only lookback is ``length`` bars (plus ``extra``)."""
+    return lambda length=default, **_: _length(length, default) + extra
+
+
+STREAMS: Dict[str, _Stream] = {
+    "sma": _Stream(_lookback(10)),
+    "ema": _Stream(lambda **_: 0, _init_ema, _update_ema),
+    "wma": _Stream(_lookback(10)),
+    "tema": _Stream(lambda **_: 0, _init_tema, _update_tema),
+    "vwma": _Stream(_lookback(10)),
+    "linreg": _Stream(_lookback(14)),
+    "rsi": _Stream(lambda drift=1, **_: _length(drift, 1), _init_rsi, _update_rsi),
+    "roc": _Stream(_lookback(10, 0)),
+    "macd": _Stream(lambda **_: 0, _init_macd, _update_macd),
+    "bbands": _Stream(_lookback(5)),
+    "atr": _Stream(lambda drift=1, **_: _length(drift, 1), _init_atr, _update_atr),
+    "adx": _Stream(lambda drift=1, **_: _length(drift, 1), _init_adx, _update_adx),
+    "stoch": _Stream(
+        lambda k=14, d=3, smooth_k=3: _length(k, 14) + _length(d, 3) + _length(smooth_k, 3) - 3
+    ),
+    "cci": _Stream(_lookback(14)),
+    "mfi": _Stream(lambda length=14, drift=1: _length(length, 14) - 1 + _length(drift, 1)),
+    "obv": _Stream(lambda: 1, _init_obv, _update_obv),
+    "uo": _Stream(
+        lambda fast=7, medium=14, slow=28, drift=1, **_: max(
+            _length(fast, 7), _length(medium, 14), _length(slow, 28)
+        )
+        - 1
+        + _length(drift, 1)
+    ),
+}
+
+
+def record_state(
+    name: str, frame: pd.DataFrame, params: Optional[Dict[str, Any]] = None
+) -> Tuple[KernelResult, Dict[str, Any]]:
+    """
+    Run kernel ``name`` over ``frame`` and capture the state to extend it later.
+
+    Returns:
+        tuple: (kernel output, JSON-serializable state). ``state["window"]`` is
+        the number of trailing bars `continue_state` needs besides the new ones.
+
+    Raises:
+        StreamStateError: The run cannot be continued (e.g. gaps in the bars).
+    """
+    kernel, params = get_kernel(name, params), params or {}
+    if kernel is None:
+        raise StreamStateError(f"No kernel for {name} with params {params}.")
+    if frame.isna().to_numpy().any():
+        raise StreamStateError("Cannot save the state of a run over gaps.")
+    stream = STREAMS[name]
+    if stream.init is None:
+        result, ends = kernel(frame, **params), {}
+    else:
+        result, ends = stream.init(frame, **params)
+    if result is None:
+        raise StreamStateError(f"Not enough bars to start {name}.")
+    return result, {"window": stream.window(**params), "recursions": ends}
+
+
+def continue_state(
+    name: str,
+    frame: pd.DataFrame,
+    params: Optional[Dict[str, Any]],
+    state: Dict[str, Any],
+    new_rows: int,
+) -> Tuple[KernelResult, Dict[str, Any]]:
+    """
+    Compute kernel ``name`` for bars appended after a recorded run.
+
+    Args:
+        name: Indicator name.
+        frame: The last ``state["window"]`` bars of the recorded run (fewer if
+            the run was shorter) followed by the ``new_rows`` new bars.
+        params: Indicator parameters, as recorded.
+        state: State from `record_state` or a previous `continue_state`.
+        new_rows: Number of new bars at the end of ``frame``.
+
+    Returns:
+        tuple: (kernel output for the new bars only, updated state).
+
+    Raises:
+        StreamStateError: The state does not fit the bars; recompute instead.
+    """
+    kernel, params = get_kernel(name, params), params or {}
+    if kernel is None or not 0 < new_rows <= len(frame):
+        raise StreamStateError(f"Cannot continue {name} over {new_rows} new bars.")
+    stream = STREAMS[name]
+    if stream.update is None:
+        result, ends = kernel(frame, **params), {}
+        if result is None:
+            raise StreamStateError(f"Not enough bars to continue {name}.")
+        result = result.iloc[-new_rows:]
+    else:
+        result, ends = stream.update(frame, state["recursions"], new_rows, **params)
+    return result, {"window": state["window"], "recursions": ends}
@@ -0,0 +1,203 @@
+"""
+In-process PostgREST-compatible stub server for local testing and benchmarks.
+
+Implements the subset of the PostgREST HTTP API the pipeline uses: ``POST``
+inserts/upserts (``Prefer: resolution=merge-duplicates`` with an optional
+``on_conflict`` query parameter), ``GET`` of all rows with ``eq.`` filters and
+``DELETE`` of a whole table. Tables live in memory. Artificial latency and
+injected failures make it suitable for exercising `bulk_writer`.
+
+Usage:
+    with PostgrestStub(primary_keys={"stock_prices": ("symbol", "timestamp")}) as stub:
+        client = postgrest.SyncPostgrestClient(stub.url)
+        ...
+        rows = stub.rows("stock_prices")
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+class PostgrestStub:
+    """
+    Background HTTP server holding in-memory tables.
+
+    Args:
+        primary_keys: Table -> key columns used to resolve upserts when the
+            request does not name an ``on_conflict`` target.
+        latency: Seconds to sleep per request, plus ``latency_per_row`` per row written.
+        latency_per_row: Extra seconds per row in a write request.
+        host: Interface to bind (port is picked automatically).
+    """
+
+    def __init__(
+        self,
+        primary_keys: Optional[Dict[str, Sequence[str]]] = None,
+        latency: float = 0.0,
+        latency_per_row: float = 0.0,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.primary_keys = {name: tuple(cols) for name, cols in (primary_keys or {}).items()}
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.tables: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batch_sizes: List[int] = []
+        self._failures: List[int] = []
+        self._failures_after = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "PostgrestStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "PostgrestStub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def fail_next(self, count: int = 1, status: int = 503, after: int = 0) -> None:
+        """Make ``count`` write requests fail with ``status``, after ``after`` more succeed."""
+        with self._lock:
+            self._failures.extend([status] * count)
+            self._failures_after = after
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """Return a copy of the rows currently stored in ``table``."""
+        with self._lock:
+            return [dict(row) for row in self.tables.get(table, {}).values()]
+
+    def _write(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        upsert: bool,
+        on_conflict: Optional[Tuple[str, ...]],
+    ) -> Optional[int]:
+        """Apply a write; returns an HTTP error status or None on success."""
+        with self._lock:
+            if self._failures and self._failures_after <= 0:
+                return self._failures.pop(0)
+            self._failures_after -= 1
+            store = self.tables.setdefault(table, {})
+            key_cols = on_conflict or self.primary_keys.get(table)
+            for row in rows:
+                key = tuple(row.get(col) for col in key_cols) if key_cols else len(store)
+                if key in store and not upsert:
+                    return 409
+                if key in store:
+                    store[key].update(row)
+                else:
+                    store[key] = dict(row)
+            self.batch_sizes.append(len(rows))
+        return None
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler bound to the enclosing stub."""
+
+            def log_message(self, *_args) -> None:  # silence default stderr logging
+                return
+
+            def _send(self, status: int, body: Any = None) -> None:
+                payload = b"" if body is None else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _route(self) -> Tuple[str, Dict[str, str]]:
+                parts = urlsplit(self.path)
+                return parts.path.rstrip("/").rsplit("/", 1)[-1], dict(parse_qsl(parts.query))
+
+            def _enter(self) -> None:
+                with stub._lock:  # pylint: disable=protected-access
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+
+            def _exit(self) -> None:
+                with stub._lock:  # pylint: disable=protected-access
+                    stub.in_flight -= 1
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                self._enter()
+                try:
+                    table, query = self._route()
+                    length = int(self.headers.get("Content-Length") or 0)
+                    body = json.loads(self.rfile.read(length) or b"[]")
+                    rows = body if isinstance(body, list) else [body]
+                    time.sleep(stub.latency + stub.latency_per_row * len(rows))
+                    prefer = self.headers.get("Prefer", "")
+                    on_conflict = query.get("on_conflict")
+                    status = stub._write(  # pylint: disable=protected-access
+                        table,
+                        rows,
+                        upsert="merge-duplicates" in prefer,
+                        on_conflict=tuple(on_conflict.split(",")) if on_conflict else None,
+                    )
+                    if status is not None:
+                        self._send(status, {"message": "stub failure", "code": str(status)})
+                    elif "return=minimal" in prefer:
+                        self._send(201)
+                    else:
+                        self._send(201, rows)
+                finally:
+                    self._exit()
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                self._enter()
+                try:
+                    table, query = self._route()
+                    filters = {
+                        col: value[3:]
+                        for col, value in query.items()
+                        if value.startswith("eq.")
+                    }
+                    rows = [
+                        row
+                        for row in stub.rows(table)
+                        if all(str(row.get(col)) == value for col, value in filters.items())
+                    ]
+                    self._send(200, rows)
+                finally:
+                    self._exit()
+
+            def do_DELETE(self) -> None:  # noqa: N802 - http.server naming
+                self._enter()
+                try:
+                    table, _ = self._route()
+                    with stub._lock:  # pylint: disable=protected-access
+                        stub.tables.pop(table, None)
+                    self._send(204)
+                finally:
+                    self._exit()
+
+        return Handler
@@ -14,12 +14,20 @@ import logging
 import pickle
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 
 import pandas as pd
 
+from .bulk_writer import bulk_write
 from .config import DATA_STORAGE_DIR
-from .dataset_manager import DEFAULT_VERSION, load_dataset
+from .dataset_manager import (
+    DEFAULT_VERSION,
+    load_dataset,
+    read_feather_subset,
+    read_latest_pointer,
+    read_parquet_subset,
+    subset_frame,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 logger = logging.getLogger(__name__)
@@ -33,11 +41,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--model", default="random_forest", help="Model name directory (e.g., random_forest).")
     parser.add_argument(
         "--artifact-path",
-        help="Path to a specific model pickle. Defaults to latest.pkl under models/<symbol>/<model>/.",
+        help="Path to a specific model pickle. Defaults to the latest model under models/<symbol>/<model>/.",
     )
     parser.add_argument(
         "--metadata-path",
-        help="Path to a specific metadata JSON. Defaults to latest.json under models/<symbol>/<model>/.",
+        help="Path to a specific metadata JSON. Defaults to the latest metadata under models/<symbol>/<model>/.",
     )
     parser.add_argument(
         "--artifact-dir",
@@ -45,7 +53,7 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--dataset-path",
-        help="Optional direct path to features dataset (CSV/Parquet). Overrides cache lookup.",
+        help="Optional direct path to features dataset (CSV/Parquet/Feather). Overrides cache lookup.",
     )
     parser.add_argument("--dataset-type", default="features", choices=["features"], help="Dataset type when using cache.")
     parser.add_argument("--mode", default="intraday", help="Mode label used during feature engineering.")
@@ -56,6 +64,8 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_VERSION,
         help="Version of the feature dataset to load (default: latest).",
     )
+    parser.add_argument("--start", help="Only load features at or after this timestamp.")
+    parser.add_argument("--end", help="Only load features at or before this timestamp.")
     parser.add_argument("--target-column", default="target", help="Target column to drop if present.")
     parser.add_argument(
         "--predict-proba",
@@ -76,8 +86,13 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_dataset_from_path(path: str) -> pd.DataFrame:
-    """Load a dataset directly from CSV/Parquet."""
+def load_dataset_from_path(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load a dataset directly from CSV/Parquet/Feather, optionally projected and time-filtered."""
     dataset_path = Path(path).expanduser().resolve()
     if not dataset_path.exists():
         raise FileNotFoundError(f"Dataset path not found: {dataset_path}")
@@ -85,7 +100,9 @@ def load_dataset_from_path(path: str) -> pd.DataFrame:
     if dataset_path.suffix.lower() == ".csv":
         df = pd.read_csv(dataset_path)
     elif dataset_path.suffix.lower() in {".parquet", ".pq"}:
-        df = pd.read_parquet(dataset_path)
+        df = read_parquet_subset(dataset_path, columns, start, end)
+    elif dataset_path.suffix.lower() == ".feather":
+        df = read_feather_subset(dataset_path, columns, start, end)
     else:
         raise ValueError(f"Unsupported dataset format: {dataset_path.suffix}")
 
@@ -96,7 +113,7 @@ def load_dataset_from_path(path: str) -> pd.DataFrame:
         df["date"] = pd.to_datetime(df["date"])
         df.set_index("date", inplace=True)
 
-    return df
+    return subset_frame(df, columns, start, end)
 
 
 def resolve_artifact_paths(
@@ -106,9 +123,17 @@ def resolve_artifact_paths(
     metadata_path: Optional[str],
     artifact_dir: Optional[str],
 ) -> Tuple[Path, Path]:
+    """
+    Locate the model pickle and metadata JSON to load.
+
+    Unless explicit paths are given, ``latest`` is resolved through the
+    ``latest.ptr`` pointer written by `train_model.save_artifacts`, falling
+    back to ``latest.pkl``/``latest.json`` copies from older runs.
+    """
     base_dir = Path(artifact_dir or MODEL_DIR / symbol / model_name).resolve()
-    model_path = Path(artifact_path).expanduser().resolve() if artifact_path else base_dir / "latest.pkl"
-    meta_path = Path(metadata_path).expanduser().resolve() if metadata_path else base_dir / "latest.json"
+    latest = read_latest_pointer(base_dir) or "latest"
+    model_path = Path(artifact_path).expanduser().resolve() if artifact_path else base_dir / f"{latest}.pkl"
+    meta_path = Path(metadata_path).expanduser().resolve() if metadata_path else base_dir / f"{latest}.json"
     if not model_path.exists():
         raise FileNotFoundError(f"Model artifact not found at {model_path}")
     if not meta_path.exists():
@@ -131,11 +156,18 @@ def load_artifacts(
     return model, metadata
 
 
-def load_features(args: argparse.Namespace) -> pd.DataFrame:
-    """Load feature dataset from cache or explicit path based on CLI args."""
+def load_features(
+    args: argparse.Namespace,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load feature dataset from cache or explicit path based on CLI args.
+
+    Only ``columns`` (all when None) and rows within ``--start``/``--end`` are read.
+    """
     if args.dataset_path:
         logger.info("Loading dataset from %s", args.dataset_path)
-        return load_dataset_from_path(args.dataset_path)
+        return load_dataset_from_path(args.dataset_path, columns, args.start, args.end)
 
     df = load_dataset(
         dataset_type=args.dataset_type,
@@ -144,6 +176,9 @@ def load_features(args: argparse.Namespace) -> pd.DataFrame:
         interval=args.interval,
         outputsize=args.outputsize,
         version=args.features_version,
+        columns=columns,
+        start=args.start,
+        end=args.end,
     )
     if df is None:
         raise FileNotFoundError(
@@ -225,19 +260,20 @@ def build_results_df(
 def upload_predictions_to_supabase(results_df: pd.DataFrame, table_name: str) -> None:
     """Best-effort upload of prediction results to Supabase."""
     try:
-        from .supabase_uploader import SupabaseUploadError, supabase
+        from .supabase_uploader import supabase
     except Exception as exc:  # pylint: disable=broad-except
         logger.warning("Supabase upload skipped (client unavailable): %s", exc)
         return
 
     records = results_df.reset_index(drop=True).to_dict(orient="records")
     try:
-        for idx in range(0, len(records), 100):
-            chunk = records[idx : idx + 100]
-            response = supabase.table(table_name).upsert(chunk).execute()
-            if getattr(response, "error", None):
-                raise SupabaseUploadError(response.error.message)
-        logger.info("✅ Uploaded %d prediction rows to %s", len(records), table_name)
+        stats = bulk_write(supabase, table_name, records, method="upsert")
+        logger.info(
+            "✅ Uploaded %d prediction rows to %s (%.1f rows/s)",
+            stats["rows"],
+            table_name,
+            stats["rows_per_second"],
+        )
     except Exception as exc:  # pylint: disable=broad-except
         logger.warning("Failed to upload predictions: %s", exc)
 
@@ -254,7 +290,8 @@ def main() -> None:
     )
     metadata_dict = metadata if isinstance(metadata, dict) else dict(metadata)
 
-    features_df = load_features(args)
+    # Read only the columns the model was trained on (plus the time index).
+    features_df = load_features(args, columns=metadata_dict.get("feature_columns"))
     aligned_features = align_features(features_df, metadata_dict, args.target_column)
     predictions, proba = run_predictions(model, aligned_features, args.predict_proba)
     results_df = build_results_df(aligned_features, predictions, proba, args, metadata_dict)
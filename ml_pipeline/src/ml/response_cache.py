@@ -0,0 +1,237 @@
+"""
+On-disk cache for raw Alpha Vantage responses.
+
+Responses are keyed by (function, symbol, interval, outputsize), stored as
+gzip-compressed payloads and expire when the next bar closes, so re-running a
+fetch within the same bar is served locally without spending API quota. The
+cache directory is trimmed back under a byte budget by evicting the least
+recently used entries.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional
+
+import pytz
+
+from .config import HTTP_CACHE_DIR, HTTP_CACHE_ENABLED, HTTP_CACHE_MAX_BYTES
+from .disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+MARKET_TZ = pytz.timezone("America/New_York")
+DAILY_CLOSE_HOUR = 16
+
+
+def next_bar_close(interval: Optional[str], now: Optional[float] = None) -> float:
+    """
+    Return the epoch time at which the bar in progress closes.
+
+    Intraday intervals (e.g. ``60min``) align to multiples of the interval, so
+    60min bars expire at the next full hour. Daily data (no interval) expires
+    at the next 16:00 America/New_York close.
+    """
+    now = time.time() if now is None else now
+    if interval and interval.endswith("min"):
+        step = int(interval[:-3]) * 60
+        return (math.floor(now / step) + 1) * step
+
+    local_day = datetime.fromtimestamp(now, MARKET_TZ).date()
+    for offset in (0, 1):
+        day = local_day + timedelta(days=offset)
+        close = MARKET_TZ.localize(datetime(day.year, day.month, day.day, DAILY_CLOSE_HOUR))
+        if close.timestamp() > now:
+            break
+    return close.timestamp()
+
+
+class ResponseCache(DiskCache):
+    """
+    Gzip-compressed response store with bar-aligned TTLs and a size budget.
+
+    Args:
+        cache_dir: Directory holding cached entries.
+        max_bytes: Total size the directory is trimmed back to after writes.
+        enabled: When False every lookup misses and nothing is stored.
+    """
+
+    ENTRY_SUFFIX = ".json.gz"
+    LABEL = "response cache"
+
+    def __init__(
+        self,
+        cache_dir: Path = HTTP_CACHE_DIR,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        enabled: bool = HTTP_CACHE_ENABLED,
+    ) -> None:
+        super().__init__(cache_dir, max_bytes, enabled)
+
+    @staticmethod
+    def _key(
+        function: str,
+        symbol: str,
+        interval: Optional[str],
+        outputsize: Optional[str],
+        datatype: Optional[str] = None,
+    ) -> str:
+        parts = [function, symbol.upper(), interval or "", outputsize or ""]
+        if datatype and datatype != "json":
+            parts.append(datatype)
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def open_payload(
+        self,
+        function: str,
+        symbol: str,
+        interval: Optional[str] = None,
+        outputsize: Optional[str] = None,
+        datatype: Optional[str] = None,
+    ) -> Iterator[Optional[IO[bytes]]]:
+        """
+        Open a cached response body for streaming reads.
+
+        Yields a binary file positioned at the start of the payload, or None
+        when the entry is missing, expired or unreadable.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        path = self._path(self._key(function, symbol, interval, outputsize, datatype))
+        try:
+            file = gzip.open(path, "rb")
+        except FileNotFoundError:
+            self._count(hit=False)
+            yield None
+            return
+
+        with file:
+            try:
+                header = json.loads(file.readline())
+                fresh = header["expires_at"] > time.time()
+            except (OSError, ValueError, KeyError) as exc:
+                logger.debug("Ignoring unreadable cache entry %s: %s", path, exc)
+                fresh = False
+            self._count(hit=fresh)
+            if not fresh:
+                yield None
+                return
+            self._touch(path)
+            logger.info("Serving %s %s from the response cache.", function, symbol)
+            yield file
+
+    def get(
+        self,
+        function: str,
+        symbol: str,
+        interval: Optional[str] = None,
+        outputsize: Optional[str] = None,
+        datatype: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached JSON payload, or None when missing or expired."""
+        with self.open_payload(function, symbol, interval, outputsize, datatype) as file:
+            if file is None:
+                return None
+            try:
+                return json.loads(file.read())
+            except (OSError, ValueError) as exc:
+                logger.debug("Discarding undecodable cache entry for %s: %s", symbol, exc)
+                return None
+
+    def get_bytes(
+        self,
+        function: str,
+        symbol: str,
+        interval: Optional[str] = None,
+        outputsize: Optional[str] = None,
+        datatype: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """Return the cached raw payload bytes, or None when missing or expired."""
+        with self.open_payload(function, symbol, interval, outputsize, datatype) as file:
+            return None if file is None else file.read()
+
+    @contextmanager
+    def writer(
+        self,
+        function: str,
+        symbol: str,
+        interval: Optional[str] = None,
+        outputsize: Optional[str] = None,
+        expires_at: Optional[float] = None,
+        datatype: Optional[str] = None,
+    ) -> Iterator[Optional[IO[bytes]]]:
+        """
+        Stream a response body into the cache.
+
+        Yields a binary file to write payload chunks to (None when disabled).
+        The entry is published atomically when the block exits cleanly and
+        discarded if it raises, so partial or invalid payloads are never served.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        header = {
+            "function": function,
+            "symbol": symbol.upper(),
+            "interval": interval,
+            "outputsize": outputsize,
+            "datatype": datatype or "json",
+            "expires_at": expires_at or next_bar_close(interval),
+        }
+        path = self._path(self._key(function, symbol, interval, outputsize, datatype))
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw_file, gzip.GzipFile(
+                fileobj=raw_file, mode="wb"
+            ) as file:
+                file.write(json.dumps(header).encode("utf-8") + b"\n")
+                yield file
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        try:
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            logger.warning("Failed to write response cache entry %s: %s", path, exc)
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def put(
+        self,
+        function: str,
+        symbol: str,
+        interval: Optional[str],
+        outputsize: Optional[str],
+        content: bytes,
+        expires_at: Optional[float] = None,
+        datatype: Optional[str] = None,
+    ) -> None:
+        """Store a raw response body until ``expires_at`` (default: next bar close)."""
+        try:
+            with self.writer(
+                function, symbol, interval, outputsize, expires_at, datatype
+            ) as file:
+                if file is not None:
+                    file.write(content)
+        except OSError as exc:
+            logger.warning("Failed to write response cache entry for %s: %s", symbol, exc)
+
+
+# Process-wide cache shared by the real-time and historical fetchers.
+response_cache = ResponseCache()
@@ -0,0 +1,64 @@
+"""
+Per-stage wall-clock latencies of the fetch and ingestion pipelines.
+
+Both the real-time fetcher and the historical ingestion record into the
+process-wide `stage_timings` and report its snapshot at the end of a run.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class StageTimings:
+    """
+    Thread-safe wall-clock latency samples per pipeline stage.
+
+    Usage:
+        with stage_timings.time("fetch"):
+            raw = fetch_daily_adjusted(symbol)
+        stage_timings.snapshot()  # {"fetch": {"count": 1, "total_seconds": ...}}
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage count, total, mean, p50 and p95 latency in seconds."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+        summary = {}
+        for stage, values in samples.items():
+            count = len(values)
+            summary[stage] = {
+                "count": count,
+                "total_seconds": round(sum(values), 4),
+                "mean_seconds": round(sum(values) / count, 4),
+                "p50_seconds": round(values[(count - 1) // 2], 4),
+                "p95_seconds": round(values[min(count - 1, int(count * 0.95))], 4),
+            }
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples = {}
+
+
+# Process-wide per-stage latencies (fetch, normalize, cache, records, upload).
+stage_timings = StageTimings()
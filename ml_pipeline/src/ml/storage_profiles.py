@@ -0,0 +1,133 @@
+"""
+Named Parquet storage profiles shared by every dataset writer.
+
+A profile bundles the Parquet codec, compression level, row-group size,
+dictionary encoding and optional dtype downcasting applied on save:
+
+- ``default``: snappy, ML_PARQUET_ROW_GROUP_SIZE rows per group, dtypes as is
+- ``fast``: lz4, large row groups, no dictionary pages (cheapest to write/read)
+- ``compact``: zstd with dictionary encoding, float64 columns stored as float32
+  and the ``symbol`` column as a categorical
+
+Profiles are defined in `config.STORAGE_PROFILES` (extendable through the
+ML_STORAGE_PROFILES JSON variable) and selected with ML_STORAGE_PROFILE, or
+per dataset type with ML_RAW_STORAGE_PROFILE / ML_FEATURES_STORAGE_PROFILE.
+
+Downcast columns are recorded in the file's schema metadata and cast back to
+their original dtypes by `restore_dtypes` on load, so readers always see the
+dtypes that were saved (float32 storage does round the values).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import (
+    DATASET_ROW_GROUP_SIZE,
+    FEATURES_STORAGE_PROFILE,
+    RAW_STORAGE_PROFILE,
+    STORAGE_PROFILE,
+    STORAGE_PROFILES,
+)
+
+
+# Schema metadata key holding the profile name and the dtypes it changed.
+METADATA_KEY = b"ml_storage"
+
+PROFILE_DEFAULTS: Dict[str, Any] = {
+    "compression": "snappy",
+    "compression_level": None,
+    "row_group_size": None,  # None: DATASET_ROW_GROUP_SIZE
+    "use_dictionary": True,
+    "float_dtype": None,
+    "categorical_columns": [],
+}
+
+DATASET_PROFILES = {
+    "raw": RAW_STORAGE_PROFILE,
+    "features": FEATURES_STORAGE_PROFILE,
+}
+
+
+def get_profile(name: Optional[str] = None, dataset_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Resolve a storage profile to its full settings.
+
+    Args:
+        name: Profile name; defaults to the one configured for ``dataset_type``
+            (or ML_STORAGE_PROFILE).
+        dataset_type: "raw" or "features", used when ``name`` is None.
+    """
+    name = (name or DATASET_PROFILES.get(dataset_type or "") or STORAGE_PROFILE).lower()
+    if name not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown storage profile '{name}'. Choose from {', '.join(STORAGE_PROFILES)}."
+        )
+    profile = {**PROFILE_DEFAULTS, **STORAGE_PROFILES[name], "name": name}
+    if profile["row_group_size"] is None:
+        profile["row_group_size"] = DATASET_ROW_GROUP_SIZE
+    return profile
+
+
+def _downcast(df: pd.DataFrame, profile: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Apply the profile's dtype changes; returns the frame and the original dtypes."""
+    changes: Dict[str, Any] = {}
+    if profile["float_dtype"]:
+        target = pd.api.types.pandas_dtype(profile["float_dtype"])
+        for col, dtype in df.dtypes.items():
+            if pd.api.types.is_float_dtype(dtype) and dtype.itemsize > target.itemsize:
+                changes[col] = target
+    for col in profile["categorical_columns"]:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            changes[col] = "category"
+    if not changes:
+        return df, {}
+    original = {str(col): str(df[col].dtype) for col in changes}
+    return df.astype(changes), original
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    profile: Optional[Union[str, Dict[str, Any]]] = None,
+    dataset_type: Optional[str] = None,
+) -> None:
+    """
+    Write ``df`` (index included) to ``path`` with a storage profile.
+
+    Args:
+        df: Frame to store.
+        path: Destination file.
+        profile: Profile name or resolved settings (see `get_profile`).
+        dataset_type: Selects the configured profile when ``profile`` is None.
+    """
+    if not isinstance(profile, dict):
+        profile = get_profile(profile, dataset_type)
+    frame, original = _downcast(df, profile)
+    table = pa.Table.from_pandas(frame)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps({"profile": profile["name"], "dtypes": original}).encode()
+    pq.write_table(
+        table.replace_schema_metadata(metadata),
+        str(path),
+        compression=profile["compression"],
+        compression_level=profile["compression_level"],
+        row_group_size=profile["row_group_size"],
+        use_dictionary=profile["use_dictionary"],
+    )
+
+
+def restore_dtypes(df: pd.DataFrame, schema: Optional[pa.Schema]) -> pd.DataFrame:
+    """Cast columns a profile downcast on save back to their original dtypes."""
+    raw = (schema.metadata or {}).get(METADATA_KEY) if schema is not None else None
+    if not raw:
+        return df
+    dtypes = json.loads(raw).get("dtypes", {})
+    restore = {col: dtype for col, dtype in dtypes.items() if col in df.columns}
+    return df.astype(restore) if restore else df
@@ -0,0 +1,213 @@
+"""
+Incremental parsers for large Alpha Vantage time series responses.
+
+`TimeSeriesStreamParser` consumes a JSON response chunk by chunk and writes
+each bar straight into growable float64/int64 NumPy columns and a datetime64
+index, so the nested dict-of-dicts for an ``outputsize=full`` payload is never
+materialized. `parse_csv_series` handles ``datatype=csv`` responses with
+pandas' CSV reader (pyarrow engine when available).
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .alpha_vantage import COLUMN_MAPPING, AlphaVantageError, extract_time_series
+
+try:
+    import pyarrow  # type: ignore[import-not-found]  # noqa: F401  # pylint: disable=unused-import
+
+    CSV_ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - optional dependency
+    CSV_ENGINE = "c"
+
+INTEGER_COLUMNS = {"volume"}
+_SEPARATORS = " \t\r\n,"
+_WHITESPACE = " \t\r\n"
+
+
+class TimeSeriesStreamParser:
+    """
+    Parse an Alpha Vantage JSON payload incrementally into typed arrays.
+
+    Usage:
+        parser = TimeSeriesStreamParser("Time Series (60min)", mode="intraday", interval="60min")
+        for chunk in response.iter_content(chunk_size=65536):
+            parser.feed(chunk)
+        df = parser.finish()
+
+    Args:
+        series_key: Name of the time series object in the payload.
+        mode: Request mode, used to raise the usual errors for non-data payloads.
+        interval: Intraday interval, used with ``mode`` as above.
+        initial_capacity: Starting row capacity; arrays double when full.
+    """
+
+    def __init__(
+        self,
+        series_key: str,
+        mode: str = "intraday",
+        interval: str = "60min",
+        initial_capacity: int = 4096,
+    ) -> None:
+        self.series_key = series_key
+        self.mode = mode
+        self.interval = interval
+        self._start = re.compile(re.escape(json.dumps(series_key)) + r"\s*:\s*\{")
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "seek"
+        self._rows = 0
+        self._capacity = max(16, initial_capacity)
+        self._index = np.empty(self._capacity, dtype="datetime64[s]")
+        self._fields: List[Tuple[str, str]] = []
+        self._columns: Dict[str, np.ndarray] = {}
+        self._invalid_int: Dict[str, List[int]] = {}
+
+    @property
+    def rows(self) -> int:
+        """Number of bars parsed so far."""
+        return self._rows
+
+    def feed(self, chunk: Union[bytes, str]) -> None:
+        """Consume the next piece of the response body."""
+        text = chunk if isinstance(chunk, str) else self._text.decode(chunk)
+        if not text:
+            return
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        self._consume()
+
+    def finish(self) -> pd.DataFrame:
+        """Validate that the payload was complete and return the time-sorted frame."""
+        self.feed(self._text.decode(b"", final=True))
+        if self._state == "seek":
+            try:
+                payload = json.loads(self._buffer)
+            except ValueError as exc:
+                raise AlphaVantageError(f"Malformed Alpha Vantage response: {exc}") from exc
+            # Raises the rate-limit / error / missing-key error for this payload.
+            extract_time_series(payload, self.mode, self.interval)
+            raise AlphaVantageError(f"Could not locate '{self.series_key}' in the response.")
+        if self._state != "done":
+            raise AlphaVantageError(f"Truncated '{self.series_key}' object in the response.")
+
+        n = self._rows
+        data = {}
+        for _, name in self._fields:
+            column = self._columns[name][:n]
+            if self._invalid_int.get(name):
+                column = column.astype(np.float64)
+                column[self._invalid_int[name]] = np.nan
+            data[name] = column
+        index = pd.DatetimeIndex(self._index[:n].astype("datetime64[ns]"))
+        df = pd.DataFrame(data, index=index)
+        return df.sort_index()
+
+    def _consume(self) -> None:
+        buffer = self._buffer
+        if self._state == "seek":
+            match = self._start.search(buffer)
+            if match is None:
+                return
+            self._pos = match.end()
+            self._state = "entries"
+
+        decode = self._decoder.raw_decode
+        pos = self._pos
+        end = len(buffer)
+        while self._state == "entries":
+            while pos < end and buffer[pos] in _SEPARATORS:
+                pos += 1
+            if pos >= end:
+                break
+            if buffer[pos] == "}":
+                self._state = "done"
+                pos += 1
+                break
+            try:
+                timestamp, key_end = decode(buffer, pos)
+                colon = key_end
+                while colon < end and buffer[colon] in _WHITESPACE:
+                    colon += 1
+                if colon >= end:
+                    break
+                if buffer[colon] != ":":
+                    raise AlphaVantageError(f"Malformed time series entry near '{timestamp}'.")
+                value_start = colon + 1
+                while value_start < end and buffer[value_start] in _WHITESPACE:
+                    value_start += 1
+                values, value_end = decode(buffer, value_start)
+            except json.JSONDecodeError:
+                break  # entry continues in the next chunk
+            self._append(timestamp, values)
+            pos = value_end
+        self._pos = pos
+
+    def _append(self, timestamp: str, values: Dict[str, str]) -> None:
+        if not self._fields:
+            self._fields = [(key, COLUMN_MAPPING.get(key, key)) for key in values]
+            for _, name in self._fields:
+                dtype = np.int64 if name in INTEGER_COLUMNS else np.float64
+                self._columns[name] = np.empty(self._capacity, dtype=dtype)
+
+        row = self._rows
+        if row == self._capacity:
+            self._grow()
+        self._index[row] = np.datetime64(timestamp)
+        for key, name in self._fields:
+            raw = values.get(key)
+            try:
+                if name in INTEGER_COLUMNS:
+                    self._columns[name][row] = int(raw)
+                else:
+                    self._columns[name][row] = float(raw)
+            except (TypeError, ValueError):
+                if name in INTEGER_COLUMNS:
+                    self._invalid_int.setdefault(name, []).append(row)
+                    self._columns[name][row] = 0
+                else:
+                    self._columns[name][row] = np.nan
+        self._rows += 1
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        self._index = np.resize(self._index, self._capacity)
+        for name, column in self._columns.items():
+            self._columns[name] = np.resize(column, self._capacity)
+
+
+def parse_csv_series(
+    content: bytes,
+    mode: str = "intraday",
+    interval: str = "60min",
+) -> pd.DataFrame:
+    """
+    Parse a ``datatype=csv`` response into the same frame layout as the JSON path.
+
+    Alpha Vantage still answers rate limits and errors with JSON, which is
+    surfaced through the usual AlphaVantage* exceptions.
+    """
+    if content.lstrip()[:1] == b"{":
+        payload = json.loads(content)
+        extract_time_series(payload, mode, interval)
+        raise AlphaVantageError("Expected CSV time series but received JSON.")
+
+    df = pd.read_csv(BytesIO(content), engine=CSV_ENGINE)
+    time_column: Optional[str] = next(
+        (col for col in ("timestamp", "time", "date") if col in df.columns), None
+    )
+    if time_column is None:
+        raise AlphaVantageError(f"CSV response missing a timestamp column: {list(df.columns)}")
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop(time_column)))
+    df.index.name = None
+    return df.sort_index()
@@ -6,7 +6,9 @@ from requests.exceptions import RequestException
 import pandas as pd
 from supabase import create_client, Client
 
+from .bulk_writer import BulkWriteError, bulk_write
 from .config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
+from .upload_state import make_scope, upload_state
 
 TABLE_NAME = "stock_prices"
 LOG_TABLE_NAME = "pipeline_logs"
@@ -23,8 +25,26 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 
 
-def upload_to_supabase(df: pd.DataFrame, symbol: str) -> None:
-    """Uploads stock market data to Supabase."""
+def _record_batch(scope, hashes: pd.Series, rows) -> None:
+    """Mark the rows of one written batch as uploaded in the upload index."""
+    upload_state.record(scope, hashes.loc[[str(row["timestamp"]) for row in rows]])
+
+
+def upload_to_supabase(
+    df: pd.DataFrame,
+    symbol: str,
+    mode: str | None = None,
+    interval: str | None = None,
+    dedupe: bool = True,
+) -> None:
+    """
+    Uploads stock market data to Supabase.
+
+    Rows already uploaded for (symbol, mode, interval) with identical values
+    are skipped using the local upload index; pass ``dedupe=False`` to re-send
+    everything. The index is updated after every written batch, so a failure
+    partway only resends the batches that did not make it.
+    """
     if df.empty:
         print(f"⚠️ No data to upload for {symbol}")
         return
@@ -39,23 +59,34 @@ def upload_to_supabase(df: pd.DataFrame, symbol: str) -> None:
         lambda x: x.isoformat() if isinstance(x, (datetime, pd.Timestamp)) else x
     )
 
+    scope = make_scope(TABLE_NAME, symbol, mode, interval)
+    hashes = None
+    if dedupe:
+        df, hashes = upload_state.select_changed(df, scope, key_column="timestamp")
+        if df.empty:
+            logging.info("✅ No new or changed rows to upload for %s.", symbol)
+            return
+
     records = df.to_dict(orient="records")
+    on_batch = (lambda rows: _record_batch(scope, hashes, rows)) if hashes is not None else None
 
     try:
-        for chunk_start in range(0, len(records), 100):
-            chunk = records[chunk_start : chunk_start + 100]
-            response = supabase.table(TABLE_NAME).upsert(chunk).execute()
-
-            if not response.data:
-                raise SupabaseUploadError(
-                    "Upload failed to Supabase: invalid response or empty data"
-                )
-
-        logging.info("✅ Uploaded %d rows for %s to Supabase.", len(records), symbol)
-
+        stats = bulk_write(supabase, TABLE_NAME, records, method="upsert", on_batch=on_batch)
+        logging.info(
+            "✅ Uploaded %d rows for %s to Supabase (%.1f rows/s).",
+            stats["rows"],
+            symbol,
+            stats["rows_per_second"],
+        )
+
+    except BulkWriteError as e:
+        logging.error("Upload failed for %s: %s", symbol, e)
+        raise SupabaseUploadError(f"Upload failed: {e}") from e
     except (ValueError, KeyError, RequestException) as e:
         logging.error("Upload failed due to known error: %s", e)
         raise SupabaseUploadError(f"Upload failed due to known error: {e}") from e
+    finally:
+        upload_state.flush(scope)
 
 
 def upload_logs_to_supabase(
@@ -13,7 +13,7 @@ import logging
 import pickle
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -36,7 +36,11 @@ from .dataset_manager import (
     DEFAULT_VERSION,
     ensure_data_dirs,
     load_dataset,
+    read_feather_subset,
+    read_parquet_subset,
     split_dataset,
+    subset_frame,
+    write_latest_pointer,
 )
 
 logging.basicConfig(
@@ -61,7 +65,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--symbol", required=True, help="Ticker symbol to train on.")
     parser.add_argument(
         "--dataset-path",
-        help="Optional direct path to features dataset (CSV/Parquet). Overrides cache lookup.",
+        help="Optional direct path to features dataset (CSV/Parquet/Feather). Overrides cache lookup.",
     )
     parser.add_argument(
         "--dataset-type",
@@ -89,6 +93,19 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_VERSION,
         help="Version of the feature dataset to load (default: latest).",
     )
+    parser.add_argument(
+        "--start",
+        help="Only train on rows at or after this timestamp.",
+    )
+    parser.add_argument(
+        "--end",
+        help="Only train on rows at or before this timestamp.",
+    )
+    parser.add_argument(
+        "--feature-columns",
+        type=lambda value: [col.strip() for col in value.split(",") if col.strip()],
+        help="Comma-separated feature columns to load and train on (default: all).",
+    )
     parser.add_argument(
         "--target-column",
         default="target",
@@ -149,8 +166,13 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_dataset_from_path(path: str) -> pd.DataFrame:
-    """Load a dataset directly from CSV/Parquet."""
+def load_dataset_from_path(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load a dataset directly from CSV/Parquet/Feather, optionally projected and time-filtered."""
     dataset_path = Path(path).expanduser().resolve()
     if not dataset_path.exists():
         raise FileNotFoundError(f"Dataset path not found: {dataset_path}")
@@ -158,7 +180,9 @@ def load_dataset_from_path(path: str) -> pd.DataFrame:
     if dataset_path.suffix.lower() == ".csv":
         df = pd.read_csv(dataset_path)
     elif dataset_path.suffix.lower() in {".parquet", ".pq"}:
-        df = pd.read_parquet(dataset_path)
+        df = read_parquet_subset(dataset_path, columns, start, end)
+    elif dataset_path.suffix.lower() == ".feather":
+        df = read_feather_subset(dataset_path, columns, start, end)
     else:
         raise ValueError(f"Unsupported dataset format: {dataset_path.suffix}")
 
@@ -169,14 +193,21 @@ def load_dataset_from_path(path: str) -> pd.DataFrame:
         df["date"] = pd.to_datetime(df["date"])
         df.set_index("date", inplace=True)
 
-    return df
+    return subset_frame(df, columns, start, end)
+
 
+def load_features(
+    args: argparse.Namespace,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load feature dataset from cache or explicit path based on CLI args.
 
-def load_features(args: argparse.Namespace) -> pd.DataFrame:
-    """Load feature dataset from cache or explicit path based on CLI args."""
+    Only ``columns`` (all when None) and rows within ``--start``/``--end`` are read.
+    """
     if args.dataset_path:
         logger.info("Loading dataset from %s", args.dataset_path)
-        return load_dataset_from_path(args.dataset_path)
+        return load_dataset_from_path(args.dataset_path, columns, args.start, args.end)
 
     df = load_dataset(
         dataset_type=args.dataset_type,
@@ -185,6 +216,9 @@ def load_features(args: argparse.Namespace) -> pd.DataFrame:
         interval=args.interval,
         outputsize=args.outputsize,
         version=args.features_version,
+        columns=columns,
+        start=args.start,
+        end=args.end,
     )
     if df is None:
         raise FileNotFoundError(
@@ -283,29 +317,34 @@ def save_artifacts(
     export_onnx: bool = False,
     feature_dim: Optional[int] = None,
 ) -> Tuple[Path, Path, Optional[Path]]:
-    """Persist model pickle + metadata JSON + optional ONNX export."""
+    """
+    Persist model pickle + metadata JSON + optional ONNX export.
+
+    Each artifact is written once under its timestamp; ``latest`` is a
+    pointer (``latest.ptr``) switched atomically afterwards, so readers never
+    see a half-written model.
+    """
     timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     model_dir = Path(artifact_dir or MODEL_DIR / metadata["symbol"] / metadata["model"])
     model_dir.mkdir(parents=True, exist_ok=True)
 
     artifact_path = model_dir / f"{timestamp}.pkl"
-    latest_path = model_dir / "latest.pkl"
     metadata_path = model_dir / f"{timestamp}.json"
-    latest_metadata_path = model_dir / "latest.json"
 
     with artifact_path.open("wb") as file:
         pickle.dump(model, file)
-    with latest_path.open("wb") as file:
-        pickle.dump(model, file)
     with metadata_path.open("w", encoding="utf-8") as file:
         json.dump(metadata, file, indent=2)
-    with latest_metadata_path.open("w", encoding="utf-8") as file:
-        json.dump(metadata, file, indent=2)
 
     onnx_path = None
     if export_onnx and feature_dim:
         onnx_path = _export_onnx_model(model, feature_dim, model_dir / f"{timestamp}.onnx")
 
+    write_latest_pointer(model_dir, timestamp)
+    # Copies written before `latest` became a pointer are superseded now.
+    for legacy in ("latest.pkl", "latest.json"):
+        (model_dir / legacy).unlink(missing_ok=True)
+
     return artifact_path, metadata_path, onnx_path
 
 
@@ -369,7 +408,10 @@ def main() -> None:
     """Entry point for CLI training command."""
     ensure_data_dirs()
     args = parse_args()
-    df = load_features(args)
+    columns = None
+    if args.feature_columns:
+        columns = [*args.feature_columns, args.target_column]
+    df = load_features(args, columns=columns)
 
     if args.target_column not in df.columns:
         raise ValueError(f"Target column '{args.target_column}' not found in dataset.")
@@ -415,6 +457,8 @@ def main() -> None:
             "interval": args.interval,
             "outputsize": args.outputsize,
             "version": args.features_version,
+            "start": args.start,
+            "end": args.end,
         },
         "model": args.model,
         "task": model_task,
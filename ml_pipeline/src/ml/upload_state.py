@@ -0,0 +1,194 @@
+"""
+Local row-hash index of what has already been uploaded to Supabase.
+
+For each (table, symbol, mode, interval) scope the index stores one 64-bit hash
+per row key (timestamp/date). Before an upload, rows whose key is unknown or
+whose hash changed are selected; as batches are written their hashes are
+recorded in memory and written out every ``ML_UPLOAD_STATE_FLUSH_BATCHES``
+batches and by `UploadState.flush` at the end of the upload. Re-running a
+refresh therefore only sends the new bars and any revised ones instead of the
+whole fetched history.
+
+The index is advisory: delete ``ML_UPLOAD_STATE_DIR`` (or set
+``ML_UPLOAD_DEDUPE=0``) to force a full re-upload, e.g. after rows were removed
+from the remote table.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import UPLOAD_DEDUPE_ENABLED, UPLOAD_STATE_DIR, UPLOAD_STATE_FLUSH_BATCHES
+
+logger = logging.getLogger(__name__)
+
+Scope = Tuple[str, str, Optional[str], Optional[str]]
+
+
+def make_scope(
+    table: str,
+    symbol: str,
+    mode: Optional[str] = None,
+    interval: Optional[str] = None,
+) -> Scope:
+    """Build the index scope for one symbol's rows in ``table``."""
+    return (table, symbol.upper(), mode, interval if mode != "daily" else None)
+
+
+def hash_rows(
+    df: pd.DataFrame,
+    key_column: str,
+    ignore_columns: Iterable[str] = (),
+) -> pd.Series:
+    """
+    Hash each row's content, excluding ``ignore_columns`` (e.g. ingestion timestamps).
+
+    Returns:
+        pd.Series: uint64 hashes indexed by the row key rendered as a string.
+    """
+    ignored = set(ignore_columns)
+    columns = sorted(col for col in df.columns if col not in ignored)
+    hashes = pd.util.hash_pandas_object(df[columns], index=False)
+    return pd.Series(hashes.to_numpy(), index=df[key_column].astype(str).to_numpy())
+
+
+class UploadState:
+    """
+    Per-scope row-hash index persisted as small Parquet files.
+
+    Args:
+        state_dir: Directory holding one index file per scope.
+        enabled: When False every row is treated as new and nothing is stored.
+        flush_every: `record` calls per scope after which its index is written
+            out; `flush` writes the rest.
+    """
+
+    def __init__(
+        self,
+        state_dir: Path = UPLOAD_STATE_DIR,
+        enabled: bool = UPLOAD_DEDUPE_ENABLED,
+        flush_every: int = UPLOAD_STATE_FLUSH_BATCHES,
+    ) -> None:
+        self.state_dir = Path(state_dir)
+        self.enabled = enabled
+        self.flush_every = max(1, flush_every)
+        self._indexes: Dict[Scope, pd.Series] = {}
+        self._unsaved: Dict[Scope, int] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _path(self, scope: Scope) -> Path:
+        name = "__".join(part or "none" for part in scope)
+        return self.state_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.parquet"
+
+    def _load(self, scope: Scope) -> pd.Series:
+        with self._lock:
+            if scope in self._indexes:
+                return self._indexes[scope]
+        path = self._path(scope)
+        index = pd.Series([], dtype=np.uint64)
+        if path.exists():
+            try:
+                table = pd.read_parquet(path)
+                index = pd.Series(
+                    table["hash"].to_numpy(dtype=np.uint64),
+                    index=table["key"].astype(str).to_numpy(),
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Ignoring unreadable upload state %s: %s", path, exc)
+        with self._lock:
+            self._indexes[scope] = index
+        return index
+
+    def select_changed(
+        self,
+        df: pd.DataFrame,
+        scope: Scope,
+        key_column: str,
+        ignore_columns: Iterable[str] = (),
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Return the rows of ``df`` not yet uploaded (new key or changed content).
+
+        Returns:
+            tuple: (rows to upload, their hashes to pass to `record` once uploaded).
+        """
+        hashes = hash_rows(df, key_column, ignore_columns)
+        if not self.enabled or df.empty:
+            return df, hashes
+
+        stored = self._load(scope)
+        positions = stored.index.get_indexer(hashes.index)
+        known = positions >= 0
+        unchanged = np.zeros(len(df), dtype=bool)
+        unchanged[known] = stored.to_numpy()[positions[known]] == hashes.to_numpy()[known]
+        if unchanged.any():
+            logger.info(
+                "Skipping %d of %d already uploaded rows for %s",
+                int(unchanged.sum()),
+                len(df),
+                "/".join(part for part in scope if part),
+            )
+        return df.loc[~unchanged], hashes[~unchanged]
+
+    def record(self, scope: Scope, hashes: pd.Series) -> None:
+        """
+        Remember ``hashes`` as uploaded for ``scope``.
+
+        The index is written out every ``flush_every`` calls; call `flush` once
+        the upload is over. Hashes lost to a crash before that only make the
+        next run resend those rows.
+        """
+        if not self.enabled or hashes.empty:
+            return
+        stored = self._load(scope)
+        with self._lock:
+            stored = self._indexes.get(scope, stored)
+            merged = pd.concat([stored[~stored.index.isin(hashes.index)], hashes])
+            self._indexes[scope] = merged[~merged.index.duplicated(keep="last")]
+            self._unsaved[scope] = self._unsaved.get(scope, 0) + 1
+            due = self._unsaved[scope] >= self.flush_every
+        if due:
+            self.flush(scope)
+
+    def flush(self, scope: Optional[Scope] = None) -> None:
+        """Persist the recorded hashes of ``scope`` (default: every scope with unsaved ones)."""
+        with self._write_lock:
+            with self._lock:
+                scopes = list(self._unsaved) if scope is None else [scope]
+                pending = [(s, self._indexes[s]) for s in scopes if self._unsaved.pop(s, 0)]
+            for pending_scope, index in pending:
+                self._write(pending_scope, index)
+
+    def _write(self, scope: Scope, index: pd.Series) -> None:
+        path = self._path(scope)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame = pd.DataFrame({"key": index.index.astype(str), "hash": index.to_numpy()})
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            frame.to_parquet(tmp_name, index=False)
+            os.replace(tmp_name, path)
+        except Exception as exc:  # pylint: disable=broad-except
+            Path(tmp_name).unlink(missing_ok=True)
+            logger.warning("Failed to persist upload state %s: %s", path, exc)
+
+    def reset(self, scope: Scope) -> None:
+        """Forget everything recorded for ``scope`` so its rows are re-sent."""
+        with self._lock:
+            self._indexes.pop(scope, None)
+            self._unsaved.pop(scope, None)
+        self._path(scope).unlink(missing_ok=True)
+
+
+# Process-wide index shared by the real-time and historical uploaders.
+upload_state = UploadState()
@@ -0,0 +1,178 @@
+"""
+SQLite index of the versions stored in one dataset directory.
+
+Each dataset directory (``raw|features/<SYMBOL>/<mode>/...``) keeps a small
+``_versions.sqlite`` next to its versions with one row per version: row count,
+min/max timestamp, a hash of the column schema, byte size on disk, whether it
+is partitioned and where it is stored (``local``, ``s3`` or ``both``).
+
+`dataset_manager` updates it on every save and answers `list_versions`,
+`dataset_exists` and time-coverage questions from it without globbing the
+directory, opening Parquet files or probing S3.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+INDEX_FILE = "_versions.sqlite"
+LOCATIONS = ("local", "s3", "both")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    version TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    min_ts INTEGER,
+    max_ts INTEGER,
+    schema_hash TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    location TEXT NOT NULL,
+    partitioned INTEGER NOT NULL DEFAULT 0,
+    saved_at TEXT NOT NULL
+)
+"""
+_COLUMNS = (
+    "version", "rows", "min_ts", "max_ts", "schema_hash",
+    "bytes", "location", "partitioned", "saved_at",
+)
+
+
+def schema_signature(df: pd.DataFrame) -> str:
+    """Index and column names/dtypes of ``df`` as one comparable string."""
+    layout = [f"{df.index.name}:{df.index.dtype}"]
+    layout += [f"{col}:{dtype}" for col, dtype in df.dtypes.items()]
+    return "|".join(layout)
+
+
+def _to_epoch_ns(value: Any) -> Optional[int]:
+    """UTC epoch nanoseconds of a timestamp (naive values are taken as UTC)."""
+    if value is None or pd.isna(value):
+        return None
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return int(stamp.value)
+
+
+def describe_frame(df: pd.DataFrame) -> Dict[str, Any]:
+    """Row count, time range and schema hash of a dataset about to be saved."""
+    min_ts = max_ts = None
+    if isinstance(df.index, pd.DatetimeIndex) and len(df.index):
+        min_ts = _to_epoch_ns(df.index.min())
+        max_ts = _to_epoch_ns(df.index.max())
+    return {
+        "rows": len(df),
+        "min_ts": min_ts,
+        "max_ts": max_ts,
+        "schema_hash": hashlib.sha1(schema_signature(df).encode("utf-8")).hexdigest()[:16],
+    }
+
+
+class VersionIndex:
+    """
+    Per-directory version index backed by SQLite.
+
+    Args:
+        path: Location of the ``_versions.sqlite`` file (created on first write).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute(_SCHEMA)
+        return conn
+
+    def record(
+        self,
+        version: str,
+        df: pd.DataFrame,
+        nbytes: int,
+        location: str = "local",
+        partitioned: bool = False,
+        saved_at: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insert or replace the entry for ``version`` and return it.
+
+        ``saved_at`` (UTC) defaults to now; pass the file time when indexing
+        versions written earlier.
+        """
+        if location not in LOCATIONS:
+            raise ValueError(f"Unknown location '{location}'. Choose from {', '.join(LOCATIONS)}.")
+        entry = {
+            "version": version,
+            **describe_frame(df),
+            "bytes": int(nbytes),
+            "location": location,
+            "partitioned": int(partitioned),
+            "saved_at": (saved_at or datetime.utcnow()).isoformat() + "Z",
+        }
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO versions ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [entry[name] for name in _COLUMNS],
+            )
+        return entry
+
+    def get(self, version: str) -> Optional[Dict[str, Any]]:
+        """Entry for ``version``, or None when it is not indexed."""
+        if not self.exists():
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM versions WHERE version = ?", (version,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def versions(self) -> List[str]:
+        """All indexed versions, oldest name first."""
+        if not self.exists():
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT version FROM versions ORDER BY version").fetchall()
+        return [row["version"] for row in rows]
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every indexed entry, ordered by version."""
+        if not self.exists():
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM versions ORDER BY version").fetchall()
+        return [dict(row) for row in rows]
+
+    def covering(self, start: Any = None, end: Any = None) -> List[str]:
+        """Versions holding at least one row within the inclusive [start, end] range."""
+        if not self.exists():
+            return []
+        clauses, params = ["rows > 0"], []
+        if start is not None:
+            clauses.append("max_ts >= ?")
+            params.append(_to_epoch_ns(start))
+        if end is not None:
+            clauses.append("min_ts <= ?")
+            params.append(_to_epoch_ns(end))
+        query = f"SELECT version FROM versions WHERE {' AND '.join(clauses)} ORDER BY version"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [row["version"] for row in rows]
+
+    def remove(self, version: str) -> bool:
+        """Drop ``version`` from the index. Returns False when it was not indexed."""
+        if not self.exists():
+            return False
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute("DELETE FROM versions WHERE version = ?", (version,))
+        return cursor.rowcount > 0
@@ -0,0 +1,58 @@
+"""
+conftest.py
+Makes the project root importable so tests can use the
+`ml_pipeline.` package imports used throughout the pipeline modules, and
+provides the fixtures shared by several test modules.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """
+    Point the dataset manager at scratch raw/features directories.
+
+    S3 is switched off (``.env`` may configure a real bucket) and the
+    in-process dataset cache is emptied.
+    """
+    from ml_pipeline.src.ml import dataset_manager  # needs PROJECT_ROOT on sys.path
+
+    dirs = {"raw": tmp_path / "raw", "features": tmp_path / "features"}
+    monkeypatch.setattr(dataset_manager, "DATASET_DIRS", dirs)
+    monkeypatch.setattr(dataset_manager, "USE_S3", False)
+    dataset_manager.dataset_cache.clear()
+    return dirs
+
+
+def _ohlcv(rows=400, seed=7):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2023-01-02 09:00", periods=rows, freq="h", name="timestamp")
+    close = 150 + rng.standard_normal(rows).cumsum()
+    open_ = close + rng.normal(0, 0.3, rows)
+    spread = rng.uniform(0.1, 1.5, rows)
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 50_000, rows).astype(float),
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def ohlcv():
+    """Builder of a random-walk hourly OHLCV frame: ``ohlcv(rows=400, seed=7)``."""
+    return _ohlcv
@@ -0,0 +1,58 @@
+"""
+test_alpha_vantage_async.py
+Exercises `AsyncAlphaVantageClient` against an in-process httpx transport.
+"""
+
+import asyncio
+
+import httpx
+
+from ml_pipeline.src.ml.alpha_vantage import (
+    AlphaVantageRateLimitError,
+    AsyncAlphaVantageClient,
+)
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    symbol = request.url.params["symbol"]
+    if symbol == "LIMIT":
+        return httpx.Response(200, json={"Note": "Thank you for using Alpha Vantage!"})
+    return httpx.Response(
+        200,
+        json={
+            "Time Series (60min)": {
+                "2024-07-25 11:00:00": {
+                    "1. open": "201.0",
+                    "2. high": "202.0",
+                    "3. low": "200.0",
+                    "4. close": "201.5",
+                    "5. volume": "1200",
+                },
+                "2024-07-25 10:00:00": {
+                    "1. open": "200.0",
+                    "2. high": "201.0",
+                    "3. low": "199.0",
+                    "4. close": "201.0",
+                    "5. volume": "1000",
+                },
+            }
+        },
+    )
+
+
+def test_fetch_many_normalizes_and_reports_per_symbol_errors():
+    """Each symbol gets a sorted numeric frame, or the error raised for it."""
+
+    async def _fetch():
+        async with AsyncAlphaVantageClient(
+            api_key="demo",
+            max_concurrency=2,
+            transport=httpx.MockTransport(_handler),
+        ) as client:
+            return await client.fetch_many(["AAPL", "MSFT", "LIMIT"])
+
+    results = asyncio.run(_fetch())
+    assert list(results["AAPL"].columns) == ["open", "high", "low", "close", "volume"]
+    assert results["AAPL"].index.is_monotonic_increasing
+    assert results["MSFT"]["volume"].tolist() == [1000, 1200]
+    assert isinstance(results["LIMIT"], AlphaVantageRateLimitError)
@@ -0,0 +1,55 @@
+"""
+test_alpha_vantage_stub.py
+Records responses through the Alpha Vantage stub and replays them offline.
+"""
+
+import asyncio
+
+import httpx
+
+from ml_pipeline.src.ml.alpha_vantage import AsyncAlphaVantageClient
+from ml_pipeline.src.ml.alpha_vantage_stub import AlphaVantageStub
+from ml_pipeline.src.ml.streaming_parser import parse_csv_series
+
+
+def _fetch(url, symbol, outputsize="full"):
+    async def _run():
+        async with AsyncAlphaVantageClient(api_key="replay", base_url=url) as client:
+            return await client.fetch_dataframe(symbol, "daily", outputsize=outputsize)
+
+    return asyncio.run(_run())
+
+
+def test_record_then_replay_offline(tmp_path):
+    # A synthetic stub stands in for the real API while recording.
+    with AlphaVantageStub(synthetic_rows=300) as upstream:
+        with AlphaVantageStub(fixtures_dir=tmp_path, upstream=upstream.url) as recorder:
+            recorded = _fetch(recorder.url, "AAPL")
+        assert recorder.served["recorded"] == 1
+
+    fixtures = list(tmp_path.iterdir())
+    assert [path.name for path in fixtures] == [
+        "TIME_SERIES_DAILY_ADJUSTED_AAPL_daily_full.json"
+    ]
+
+    with AlphaVantageStub(fixtures_dir=tmp_path) as replay:
+        replayed = _fetch(replay.url, "AAPL")
+        compact = _fetch(replay.url, "AAPL", outputsize="compact")
+        csv = httpx.get(
+            replay.url,
+            params={
+                "function": "TIME_SERIES_DAILY_ADJUSTED",
+                "symbol": "AAPL",
+                "outputsize": "full",
+                "datatype": "csv",
+            },
+        )
+        missing = httpx.get(
+            replay.url, params={"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": "MSFT"}
+        ).json()
+
+    assert len(replayed) == 300
+    assert replayed.equals(recorded)
+    assert len(compact) == 100 and compact.index.max() == replayed.index.max()
+    assert parse_csv_series(csv.content, mode="daily")["close"].equals(replayed["close"])
+    assert "Error Message" in missing
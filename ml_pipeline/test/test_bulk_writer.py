@@ -0,0 +1,65 @@
+"""
+test_bulk_writer.py
+Runs `BulkWriter` against the in-process PostgREST stub server.
+"""
+
+import postgrest
+import pytest
+
+from ml_pipeline.src.ml.bulk_writer import BulkWriteError, BulkWriter
+from ml_pipeline.src.ml.postgrest_stub import PostgrestStub
+
+
+def _records(count):
+    return [
+        {"symbol": "AAPL", "timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}", "close": i}
+        for i in range(count)
+    ]
+
+
+def test_bulk_writer_upserts_concurrently_and_retries():
+    keys = {"stock_prices": ("symbol", "timestamp")}
+    with PostgrestStub(primary_keys=keys, latency=0.01) as stub:
+        client = postgrest.SyncPostgrestClient(stub.url)
+        stub.fail_next(2)
+        writer = BulkWriter(
+            client,
+            "stock_prices",
+            max_in_flight=4,
+            batch_size=50,
+            target_latency=1.0,
+            retry_backoff=0.01,
+        )
+        stats = writer.write(_records(3000))
+        # Upserting the same rows again must not duplicate them.
+        writer.write(_records(3000)[:500])
+
+        assert stats["rows"] == 3000
+        assert stats["failed_rows"] == 0
+        assert stats["retries"] == 2
+        assert stats["rows_per_second"] > 0
+        assert len(stub.rows("stock_prices")) == 3000
+        assert 1 < stub.max_in_flight <= 4
+        # Fast responses grow the batch size beyond the starting point.
+        assert max(stub.batch_sizes) > 50
+
+
+def test_bulk_writer_shrinks_batches_when_slow_and_reports_failures():
+    with PostgrestStub(latency_per_row=0.001) as stub:
+        client = postgrest.SyncPostgrestClient(stub.url)
+        writer = BulkWriter(
+            client,
+            "pipeline_logs",
+            method="insert",
+            max_in_flight=2,
+            batch_size=400,
+            target_latency=0.1,
+            max_retries=0,
+        )
+        writer.write(_records(1200))
+        assert writer.batch_size < 400
+
+        stub.fail_next(1, status=500)
+        with pytest.raises(BulkWriteError) as excinfo:
+            writer.write(_records(10))
+        assert excinfo.value.stats["failed_rows"] == 10
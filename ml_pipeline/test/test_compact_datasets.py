@@ -0,0 +1,116 @@
+"""
+test_compact_datasets.py
+Covers merging overlapping dataset versions and the retention policy.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ml_pipeline.src.ml import dataset_manager
+from ml_pipeline.src.ml.compact_datasets import compact_dataset, retained_versions
+from ml_pipeline.src.ml.dataset_manager import (
+    INDEX_FILE,
+    iter_datasets,
+    list_versions,
+    load_dataset,
+    save_dataset,
+)
+
+DATASET = {"dataset_type": "raw", "symbol": "AAPL", "mode": "intraday", "interval": "60min"}
+
+
+def _window(start, hours, value):
+    index = pd.date_range(start, periods=hours, freq="h", name="timestamp")
+    return pd.DataFrame({"close": np.full(hours, float(value))}, index=index)
+
+
+def test_retention_keeps_last_n_and_one_per_day():
+    stamps = {
+        "a": datetime(2024, 1, 1, 9),
+        "b": datetime(2024, 1, 1, 17),
+        "c": datetime(2024, 1, 2, 9),
+        "d": datetime(2024, 1, 3, 9),
+        "e": datetime(2024, 1, 3, 12),
+        "f": datetime(2024, 1, 3, 18),
+    }
+    assert retained_versions(stamps, keep_last=2, keep_daily=0) == ["e", "f"]
+    assert retained_versions(stamps, keep_last=0, keep_daily=2) == ["c", "f"]
+    assert retained_versions(stamps, keep_last=1, keep_daily=5) == ["b", "c", "f"]
+
+
+def test_overlapping_versions_merge_into_one_history(data_dirs):
+    # An older run with a different schema is kept untouched.
+    save_dataset(
+        _window("2023-12-01", 5, 0).assign(volume=1), **DATASET, version="20231201000000"
+    )
+    # Each run re-fetches the trailing window, overlapping the previous one.
+    save_dataset(_window("2024-01-01", 48, 1), **DATASET, version="20240102000000")
+    save_dataset(_window("2024-01-02", 48, 2), **DATASET, version="20240103000000")
+    save_dataset(_window("2024-01-03", 48, 3), **DATASET, version="20240104000000")
+
+    preview = compact_dataset(**DATASET, keep_last=1, keep_daily=0, dry_run=True)
+    assert preview["deleted"] == ["20240102000000", "20240103000000", "20240104000000"]
+    assert len(list_versions(**DATASET)) == 4
+
+    stats = compact_dataset(**DATASET, keep_last=1, keep_daily=0)
+    compacted = stats["compacted_version"]
+    assert stats["merged"] == 3 and stats["rows"] == 96
+    assert stats["deleted"] == preview["deleted"]
+    assert stats["bytes_freed"] > 0
+    assert list_versions(**DATASET) == ["20231201000000", compacted]
+    assert dataset_manager.resolve_version(**DATASET) == compacted
+
+    history = load_dataset(**DATASET)
+    assert history.index.is_monotonic_increasing and history.index.is_unique
+    # Newer runs win where windows overlap.
+    assert history.loc["2024-01-01 00:00", "close"] == 1.0
+    assert history.loc["2024-01-02 12:00", "close"] == 2.0
+    assert history.loc["2024-01-03 12:00", "close"] == 3.0
+
+    # Running again finds nothing left to merge or delete.
+    again = compact_dataset(**DATASET, keep_last=1, keep_daily=0)
+    assert again["compacted_version"] is None and again["deleted"] == []
+
+
+def test_named_versions_never_outrank_timestamped_ones(data_dirs):
+    # A hand-saved copy from before the index existed, then a regular run.
+    save_dataset(_window("2024-01-01", 24, 1), **DATASET, version="manual")
+    save_dataset(_window("2024-01-01", 48, 1), **DATASET, version="20251119103021")
+    base_dir = dataset_manager._dataset_dir(**DATASET)
+    written = datetime(2024, 1, 5, 12).timestamp()
+    os.utime(dataset_manager._version_file(base_dir, "manual"), (written, written))
+    (base_dir / INDEX_FILE).unlink()
+
+    # The rebuilt index keeps the file's write time rather than "now".
+    entries = {e["version"]: e for e in dataset_manager.list_version_entries(**DATASET)}
+    assert entries["manual"]["saved_at"] == datetime.utcfromtimestamp(written).isoformat() + "Z"
+
+    stats = compact_dataset(**DATASET, keep_last=1, keep_daily=0)
+    assert stats["compacted_version"] is None
+    assert stats["deleted"] == ["manual"]
+    assert list_versions(**DATASET) == ["20251119103021"]
+    assert retained_versions(
+        {"manual": datetime(2030, 1, 1), "20251119103021": datetime(2025, 11, 19)},
+        keep_last=1,
+        keep_daily=0,
+    ) == ["20251119103021"]
+
+
+def test_compaction_discovers_cached_datasets(data_dirs):
+    save_dataset(_window("2024-01-01", 5, 1), **DATASET, outputsize="compact", version="v1")
+    save_dataset(_window("2024-01-01", 5, 1), "raw", "MSFT", "daily", version="v1")
+    save_dataset(
+        _window("2024-01-01", 5, 1), "raw", "TSLA", "intraday", "5min", version="v1",
+        partitioning="month",
+    )
+    found = {
+        (d["symbol"], d["mode"], d["interval"], d["outputsize"]) for d in iter_datasets("raw")
+    }
+    assert found == {
+        ("AAPL", "intraday", "60min", "compact"),
+        ("MSFT", "daily", None, None),
+        ("TSLA", "intraday", "5min", None),
+    }
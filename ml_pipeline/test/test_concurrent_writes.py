@@ -0,0 +1,145 @@
+"""
+test_concurrent_writes.py
+Stress test of `dataset_manager` with several writer and reader processes
+sharing one dataset directory, plus the `file_lock` semantics it relies on.
+"""
+
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_pipeline.src.ml import dataset_manager
+from ml_pipeline.src.ml.file_lock import file_lock
+
+ROWS = 400
+WRITERS = 3
+SAVES_PER_WRITER = 4
+READERS = 2
+
+
+def _configure(root):
+    """Point a spawned process at the scratch directory (like the data_dirs fixture)."""
+    from pathlib import Path
+
+    root = Path(root)
+    dataset_manager.DATASET_DIRS = {"raw": root / "raw", "features": root / "features"}
+    dataset_manager.USE_S3 = False
+    dataset_manager.dataset_cache.clear()
+
+
+def _frame(value):
+    index = pd.date_range("2020-01-01", periods=ROWS, freq="D", name="date")
+    return pd.DataFrame(
+        {"close": np.full(ROWS, float(value)), "tag": np.full(ROWS, value)}, index=index
+    )
+
+
+def _writer(root, writer_id, partitioning, results):
+    _configure(root)
+    for i in range(SAVES_PER_WRITER):
+        dataset_manager.save_dataset(
+            _frame(writer_id * 1000 + i), "features", "AAPL", partitioning=partitioning
+        )
+    results.put(("writer", writer_id, None))
+
+
+def _reader(root, stop, results):
+    _configure(root)
+    loads, problems = 0, []
+    while not stop.is_set():
+        try:
+            df = dataset_manager.load_dataset("features", "AAPL", use_cache=False)
+        except Exception as exc:  # pylint: disable=broad-except
+            problems.append(repr(exc))
+            continue
+        if df is None:
+            continue
+        loads += 1
+        # Every saved version holds one writer's value on every row.
+        if len(df) != ROWS or df["tag"].nunique() != 1 or (df["close"] != df["tag"]).any():
+            problems.append(f"torn read: {len(df)} rows, tags {sorted(df['tag'].unique())[:5]}")
+    results.put(("reader", loads, problems))
+
+
+@pytest.mark.parametrize("partitioning", ["none", "month"])
+def test_parallel_writers_and_readers_see_only_complete_versions(
+    data_dirs, tmp_path, partitioning
+):
+    context = multiprocessing.get_context("spawn")
+    results, stop = context.Queue(), context.Event()
+    readers = [
+        context.Process(target=_reader, args=(str(tmp_path), stop, results))
+        for _ in range(READERS)
+    ]
+    writers = [
+        context.Process(target=_writer, args=(str(tmp_path), writer_id, partitioning, results))
+        for writer_id in range(1, WRITERS + 1)
+    ]
+    for process in readers + writers:
+        process.start()
+    for process in writers:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+    time.sleep(0.2)  # let readers observe the final state too
+    stop.set()
+    for process in readers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    reports = [results.get(timeout=10) for _ in range(WRITERS + READERS)]
+    reader_reports = [report for report in reports if report[0] == "reader"]
+    assert all(not problems for _, _, problems in reader_reports), reader_reports
+    assert sum(loads for _, loads, _ in reader_reports) > 0
+
+    versions = dataset_manager.list_versions("features", "AAPL")
+    # Writers saving in the same second get distinct versions instead of clobbering.
+    assert len(versions) == WRITERS * SAVES_PER_WRITER
+    tags = set()
+    for version in versions:
+        df = dataset_manager.load_dataset("features", "AAPL", version=version, use_cache=False)
+        assert len(df) == ROWS and df["tag"].nunique() == 1
+        tags.add(int(df["tag"].iloc[0]))
+    assert tags == {w * 1000 + i for w in range(1, WRITERS + 1) for i in range(SAVES_PER_WRITER)}
+    assert dataset_manager.resolve_version("features", "AAPL") in versions
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_file_lock_is_exclusive_across_threads_and_reentrant(tmp_path):
+    path = tmp_path / ".lock"
+    events = []
+
+    def contender():
+        with file_lock(path):
+            events.append("contender")
+
+    with file_lock(path):
+        with file_lock(path, shared=True):  # nested requests do not block
+            thread = threading.Thread(target=contender)
+            thread.start()
+            time.sleep(0.2)
+            events.append("holder")
+    thread.join(timeout=5)
+    assert events == ["holder", "contender"]
+
+    # A shared holder cannot upgrade, and exclusive waiters give up after the timeout.
+    errors = []
+
+    def try_exclusive():
+        try:
+            with file_lock(path, timeout=0.1):
+                pass
+        except TimeoutError as exc:
+            errors.append(exc)
+
+    with file_lock(path, shared=True):
+        with pytest.raises(RuntimeError):
+            with file_lock(path):
+                pass
+        worker = threading.Thread(target=try_exclusive)
+        worker.start()
+        worker.join(timeout=5)
+    assert len(errors) == 1
@@ -0,0 +1,118 @@
+"""
+test_data_fetcher.py
+Covers the incremental refresh in `src.ml.data_fetcher`: choosing the fetch
+outputsize from the cached history, merging the fetched bars into it and
+counting the bars that actually changed.
+"""
+
+import importlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import supabase
+
+from ml_pipeline.src.ml import config
+
+MODULES = ("ml_pipeline.src.ml.supabase_uploader", "ml_pipeline.src.ml.data_fetcher")
+NOW = pd.Timestamp("2024-03-15 16:00")
+
+
+@pytest.fixture
+def data_fetcher(monkeypatch):
+    """data_fetcher imported without Supabase credentials."""
+    monkeypatch.setattr(config, "SUPABASE_URL", "http://localhost")
+    monkeypatch.setattr(config, "SUPABASE_SERVICE_ROLE_KEY", "test")
+    monkeypatch.setattr(supabase, "create_client", lambda *_args: None)
+    for name in MODULES:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module(MODULES[-1])
+
+
+def _this_hour():
+    return pd.Timestamp.now(tz="UTC").tz_localize(None).floor("h")
+
+
+def _bars(start, hours, value):
+    index = pd.date_range(start, periods=hours, freq="h", name="timestamp")
+    return pd.DataFrame({"close": np.full(hours, float(value))}, index=index)
+
+
+def _refresh(data_fetcher, monkeypatch, cached, fresh):
+    """Run `incremental_refresh` against ``cached``; returns (merged, fetch size, changed)."""
+    requested = []
+
+    def fetch(**kwargs):
+        requested.append(kwargs["outputsize"])
+        return fresh
+
+    monkeypatch.setattr(data_fetcher, "load_cached_dataset", lambda **_kwargs: cached)
+    monkeypatch.setattr(data_fetcher, "fetch_stock_data", fetch)
+    merged, _, changed = data_fetcher.incremental_refresh("AAPL", "intraday", "60min")
+    return merged, requested[0], changed
+
+
+def test_choose_outputsize_covers_the_gap(data_fetcher):
+    choose = data_fetcher.choose_outputsize
+    bars = data_fetcher.COMPACT_BARS
+
+    assert choose(None, now=NOW) == "full"
+    assert choose(pd.NaT, now=NOW) == "full"
+    assert choose(NOW - pd.Timedelta(hours=bars - 1), now=NOW) == "compact"
+    assert choose(NOW - pd.Timedelta(hours=bars), now=NOW) == "full"
+    five_min_gap = NOW - pd.Timedelta(minutes=5 * (bars - 1))
+    assert choose(five_min_gap, "intraday", "5min", now=NOW) == "compact"
+    # Aware timestamps are compared in UTC.
+    aware = (NOW - pd.Timedelta(hours=2)).tz_localize("UTC").tz_convert("US/Eastern")
+    assert choose(aware, now=NOW) == "compact"
+    # Daily gaps count business days only.
+    assert choose(pd.Timestamp("2024-03-08"), "daily", now=NOW) == "compact"
+    assert choose(NOW - pd.offsets.BDay(bars), "daily", now=NOW) == "full"
+
+
+def test_refresh_merges_overlap_with_fetched_rows_winning(data_fetcher, monkeypatch):
+    start = _this_hour() - pd.Timedelta(hours=47)
+    cached = _bars(start, 24, 1)
+    # The fetch repeats the last 4 cached bars (one of them twice) with revised values.
+    fresh = _bars(start + pd.Timedelta(hours=20), 28, 2)
+    fresh = pd.concat([fresh.iloc[:1].assign(close=1.5), fresh])
+
+    merged, size, changed = _refresh(data_fetcher, monkeypatch, cached, fresh)
+
+    assert size == "compact"
+    assert changed == 28
+    assert len(merged) == 48
+    assert merged.index.is_unique and merged.index.is_monotonic_increasing
+    assert (merged["close"].iloc[:20] == 1.0).all()
+    assert (merged["close"].iloc[20:] == 2.0).all()
+
+
+def test_refresh_of_empty_cache_fetches_full_history(data_fetcher, monkeypatch):
+    fresh = _bars("2024-01-01", 10, 1)
+    for cached in (None, fresh.iloc[:0]):
+        merged, size, changed = _refresh(data_fetcher, monkeypatch, cached, fresh)
+        assert size == "full"
+        assert changed == 10
+        pd.testing.assert_frame_equal(merged, fresh, check_freq=False)
+
+
+def test_refresh_after_gap_longer_than_compact_window_fetches_full(data_fetcher, monkeypatch):
+    bars = data_fetcher.COMPACT_BARS
+    start = _this_hour() - pd.Timedelta(hours=2 * bars)
+    cached = _bars(start, 24, 1)
+    fresh = _bars(start, 2 * bars, 2)
+
+    merged, size, _ = _refresh(data_fetcher, monkeypatch, cached, fresh)
+
+    assert size == "full"
+    pd.testing.assert_frame_equal(merged, fresh, check_freq=False)
+
+
+def test_refetching_the_cached_bars_changes_nothing(data_fetcher, monkeypatch):
+    cached = _bars(_this_hour() - pd.Timedelta(hours=23), 24, 1)
+
+    merged, _, changed = _refresh(data_fetcher, monkeypatch, cached, cached.iloc[-5:].copy())
+
+    assert changed == 0
+    pd.testing.assert_frame_equal(merged, cached, check_freq=False)
@@ -0,0 +1,118 @@
+"""
+test_dataset_cache.py
+Covers the in-process LRU cache behind `dataset_manager.load_dataset`.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_pipeline.src.ml import dataset_manager
+from ml_pipeline.src.ml.dataset_cache import DatasetCache, frame_nbytes
+from ml_pipeline.src.ml.dataset_manager import load_dataset, save_dataset
+
+
+@pytest.fixture
+def cache(data_dirs, monkeypatch):
+    """Scratch dataset directories and a fresh cache wired into the manager."""
+    fresh = DatasetCache(max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(dataset_manager, "dataset_cache", fresh)
+    return fresh
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record every Parquet read performed by the dataset manager."""
+    calls = []
+    original = dataset_manager.read_parquet_subset
+
+    def tracking(path, *args, **kwargs):
+        calls.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(dataset_manager, "read_parquet_subset", tracking)
+    return calls
+
+
+def _frame(rows=500, value=0.0):
+    index = pd.date_range("2024-01-01", periods=rows, freq="min", name="timestamp")
+    return pd.DataFrame({"close": np.full(rows, value), "rsi": np.arange(rows, dtype=float)}, index=index)
+
+
+def test_repeated_loads_are_served_from_memory(cache, reads):
+    save_dataset(_frame(), "features", "AAPL", version="v1")
+
+    first = load_dataset("features", "AAPL")
+    second = load_dataset("features", "AAPL")
+    projected = load_dataset("features", "AAPL", columns=["rsi"])
+    load_dataset("features", "AAPL", columns=["rsi"])
+
+    assert len(reads) == 2  # one read per distinct projection
+    pd.testing.assert_frame_equal(first, second)
+    assert list(projected.columns) == ["rsi"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
+    assert stats["bytes"] == frame_nbytes(first) + frame_nbytes(projected)
+
+
+def test_callers_cannot_corrupt_cached_frames(cache, reads):
+    save_dataset(_frame(), "features", "AAPL", version="v1")
+
+    loaded = load_dataset("features", "AAPL")
+    loaded.iloc[0, 0] = 999.0
+    loaded["extra"] = 1
+
+    again = load_dataset("features", "AAPL")
+    assert again.iloc[0, 0] == 0.0
+    assert "extra" not in again.columns
+    assert len(reads) == 1
+
+
+def test_changed_files_are_never_served_stale(cache, reads):
+    save_dataset(_frame(value=1.0), "features", "AAPL", version="v1")
+    assert load_dataset("features", "AAPL")["close"].iloc[0] == 1.0
+
+    # Another process rewrites the version latest points to behind our back.
+    path = dataset_manager.get_dataset_path("features", "AAPL", version="v1")
+    _frame(value=2.0).to_parquet(path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_dataset("features", "AAPL")["close"].iloc[0] == 2.0
+    assert cache.stats()["stale"] == 1
+
+    # Saving through the manager drops the entries up front.
+    save_dataset(_frame(value=3.0), "features", "AAPL", version="v2")
+    assert cache.stats()["entries"] == 0
+    assert load_dataset("features", "AAPL")["close"].iloc[0] == 3.0
+
+
+def test_least_recently_used_entries_are_evicted_within_budget(cache):
+    size = frame_nbytes(_frame())
+    cache.max_bytes = int(size * 2.5)
+    for symbol in ("AAA", "BBB", "CCC"):
+        save_dataset(_frame(), "features", symbol, version="v1")
+
+    load_dataset("features", "AAA")
+    load_dataset("features", "BBB")
+    load_dataset("features", "AAA")  # AAA is now the most recently used
+    load_dataset("features", "CCC")
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    load_dataset("features", "AAA")
+    assert cache.stats()["hits"] == 2
+    load_dataset("features", "BBB")
+    assert cache.stats()["misses"] == 4
+
+
+def test_oversized_frames_and_disabled_cache_bypass_storage(cache, reads):
+    save_dataset(_frame(), "features", "AAPL", version="v1")
+    cache.max_bytes = 10
+    load_dataset("features", "AAPL")
+    load_dataset("features", "AAPL", use_cache=False)
+    assert cache.stats()["entries"] == 0
+    assert len(reads) == 2
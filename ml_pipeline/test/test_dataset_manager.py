@@ -0,0 +1,436 @@
+"""
+test_dataset_manager.py
+Covers projection/time-range pushdown and versioned storage in
+`src.ml.dataset_manager`.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from ml_pipeline.src.ml import dataset_manager, storage_profiles
+from ml_pipeline.src.ml.dataset_manager import load_dataset, read_parquet_subset, save_dataset
+
+
+@pytest.fixture
+def data_dirs(data_dirs, monkeypatch):
+    """The shared scratch directories, with row groups small enough to skip."""
+    monkeypatch.setattr(storage_profiles, "DATASET_ROW_GROUP_SIZE", 100)
+    return data_dirs
+
+
+def _frame(rows=1000, tz=None):
+    index = pd.date_range("2020-01-01", periods=rows, freq="D", tz=tz, name="date")
+    return pd.DataFrame(
+        {
+            "close": np.arange(rows, dtype=float),
+            "volume": np.arange(rows, dtype=np.int64) * 10,
+            "rsi": np.linspace(0, 100, rows),
+        },
+        index=index,
+    )
+
+
+def _bound(value, tz):
+    return dataset_manager._coerce_bound(value, tz)
+
+
+def test_projection_keeps_datetime_index(data_dirs):
+    df = _frame()
+    save_dataset(df, "features", "AAPL", version="v1")
+
+    loaded = load_dataset("features", "AAPL", columns=["close", "missing"])
+    assert list(loaded.columns) == ["close"]
+    assert isinstance(loaded.index, pd.DatetimeIndex)
+    assert loaded.index.name == "date"
+    pd.testing.assert_series_equal(loaded["close"], df["close"], check_freq=False)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_projection_keeps_time_column_of_files_without_index(tmp_path, suffix):
+    df = _frame()
+    exported = tmp_path / f"export{suffix}"
+    indexed = tmp_path / f"indexed{suffix}"
+    if suffix == ".parquet":
+        df.reset_index().to_parquet(exported, index=False)
+        df.to_parquet(indexed)
+    else:
+        df.reset_index().to_feather(exported)
+        dataset_manager._write_feather(df, indexed)
+
+    loaded = dataset_manager.read_dataset_file(exported, ["close"])
+    assert list(loaded.columns) == ["date", "close"]
+    loaded = dataset_manager.read_dataset_file(indexed, ["close"])
+    assert list(loaded.columns) == ["close"] and loaded.index.name == "date"
+
+
+@pytest.mark.parametrize("tz", [None, "UTC"])
+def test_time_range_is_inclusive_for_naive_and_aware_bounds(data_dirs, tz):
+    df = _frame(tz=tz)
+    save_dataset(df, "features", "AAPL", version="v1")
+
+    for start, end in (
+        ("2020-03-01", "2020-03-31"),
+        (pd.Timestamp("2020-03-01", tz="UTC"), pd.Timestamp("2020-03-31", tz="UTC")),
+    ):
+        loaded = load_dataset("features", "AAPL", columns=["rsi"], start=start, end=end)
+        assert len(loaded) == 31
+        assert loaded.index.min().day == 1 and loaded.index.max().day == 31
+
+    tail = load_dataset("features", "AAPL", start="2022-09-01")
+    pd.testing.assert_frame_equal(tail, df.loc["2022-09-01":], check_freq=False)
+
+
+def test_row_groups_outside_the_range_are_skipped(data_dirs):
+    path = save_dataset(_frame(), "features", "AAPL", version="v1")
+    assert pq.ParquetFile(path).metadata.num_row_groups == 10
+
+    start, end = pd.Timestamp("2020-04-15"), pd.Timestamp("2020-05-15")
+    # Row-group min/max statistics on the index let the reader prune to one group.
+    fragment = next(ds.dataset(path).get_fragments())
+    matching = fragment.split_by_row_group(
+        (ds.field("date") >= start) & (ds.field("date") <= end)
+    )
+    assert len(matching) == 1
+
+    loaded = read_parquet_subset(path, ["close"], start=start, end=end)
+    assert len(loaded) == 31
+    assert loaded["close"].iloc[0] == 105.0
+
+
+def test_latest_fallback_forwards_filters(data_dirs):
+    df = _frame(rows=50)
+    save_dataset(df, "raw", "MSFT", version="20240101000000", persist_latest=False)
+
+    loaded = load_dataset("raw", "MSFT", columns=["volume"], end="2020-01-10")
+    assert list(loaded.columns) == ["volume"]
+    assert len(loaded) == 10
+
+
+class FakeS3:
+    """In-memory stand-in for the boto3 calls used by the dataset manager."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = []
+
+    def upload_file(self, filename, _bucket, key):
+        self.uploads.append(key)
+        with open(filename, "rb") as handle:
+            self.objects[key] = handle.read()
+
+    def copy_object(self, Bucket, Key, CopySource):  # noqa: N803 - boto3 naming
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    def delete_object(self, Bucket, Key):  # noqa: N803
+        self.objects.pop(Key, None)
+
+    def download_file(self, _bucket, key, filename):
+        with open(filename, "wb") as handle:
+            handle.write(self.objects[key])
+
+    def get_object(self, Bucket, Key):  # noqa: N803
+        raise KeyError(Key)
+
+    def head_object(self, Bucket, Key):  # noqa: N803
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {"ETag": str(hash(self.objects[Key]))}
+
+
+def _intraday(start="2023-01-01", end="2023-06-30 23:00"):
+    index = pd.date_range(start, end, freq="h", name="timestamp")
+    return pd.DataFrame({"close": np.arange(len(index), dtype=float)}, index=index)
+
+
+def test_merge_time_series_keeps_newest_rows():
+    existing = _intraday("2023-01-01", "2023-01-02 23:00")
+    new = _intraday("2023-01-02 12:00", "2023-01-03 23:00") + 1000
+    # A bar fetched twice in one response: the later row is the final one.
+    new = pd.concat([new.iloc[[0]] - 500, new])
+
+    merged = dataset_manager.merge_time_series(existing, new)
+
+    assert len(merged) == 72
+    assert merged.index.is_unique and merged.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(merged.iloc[:36], existing.iloc[:36], check_freq=False)
+    pd.testing.assert_frame_equal(merged.iloc[36:], new.iloc[1:], check_freq=False)
+
+    shuffled = new.iloc[1:].sample(frac=1, random_state=0)
+    for empty in (None, existing.iloc[:0]):
+        merged = dataset_manager.merge_time_series(empty, shuffled)
+        pd.testing.assert_frame_equal(merged, new.iloc[1:], check_freq=False)
+
+
+def test_partitioned_save_rewrites_only_changed_partitions(data_dirs):
+    df = _intraday()
+    first = save_dataset(df, "raw", "AAPL", "intraday", "60min", version="v1", partitioning="month")
+    assert sorted(p.parent.name for p in first.rglob("data.parquet")) == [
+        f"month={m:02d}" for m in range(1, 7)
+    ]
+
+    updated = df.copy()
+    updated.loc["2023-06-30 23:00", "close"] = -1.0
+    appended = pd.concat([updated, _intraday("2023-07-01", "2023-07-01 05:00")])
+    second = save_dataset(
+        appended, "raw", "AAPL", "intraday", "60min", version="v2", partitioning="month"
+    )
+
+    # Unchanged months are hard links to the previous latest, not new encodes.
+    rewritten = sorted(
+        str(p.relative_to(second))
+        for p in second.rglob("data.parquet")
+        if not (first / p.relative_to(second)).exists()
+        or not os.path.samefile(p, first / p.relative_to(second))
+    )
+    assert rewritten == ["year=2023/month=06/data.parquet", "year=2023/month=07/data.parquet"]
+    v1 = load_dataset("raw", "AAPL", "intraday", "60min", version="v1")
+    pd.testing.assert_frame_equal(v1, df, check_freq=False)
+    latest = load_dataset("raw", "AAPL", "intraday", "60min")
+    pd.testing.assert_frame_equal(latest, appended, check_freq=False)
+    assert dataset_manager.list_versions("raw", "AAPL", "intraday", "60min") == ["v1", "v2"]
+
+
+def test_partitioned_load_reads_only_overlapping_partitions(data_dirs, monkeypatch):
+    df = _intraday()
+    save_dataset(df, "raw", "AAPL", "intraday", "60min", version="v1", partitioning="month")
+
+    read = []
+    original = dataset_manager.read_parquet_subset
+
+    def tracking(path, *args, **kwargs):
+        read.append(Path(path).parent.name)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(dataset_manager, "read_parquet_subset", tracking)
+    loaded = load_dataset(
+        "raw", "AAPL", "intraday", "60min", start="2023-02-15", end="2023-03-01 10:00"
+    )
+    assert read == ["month=02", "month=03"]
+    pd.testing.assert_frame_equal(loaded, df.loc["2023-02-15":"2023-03-01 10:00"], check_freq=False)
+
+    empty = load_dataset("raw", "AAPL", "intraday", "60min", start="2030-01-01")
+    assert empty.empty and list(empty.columns) == ["close"]
+
+
+def test_partitions_sync_to_s3_individually(data_dirs, monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(dataset_manager, "USE_S3", True)
+    monkeypatch.setattr(dataset_manager, "_get_s3_client", lambda: fake)
+    monkeypatch.setattr(dataset_manager, "S3_PREFIX", "ml_data")
+    df = _intraday()
+    save_dataset(df, "raw", "AAPL", "intraday", "60min", version="v1", partitioning="month")
+    assert sum(key.endswith("data.parquet") for key in fake.uploads) == 6
+
+    fake.uploads.clear()
+    updated = df.copy()
+    updated.iloc[-1, 0] = -1.0
+    save_dataset(updated, "raw", "AAPL", "intraday", "60min", version="v2", partitioning="month")
+    # Only June is re-uploaded; the rest of v2 is assembled with server-side copies.
+    assert [k for k in fake.uploads if k.endswith("data.parquet")] == [
+        "ml_data/raw/AAPL/intraday/60min/v2/year=2023/month=06/data.parquet"
+    ]
+    assert "ml_data/raw/AAPL/intraday/60min/v2/year=2023/month=01/data.parquet" in fake.objects
+
+    # A fresh machine follows the S3 pointer and pulls only the partitions it needs.
+    shutil.rmtree(data_dirs["raw"])
+    loaded = load_dataset("raw", "AAPL", "intraday", "60min", start="2023-06-01")
+    pd.testing.assert_frame_equal(loaded, updated.loc["2023-06-01":], check_freq=False)
+    assert [p.parent.name for p in data_dirs["raw"].rglob("data.parquet")] == ["month=06"]
+
+
+def test_latest_is_a_pointer_not_a_copy(data_dirs, monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(dataset_manager, "USE_S3", True)
+    monkeypatch.setattr(dataset_manager, "_get_s3_client", lambda: fake)
+    monkeypatch.setattr(dataset_manager, "S3_PREFIX", "ml_data")
+    base = data_dirs["features"] / "AAPL" / "default"
+    # A physical latest left over from before pointers existed.
+    base.mkdir(parents=True)
+    _frame(rows=5).to_parquet(base / "latest.parquet")
+    assert dataset_manager.resolve_version("features", "AAPL") == "latest"
+
+    save_dataset(_frame(rows=20), "features", "AAPL", version="20240101000000")
+    save_dataset(_frame(rows=30), "features", "AAPL", version="20240102000000")
+
+    assert sorted(p.name for p in base.iterdir()) == [
+        ".lock",
+        ".lock.gate",
+        "20240101000000.parquet",
+        "20240102000000.parquet",
+        "_versions.sqlite",
+        "latest.ptr",
+    ]
+    assert dataset_manager.read_latest_pointer(base) == "20240102000000"
+    assert len(load_dataset("features", "AAPL")) == 30
+    assert dataset_manager.list_versions("features", "AAPL", include_latest=True) == [
+        "20240101000000", "20240102000000", "latest"
+    ]
+    assert dataset_manager.dataset_exists("features", "AAPL")
+    # Each save uploads its version once plus the tiny pointer and index objects.
+    assert fake.uploads == [
+        "ml_data/features/AAPL/default/20240101000000.parquet",
+        "ml_data/features/AAPL/default/latest.ptr",
+        "ml_data/features/AAPL/default/_versions.sqlite",
+        "ml_data/features/AAPL/default/20240102000000.parquet",
+        "ml_data/features/AAPL/default/latest.ptr",
+        "ml_data/features/AAPL/default/_versions.sqlite",
+    ]
+
+    save_dataset(_frame(rows=40), "features", "AAPL", version="20240103000000", persist_latest=False)
+    assert len(load_dataset("features", "AAPL")) == 30
+
+
+def test_taken_timestamp_versions_move_to_the_next_free_second(data_dirs):
+    for rows in (10, 20, 30):
+        save_dataset(_frame(rows=rows), "raw", "MSFT", "daily", version="20240101000000")
+    save_dataset(_frame(rows=40), "raw", "MSFT", "daily", version="manual")
+    save_dataset(_frame(rows=50), "raw", "MSFT", "daily", version="manual")
+
+    assert dataset_manager.list_versions("raw", "MSFT", "daily") == [
+        "20240101000000", "20240101000001", "20240101000002", "manual"
+    ]
+    assert len(load_dataset("raw", "MSFT", "daily", version="20240101000000")) == 10
+    assert len(load_dataset("raw", "MSFT", "daily", version="manual")) == 50
+
+
+def test_feature_sets_are_separate_datasets_of_one_mode(data_dirs):
+    save_dataset(_frame(rows=10), "features", "AAPL", "daily", version="20240101000000")
+    save_dataset(
+        _frame(rows=20), "features", "AAPL", "daily", version="20240102000000",
+        feature_set="indicators_set1",
+    )
+
+    assert len(load_dataset("features", "AAPL", "daily")) == 10
+    assert len(load_dataset("features", "AAPL", "daily", feature_set="indicators_set1")) == 20
+    assert dataset_manager.get_dataset_path(
+        "features", "AAPL", "daily", feature_set="indicators_set1"
+    ).parent == data_dirs["features"] / "sets" / "indicators_set1" / "AAPL" / "daily"
+    assert [
+        (d["symbol"], d["mode"], d["feature_set"])
+        for d in dataset_manager.iter_datasets("features")
+    ] == [("AAPL", "daily", None), ("AAPL", "daily", "indicators_set1")]
+
+
+def test_version_index_answers_lookups_without_listing_or_s3(data_dirs, monkeypatch):
+    fake = FakeS3()
+    heads = []
+    original_head = fake.head_object
+
+    def counting_head(**kwargs):
+        heads.append(kwargs["Key"])
+        return original_head(**kwargs)
+
+    fake.head_object = counting_head
+    monkeypatch.setattr(dataset_manager, "USE_S3", True)
+    monkeypatch.setattr(dataset_manager, "_get_s3_client", lambda: fake)
+    monkeypatch.setattr(dataset_manager, "S3_PREFIX", "ml_data")
+
+    save_dataset(_frame(rows=31), "features", "AAPL", version="202301")
+    march = _frame(rows=31).set_axis(pd.date_range("2023-03-01", periods=31, name="date"))
+    save_dataset(march, "features", "AAPL", version="202303", partitioning="month")
+
+    entry = dataset_manager._version_index("features", "AAPL").get("202303")
+    assert entry["rows"] == 31 and entry["partitioned"] == 1 and entry["location"] == "both"
+    assert dataset_manager.versions_covering("features", "AAPL", start="2023-03-10") == ["202303"]
+
+    # A fresh machine answers from the index pulled from S3: no listing, no HEAD probes.
+    shutil.rmtree(data_dirs["features"])
+    monkeypatch.setattr(dataset_manager, "_scan_versions", lambda _dir: pytest.fail("globbed"))
+    assert dataset_manager.list_versions("features", "AAPL") == ["202301", "202303"]
+    assert dataset_manager.dataset_exists("features", "AAPL", version="202301")
+    assert not dataset_manager.dataset_exists("features", "AAPL", version="202302")
+    assert load_dataset("features", "AAPL", version="202302") is None
+    assert heads == []
+
+
+def test_version_index_is_rebuilt_for_existing_directories(data_dirs):
+    base = data_dirs["raw"] / "MSFT" / "daily"
+    base.mkdir(parents=True)
+    _frame(rows=10).to_parquet(base / "20240101000000.parquet")
+    _frame(rows=20).to_parquet(base / "20240102000000.parquet")
+
+    assert dataset_manager.list_versions("raw", "MSFT", "daily") == [
+        "20240101000000", "20240102000000"
+    ]
+    index = dataset_manager._version_index("raw", "MSFT", "daily")
+    assert index.get("20240102000000")["rows"] == 20
+    assert index.get("20240101000000")["bytes"] == (base / "20240101000000.parquet").stat().st_size
+
+
+@pytest.mark.parametrize("tz", [None, "UTC"])
+def test_feather_datasets_are_memory_mapped_and_sliced(data_dirs, monkeypatch, tz):
+    monkeypatch.setattr(dataset_manager, "DATASET_FORMATS", {"raw": "parquet", "features": "feather"})
+    df = _frame(tz=tz)
+    assert save_dataset(df, "raw", "AAPL", version="v1").suffix == ".parquet"
+    save_dataset(df.iloc[:10], "features", "AAPL", version="v1")
+    path = save_dataset(df, "features", "AAPL", version="v2")
+    assert path.name == "v2.feather"
+
+    start, end = "2020-03-01", pd.Timestamp("2020-03-31", tz="UTC")
+    loaded = load_dataset("features", "AAPL", columns=["rsi"], start=start, end=end)
+    expected = df.loc[(df.index >= _bound(start, tz)) & (df.index <= _bound(end, tz)), ["rsi"]]
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+    # Columns are views of the mapped file rather than private copies.
+    assert not loaded["rsi"].to_numpy().flags.writeable
+    assert dataset_manager.dataset_cache.stats()["entries"] == 0
+
+    # Unsorted indexes fall back to filtering.
+    shuffled = df.sample(frac=1.0, random_state=0)
+    save_dataset(shuffled, "features", "AAPL", version="v3")
+    loaded = load_dataset("features", "AAPL", start=start, end=end)
+    mask = (shuffled.index >= _bound(start, tz)) & (shuffled.index <= _bound(end, tz))
+    pd.testing.assert_frame_equal(loaded, shuffled.loc[mask])
+
+    assert dataset_manager.list_versions("features", "AAPL") == ["v1", "v2", "v3"]
+    dataset_manager.delete_version("features", "AAPL", version="v1")
+    assert not (data_dirs["features"] / "AAPL" / "default" / "v1.feather").exists()
+    assert dataset_manager.rebuild_version_index("features", "AAPL").versions() == ["v2", "v3"]
+
+    with pytest.raises(ValueError):
+        save_dataset(df, "features", "AAPL", partitioning="year")
+
+
+@pytest.mark.parametrize("layout", ["multiindex", "long"])
+def test_panel_loads_symbols_concurrently(data_dirs, monkeypatch, layout):
+    for offset, symbol in enumerate(("AAPL", "MSFT")):
+        save_dataset(_frame() + offset, "features", symbol, version="v1")
+
+    # Both loads must be in flight together to get past the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+    original = dataset_manager.load_dataset
+
+    def rendezvous(dataset_type, symbol, **kwargs):
+        if symbol != "NONE":
+            barrier.wait()
+        return original(dataset_type, symbol, **kwargs)
+
+    monkeypatch.setattr(dataset_manager, "load_dataset", rendezvous)
+    panel = dataset_manager.load_panel(
+        ["aapl", "MSFT", "AAPL", "NONE"],
+        columns=["close"],
+        start="2020-02-01",
+        end="2020-02-10",
+        layout=layout,
+        max_workers=2,
+    )
+
+    assert panel.attrs["missing_symbols"] == ["NONE"]
+    for offset, symbol in enumerate(("AAPL", "MSFT")):
+        expected = (_frame() + offset).loc["2020-02-01":"2020-02-10", ["close"]]
+        if layout == "multiindex":
+            part = panel.xs(symbol, level="symbol")
+        else:
+            part = panel[panel["symbol"] == symbol].drop(columns="symbol")
+        pd.testing.assert_frame_equal(part, expected, check_freq=False)
+    if layout == "multiindex":
+        assert panel.index.names == ["symbol", "date"]
+    else:
+        assert list(panel.columns) == ["symbol", "close"]
@@ -0,0 +1,117 @@
+"""
+test_incremental_features.py
+Checks that incremental feature updates from saved indicator state match a
+full recompute exactly, fall back when the state is stale, and round-trip
+through the features dataset.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from ml_pipeline.src.ml import dataset_manager, indicator_engine, incremental_features
+from ml_pipeline.src.ml.incremental_features import (
+    state_path,
+    update_feature_dataset,
+    update_features,
+)
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+CONFIGS = sorted(CONFIG_DIR.glob("indicators_set*.yaml"))
+
+INDICATORS = [
+    {"name": "ema", "params": {"length": 12}},
+    {"name": "rsi", "params": {"length": 14}},
+    {"name": "macd", "params": {"fast": 12, "slow": 26, "signal": 9}},
+    {"name": "bbands", "params": {"length": 20, "std": 2}},
+    {"name": "adx", "params": {"length": 14}},
+    {"name": "obv"},
+]
+
+
+def _full(df, indicators):
+    features, _, _, report = update_features(df, indicators)
+    assert report["mode"] == "full"
+    return features
+
+
+def _append_in_chunks(df, indicators, start, ends):
+    features, state, _, report = update_features(df.iloc[:start], indicators)
+    reports = [report]
+    for end in ends:
+        features, state, _, report = update_features(df.iloc[:end], indicators, features, state)
+        reports.append(report)
+    return features, state, reports
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda path: path.stem)
+def test_appended_bars_match_full_recompute(config, ohlcv):
+    indicators = yaml.safe_load(config.read_text(encoding="utf-8"))["indicators"]
+    df = ohlcv(rows=900)
+    features, _, reports = _append_in_chunks(df, indicators, 600, [601, 640, 640, 900])
+
+    assert [r["mode"] for r in reports] == ["full"] + ["incremental"] * 4
+    assert [r["new_rows"] for r in reports[1:]] == [1, 39, 0, 260]
+    pd.testing.assert_frame_equal(features, _full(df, indicators), check_freq=False)
+
+
+def test_revised_bars_and_config_changes_fall_back_to_full_build(ohlcv):
+    df = ohlcv(rows=500)
+    features, state, _ = _append_in_chunks(df, INDICATORS, 400, [])
+
+    revised = df.copy()
+    revised.iloc[350, revised.columns.get_loc("close")] += 1.0
+    result, _, _, report = update_features(revised, INDICATORS, features, state)
+    assert report["mode"] == "full"
+    assert "revised" in report["reason"]
+    pd.testing.assert_frame_equal(result, _full(revised, INDICATORS), check_freq=False)
+
+    changed = INDICATORS[:-1] + [{"name": "sma", "params": {"length": 10}}]
+    _, _, _, report = update_features(df, changed, features, state)
+    assert (report["mode"], report["reason"]) == ("full", "indicator configuration changed")
+
+    shifted = df.iloc[1:]
+    _, _, _, report = update_features(shifted, INDICATORS, features, state)
+    assert report["mode"] == "full"
+
+
+def test_indicators_without_kernel_are_recomputed_for_new_bars(monkeypatch, ohlcv):
+    def spread(frame, length):
+        return (frame["high"] - frame["low"]).rolling(length).mean().rename(f"SPREAD_{length}")
+
+    original = indicator_engine.indicator_function
+    monkeypatch.setattr(
+        indicator_engine,
+        "indicator_function",
+        lambda name, params=None: spread if name == "spread" else original(name, params),
+    )
+    indicators = INDICATORS + [{"name": "spread", "params": {"length": 5}}]
+    df = ohlcv(rows=500)
+    features, state, reports = _append_in_chunks(df, indicators, 450, [500])
+
+    assert state["indicators"][-1] is None
+    assert reports[-1]["mode"] == "incremental"
+    assert features.columns[-1] == "SPREAD_5"
+    pd.testing.assert_frame_equal(features, _full(df, indicators), check_freq=False)
+
+
+def test_feature_dataset_round_trip(data_dirs, ohlcv):
+    df = ohlcv(rows=600)
+    first, _, _, report = update_feature_dataset(df.iloc[:-10], INDICATORS, "AAPL")
+    assert report["mode"] == "full"
+    state = incremental_features.load_state(state_path("AAPL"))
+    assert state["version"] == first.stem
+    assert state_path("AAPL").parent == first.parent
+
+    second, _, outcomes, report = update_feature_dataset(df, INDICATORS, "AAPL")
+    assert report["mode"] == "incremental"
+    assert report["new_rows"] == 10
+    assert [o["source"] for o in outcomes] == ["kernel"] * len(INDICATORS)
+    assert incremental_features.load_state(state_path("AAPL"))["version"] == second.stem
+
+    saved = dataset_manager.load_dataset("features", "AAPL", version=second.stem)
+    pd.testing.assert_frame_equal(
+        saved, _full(df, INDICATORS), check_freq=False, check_index_type=False
+    )
@@ -0,0 +1,144 @@
+"""
+test_indicator_cache.py
+Covers the on-disk indicator memo and the single-pass multi-set build: one
+computation per distinct indicator across the indicators_set sweep,
+data/param keying and size-based eviction.
+"""
+
+import functools
+import os
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from ml_pipeline.src.ml import indicator_cache, indicator_kernels
+from ml_pipeline.src.ml.indicator_cache import IndicatorCache, canonical_params, frame_fingerprint
+from ml_pipeline.src.ml.indicator_engine import (
+    compute_indicator_sets,
+    compute_indicators,
+    merge_outputs,
+    ohlcv_frame,
+)
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+CONFIGS = sorted(CONFIG_DIR.glob("indicators_set*.yaml"))
+
+
+def _count_kernel_calls(monkeypatch):
+    """Count kernel evaluations by (name, canonical params)."""
+    calls = Counter()
+    for name, kernel in list(indicator_kernels.KERNELS.items()):
+
+        @functools.wraps(kernel)
+        def counted(frame, *args, _name=name, _kernel=kernel, **params):
+            key = repr(sorted(canonical_params(_name, params, "kernel").items()))
+            calls[(_name, key)] += 1
+            return _kernel(frame, *args, **params)
+
+        monkeypatch.setitem(indicator_kernels.KERNELS, name, counted)
+    return calls
+
+
+def _sweep(df, cache):
+    results = {}
+    for config in CONFIGS:
+        indicators = yaml.safe_load(config.read_text(encoding="utf-8"))["indicators"]
+        results[config.stem] = merge_outputs(df, compute_indicators(df, indicators, cache=cache))
+    return results
+
+
+def test_sweep_computes_each_distinct_indicator_once(tmp_path, monkeypatch, ohlcv):
+    df = ohlcv()
+    uncached = _sweep(df, None)
+    calls = _count_kernel_calls(monkeypatch)
+    cache = IndicatorCache(tmp_path, max_bytes=100 * 1024 * 1024, enabled=True)
+
+    first = _sweep(df, cache)
+    assert calls and set(calls.values()) == {1}
+    assert cache.misses == len(calls)
+    assert cache.hits > 0  # the sets share indicators
+
+    calls.clear()
+    second = _sweep(df, cache)
+    assert not calls
+    for stem, expected in uncached.items():
+        pd.testing.assert_frame_equal(first[stem], expected, check_freq=False)
+        pd.testing.assert_frame_equal(second[stem], expected, check_freq=False)
+
+
+def test_keys_follow_data_and_canonical_params(tmp_path, ohlcv):
+    cache = IndicatorCache(tmp_path, max_bytes=100 * 1024 * 1024, enabled=True)
+    df = ohlcv()
+
+    outcomes = compute_indicators(df, [{"name": "sma"}], cache=cache)
+    assert not outcomes[0]["cached"]
+    outcomes = compute_indicators(df, [{"name": "sma", "params": {"length": 10}}], cache=cache)
+    assert outcomes[0]["cached"] and outcomes[0]["source"] == "kernel"
+    assert list(outcomes[0]["result"].columns) == ["SMA_10"]
+
+    other = ohlcv(seed=8)
+    outcomes = compute_indicators(other, [{"name": "sma"}], cache=cache)
+    assert not outcomes[0]["cached"]
+    pd.testing.assert_series_equal(
+        outcomes[0]["result"]["SMA_10"], other["close"].rolling(10).mean(), check_names=False
+    )
+
+    outcomes = compute_indicators(df, [{"name": "no_such_indicator"}], cache=cache)
+    assert outcomes[0]["status"] == "unknown"
+    assert len(list(tmp_path.glob("*.parquet"))) == 2
+
+
+def test_keys_follow_implementation_versions(monkeypatch):
+    key = IndicatorCache.key("fp", "sma", {"length": 10}, "kernel")
+    monkeypatch.setattr(indicator_cache, "KERNELS_VERSION", indicator_kernels.KERNELS_VERSION + 1)
+    bumped = IndicatorCache.key("fp", "sma", {"length": 10}, "kernel")
+    monkeypatch.setattr(indicator_cache, "INSTALLED_PANDAS_TA", "0.4.67b0")
+    upgraded = IndicatorCache.key("fp", "sma", {"length": 10}, "kernel")
+    assert len({key, bumped, upgraded}) == 3
+
+
+def _sma_key(cache, df, length):
+    fingerprint = frame_fingerprint(ohlcv_frame(df))
+    return cache.key(fingerprint, "sma", {"length": length}, "kernel")
+
+
+def test_eviction_keeps_cache_under_budget(tmp_path, ohlcv):
+    df = ohlcv()
+    cache = IndicatorCache(tmp_path, max_bytes=10**9, enabled=True)
+    compute_indicators(df, [{"name": "sma", "params": {"length": 5}}], cache=cache)
+    entry_size = next(tmp_path.glob("*.parquet")).stat().st_size
+
+    cache.max_bytes = int(entry_size * 2.5)
+    for length, mtime in ((5, 0), (6, 1), (7, 2), (8, 3)):
+        path = cache._path(_sma_key(cache, df, length))
+        if not path.exists():
+            compute_indicators(df, [{"name": "sma", "params": {"length": length}}], cache=cache)
+        os.utime(path, (mtime, mtime))  # deterministic LRU order
+
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.parquet")) <= cache.max_bytes
+    outcomes = compute_indicators(df, [{"name": "sma", "params": {"length": 8}}], cache=cache)
+    assert outcomes[0]["cached"]
+    outcomes = compute_indicators(df, [{"name": "sma", "params": {"length": 5}}], cache=cache)
+    assert not outcomes[0]["cached"]
+
+    disabled = IndicatorCache(tmp_path / "off", enabled=False)
+    compute_indicators(df, [{"name": "sma"}], cache=disabled)
+    assert not (tmp_path / "off").exists()
+
+
+def test_single_pass_over_all_sets_matches_per_set_builds(monkeypatch, ohlcv):
+    df = ohlcv()
+    per_set = _sweep(df, None)
+    calls = _count_kernel_calls(monkeypatch)
+    sets = {
+        config.stem: yaml.safe_load(config.read_text(encoding="utf-8"))["indicators"]
+        for config in CONFIGS
+    }
+
+    by_set = compute_indicator_sets(df, sets)
+
+    assert calls and set(calls.values()) == {1}
+    for stem, expected in per_set.items():
+        pd.testing.assert_frame_equal(merge_outputs(df, by_set[stem]), expected)
@@ -0,0 +1,179 @@
+"""
+test_indicator_engine.py
+Covers `indicator_engine.compute_indicators` in sequential, thread and process
+mode and the ordered merge of indicator outputs.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_pipeline.src.ml import indicator_engine
+from ml_pipeline.src.ml.indicator_engine import compute_indicators, merge_outputs
+
+CONFIG = [
+    {"name": "slow_mean", "params": {"length": 5}},
+    {"name": "missing"},
+    {"name": "spread", "params": {}},
+    {"name": "broken", "params": {"length": 3}},
+    {"name": "fast_mean", "params": {"length": 2}},
+]
+
+
+def _slow_mean(frame, length):
+    time.sleep(0.2)  # finishes last, so completion order differs from configured order
+    return frame["close"].rolling(length).mean().rename(f"SLOW_{length}")
+
+
+def _fast_mean(frame, length):
+    return frame["close"].rolling(length).mean().rename(f"FAST_{length}")
+
+
+def _spread(frame):
+    return pd.DataFrame(
+        {"SPREAD": frame["high"] - frame["low"], "MID": (frame["high"] + frame["low"]) / 2}
+    )
+
+
+def _broken(frame, length):
+    raise RuntimeError(f"bad length {length}")
+
+
+FUNCTIONS = {"slow_mean": _slow_mean, "fast_mean": _fast_mean, "spread": _spread, "broken": _broken}
+
+
+@pytest.fixture(autouse=True)
+def fake_indicators(monkeypatch):
+    monkeypatch.setattr(
+        indicator_engine, "indicator_function", lambda name, params=None: FUNCTIONS.get(name)
+    )
+
+
+def _prices(rows=50):
+    index = pd.date_range("2024-01-01", periods=rows, freq="D", name="date")
+    close = 100 + np.arange(rows, dtype=float)
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 2,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(rows, 1000.0),
+            "symbol": "AAPL",
+        },
+        index=index,
+    )
+
+
+@pytest.mark.parametrize("workers,executor", [(1, "thread"), (4, "thread"), (3, "process")])
+def test_outcomes_and_merge_follow_configured_order(workers, executor):
+    df = _prices()
+    outcomes = compute_indicators(df, CONFIG, workers=workers, executor=executor)
+
+    assert [o["name"] for o in outcomes] == [ind["name"] for ind in CONFIG]
+    assert [o["status"] for o in outcomes] == ["ok", "unknown", "ok", "error", "ok"]
+    assert outcomes[3]["error"] == "bad length 3"
+    assert outcomes[2]["params"] == {}
+
+    merged = merge_outputs(df, outcomes)
+    assert list(merged.columns) == list(df.columns) + ["SLOW_5", "SPREAD", "MID", "FAST_2"]
+    pd.testing.assert_series_equal(merged["SPREAD"], df["high"] - df["low"], check_names=False)
+    assert list(df.columns) == ["open", "high", "low", "close", "volume", "symbol"]
+
+
+def test_parallel_results_match_sequential():
+    df = _prices()
+    sequential = merge_outputs(df, compute_indicators(df, CONFIG, workers=1))
+    threaded = merge_outputs(df, compute_indicators(df, CONFIG, workers=4))
+    pd.testing.assert_frame_equal(sequential, threaded)
+
+
+def test_threads_share_one_ohlcv_frame_and_run_concurrently(monkeypatch):
+    seen, active, peak = set(), [0], [0]
+    lock = threading.Lock()
+
+    def probe(frame, tag):
+        with lock:
+            seen.add(id(frame))
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return frame["close"].rename(f"PROBE_{tag}")
+
+    monkeypatch.setattr(indicator_engine, "indicator_function", lambda name, params=None: probe)
+    config = [{"name": "probe", "params": {"tag": i}} for i in range(4)]
+    outcomes = compute_indicators(_prices(), config, workers=4)
+
+    assert all(o["status"] == "ok" for o in outcomes)
+    assert len(seen) == 1
+    assert peak[0] > 1
+    assert list(outcomes[0]["result"].columns) == ["PROBE_0"]
+
+
+def test_repeated_columns_keep_position_and_take_later_value():
+    df = _prices()
+    config = [
+        {"name": "fast_mean", "params": {"length": 2}},
+        {"name": "spread"},
+        {"name": "fast_mean", "params": {"length": 2}},
+    ]
+    outcomes = compute_indicators(df, config)
+    outcomes[2]["result"] = outcomes[2]["result"] * 2
+    merged = merge_outputs(df, outcomes)
+
+    assert list(merged.columns)[-3:] == ["FAST_2", "SPREAD", "MID"]
+    pd.testing.assert_series_equal(
+        merged["FAST_2"], df["close"].rolling(2).mean() * 2, check_names=False
+    )
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        compute_indicators(_prices(), CONFIG, workers=2, executor="gpu")
+
+
+def test_indicator_sets_compute_shared_entries_once(monkeypatch):
+    calls = []
+
+    def counted(name, params=None):
+        func = FUNCTIONS.get(name)
+        if func is None:
+            return None
+
+        def run(frame, **kwargs):
+            calls.append((name, sorted(kwargs.items())))
+            return func(frame, **kwargs)
+
+        return run
+
+    monkeypatch.setattr(indicator_engine, "indicator_function", counted)
+    sets = {
+        "set_a": CONFIG,
+        "set_b": [{"name": "spread"}, {"name": "fast_mean", "params": {"length": 2}}],
+        "set_c": [{"name": "fast_mean", "params": {"length": 3}}, {"name": "missing"}],
+    }
+    df = _prices()
+    by_set = indicator_engine.compute_indicator_sets(df, sets, workers=3)
+
+    assert sorted(calls) == sorted(
+        [
+            ("slow_mean", [("length", 5)]),
+            ("spread", []),
+            ("broken", [("length", 3)]),
+            ("fast_mean", [("length", 2)]),
+            ("fast_mean", [("length", 3)]),
+        ]
+    )
+    assert list(by_set) == ["set_a", "set_b", "set_c"]
+    for set_name, indicators in sets.items():
+        expected = compute_indicators(df, indicators)
+        assert [o["status"] for o in by_set[set_name]] == [o["status"] for o in expected]
+        assert [o["params"] for o in by_set[set_name]] == [o["params"] for o in expected]
+        pd.testing.assert_frame_equal(
+            merge_outputs(df, by_set[set_name]), merge_outputs(df, expected)
+        )
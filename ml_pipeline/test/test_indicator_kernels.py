@@ -0,0 +1,291 @@
+"""
+test_indicator_kernels.py
+Checks the NumPy indicator kernels against pandas_ta (when installed) and
+against pandas transcriptions of pandas_ta's formulas, plus the kernel
+dispatch in `indicator_engine`. CI sets ML_REQUIRE_PANDAS_TA=1 so the
+pandas_ta comparison fails instead of skipping when the pinned release is
+not installed.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from ml_pipeline.src.ml import indicator_engine
+from ml_pipeline.src.ml.indicator_engine import compute_indicators
+from ml_pipeline.src.ml.indicator_kernels import (
+    INSTALLED_PANDAS_TA,
+    KERNELS,
+    PANDAS_TA_PACKAGE,
+    PANDAS_TA_VERSION,
+    STREAMS,
+    continue_state,
+    get_kernel,
+    pandas_ta_compatible,
+    record_state,
+)
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+EPS = np.finfo(float).eps
+
+
+def _configured_kernels():
+    """Distinct (name, params) entries of config/indicators_set*.yaml that have a kernel."""
+    seen = {}
+    for path in sorted(CONFIG_DIR.glob("indicators_set*.yaml")):
+        for ind in yaml.safe_load(path.read_text(encoding="utf-8"))["indicators"]:
+            params = ind.get("params") or {}
+            if ind["name"] in KERNELS:
+                seen[(ind["name"], repr(sorted(params.items())))] = (ind["name"], params)
+    return list(seen.values())
+
+
+CONFIGURED = _configured_kernels()
+DEFAULTS = [(name, {}) for name in KERNELS]
+
+
+def _as_frame(result):
+    return result.to_frame() if isinstance(result, pd.Series) else result
+
+
+@pytest.mark.parametrize("name,params", CONFIGURED + DEFAULTS)
+def test_kernels_match_pandas_ta(name, params, ohlcv):
+    pinned = (PANDAS_TA_PACKAGE, PANDAS_TA_VERSION)
+    if INSTALLED_PANDAS_TA is None or not pandas_ta_compatible(INSTALLED_PANDAS_TA):
+        message = f"kernels mirror {pinned}, installed: {INSTALLED_PANDAS_TA}"
+        if os.getenv("ML_REQUIRE_PANDAS_TA") == "1":
+            pytest.fail(message)
+        pytest.skip(message)
+    df = ohlcv()
+    expected = _as_frame(getattr(df.ta, name)(talib=False, **params))
+    actual = _as_frame(KERNELS[name](df, **params))
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False, rtol=1e-8)
+
+
+# pandas transcriptions of the pandas_ta implementations, for environments
+# without pandas_ta.
+def _ref_seeded(series, length):
+    first = series.index.get_loc(series.first_valid_index())
+    seeded = series.copy()
+    seeded.iloc[: first + length - 1] = np.nan
+    seeded.iloc[first + length - 1] = series.iloc[first : first + length].mean()
+    return seeded
+
+
+def _ref_ema(close, length):
+    return _ref_seeded(close, length).ewm(span=length, adjust=False).mean()
+
+
+def _ref_rma(series, length):
+    return _ref_seeded(series, length).ewm(alpha=1.0 / length, adjust=False).mean()
+
+
+def _ref_wilder(series, length):
+    values = series.to_numpy(dtype=float)
+    out = np.full(len(values), np.nan)
+    out[length - 1] = values[1:length].sum()
+    for i in range(length, len(values)):
+        out[i] = out[i - 1] - out[i - 1] / length + values[i]
+    return pd.Series(out, index=series.index)
+
+
+def _ref_non_zero_range(high, low):
+    diff = high - low
+    return diff.where(diff != 0, EPS)
+
+
+def _ref_true_range(df):
+    prev_close = df["close"].shift(1)
+    ranges = [
+        _ref_non_zero_range(df["high"], df["low"]),
+        df["high"] - prev_close,
+        prev_close - df["low"],
+    ]
+    tr = pd.concat(ranges, axis=1).abs().max(axis=1)
+    tr.iloc[:1] = np.nan
+    return tr
+
+
+def _reference(df, name, params):
+    close, high, low, volume = df["close"], df["high"], df["low"], df["volume"]
+    if name == "sma":
+        return close.rolling(params["length"]).mean()
+    if name == "ema":
+        return _ref_ema(close, params["length"])
+    if name == "tema":
+        length = params["length"]
+        ema1 = _ref_ema(close, length)
+        ema2 = _ref_ema(ema1, length)
+        return 3 * (ema1 - ema2) + _ref_ema(ema2, length)
+    if name == "wma":
+        length = params["length"]
+        weights = np.arange(1, length + 1)
+        return close.rolling(length).apply(lambda x: np.dot(x, weights), raw=True) / weights.sum()
+    if name == "rsi":
+        negative = close.diff(1)
+        positive = negative.copy()
+        positive[positive < 0] = 0
+        negative[negative > 0] = 0
+        pos_avg = _ref_rma(positive, params["length"])
+        neg_avg = _ref_rma(negative, params["length"])
+        return 100 * pos_avg / (pos_avg + neg_avg.abs())
+    if name == "macd":
+        line = _ref_ema(close, params["fast"]) - _ref_ema(close, params["slow"])
+        signal = _ref_ema(line.loc[line.first_valid_index():], params["signal"])
+        return pd.DataFrame({"macd": line, "hist": line - signal, "signal": signal})
+    if name == "bbands":
+        length, std = params["length"], params["std"]
+        mid = close.rolling(length).mean()
+        dev = std * close.rolling(length).var(ddof=0).apply(np.sqrt)
+        lower, upper = mid - dev, mid + dev
+        width = _ref_non_zero_range(upper, lower)
+        return pd.DataFrame(
+            {
+                "l": lower,
+                "m": mid,
+                "u": upper,
+                "b": 100 * width / mid,
+                "p": _ref_non_zero_range(close, lower) / width,
+            }
+        )
+    if name == "atr":
+        return _ref_rma(_ref_true_range(df), params["length"])
+    if name == "adx":
+        length = params["length"]
+        up = high - high.shift(1)
+        down = low.shift(1) - low
+        pos = (((up > down) & (up > 0)) * up).apply(lambda v: 0 if abs(v) < EPS else v)
+        neg = (((down > up) & (down > 0)) * down).apply(lambda v: 0 if abs(v) < EPS else v)
+        k = 100 / _ref_wilder(_ref_true_range(df), length)
+        dmp, dmn = k * _ref_wilder(pos, length), k * _ref_wilder(neg, length)
+        dmp.iloc[length - 1] = dmn.iloc[length - 1] = np.nan
+        dx = 100 * (dmp - dmn).abs() / (dmp + dmn)
+        return pd.DataFrame({"adx": _ref_rma(dx, length), "dmp": dmp, "dmn": dmn})
+    if name == "stoch":
+        lowest = low.rolling(params["k"]).min()
+        highest = high.rolling(params["k"]).max()
+        raw = 100 * (close - lowest) / _ref_non_zero_range(highest, lowest)
+        stoch_k = raw.rolling(params["smooth_k"]).mean()
+        return pd.DataFrame({"k": stoch_k, "d": stoch_k.rolling(params["d"]).mean()})
+    if name == "obv":
+        sign = close.diff(1)
+        sign[sign > 0] = 1
+        sign[sign < 0] = -1
+        sign.iloc[0] = 1
+        return (sign * volume).cumsum()
+    if name == "mfi":
+        typical = (high + low + close) / 3
+        flow = typical * volume
+        change = typical.diff(1)
+        psum = flow.where(change > 0, 0.0).rolling(params["length"]).sum()
+        nsum = flow.where(change < 0, 0.0).rolling(params["length"]).sum()
+        return 100 * psum / (psum + nsum)
+    if name == "linreg":
+        length = params["length"]
+        x = np.arange(length)
+        end_point = lambda y: np.polyval(np.polyfit(x, y, 1), length - 1)  # noqa: E731
+        return close.rolling(length).apply(end_point, raw=True)
+    if name == "cci":
+        length = params["length"]
+        typical = (high + low + close) / 3
+        mad = typical.rolling(length).apply(lambda x: np.fabs(x - x.mean()).mean(), raw=True)
+        return (typical - typical.rolling(length).mean()) / (0.015 * mad)
+    raise KeyError(name)
+
+
+REFERENCE_CASES = [
+    ("sma", {"length": 20}),
+    ("ema", {"length": 21}),
+    ("tema", {"length": 30}),
+    ("wma", {"length": 30}),
+    ("rsi", {"length": 14}),
+    ("macd", {"fast": 12, "slow": 26, "signal": 9}),
+    ("bbands", {"length": 20, "std": 2}),
+    ("atr", {"length": 14}),
+    ("adx", {"length": 14}),
+    ("stoch", {"k": 14, "d": 3, "smooth_k": 3}),
+    ("obv", {}),
+    ("mfi", {"length": 14}),
+    ("cci", {"length": 20}),
+    ("linreg", {"length": 14}),
+]
+
+
+@pytest.mark.parametrize("name,params", REFERENCE_CASES)
+def test_kernels_match_pandas_formulas(name, params, ohlcv):
+    df = ohlcv()
+    expected = _as_frame(_reference(df, name, params))
+    actual = _as_frame(KERNELS[name](df, **params))
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("name,params", CONFIGURED + DEFAULTS)
+def test_continued_state_matches_a_full_run(name, params, ohlcv):
+    df = ohlcv()
+    full = _as_frame(KERNELS[name](df, **params))
+    recorded, state = record_state(name, df.iloc[:300], params)
+    pd.testing.assert_frame_equal(_as_frame(recorded), full.iloc[:300], check_exact=True)
+
+    rows = 300
+    for end in (301, 340, 400):
+        window = df.iloc[max(0, rows - state["window"]) : end]
+        result, state = continue_state(name, window, params, state, end - rows)
+        pd.testing.assert_frame_equal(_as_frame(result), full.iloc[rows:end], check_exact=True)
+        rows = end
+
+
+def test_every_kernel_can_be_continued():
+    assert set(STREAMS) == set(KERNELS)
+
+
+def test_column_names_follow_pandas_ta(ohlcv):
+    df = ohlcv()
+    names = {
+        ("sma", ()): ["SMA_10"],
+        ("bbands", (("length", 20), ("std", 2))): [
+            "BBL_20_2.0", "BBM_20_2.0", "BBU_20_2.0", "BBB_20_2.0", "BBP_20_2.0"
+        ],
+        ("macd", (("fast", 26), ("slow", 12))): ["MACD_12_26_9", "MACDh_12_26_9", "MACDs_12_26_9"],
+        ("adx", (("length", 10),)): ["ADX_10", "DMP_10", "DMN_10"],
+        ("atr", ()): ["ATRr_14"],
+        ("stoch", ()): ["STOCHk_14_3_3", "STOCHd_14_3_3"],
+        ("cci", ()): ["CCI_14_0.015"],
+        ("uo", ()): ["UO_7_14_28"],
+        ("linreg", ()): ["LR_14"],
+        ("obv", ()): ["OBV"],
+    }
+    for (name, params), expected in names.items():
+        assert list(_as_frame(KERNELS[name](df, **dict(params))).columns) == expected
+
+
+def test_kernels_only_stand_in_for_the_pinned_pandas_ta():
+    assert pandas_ta_compatible((PANDAS_TA_PACKAGE, PANDAS_TA_VERSION))
+    assert pandas_ta_compatible(None)  # nothing to fall back to
+    assert not pandas_ta_compatible((PANDAS_TA_PACKAGE, "0.8.33"))
+    assert not pandas_ta_compatible(("pandas_ta", "0.4.71b0"))
+    assert not pandas_ta_compatible((PANDAS_TA_PACKAGE, "unknown"))
+
+
+def test_short_input_returns_none_like_pandas_ta(ohlcv):
+    assert KERNELS["sma"](ohlcv(rows=5), length=20) is None
+
+
+def test_unsupported_params_fall_back_to_pandas_ta(monkeypatch, ohlcv):
+    assert get_kernel("rsi", {"length": 14}) is KERNELS["rsi"]
+    assert get_kernel("rsi", {"length": 14, "offset": 1}) is None
+    assert get_kernel("atr", {"mamode": "ema"}) is None
+    assert get_kernel("kama", {"length": 10}) is None
+
+    df = ohlcv()
+    outcomes = compute_indicators(df, [{"name": "sma", "params": {"length": 5}}])
+    assert outcomes[0]["source"] == "kernel"
+    assert list(outcomes[0]["result"].columns) == ["SMA_5"]
+
+    monkeypatch.setattr(indicator_engine, "KERNELS_ENABLED", False)
+    monkeypatch.setattr(indicator_engine, "ta", None)
+    outcomes = compute_indicators(df, [{"name": "sma", "params": {"length": 5}}])
+    assert outcomes[0]["status"] == "unknown"
@@ -0,0 +1,48 @@
+"""
+test_model_artifacts.py
+Covers saving model artifacts behind a `latest` pointer and loading them back
+through `predictor.load_artifacts`.
+"""
+
+import pickle
+
+from ml_pipeline.src.ml.predictor import load_artifacts, resolve_artifact_paths
+from ml_pipeline.src.ml.train_model import save_artifacts
+
+
+def test_latest_pointer_resolves_to_the_newest_artifacts(tmp_path, monkeypatch):
+    timestamps = iter(["20240101000000", "20240102000000"])
+
+    class FrozenDatetime:
+        @staticmethod
+        def utcnow():
+            class Stamp:
+                @staticmethod
+                def strftime(_fmt):
+                    return next(timestamps)
+
+            return Stamp()
+
+    monkeypatch.setattr("ml_pipeline.src.ml.train_model.datetime", FrozenDatetime)
+    # Copies left by runs from before `latest` became a pointer.
+    (tmp_path / "latest.pkl").write_bytes(pickle.dumps({"model": "legacy"}))
+    (tmp_path / "latest.json").write_text("{}", encoding="utf-8")
+
+    metadata = {"symbol": "AAPL", "model": "random_forest"}
+    save_artifacts({"model": "first"}, {**metadata, "run": 1}, artifact_dir=str(tmp_path))
+    save_artifacts({"model": "second"}, {**metadata, "run": 2}, artifact_dir=str(tmp_path))
+
+    # Every artifact is written exactly once; latest is only a pointer.
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "20240101000000.json",
+        "20240101000000.pkl",
+        "20240102000000.json",
+        "20240102000000.pkl",
+        "latest.ptr",
+    ]
+    model_path, meta_path = resolve_artifact_paths("AAPL", "random_forest", None, None, str(tmp_path))
+    assert (model_path.name, meta_path.name) == ("20240102000000.pkl", "20240102000000.json")
+
+    model, loaded = load_artifacts("AAPL", "random_forest", artifact_dir=str(tmp_path))
+    assert model == {"model": "second"}
+    assert loaded["run"] == 2
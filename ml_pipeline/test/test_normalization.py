@@ -6,7 +6,7 @@ function used in the historical data ingestion pipeline.
 ---
 """
 
-from historical_ingestion.ingest_historical import normalize_stock_data
+from historical_ingestion.ingest_historical import normalize_stock_data, normalize_stock_frame
 
 
 def test_normalize_stock_data():
@@ -33,3 +33,32 @@ def test_normalize_stock_data():
     assert row["open"] == 200.00
     assert row["adjusted_close"] == 202.00
     assert "date" in row
+
+
+def test_normalize_stock_frame_is_typed_and_drops_bad_rows():
+    """The columnar normalizer returns typed columns and skips unparseable rows."""
+
+    raw = {
+        "2024-07-26": {
+            "1. open": "202.00",
+            "2. high": "206.00",
+            "3. low": "201.00",
+            "4. close": "205.00",
+            "5. adjusted close": "205.00",
+            "6. volume": "12000000",
+        },
+        "2024-07-25": {
+            "1. open": "200.00",
+            "2. high": "205.00",
+            "3. low": "198.00",
+            "4. close": "n/a",
+            "5. adjusted close": "202.00",
+            "6. volume": "15000000",
+        },
+    }
+    frame = normalize_stock_frame("TEST", raw)
+    assert len(frame) == 1
+    assert str(frame["date"].dtype) == "datetime64[ns, UTC]"
+    assert frame["volume"].dtype == "int64"
+    assert frame["close"].iloc[0] == 205.00
+    assert frame["ingested_at"].nunique() == 1
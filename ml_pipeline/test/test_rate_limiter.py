@@ -0,0 +1,47 @@
+"""
+test_rate_limiter.py
+Verifies the token-bucket pacing and daily quota enforced by `RateLimiter`.
+"""
+
+import pytest
+
+from historical_ingestion import rate_limiter
+from historical_ingestion.rate_limiter import DailyQuotaExceeded, RateLimiter, TokenBucket
+
+
+def test_token_bucket_queues_reservations_in_order():
+    """Reservations beyond capacity wait one refill interval per token."""
+    bucket = TokenBucket(capacity=2, refill_rate=1.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_rate_limiter_enforces_daily_quota():
+    """Requests past the daily budget raise instead of waiting."""
+    limiter = RateLimiter(requests_per_minute=6000, requests_per_day=2, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.requests_made == 2
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.acquire()
+
+
+def test_daily_quota_is_a_rolling_24_hour_window(monkeypatch):
+    """Requests become available again as those made a day earlier age out."""
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(requests_per_minute=6000, requests_per_day=2, burst=2)
+    limiter.acquire()
+    clock[0] += 3600
+    limiter.acquire()
+
+    clock[0] += rate_limiter.DAY_SECONDS - 3601
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.acquire()
+    clock[0] += 1  # the first request is now 24h old
+    limiter.acquire()
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.acquire()
+    assert limiter.requests_made == 3
@@ -0,0 +1,38 @@
+"""
+test_response_cache.py
+Checks bar-aligned expiry and size-based eviction of the Alpha Vantage response cache.
+"""
+
+import json
+import os
+import time
+
+from ml_pipeline.src.ml.response_cache import ResponseCache, next_bar_close
+
+
+def test_next_bar_close_aligns_to_interval():
+    """60min bars expire on the next full hour; daily data at the next 16:00 New York close."""
+    now = 1_700_000_123.0  # 2023-11-14 22:15:23 UTC
+    assert next_bar_close("60min", now) == 1_700_002_800.0
+    assert next_bar_close("5min", now) == 1_700_000_400.0
+    # 22:15 UTC is after the 16:00 EST close, so the next close is tomorrow 21:00 UTC.
+    assert next_bar_close(None, now) == 1_700_082_000.0
+
+
+def test_cache_round_trip_expiry_and_eviction(tmp_path):
+    """Entries are served until they expire and trimmed back under the byte budget."""
+    cache = ResponseCache(cache_dir=tmp_path, max_bytes=10_000_000, enabled=True)
+    payload = {"Time Series (Daily)": {"2024-07-25": {"4. close": "202.00"}}}
+    cache.put("TIME_SERIES_DAILY_ADJUSTED", "aapl", None, "full", json.dumps(payload).encode())
+
+    assert cache.get("TIME_SERIES_DAILY_ADJUSTED", "AAPL", None, "full") == payload
+    assert cache.get("TIME_SERIES_DAILY_ADJUSTED", "AAPL", None, "compact") is None
+    cache.put("TIME_SERIES_INTRADAY", "AAPL", "60min", "compact", b"{}", expires_at=time.time() - 1)
+    assert cache.get("TIME_SERIES_INTRADAY", "AAPL", "60min", "compact") is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+    oldest = next(tmp_path.glob("*.json.gz"))
+    os.utime(oldest, (0, 0))
+    cache.max_bytes = max(p.stat().st_size for p in tmp_path.glob("*.json.gz"))
+    assert cache.evict() == 1
+    assert not oldest.exists()
@@ -0,0 +1,126 @@
+"""
+test_retry.py
+Covers backoff, rate-limit classification, time budgets and async support of
+`historical_ingestion.utils.retry`.
+"""
+
+import asyncio
+
+import pytest
+
+from ml_pipeline.historical_ingestion import utils
+from ml_pipeline.historical_ingestion.utils import (
+    RATE_LIMIT,
+    TRANSIENT,
+    RetryError,
+    RetryStats,
+    backoff_delay,
+    classify_exception,
+    retry,
+)
+
+
+class QuotaNote(Exception):
+    """Stand-in for an API's "slow down" error."""
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Replace sleeping with a fake clock that advances by the requested delay."""
+    recorded = []
+    clock = [0.0]
+
+    def fake_sleep(seconds):
+        recorded.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(utils.time, "sleep", fake_sleep)
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    return recorded
+
+
+def _flaky(failures):
+    state = {"calls": 0}
+
+    def call():
+        state["calls"] += 1
+        if failures:
+            raise failures.pop(0)
+        return state["calls"]
+
+    return call
+
+
+def test_backoff_grows_exponentially_within_jitter_bounds():
+    for retry_number, expected in ((1, 2.0), (2, 4.0), (3, 8.0), (10, 30.0)):
+        delay = backoff_delay(retry_number, base=2.0, max_delay=30.0, jitter=0.5)
+        assert expected * 0.5 <= delay <= expected
+    assert backoff_delay(3, base=1.0, jitter=0) == 4.0
+
+
+def test_classifies_rate_limits_separately_from_transient_errors(sleeps):
+    class Response:
+        status_code = 429
+
+    http_429 = ConnectionError("too many requests")
+    http_429.response = Response()
+    assert classify_exception(QuotaNote(), (QuotaNote,)) == RATE_LIMIT
+    assert classify_exception(QuotaNote()) == TRANSIENT
+    assert classify_exception(http_429) == RATE_LIMIT
+    assert classify_exception(ConnectionError("reset")) == TRANSIENT
+
+    stats = RetryStats()
+    call = retry(
+        attempts=3,
+        delay=1,
+        rate_limit_delay=20,
+        jitter=0,
+        rate_limit_exceptions=(QuotaNote,),
+        stats=stats,
+    )(_flaky([QuotaNote(), ConnectionError("reset")]))
+    assert call() == 3
+    # Rate limit waits from the rate-limit base, the transient error from `delay`.
+    assert sleeps == [20, 2]
+    counters = stats.snapshot()
+    assert counters["attempts"] == 3
+    assert counters["rate_limited"] == 1
+    assert counters["transient"] == 1
+    assert counters["sleep_seconds"] == 22
+
+
+def test_gives_up_when_attempts_or_budget_run_out(sleeps):
+    stats = RetryStats()
+    call = retry(attempts=2, delay=1, jitter=0, stats=stats)(_flaky([TimeoutError()] * 5))
+    with pytest.raises(RetryError):
+        call()
+    assert stats.snapshot()["exhausted"] == 1
+
+    budgeted = retry(attempts=10, delay=5, jitter=0, max_elapsed=12, stats=stats)(
+        _flaky([TimeoutError()] * 10)
+    )
+    with pytest.raises(RetryError):
+        budgeted()
+    # 5s + 10s would exceed the 12s budget, so only the first retry sleeps.
+    assert sleeps[-1:] == [5]
+
+    with pytest.raises(ValueError):
+        retry(stats=stats)(_flaky([ValueError("not retried")]))()
+
+
+def test_async_functions_are_retried_without_blocking(monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(utils.asyncio, "sleep", fake_sleep)
+    failures = [ConnectionError("reset")]
+
+    @retry(attempts=2, delay=3, jitter=0, stats=RetryStats())
+    async def fetch():
+        if failures:
+            raise failures.pop()
+        return "ok"
+
+    assert asyncio.run(fetch()) == "ok"
+    assert waits == [3]
@@ -0,0 +1,53 @@
+"""
+test_run_pipeline.py
+Checks the per-stage timings `run_pipeline.ingest_symbol` records.
+"""
+
+import importlib
+import sys
+
+import pytest
+import supabase
+
+from ml_pipeline.src.ml.stage_timings import StageTimings
+
+MODULES = (
+    "ml_pipeline.historical_ingestion.supabase_client",
+    "ml_pipeline.historical_ingestion.run_pipeline",
+)
+
+RAW = {
+    day: {
+        "1. open": "200.00",
+        "2. high": "205.00",
+        "3. low": "198.00",
+        "4. close": "202.00",
+        "5. adjusted close": "202.00",
+        "6. volume": "15000000",
+    }
+    for day in ("2024-07-25", "2024-07-26")
+}
+
+
+@pytest.fixture
+def run_pipeline(tmp_path, monkeypatch):
+    """run_pipeline with fetch, cache and upload replaced by fakes."""
+    monkeypatch.setattr(supabase, "create_client", lambda *_args: None)
+    for name in MODULES:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    module = importlib.import_module(MODULES[-1])
+    monkeypatch.setattr(module, "stage_timings", StageTimings())
+    monkeypatch.setattr(module, "fetch_daily_adjusted", lambda symbol, rate_limiter=None: RAW)
+    monkeypatch.setattr(module, "save_dataset", lambda *_args, **_kwargs: tmp_path)
+    monkeypatch.setattr(
+        module, "insert_stock_data", lambda records, mode: {"rows": len(records)}
+    )
+    return module
+
+
+def test_each_stage_is_timed_once_per_symbol(run_pipeline):
+    for symbol in ("AAPL", "MSFT", "GOOG"):
+        assert run_pipeline.ingest_symbol(symbol) == 2
+
+    counts = {stage: t["count"] for stage, t in run_pipeline.stage_timings.snapshot().items()}
+    assert counts == {"fetch": 3, "normalize": 3, "cache": 3, "records": 3, "upload": 3}
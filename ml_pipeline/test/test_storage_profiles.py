@@ -0,0 +1,91 @@
+"""
+test_storage_profiles.py
+Covers the named Parquet storage profiles applied by `dataset_manager.save_dataset`
+and `storage_profiles.write_parquet`, and the dtype restoration on load.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from ml_pipeline.src.ml import dataset_manager
+from ml_pipeline.src.ml.dataset_manager import load_dataset, read_parquet_subset, save_dataset
+from ml_pipeline.src.ml.storage_profiles import get_profile, write_parquet
+
+
+def _frame(rows=2000):
+    index = pd.date_range("2024-01-01", periods=rows, freq="h", tz="UTC", name="timestamp")
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(
+        {
+            "symbol": "AAPL",
+            "close": 100 + rng.standard_normal(rows).cumsum(),
+            "volume": rng.integers(0, 10_000, rows),
+            "rsi_14": rng.uniform(0, 100, rows),
+        },
+        index=index,
+    )
+
+
+def _codecs(path):
+    metadata = pq.ParquetFile(path).metadata
+    return {metadata.row_group(0).column(i).compression for i in range(metadata.num_columns)}
+
+
+@pytest.mark.parametrize(
+    "profile, codec, row_groups",
+    [("default", "SNAPPY", 2), ("fast", "LZ4", 1), ("compact", "ZSTD", 2)],
+)
+def test_profiles_round_trip_with_original_dtypes(
+    data_dirs, monkeypatch, profile, codec, row_groups
+):
+    monkeypatch.setattr("ml_pipeline.src.ml.storage_profiles.DATASET_ROW_GROUP_SIZE", 1000)
+    df = _frame()
+    path = save_dataset(df, "features", "AAPL", version="v1", profile=profile)
+
+    assert _codecs(path) == {codec}
+    assert pq.ParquetFile(path).metadata.num_row_groups == row_groups
+    loaded = load_dataset("features", "AAPL")
+    assert loaded.dtypes.equals(df.dtypes)
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False, rtol=1e-6)
+
+    projected = load_dataset("features", "AAPL", columns=["rsi_14"], start="2024-02-01")
+    assert projected["rsi_14"].dtype == np.float64
+    assert projected.index.min() == pd.Timestamp("2024-02-01", tz="UTC")
+
+
+def test_compact_profile_stores_float32_and_dictionary_symbols(data_dirs):
+    path = save_dataset(_frame(), "features", "AAPL", version="v1", profile="compact")
+    schema = pq.read_schema(path)
+    assert str(schema.field("rsi_14").type) == "float"
+    assert str(schema.field("symbol").type).startswith("dictionary")
+    assert path.stat().st_size < save_dataset(
+        _frame(), "features", "AAPL", version="v2", profile="default"
+    ).stat().st_size
+
+
+def test_configured_profile_applies_to_every_writer(data_dirs, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "ml_pipeline.src.ml.storage_profiles.DATASET_PROFILES",
+        {"raw": "compact", "features": "default"},
+    )
+    assert get_profile(dataset_type="raw")["name"] == "compact"
+    df = _frame()
+
+    output = tmp_path / "out.parquet"
+    write_parquet(df, output, dataset_type="raw")
+    assert _codecs(output) == {"ZSTD"}
+    pd.testing.assert_frame_equal(read_parquet_subset(output), df, check_freq=False, rtol=1e-6)
+
+    cached = save_dataset(df, "raw", "AAPL", version="v1", partitioning="month")
+    parts = sorted(cached.rglob("*.parquet"))
+    assert parts and all(_codecs(part) == {"ZSTD"} for part in parts)
+    # Partitions written with another profile are re-encoded, not reused.
+    save_dataset(df, "raw", "AAPL", version="v2", partitioning="month", profile="fast")
+    v2_parts = sorted((cached.parent / "v2").rglob("*.parquet"))
+    assert v2_parts and all(_codecs(part) == {"LZ4"} for part in v2_parts)
+    pd.testing.assert_frame_equal(load_dataset("raw", "AAPL"), df, check_freq=False)
+
+    with pytest.raises(ValueError):
+        get_profile("missing")
@@ -0,0 +1,74 @@
+"""
+test_streaming_parser.py
+Checks the incremental time series parser against the dict-based normalizer.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from ml_pipeline.src.ml.alpha_vantage import (
+    AlphaVantageError,
+    AlphaVantageRateLimitError,
+    normalize_time_series,
+)
+from ml_pipeline.src.ml.streaming_parser import TimeSeriesStreamParser, parse_csv_series
+
+SERIES_KEY = "Time Series (Daily)"
+
+
+def _payload(rows=50):
+    series = {}
+    for i, day in enumerate(pd.bdate_range("2024-01-01", periods=rows)[::-1]):
+        series[day.strftime("%Y-%m-%d")] = {
+            "1. open": f"{100 + i}.25",
+            "2. high": f"{101 + i}.5",
+            "3. low": f"{99 + i}.75",
+            "4. close": f"{100 + i}.0",
+            "5. adjusted close": f"{100 + i}.0",
+            "6. volume": str(1000 + i),
+        }
+    series["2024-01-03"]["4. close"] = "None"
+    return {"Meta Data": {"2. Symbol": "AAPL"}, SERIES_KEY: series}
+
+
+def _parse(body: bytes, chunk_size: int) -> pd.DataFrame:
+    parser = TimeSeriesStreamParser(SERIES_KEY, mode="daily", initial_capacity=16)
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start : start + chunk_size])
+    return parser.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_stream_parser_matches_normalize_time_series(chunk_size):
+    payload = _payload()
+    body = json.dumps(payload, indent=2).encode("utf-8")
+
+    expected = normalize_time_series(payload[SERIES_KEY])
+    result = _parse(body, chunk_size)
+
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+def test_stream_parser_raises_for_rate_limit_and_truncation():
+    note = json.dumps({"Note": "Thank you for using Alpha Vantage!"}).encode("utf-8")
+    with pytest.raises(AlphaVantageRateLimitError):
+        _parse(note, 5)
+
+    body = json.dumps(_payload()).encode("utf-8")
+    with pytest.raises(AlphaVantageError):
+        _parse(body[: len(body) // 2], 64)
+
+
+def test_parse_csv_series():
+    content = (
+        b"timestamp,open,high,low,close,volume\n"
+        b"2024-07-25 11:00:00,201.0,202.0,200.0,201.5,1200\n"
+        b"2024-07-25 10:00:00,200.0,201.0,199.0,201.0,1000\n"
+    )
+    df = parse_csv_series(content)
+
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert df.index.is_monotonic_increasing
+    assert df["volume"].tolist() == [1000, 1200]
@@ -0,0 +1,81 @@
+"""
+test_supabase_client.py
+Runs `historical_ingestion.supabase_client.insert_stock_data` against the
+in-process PostgREST stub server with a scratch upload index.
+"""
+
+import functools
+import importlib
+import sys
+
+import postgrest
+import pytest
+import supabase
+
+from ml_pipeline.src.ml import bulk_writer
+from ml_pipeline.src.ml.postgrest_stub import PostgrestStub
+from ml_pipeline.src.ml.upload_state import UploadState
+
+MODULE = "ml_pipeline.historical_ingestion.supabase_client"
+
+
+@pytest.fixture
+def stub():
+    with PostgrestStub() as server:
+        yield server
+
+
+@pytest.fixture
+def client(stub, tmp_path, monkeypatch):
+    """The module wired to the stub: one 10-row batch at a time, no retries."""
+    monkeypatch.setattr(supabase, "create_client", lambda *_args: None)
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+    module = importlib.import_module(MODULE)
+    monkeypatch.setattr(module, "supabase", postgrest.SyncPostgrestClient(stub.url))
+    monkeypatch.setattr(module, "upload_state", UploadState(tmp_path, enabled=True))
+    monkeypatch.setattr(
+        module,
+        "bulk_write",
+        functools.partial(
+            bulk_writer.bulk_write, max_in_flight=1, batch_size=10, max_batch_size=10, max_retries=0
+        ),
+    )
+    return module
+
+
+def _records(count, close=1.0):
+    return [
+        {
+            "symbol": "AAPL",
+            "date": f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00:00",
+            "close": close,
+            "ingested_at": "2024-02-01T00:00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def test_changed_rows_are_upserted_not_duplicated(client, stub):
+    assert client.insert_stock_data(_records(30))["rows"] == 30
+
+    revised = _records(30)
+    revised[5]["close"] = 2.0
+    stats = client.insert_stock_data(revised)
+
+    assert stats["rows"] == 1
+    rows = stub.rows("stock_prices")
+    assert len(rows) == 30
+    assert [row["close"] for row in rows if row["date"] == revised[5]["date"]] == [2.0]
+
+
+def test_batches_written_before_a_failure_are_not_resent(client, stub):
+    stub.fail_next(1, after=1)  # the second of three batches fails
+    assert client.insert_stock_data(_records(30)) is None
+    assert len(stub.rows("stock_prices")) == 20
+
+    requests = stub.requests
+    stats = client.insert_stock_data(_records(30))
+
+    assert stats["rows"] == 10
+    assert stub.requests == requests + 1
+    assert len(stub.rows("stock_prices")) == 30
@@ -0,0 +1,64 @@
+"""
+test_supabase_uploader.py
+Runs `src.ml.supabase_uploader.upload_to_supabase` against the in-process
+PostgREST stub server with a scratch upload index.
+"""
+
+import functools
+import importlib
+import sys
+
+import pandas as pd
+import postgrest
+import pytest
+import supabase
+
+from ml_pipeline.src.ml import bulk_writer, config
+from ml_pipeline.src.ml.postgrest_stub import PostgrestStub
+from ml_pipeline.src.ml.upload_state import UploadState
+
+MODULE = "ml_pipeline.src.ml.supabase_uploader"
+
+
+@pytest.fixture
+def stub():
+    with PostgrestStub(primary_keys={"stock_prices": ("symbol", "timestamp")}) as server:
+        yield server
+
+
+@pytest.fixture
+def uploader(stub, tmp_path, monkeypatch):
+    """The module wired to the stub: one 10-row batch at a time, no retries."""
+    monkeypatch.setattr(config, "SUPABASE_URL", "http://localhost")
+    monkeypatch.setattr(config, "SUPABASE_SERVICE_ROLE_KEY", "test")
+    monkeypatch.setattr(supabase, "create_client", lambda *_args: None)
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+    module = importlib.import_module(MODULE)
+    monkeypatch.setattr(module, "supabase", postgrest.SyncPostgrestClient(stub.url))
+    monkeypatch.setattr(module, "upload_state", UploadState(tmp_path, enabled=True))
+    monkeypatch.setattr(
+        module,
+        "bulk_write",
+        functools.partial(
+            bulk_writer.bulk_write, max_in_flight=1, batch_size=10, max_batch_size=10, max_retries=0
+        ),
+    )
+    return module
+
+
+def _bars(hours):
+    index = pd.date_range("2024-01-01", periods=hours, freq="h", name="timestamp")
+    return pd.DataFrame({"close": [1.0] * hours}, index=index)
+
+
+def test_batches_written_before_a_failure_are_not_resent(uploader, stub):
+    stub.fail_next(1, after=1)  # the second of three batches fails
+    with pytest.raises(uploader.SupabaseUploadError):
+        uploader.upload_to_supabase(_bars(30), "AAPL", mode="intraday", interval="60min")
+    assert len(stub.rows("stock_prices")) == 20
+
+    requests = stub.requests
+    uploader.upload_to_supabase(_bars(30), "AAPL", mode="intraday", interval="60min")
+
+    assert stub.requests == requests + 1
+    assert len(stub.rows("stock_prices")) == 30
@@ -0,0 +1,70 @@
+"""
+test_upload_state.py
+Checks that the upload index only selects new or changed rows.
+"""
+
+import pandas as pd
+
+from ml_pipeline.src.ml.upload_state import UploadState, make_scope
+
+
+def _frame(closes, ingested_at="2024-01-01T00:00:00+00:00"):
+    return pd.DataFrame(
+        {
+            "symbol": "AAPL",
+            "date": [f"2024-01-{day:02d}T00:00:00+00:00" for day in range(1, len(closes) + 1)],
+            "close": closes,
+            "volume": [100] * len(closes),
+            "ingested_at": ingested_at,
+        }
+    )
+
+
+def test_select_changed_skips_rows_already_uploaded(tmp_path):
+    state = UploadState(tmp_path, enabled=True)
+    scope = make_scope("stock_prices", "aapl", "daily", "60min")
+    ignore = ("ingested_at",)
+
+    first, hashes = state.select_changed(_frame([1.0, 2.0, 3.0]), scope, "date", ignore)
+    assert len(first) == 3
+    state.record(scope, hashes)
+    state.flush()
+
+    # Fresh process: state is reloaded from disk. A new ingestion timestamp
+    # alone does not count as a change; a revised close and a new bar do.
+    reloaded = UploadState(tmp_path, enabled=True)
+    later = _frame([1.0, 2.5, 3.0, 4.0], ingested_at="2024-01-05T00:00:00+00:00")
+    changed, hashes = reloaded.select_changed(later, scope, "date", ignore)
+    assert changed["close"].tolist() == [2.5, 4.0]
+    reloaded.record(scope, hashes)
+
+    unchanged, _ = reloaded.select_changed(later, scope, "date", ignore)
+    assert unchanged.empty
+
+    other_scope = make_scope("stock_prices", "AAPL", "intraday", "60min")
+    assert len(reloaded.select_changed(later, other_scope, "date", ignore)[0]) == 4
+
+
+def test_disabled_state_sends_everything(tmp_path):
+    state = UploadState(tmp_path, enabled=False)
+    scope = make_scope("stock_prices", "AAPL", "daily")
+    rows, hashes = state.select_changed(_frame([1.0]), scope, "date")
+    state.record(scope, hashes)
+
+    assert len(state.select_changed(_frame([1.0]), scope, "date")[0]) == 1
+    assert not any(tmp_path.iterdir())
+
+
+def test_recorded_hashes_are_written_every_few_batches(tmp_path):
+    state = UploadState(tmp_path, enabled=True, flush_every=2)
+    scope = make_scope("stock_prices", "AAPL", "daily")
+    _, hashes = state.select_changed(_frame([1.0, 2.0, 3.0]), scope, "date")
+
+    state.record(scope, hashes.iloc[:1])
+    assert not any(tmp_path.iterdir())
+    state.record(scope, hashes.iloc[1:2])
+    assert len(UploadState(tmp_path, enabled=True)._load(scope)) == 2
+
+    state.record(scope, hashes.iloc[2:])
+    state.flush()
+    assert len(UploadState(tmp_path, enabled=True)._load(scope)) == 3
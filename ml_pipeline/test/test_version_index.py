@@ -0,0 +1,48 @@
+"""
+test_version_index.py
+Covers the per-directory SQLite version index.
+"""
+
+import pandas as pd
+
+from ml_pipeline.src.ml.version_index import VersionIndex, describe_frame
+
+
+def _frame(start, periods, tz=None):
+    index = pd.date_range(start, periods=periods, freq="D", tz=tz, name="date")
+    return pd.DataFrame({"close": range(periods)}, index=index, dtype=float)
+
+
+def test_records_describe_each_version(tmp_path):
+    index = VersionIndex(tmp_path / "_versions.sqlite")
+    assert not index.exists() and index.versions() == []
+
+    entry = index.record("v1", _frame("2023-01-01", 31), nbytes=1234, location="both")
+    stored = index.get("v1")
+    assert stored == entry
+    assert stored["rows"] == 31 and stored["bytes"] == 1234 and stored["location"] == "both"
+    assert stored["min_ts"] == pd.Timestamp("2023-01-01").value
+    assert stored["max_ts"] == pd.Timestamp("2023-01-31").value
+
+    # Same columns and dtypes hash alike; a new column changes the schema hash.
+    widened = _frame("2023-01-01", 3).assign(rsi=1.0)
+    assert describe_frame(_frame("2024-01-01", 3))["schema_hash"] == stored["schema_hash"]
+    assert describe_frame(widened)["schema_hash"] != stored["schema_hash"]
+
+    index.record("v1", _frame("2023-01-01", 10), nbytes=99)
+    assert index.get("v1")["rows"] == 10
+    assert index.remove("v1") and not index.remove("v1")
+    assert index.get("v1") is None
+
+
+def test_coverage_queries_use_the_stored_ranges(tmp_path):
+    index = VersionIndex(tmp_path / "_versions.sqlite")
+    index.record("2023q1", _frame("2023-01-01", 90), nbytes=1)
+    index.record("2023q2", _frame("2023-04-01", 91, tz="America/New_York"), nbytes=1)
+    index.record("empty", _frame("2023-01-01", 0), nbytes=1)
+
+    assert index.covering("2023-03-01", "2023-03-31") == ["2023q1"]
+    assert index.covering("2023-03-31", "2023-04-02") == ["2023q1", "2023q2"]
+    assert index.covering(start="2023-06-01") == ["2023q2"]
+    assert index.covering() == ["2023q1", "2023q2"]
+    assert index.versions() == ["2023q1", "2023q2", "empty"]
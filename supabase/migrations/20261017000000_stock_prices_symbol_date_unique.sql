@@ -0,0 +1,16 @@
+-- The historical ingestion upserts daily bars with on_conflict=symbol,date
+-- (ml_pipeline/historical_ingestion/supabase_client.py). PostgREST turns that
+-- into ON CONFLICT (symbol, date), which Postgres only accepts when a unique
+-- constraint or index covers exactly those columns.
+
+-- Rows written by the earlier plain inserts may repeat a (symbol, date); keep
+-- the copy stored last (ctid order, i.e. insertion order for this append-only
+-- table) of each.
+delete from public.stock_prices as older
+using public.stock_prices as newer
+where older.symbol = newer.symbol
+  and older.date = newer.date
+  and older.ctid < newer.ctid;
+
+create unique index if not exists stock_prices_symbol_date_key
+  on public.stock_prices (symbol, date);